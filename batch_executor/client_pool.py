@@ -0,0 +1,214 @@
+"""
+常驻客户端进程池
+
+客户端进程在批次之间保持运行（环境变量 GD_SUPERVISED=1），
+通过stdin接收命令（见 src/communication/startup.py 的 SupervisorChannel）：
+- connect  连接（重连）服务器，失败时按退避间隔重试
+- reset    重置每局状态
+- stop     断开并退出
+
+批次重启时只需重启服务器，然后依次让客户端重连；
+只有客户端崩溃或内存超过阈值时才重新创建进程。
+崩溃的客户端在退出时立即重新创建（只启动进程，等待下一次connect命令）。
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .process_monitor import ProcessMonitor, ProcessTree
+from .readiness import wait_client_ready
+
+
+logger = logging.getLogger(__name__)
+
+# 运行时间短于该值（秒）就退出的客户端不立即重新创建，避免启动即崩溃时反复重启
+RESPAWN_MIN_UPTIME = 5
+
+
+class ClientPool:
+    """管理常驻客户端进程"""
+
+    def __init__(
+        self,
+        process_monitor: Optional[ProcessMonitor] = None,
+        memory_limit_mb: float = 0,
+        on_client_exit: Optional[Callable[[str, int], None]] = None
+    ):
+        """
+        初始化进程池
+
+        Args:
+            process_monitor: 进程监控器（用于查询内存）
+            memory_limit_mb: 客户端内存上限（MB），超过后在下一批次前回收，0表示不限制
+            on_client_exit: 客户端意外退出时的回调 (角色, 返回码)，在重新创建进程之后调用
+        """
+        self.process_monitor = process_monitor or ProcessMonitor()
+        self.memory_limit_mb = memory_limit_mb
+        self.processes: List[Optional[subprocess.Popen]] = []
+        self.scripts: List[str] = []
+        self.env: Dict[str, str] = {}
+        self.spawned = 0
+        self.recycled = 0
+        self.on_client_exit = on_client_exit
+        self.process_tree = ProcessTree("pool", on_exit=self._on_exit)
+        self._lock = threading.RLock()
+        self._spawned_at: Dict[int, float] = {}
+        self._ready_dir = tempfile.mkdtemp(prefix="gd_pool_")
+
+    def _ready_file(self, index: int) -> str:
+        return os.path.join(self._ready_dir, f"client{index + 1}.ready")
+
+    def _spawn(self, index: int) -> Optional[subprocess.Popen]:
+        """启动第index个客户端进程"""
+        script_path = self.scripts[index]
+        client_env = dict(os.environ, **self.env)
+        client_env["GD_SUPERVISED"] = "1"
+        client_env["GD_READY_FILE"] = self._ready_file(index)
+        try:
+            process = subprocess.Popen(
+                ['python', script_path],
+                stdin=subprocess.PIPE,
+                env=client_env,
+                text=True,
+                creationflags=subprocess.CREATE_NEW_CONSOLE if hasattr(subprocess, 'CREATE_NEW_CONSOLE') else 0
+            )
+        except (FileNotFoundError, PermissionError) as e:
+            logger.error(f"无法启动客户端 {script_path}: {e}")
+            return None
+        self.spawned += 1
+        self._spawned_at[process.pid] = time.monotonic()
+        self.process_tree.add(process, f"客户端{index + 1}")
+        logger.info(f"常驻客户端 {index + 1} 已启动，PID: {process.pid}")
+        return process
+
+    def _on_exit(self, role: str, process: subprocess.Popen, returncode: int) -> None:
+        """常驻客户端意外退出：立即重新创建进程"""
+        with self._lock:
+            if process not in self.processes:
+                return
+            index = self.processes.index(process)
+            uptime = time.monotonic() - self._spawned_at.pop(process.pid, 0.0)
+            self.recycled += 1
+            if uptime < RESPAWN_MIN_UPTIME:
+                logger.warning(
+                    f"常驻客户端 {index + 1} 启动{uptime:.1f}秒后即退出（返回码 {returncode}），下一批次前再重新创建"
+                )
+                self.processes[index] = None
+            else:
+                logger.warning(f"常驻客户端 {index + 1} 意外退出（返回码 {returncode}），立即重新创建")
+                self.processes[index] = self._spawn(index)
+        if self.on_client_exit is not None:
+            self.on_client_exit(role, returncode)
+
+    def _send(self, process: subprocess.Popen, command: str) -> bool:
+        """向客户端发送一条命令"""
+        try:
+            process.stdin.write(command + "\n")
+            process.stdin.flush()
+            return True
+        except (BrokenPipeError, OSError, ValueError):
+            return False
+
+    def _needs_recycle(self, process: Optional[subprocess.Popen]) -> Optional[str]:
+        """返回需要回收的原因，不需要返回None"""
+        if process is None:
+            return "未启动"
+        if process.poll() is not None:
+            return f"已退出（返回码 {process.returncode}）"
+        if self.memory_limit_mb > 0:
+            memory = self.process_monitor.get_memory_mb(process.pid)
+            if memory is not None and memory > self.memory_limit_mb:
+                return f"内存 {memory:.0f}MB 超过上限 {self.memory_limit_mb:.0f}MB"
+        return None
+
+    def ensure_started(self, scripts: List[str], env: Optional[Dict[str, str]] = None) -> None:
+        """
+        确保每个脚本都有一个健康的常驻进程
+
+        脚本列表或环境变量变化时重建整个进程池；崩溃或超过内存上限的进程单独回收。
+        """
+        with self._lock:
+            self._ensure_started(scripts, env)
+
+    def _ensure_started(self, scripts: List[str], env: Optional[Dict[str, str]]) -> None:
+        env = dict(env or {})
+        if scripts != self.scripts or env != self.env:
+            self.stop()
+            self.scripts = list(scripts)
+            self.env = env
+            self.processes = [None] * len(scripts)
+
+        for i, process in enumerate(self.processes):
+            reason = self._needs_recycle(process)
+            if reason is None:
+                continue
+            if process is not None:
+                logger.warning(f"回收客户端 {i + 1}: {reason}")
+                self._terminate(process)
+                self.recycled += 1
+            self.processes[i] = self._spawn(i)
+
+    def connect_all(self, wait_between: float = 3, seed: Optional[int] = None) -> List[subprocess.Popen]:
+        """
+        按顺序让客户端重置状态并连接服务器（保证座位顺序）
+
+        Args:
+            wait_between: 等待每个客户端连接的最长时间（秒）
+            seed: 本批次的随机种子，第i个客户端使用 seed + i，None表示不重新设置
+
+        Returns:
+            已发送连接命令的客户端进程列表
+        """
+        connected = []
+        with self._lock:
+            processes = list(self.processes)
+        for i, process in enumerate(processes):
+            if process is None:
+                continue
+            ready_file = self._ready_file(i)
+            if os.path.exists(ready_file):
+                os.remove(ready_file)
+            reset = "reset" if seed is None else f"reset {seed + i}"
+            if not (self._send(process, reset) and self._send(process, "connect")):
+                logger.error(f"客户端 {i + 1} 无法接收命令")
+                continue
+            connected.append(process)
+            if i < len(processes) - 1:
+                if not wait_client_ready(process, ready_file, wait_between):
+                    logger.info(f"客户端 {i + 1} 未在{wait_between}秒内连接")
+        return connected
+
+    def _terminate(self, process: subprocess.Popen, timeout: float = 5) -> None:
+        """请求客户端退出，超时后强制结束"""
+        self.process_tree.discard(process)
+        self._spawned_at.pop(process.pid, None)
+        if process.poll() is None:
+            self._send(process, "stop")
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if process.stdin:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def stop(self) -> None:
+        """结束所有常驻客户端"""
+        with self._lock:
+            processes, self.processes = self.processes, [None] * len(self.processes)
+        for process in processes:
+            if process is not None:
+                self._terminate(process)
+
+    def close(self) -> None:
+        """结束所有客户端并删除信号目录"""
+        self.stop()
+        shutil.rmtree(self._ready_dir, ignore_errors=True)
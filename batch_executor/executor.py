@@ -4,17 +4,31 @@
 整合所有模块，实现批量游戏执行的主控制逻辑。
 """
 
-from dataclasses import dataclass, asdict
+from collections import deque
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 import json
 import os
+import random
 import signal
 import subprocess
 import sys
 import tempfile
-from typing import Optional
+import threading
+from typing import Callable, List, Optional, Tuple
 import logging
 
+from .output_parser import ServerEvent, ServerOutputParser
+from .sequential_test import SequentialTest
+
+
+# 状态文件中保留的最近事件数 / 内存中保留的最近事件数（供GUI读取）
+STATE_RECENT_EVENTS = 20
+RECENT_EVENTS = 200
+
+# 连续多少个批次没有任何进展后停止（服务器能启动但始终不产生结果）
+MAX_STALLED_BATCHES = 3
+
 
 @dataclass
 class ExecutionState:
@@ -25,6 +39,15 @@ class ExecutionState:
     current_batch: int
     start_time: datetime
     last_update: datetime
+    startup_overhead: float = 0.0  # 累计启动耗时（秒）：服务器就绪 + 客户端连接
+    recent_events: List[dict] = field(default_factory=list)  # 最近的服务器事件（单局结束、战绩等）
+    stop_reason: str = ""  # 提前停止的原因（例如序贯检验已有结论）
+    # 以下字段构成逐局检查点，每局结束即写入，用于 resume=True 时从中断处继续
+    team_a_wins: int = 0  # 本次运行累计战绩
+    team_b_wins: int = 0
+    run_id: str = ""  # 逐局战绩数据库中的运行ID（恢复后继续使用）
+    seed: int = 0  # 运行种子，每批次的客户端种子由它和批次编号导出
+    config: dict = field(default_factory=dict)  # 服务器和双方客户端配置，恢复时校验
     
     def save(self, filepath: str) -> None:
         """
@@ -153,7 +176,16 @@ class BatchExecutor:
         diagnose_only: bool = False,
         state_file: str = "execution_state.json",
         score_file: str = "game_scores.json",
-        enable_signal_handler: bool = True
+        enable_signal_handler: bool = True,
+        parallel: int = 1,
+        base_port: int = 23456,
+        server_port_args: Optional[List[str]] = None,
+        persistent_clients: bool = False,
+        client_memory_limit_mb: float = 0,
+        results_file: Optional[str] = "game_results.db",
+        sequential_test: Optional[SequentialTest] = None,
+        resume: bool = False,
+        seed: Optional[int] = None
     ):
         """
         初始化批量执行器
@@ -166,6 +198,15 @@ class BatchExecutor:
             state_file: 执行状态保存文件
             score_file: 战绩保存文件
             enable_signal_handler: 是否启用信号处理器（GUI模式下应设为False）
+            parallel: 同时运行的对局组数（每组一个服务器+全部客户端），默认1（串行）
+            base_port: 并行模式下第一组的端口，第i组使用 base_port + i
+            server_port_args: 指定服务器端口的命令行参数模板，如 ["--port", "{port}"]
+            persistent_clients: 客户端进程常驻，批次之间只重启服务器
+            client_memory_limit_mb: 常驻客户端内存上限（MB），超过后回收，0表示不限制
+            results_file: 逐局战绩数据库（SQLite），None表示不记录
+            sequential_test: 序贯检验（SPRT），有结论时提前停止；None表示打满目标场数
+            resume: 从状态文件中的检查点继续（配置不同时重新开始）
+            seed: 运行种子，None表示随机生成（恢复执行时沿用检查点中的种子）
         """
         self.target_games = target_games
         self.server_path = server_path
@@ -173,9 +214,24 @@ class BatchExecutor:
         self.diagnose_only = diagnose_only
         self.state_file = state_file
         self.score_file = score_file
+        self.results_file = results_file
+        self.sequential_test = sequential_test
+        self.resume = resume
+        self.seed = seed
+        self.results_store = None
+        self._run_id = ""
+        self._strategies = self._team_strategies(client_scripts)
+        self.parallel = max(1, parallel)
+        self.base_port = base_port
+        self.server_port_args = server_port_args
+        self.persistent_clients = persistent_clients
+        self.client_memory_limit_mb = client_memory_limit_mb
         self.logger = logging.getLogger("batch_executor")
         self._running = False
         self._current_state = None
+        self._lock = threading.Lock()
+        self._event_listeners: List[Callable[[ServerEvent], None]] = []
+        self.recent_events = deque(maxlen=RECENT_EVENTS)
         
         # 导入所需模块
         from .diagnostic import DiagnosticModule
@@ -188,7 +244,11 @@ class BatchExecutor:
         self.diagnostic = DiagnosticModule()
         self.process_monitor = ProcessMonitor()
         self.tracker = ScoreTracker(score_file)
-        self.restart_manager = RestartManager(self.process_monitor)
+        self.restart_manager = RestartManager(
+            self.process_monitor,
+            persistent_clients=persistent_clients,
+            client_memory_limit_mb=client_memory_limit_mb
+        )
         self.validator = InputValidator()
         
         # 初始化信号处理器（仅在主线程中）
@@ -205,6 +265,17 @@ class BatchExecutor:
         except ValueError as e:
             self.logger.error(f"目标场数验证失败: {e}")
             raise
+        
+        # 验证序贯检验参数
+        if sequential_test is not None:
+            try:
+                self.validator.validate_sprt_params(
+                    sequential_test.elo0, sequential_test.elo1,
+                    sequential_test.alpha, sequential_test.beta, sequential_test.min_games
+                )
+            except ValueError as e:
+                self.logger.error(f"序贯检验参数验证失败: {e}")
+                raise
     
     def run_diagnostic(self):
         """
@@ -305,6 +376,7 @@ class BatchExecutor:
         self.logger.info(f"当前批次: {state.current_batch}")
         self.logger.info(f"重启次数: {state.restart_count}")
         self.logger.info(f"已运行时间: {elapsed}")
+        self.logger.info(f"累计启动开销: {state.startup_overhead:.1f}秒")
         
         # 显示累计战绩
         if self.tracker.total_games > 0:
@@ -315,14 +387,19 @@ class BatchExecutor:
     def run(self) -> None:
         """执行批量游戏"""
         # 立即创建执行状态，以便GUI可以显示
-        state = ExecutionState(
-            target_games=self.target_games,
-            completed_games=0,
-            restart_count=0,
-            current_batch=1,
-            start_time=datetime.now(),
-            last_update=datetime.now()
-        )
+        state = self._resume_state() if self.resume else None
+        resumed = state is not None
+        if state is None:
+            state = ExecutionState(
+                target_games=self.target_games,
+                completed_games=0,
+                restart_count=0,
+                current_batch=1,
+                start_time=datetime.now(),
+                last_update=datetime.now(),
+                seed=self.seed if self.seed is not None else random.randrange(2 ** 31),
+                config=self._run_config()
+            )
         
         # 保存当前状态供外部访问
         self._current_state = state
@@ -360,23 +437,50 @@ class BatchExecutor:
         except Exception as e:
             self.logger.warning(f"加载战绩失败: {e}")
         
+        # 打开逐局战绩数据库
+        if self.results_file:
+            from .results_store import ResultsStore
+            try:
+                self.results_store = ResultsStore(self.results_file)
+                self._run_id = state.run_id or state.start_time.strftime("%Y%m%d-%H%M%S")
+                state.run_id = self._run_id
+                self.logger.info(f"逐局战绩写入 {self.results_file}（运行ID {self._run_id}）")
+            except Exception as e:
+                self.logger.warning(f"无法打开战绩数据库 {self.results_file}: {e}")
+        
         # 计算需要的重启次数
         restart_count = self.validator.calculate_restart_count(self.target_games)
         self.logger.info(f"预计需要重启 {restart_count} 次")
         
-        # 清空之前的战绩，开始新的对战
-        self.tracker.team_a_wins = 0
-        self.tracker.team_b_wins = 0
-        self.tracker.total_games = 0
-        self.logger.info("已清空之前的战绩，开始新的对战")
+        if resumed:
+            # 从检查点恢复本次运行的战绩
+            self.tracker.team_a_wins = state.team_a_wins
+            self.tracker.team_b_wins = state.team_b_wins
+            self.tracker.total_games = state.team_a_wins + state.team_b_wins
+            if self.sequential_test is not None and not state.stop_reason:
+                if self.sequential_test.update(state.team_a_wins, state.team_b_wins):
+                    state.stop_reason = f"sprt:{self.sequential_test.decision}"
+            self.logger.info(
+                f"从检查点恢复: 已完成 {state.completed_games}/{state.target_games} 场，"
+                f"战绩 Team A {state.team_a_wins}胜, Team B {state.team_b_wins}胜，"
+                f"下一批次 {state.current_batch}，种子 {state.seed}"
+            )
+        else:
+            # 清空之前的战绩，开始新的对战
+            self.tracker.team_a_wins = 0
+            self.tracker.team_b_wins = 0
+            self.tracker.total_games = 0
+            self.logger.info(f"已清空之前的战绩，开始新的对战（种子 {state.seed}）")
         
-        # 记录初始战绩，用于计算增量
-        initial_team_a = 0
-        initial_team_b = 0
+        from .restart_manager import batch_seed
         
         # 主执行循环
         try:
-            while state.completed_games < state.target_games and self._running:
+            if self.parallel > 1:
+                self._run_parallel(state)
+            
+            stalled_batches = 0
+            while state.completed_games < state.target_games and self._running and not state.stop_reason:
                 if self.signal_handler and self.signal_handler.is_shutdown_requested():
                     self.logger.info("检测到关闭请求，停止执行")
                     break
@@ -396,7 +500,9 @@ class BatchExecutor:
                 # 启动服务器
                 server_process = self.restart_manager.restart_server(
                     self.server_path,
-                    batch_games
+                    batch_games,
+                    port=self.base_port,
+                    server_args=[arg.format(port=self.base_port) for arg in (self.server_port_args or [])]
                 )
                 
                 if server_process is None:
@@ -405,27 +511,37 @@ class BatchExecutor:
                 
                 # 启动客户端
                 client_processes = self.restart_manager.restart_clients(
-                    self.client_scripts
+                    self.client_scripts,
+                    env={"GD_SERVER_PORT": str(self.base_port)},
+                    seed=batch_seed(state.seed, state.current_batch)
                 )
                 
                 if not client_processes:
                     self.logger.error("没有客户端成功启动，停止执行")
                     break
                 
+                # 记录本批次启动开销
+                batch_overhead = self.restart_manager.get_startup_overhead()
+                state.startup_overhead += batch_overhead
+                self.logger.info(
+                    f"批次 {state.current_batch} 启动开销: {batch_overhead:.2f}秒 "
+                    f"(累计 {state.startup_overhead:.2f}秒)"
+                )
+                
                 # 等待服务器完成
                 server_name = os.path.basename(self.server_path)
                 self.logger.info(f"等待服务器完成 {batch_games} 场游戏...")
                 
-                # 等待服务器进程结束并读取输出
-                server_output = []
+                # 等待服务器进程结束，边读取输出边解析（实时计分）
+                parser = ServerOutputParser(state.current_batch, batch_games)
                 try:
-                    # 读取输出
-                    if server_process.stdout:
-                        for line in server_process.stdout:
-                            server_output.append(line.strip())
-                            # 实时打印服务器输出
-                            if line.strip():
-                                self.logger.info(f"[服务器] {line.strip()}")
+                    # 读取输出（启动阶段已由后台线程读取的输出也在其中）
+                    for line in self.restart_manager.iter_server_output():
+                        # 实时打印服务器输出
+                        if line.strip():
+                            self.logger.info(f"[服务器] {line.strip()}")
+                        for event in parser.feed(line):
+                            self._handle_server_event(state, event)
                     
                     server_process.wait(timeout=60)  # 等待进程结束
                     self.logger.info("服务器进程已正常结束")
@@ -435,56 +551,25 @@ class BatchExecutor:
                 except Exception as e:
                     self.logger.error(f"读取服务器输出时出错: {e}")
                 
-                # 更新状态
-                state.completed_games += batch_games
-                state.last_update = datetime.now()
-                
-                # 从服务器输出读取本批次战绩
-                # 服务器输出格式: "达到设定场次, 其中0号位胜利X次，1号位胜利Y次，2号位胜利Z次，3号位胜利W次"
-                try:
-                    import re
-                    # 从服务器输出中查找战绩
-                    for line in reversed(server_output):
-                        if "达到设定场次" in line or "其中" in line:
-                            # 提取各位置胜利次数
-                            matches = re.findall(r'(\d+)号位胜利(\d+)次', line)
-                            if matches:
-                                wins = {int(pos): int(count) for pos, count in matches}
-                                # 0号和2号是team_a，1号和3号是team_b
-                                current_team_a = wins.get(0, 0) + wins.get(2, 0)
-                                current_team_b = wins.get(1, 0) + wins.get(3, 0)
-                                
-                                # 计算本批次的增量
-                                delta_a = current_team_a - initial_team_a
-                                delta_b = current_team_b - initial_team_b
-                                
-                                # 累加到tracker
-                                for _ in range(delta_a):
-                                    self.tracker.record_game("team_a")
-                                for _ in range(delta_b):
-                                    self.tracker.record_game("team_b")
-                                
-                                # 更新初始值
-                                initial_team_a = current_team_a
-                                initial_team_b = current_team_b
-                                
-                                self.logger.info(f"本批次增量: Team A +{delta_a}, Team B +{delta_b}")
-                                self.logger.info(f"累计战绩: Team A {self.tracker.team_a_wins}胜, Team B {self.tracker.team_b_wins}胜")
-                                break
-                except Exception as e:
-                    self.logger.warning(f"读取战绩失败: {e}")
-                    import traceback
-                    traceback.print_exc()
+                # 更新状态（战绩已在事件中实时计入，这里补齐未通过事件计入的场数）
+                completed_before = state.completed_games
+                self._finish_batch(state, parser)
                 
                 # 保存战绩和状态
-                try:
-                    self.tracker.save()
-                    state.save(self.state_file)
-                except Exception as e:
-                    self.logger.error(f"保存数据失败: {e}", exc_info=True)
+                self._save_checkpoint(state)
+                
+                if state.completed_games > completed_before or parser.games_finished:
+                    stalled_batches = 0
+                else:
+                    stalled_batches += 1
+                    if stalled_batches >= MAX_STALLED_BATCHES:
+                        self.logger.error(f"连续 {stalled_batches} 个批次没有完成任何对局，停止执行")
+                        break
                 
                 # 检查是否需要重启
-                if state.completed_games < state.target_games:
+                if state.stop_reason:
+                    self.logger.info(f"提前停止（{state.stop_reason}），已完成 {state.completed_games}/{state.target_games} 场")
+                elif state.completed_games < state.target_games:
                     state.restart_count += 1
                     state.current_batch += 1
                     self.logger.info(f"准备重启，已完成 {state.completed_games}/{state.target_games} 场")
@@ -498,6 +583,8 @@ class BatchExecutor:
             self.display_progress(state)
             self.logger.info("\n最终战绩:")
             self.logger.info(self.tracker.generate_report())
+            if self.sequential_test is not None:
+                self.logger.info(self.sequential_test.result().describe())
             self.logger.info("=" * 60)
             
         except Exception as e:
@@ -506,9 +593,251 @@ class BatchExecutor:
         finally:
             # 清理所有进程
             self.logger.info("清理进程...")
-            self.restart_manager.cleanup()
+            self.restart_manager.shutdown()
+            if self.results_store is not None:
+                self.results_store.close()
+                self.results_store = None
             self._running = False
     
+    def _run_config(self) -> dict:
+        """检查点中记录的对局配置（恢复时必须一致）"""
+        return {
+            "server_path": os.path.abspath(self.server_path),
+            "client_scripts": [os.path.abspath(script) for script in self.client_scripts],
+            "strategies": list(self._strategies),
+        }
+    
+    def _resume_state(self) -> Optional[ExecutionState]:
+        """
+        加载状态文件中的检查点
+        
+        Returns:
+            可继续的执行状态；没有检查点、无法读取或配置不同时返回None（重新开始）
+        """
+        if not os.path.exists(self.state_file):
+            self.logger.info(f"没有找到检查点 {self.state_file}，重新开始")
+            return None
+        try:
+            state = ExecutionState.load(self.state_file)
+        except Exception as e:
+            self.logger.warning(f"无法读取检查点 {self.state_file}: {e}，重新开始")
+            return None
+        if state.config != self._run_config():
+            self.logger.warning("检查点的服务器/客户端配置与本次不同，重新开始")
+            return None
+        state.target_games = self.target_games
+        state.last_update = datetime.now()
+        return state
+    
+    def _save_checkpoint(self, state: ExecutionState) -> None:
+        """保存战绩和执行状态（逐局检查点）"""
+        state.team_a_wins = self.tracker.team_a_wins
+        state.team_b_wins = self.tracker.team_b_wins
+        try:
+            self.tracker.save()
+            state.save(self.state_file)
+        except Exception as e:
+            self.logger.error(f"保存数据失败: {e}", exc_info=True)
+    
+    @staticmethod
+    def _team_strategies(client_scripts: list) -> Tuple[Optional[str], Optional[str]]:
+        """按座位（启动顺序）得到双方使用的客户端名称：(0号+2号, 1号+3号)"""
+        names = [os.path.splitext(os.path.basename(script))[0] for script in client_scripts]
+        if len(names) < 4:
+            return None, None
+        return f"{names[0]}+{names[2]}", f"{names[1]}+{names[3]}"
+    
+    def _record_results(self, event: ServerEvent) -> None:
+        """
+        把战绩事件写入逐局数据库（每局一行）
+        
+        Args:
+            event: score事件（头游座位、完牌次序、级牌见 ServerEvent.game_results）
+        """
+        from .results_store import GameRecord
+        
+        games = event.game_results()
+        duration = event.duration / len(games) if event.duration is not None and games else None
+        strategy_a, strategy_b = self._strategies
+        ts = event.timestamp.timestamp()
+        self.results_store.record_games(
+            GameRecord(
+                run_id=self._run_id,
+                batch=event.batch,
+                winner=team,
+                seat=seat,
+                strategy_a=strategy_a,
+                strategy_b=strategy_b,
+                level=level,
+                finish_order=",".join(map(str, order)) if order else None,
+                duration=duration,
+                ts=ts
+            )
+            for team, seat, order, level in games
+        )
+    
+    def add_event_listener(self, listener: Callable[[ServerEvent], None]) -> None:
+        """
+        订阅服务器事件（单局结束、战绩更新、错误等）
+        
+        回调在读取服务器输出的线程中调用，GUI需要自行切换到界面线程。
+        
+        Args:
+            listener: 回调函数，参数为ServerEvent
+        """
+        self._event_listeners.append(listener)
+    
+    def _handle_server_event(self, state: ExecutionState, event: ServerEvent, prefix: str = "") -> None:
+        """
+        处理一个服务器事件：实时更新战绩、进度和状态文件，并通知订阅者
+        
+        Args:
+            state: 执行状态
+            event: 服务器事件
+            prefix: 日志前缀（并行模式下为组号）
+        """
+        with self._lock:
+            if event.kind == "score":
+                self.tracker.record_wins(event.team_a, event.team_b)
+                if self.sequential_test is not None and not state.stop_reason:
+                    if self.sequential_test.update(event.team_a, event.team_b):
+                        result = self.sequential_test.result()
+                        state.stop_reason = f"sprt:{result.decision}"
+                        self.logger.info(f"{result.games}场后序贯检验得出结论，提前停止\n{result.describe()}")
+                if self.results_store is not None:
+                    try:
+                        self._record_results(event)
+                    except Exception as e:
+                        self.logger.error(f"写入战绩数据库失败: {e}")
+            state.completed_games += event.games
+            state.last_update = event.timestamp
+            state.recent_events = (state.recent_events + [event.to_dict()])[-STATE_RECENT_EVENTS:]
+            self.recent_events.append(event)
+            
+            if event.kind in ("score", "game_end"):
+                self._save_checkpoint(state)
+        
+        if event.kind == "score":
+            self.logger.info(
+                f"{prefix}{event.describe()}，累计战绩: "
+                f"Team A {self.tracker.team_a_wins}胜, Team B {self.tracker.team_b_wins}胜"
+            )
+        elif event.kind == "error":
+            self.logger.warning(f"{prefix}服务器输出错误: {event.line}")
+        
+        for listener in self._event_listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                self.logger.warning(f"事件回调出错: {e}")
+    
+    def _finish_batch(self, state: ExecutionState, parser: ServerOutputParser, prefix: str = "") -> None:
+        """
+        批次结束：补齐进度并输出本批次战绩
+        
+        Args:
+            state: 执行状态
+            parser: 本批次的输出解析器
+            prefix: 日志前缀（并行模式下为组号）
+        """
+        with self._lock:
+            if parser.finished:
+                state.completed_games += parser.remaining_games()
+            elif parser.remaining_games():
+                # 服务器中途退出：只保留已逐局计入的场次，其余在下一批次重新进行
+                self.logger.warning(
+                    f"{prefix}批次{parser.batch} 未正常结束，"
+                    f"{parser.remaining_games()} 场未计入，将重新进行"
+                )
+            state.last_update = datetime.now()
+        
+        result = parser.result()
+        if result is not None:
+            self.logger.info(f"{prefix}本批次战绩: Team A {result[0]}胜, Team B {result[1]}胜")
+        else:
+            self.logger.warning(f"{prefix}未能从服务器输出读取本批次战绩")
+            if parser.tail:
+                self.logger.warning(f"{prefix}服务器最后输出: {parser.tail[-1]}")
+    
+    def _run_parallel(self, state: ExecutionState) -> None:
+        """
+        并行执行：K组服务器+客户端共享一个场次配额队列
+        
+        每组使用独立端口（base_port + i），服务器事件实时在锁内汇总到tracker和执行状态。
+        收到SIGINT（SignalHandler）或GUI停止请求时，结束所有组的进程后返回。
+        
+        Args:
+            state: 执行状态
+        """
+        import queue
+        from .parallel import GameGroup, split_quotas, wait_groups
+        
+        remaining = state.target_games - state.completed_games
+        quotas: "queue.Queue[Tuple[int, int]]" = queue.Queue()
+        for offset, quota in enumerate(split_quotas(remaining, self.validator.single_run_limit)):
+            quotas.put((state.current_batch + offset, quota))
+        
+        group_count = min(self.parallel, quotas.qsize())
+        self.logger.info(
+            f"并行模式: {group_count} 组，端口 {self.base_port}-{self.base_port + group_count - 1}，"
+            f"共 {quotas.qsize()} 个批次"
+        )
+        if group_count > 1 and not self.server_port_args:
+            self.logger.warning("未指定服务器端口参数(server_port_args)，各组服务器可能使用同一端口")
+        
+        stop_event = threading.Event()
+        
+        def on_event(index: int, event: ServerEvent) -> None:
+            self._handle_server_event(state, event, prefix=f"[组{index}] ")
+        
+        def on_result(index: int, parser: ServerOutputParser, overhead: float) -> None:
+            self._finish_batch(state, parser, prefix=f"[组{index}] ")
+            with self._lock:
+                state.current_batch += 1
+                state.startup_overhead += overhead
+                self.logger.info(
+                    f"已完成 {state.completed_games}/{state.target_games} 场，"
+                    f"累计战绩: Team A {self.tracker.team_a_wins}胜, Team B {self.tracker.team_b_wins}胜"
+                )
+                self._save_checkpoint(state)
+        
+        groups = [
+            GameGroup(
+                i, self.base_port + i, self.server_path, self.client_scripts, self.server_port_args,
+                self.persistent_clients, self.client_memory_limit_mb, seed=state.seed
+            )
+            for i in range(group_count)
+        ]
+        
+        # 启动前清理残留的服务器进程（之后各组只清理自己的进程）
+        self.restart_manager.cleanup()
+        
+        def should_stop() -> bool:
+            if not self._running or state.stop_reason:
+                return True
+            return bool(self.signal_handler and self.signal_handler.is_shutdown_requested())
+        
+        finished = False
+        try:
+            for group in groups:
+                group.start(quotas, on_event, on_result, stop_event)
+            finished = wait_groups(groups, should_stop)
+            if state.stop_reason:
+                self.logger.info(f"提前停止（{state.stop_reason}），结束所有对局组")
+            elif not finished:
+                self.logger.info("检测到停止请求，结束所有对局组")
+        finally:
+            # SIGINT时SignalHandler会抛出SystemExit，这里保证所有组的进程被结束
+            stop_event.set()
+            for group in groups:
+                group.cleanup()
+            for group in groups:
+                group.join(timeout=10)
+        
+        if finished and not quotas.empty():
+            # 剩余场次由串行循环完成（串行循环同样在连续多个批次没有进展后停止）
+            self.logger.error("所有对局组都已退出，仍有未完成的批次，改为串行执行剩余场次")
+    
     def start(self) -> None:
         """启动执行（用于GUI）"""
         self.run()
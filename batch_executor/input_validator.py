@@ -56,6 +56,37 @@ class InputValidator:
         self._target_games = target_games
         return self._target_games
     
+    def validate_sprt_params(
+        self,
+        elo0: float,
+        elo1: float,
+        alpha: float,
+        beta: float,
+        min_games: int = 0
+    ) -> None:
+        """
+        验证序贯检验（SPRT）参数
+        
+        Args:
+            elo0: H0的Elo差
+            elo1: H1的Elo差
+            alpha: 第一类错误率
+            beta: 第二类错误率
+            min_games: 最少对局数
+            
+        Raises:
+            ValueError: 如果参数无效
+        """
+        if elo1 <= elo0:
+            raise ValueError(f"elo1必须大于elo0，但得到 elo0={elo0}, elo1={elo1}")
+        for name, value in (("alpha", alpha), ("beta", beta)):
+            if not 0 < value < 0.5:
+                raise ValueError(f"{name}必须在(0, 0.5)之间，但得到 {value}")
+        if min_games < 0:
+            raise ValueError(f"最少对局数不能为负数，但得到 {min_games}")
+        if self._target_games is not None and min_games > self._target_games:
+            raise ValueError(f"最少对局数 {min_games} 超过目标场数 {self._target_games}")
+    
     @property
     def target_games(self) -> Optional[int]:
         """获取当前存储的目标场数"""
@@ -0,0 +1,113 @@
+"""
+日志缓冲模块
+
+供GUI使用的内存日志缓冲（与Tk无关，可在任意线程写入）：
+- 写入只追加到环形缓冲，不触发界面刷新；界面定时批量取出新日志一次性插入
+- 环形缓冲有上限，超出后丢弃最旧的记录，内存占用有界
+- 过滤和搜索在内存记录上进行，不扫描文本控件
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+
+# 每个级别单独建索引，按级别过滤时只遍历该级别的记录
+LEVELS = ("INFO", "SUCCESS", "WARNING", "ERROR")
+
+
+@dataclass
+class LogRecord:
+    """一条日志"""
+    seq: int  # 全局序号（用于判断新旧）
+    level: str
+    message: str
+
+
+class LogBuffer:
+    """线程安全的环形日志缓冲"""
+
+    def __init__(self, capacity: int = 100000):
+        """
+        初始化缓冲
+
+        Args:
+            capacity: 最多保留的日志条数
+        """
+        self.capacity = capacity
+        self._records: Deque[LogRecord] = deque(maxlen=capacity)
+        self._by_level: Dict[str, Deque[LogRecord]] = {level: deque() for level in LEVELS}
+        self._pending: Deque[LogRecord] = deque(maxlen=capacity)
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def append(self, message: str, level: str = "INFO") -> None:
+        """
+        追加一条日志（任意线程）
+
+        Args:
+            message: 日志内容（可以包含换行）
+            level: 级别，未知级别按INFO处理
+        """
+        if level not in self._by_level:
+            level = "INFO"
+        with self._lock:
+            self._seq += 1
+            record = LogRecord(self._seq, level, message)
+            if len(self._records) == self.capacity:
+                # 最旧的记录即将被挤出，同时移出它所在级别的索引
+                oldest = self._records[0]
+                self._by_level[oldest.level].popleft()
+            self._records.append(record)
+            self._by_level[level].append(record)
+            self._pending.append(record)
+
+    def drain(self) -> List[LogRecord]:
+        """取出上次调用以来的新日志（界面线程定时调用）"""
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        return pending
+
+    def clear(self) -> None:
+        """清空所有日志"""
+        with self._lock:
+            self._records.clear()
+            for records in self._by_level.values():
+                records.clear()
+            self._pending.clear()
+
+    def search(self, text: str = "", level: Optional[str] = None, limit: Optional[int] = None) -> List[LogRecord]:
+        """
+        按级别和关键字查找日志
+
+        Args:
+            text: 关键字（不区分大小写），空字符串表示不按内容过滤
+            level: 只查找该级别，None表示全部
+            limit: 只返回最新的limit条
+
+        Returns:
+            按时间顺序排列的匹配记录
+        """
+        with self._lock:
+            records = list(self._by_level[level] if level in self._by_level else self._records)
+        if text:
+            needle = text.lower()
+            records = [record for record in records if needle in record.message.lower()]
+        if limit is not None:
+            records = records[-limit:]
+        return records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def counts(self) -> Dict[str, int]:
+        """各级别的日志条数"""
+        with self._lock:
+            return {level: len(records) for level, records in self._by_level.items()}
+
+    def text(self) -> str:
+        """全部日志（用于保存到文件）"""
+        with self._lock:
+            return "".join(record.message + "\n" for record in self._records)
@@ -11,6 +11,8 @@ from pathlib import Path
 
 from .logging_config import setup_logging
 from .executor import BatchExecutor
+from .input_validator import InputValidator
+from .sequential_test import SequentialTest
 
 
 def parse_arguments():
@@ -36,6 +38,9 @@ def parse_arguments():
   
   # 指定客户端脚本
   python -m batch_executor.main --server-path server.exe --clients client1.py client2.py client3.py client4.py
+  
+  # 同时运行8组对局（端口23456-23463）
+  python -m batch_executor.main --server-path server.exe --parallel 8 --server-port-arg=--port --server-port-arg={port}
         """
     )
     
@@ -83,6 +88,102 @@ def parse_arguments():
         help='战绩保存文件路径（默认: game_scores.json）'
     )
     
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=1,
+        help='同时运行的对局组数，每组使用独立端口（默认: 1，串行）'
+    )
+    
+    parser.add_argument(
+        '--base-port',
+        type=int,
+        default=23456,
+        help='并行模式下第一组的端口，第i组使用 base-port + i（默认: 23456）'
+    )
+    
+    parser.add_argument(
+        '--server-port-arg',
+        type=str,
+        action='append',
+        default=None,
+        help='传给服务器的端口参数，{port}会被替换为本组端口，可重复指定'
+    )
+    
+    parser.add_argument(
+        '--persistent-clients',
+        action='store_true',
+        help='客户端进程常驻，批次之间只重启服务器（客户端需支持GD_SUPERVISED）'
+    )
+    
+    parser.add_argument(
+        '--client-memory-limit',
+        type=float,
+        default=0,
+        help='常驻客户端内存上限（MB），超过后在下一批次前重启该客户端（默认: 0，不限制）'
+    )
+    
+    parser.add_argument(
+        '--results-db',
+        type=str,
+        default='game_results.db',
+        help='逐局战绩数据库（SQLite）路径（默认: game_results.db）'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='从状态文件中的逐局检查点继续上次中断的运行'
+    )
+    
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='运行种子，决定每批次客户端的随机种子（默认随机；--resume时沿用检查点中的种子）'
+    )
+    
+    parser.add_argument(
+        '--sprt',
+        action='store_true',
+        help='启用序贯检验（SPRT），一方明显更强或差距不显著时提前停止'
+    )
+    
+    parser.add_argument(
+        '--elo0',
+        type=float,
+        default=0.0,
+        help='SPRT原假设的Elo差（默认: 0）'
+    )
+    
+    parser.add_argument(
+        '--elo1',
+        type=float,
+        default=50.0,
+        help='SPRT备择假设的Elo差，即需要检测出的最小优势（默认: 50）'
+    )
+    
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=0.05,
+        help='SPRT第一类错误率（默认: 0.05）'
+    )
+    
+    parser.add_argument(
+        '--beta',
+        type=float,
+        default=0.05,
+        help='SPRT第二类错误率（默认: 0.05）'
+    )
+    
+    parser.add_argument(
+        '--min-games',
+        type=int,
+        default=20,
+        help='SPRT最少对局数，之前不做结论（默认: 20）'
+    )
+    
     parser.add_argument(
         '--log-dir',
         type=str,
@@ -125,11 +226,28 @@ def validate_arguments(args):
         print(f"错误: 目标场数必须是正整数: {args.target_games}", file=sys.stderr)
         return False
     
+    # 验证并行组数
+    if args.parallel <= 0:
+        print(f"错误: 并行组数必须是正整数: {args.parallel}", file=sys.stderr)
+        return False
+    
     # 验证客户端脚本
     for client_path in args.clients:
         if not os.path.exists(client_path):
             print(f"警告: 客户端脚本不存在: {client_path}", file=sys.stderr)
     
+    # 验证序贯检验参数（在创建SequentialTest之前，避免alpha/beta为0或1时计算出错）
+    if args.sprt:
+        validator = InputValidator()
+        try:
+            validator.validate_target_games(args.target_games)
+            validator.validate_sprt_params(
+                args.elo0, args.elo1, args.alpha, args.beta, args.min_games
+            )
+        except ValueError as e:
+            print(f"错误: 序贯检验参数无效: {e}", file=sys.stderr)
+            return False
+    
     return True
 
 
@@ -154,6 +272,12 @@ def main():
     logger.info(f"目标场数: {args.target_games}")
     logger.info(f"客户端数量: {len(args.clients)}")
     logger.info(f"诊断模式: {'是' if args.diagnose_only else '否'}")
+    logger.info(f"并行组数: {args.parallel}")
+    if args.sprt:
+        logger.info(
+            f"序贯检验: elo0={args.elo0}, elo1={args.elo1}, "
+            f"alpha={args.alpha}, beta={args.beta}, 最少{args.min_games}场"
+        )
     logger.info("=" * 60)
     
     try:
@@ -164,7 +288,18 @@ def main():
             client_scripts=args.clients,
             diagnose_only=args.diagnose_only,
             state_file=args.state_file,
-            score_file=args.score_file
+            score_file=args.score_file,
+            parallel=args.parallel,
+            base_port=args.base_port,
+            server_port_args=args.server_port_arg,
+            persistent_clients=args.persistent_clients,
+            client_memory_limit_mb=args.client_memory_limit,
+            results_file=args.results_db,
+            sequential_test=SequentialTest(
+                args.elo0, args.elo1, args.alpha, args.beta, args.min_games
+            ) if args.sprt else None,
+            resume=args.resume,
+            seed=args.seed
         )
         
         # 运行
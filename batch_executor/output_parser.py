@@ -0,0 +1,227 @@
+"""
+服务器输出流式解析模块
+
+逐行分类服务器输出（战绩、单局结束、小局结束、批次结束、错误），
+在输出到达时产生事件，而不是等批次结束后再倒序扫描全部输出：
+- 战绩行（"X号位胜利Y次"）按批次内累计值求增量，实时计分
+- 对局结束行（"完牌次序为[...]，结束时所打的等级为X"）给出完牌次序和级牌，附加到随后的战绩事件
+- 只保留最近N行输出（用于出错时查看上下文），内存占用有界
+"""
+
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+# 战绩行：其中0号位胜利X次，1号位胜利Y次，2号位胜利Z次，3号位胜利W次
+SEAT_WINS_PATTERN = re.compile(r'(\d+)号位胜利(\d+)次')
+
+# 对局结束行：对局结束，完牌次序为[0, 2, 1, 3]，结束时所打的等级为2
+ORDER_PATTERN = re.compile(r'完牌次序为\[([\d,\s]+)\].*?等级为\s*([0-9TJQKA]+)')
+
+# 批次结束标记
+BATCH_END_MARKER = "达到设定场次"
+
+# 其他行的分类规则（按顺序匹配，可通过构造参数覆盖）
+DEFAULT_PATTERNS = {
+    "game_end": r"本局结束|游戏结束|[Gg]ame\s*[Oo]ver",
+    "episode": r"小局结束|对局结束|episodeOver|[Ee]pisode\s*[Oo]ver",
+    "error": r"Traceback|Exception|ERROR|错误|异常",
+}
+
+
+@dataclass
+class ServerEvent:
+    """服务器输出事件"""
+    kind: str  # score / game_end / episode / batch_end / error
+    line: str
+    batch: int
+    team_a: int = 0  # 本事件带来的Team A胜场增量
+    team_b: int = 0  # 本事件带来的Team B胜场增量
+    games: int = 0  # 本事件新完成的场数
+    seat_wins: Dict[int, int] = field(default_factory=dict)  # 各座位胜场增量
+    duration: Optional[float] = None  # 距上一个战绩事件（或批次开始）的秒数
+    order: Optional[List[int]] = None  # 最近一局的完牌次序（order[0]为头游座位）
+    level: Optional[str] = None  # 最近一局结束时所打的级牌
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self) -> dict:
+        """转换为可JSON序列化的字典（写入状态文件）"""
+        return {
+            "kind": self.kind,
+            "line": self.line,
+            "batch": self.batch,
+            "team_a": self.team_a,
+            "team_b": self.team_b,
+            "games": self.games,
+            "seat_wins": self.seat_wins,
+            "duration": self.duration,
+            "order": self.order,
+            "level": self.level,
+            "timestamp": self.timestamp.isoformat(),
+        }
+
+    def describe(self) -> str:
+        """一行描述（用于日志/GUI）"""
+        if self.kind == "score":
+            return f"批次{self.batch} 战绩更新: Team A +{self.team_a}, Team B +{self.team_b}"
+        return f"批次{self.batch} [{self.kind}] {self.line}"
+
+    def game_results(self) -> List[Tuple[str, Optional[int], Optional[List[int]], Optional[str]]]:
+        """
+        score事件 → 每局一项 (获胜方, 头游座位, 完牌次序, 级牌)
+
+        完牌次序只对应最近一局：事件只包含一局、且头游属于获胜方时才填入座位、次序和级牌，
+        否则为None（例如一个战绩行同时计入多局）。
+        """
+        winners = ["team_a"] * self.team_a + ["team_b"] * self.team_b
+        if len(winners) == 1 and self.order:
+            first = self.order[0]
+            if ("team_a" if first % 2 == 0 else "team_b") == winners[0]:
+                return [(winners[0], first, list(self.order), self.level)]
+        return [(winner, None, None, None) for winner in winners]
+
+
+def seat_wins_to_teams(wins: Dict[int, int]) -> Tuple[int, int]:
+    """
+    各座位胜场 → (team_a, team_b)，0号和2号是team_a，1号和3号是team_b
+
+    平台按座位统计胜利次数，一局获胜时同队两个座位各计一次
+    （0、2号位赢下2局后为 [2, 0, 2, 0]），所以每队取两个座位中较大的值而不是相加。
+    """
+    return max(wins.get(0, 0), wins.get(2, 0)), max(wins.get(1, 0), wins.get(3, 0))
+
+
+class ServerOutputParser:
+    """
+    一个批次的服务器输出解析器
+
+    用法：
+        parser = ServerOutputParser(batch=3, expected_games=3)
+        for line in lines:
+            for event in parser.feed(line):
+                ...
+        parser.result()  # 本批次累计 (team_a, team_b)
+    """
+
+    def __init__(
+        self,
+        batch: int = 1,
+        expected_games: Optional[int] = None,
+        patterns: Optional[Dict[str, str]] = None,
+        tail_size: int = 200
+    ):
+        """
+        初始化解析器
+
+        Args:
+            batch: 批次编号（写入事件）
+            expected_games: 本批次场数，完成场数不会超过该值
+            patterns: 覆盖默认分类规则 {kind: 正则表达式}
+            tail_size: 保留的最近输出行数
+        """
+        self.batch = batch
+        self.expected_games = expected_games
+        merged = dict(DEFAULT_PATTERNS)
+        if patterns:
+            merged.update(patterns)
+        self.patterns = [(kind, re.compile(pattern)) for kind, pattern in merged.items()]
+        self.tail: Deque[str] = deque(maxlen=tail_size)
+
+        self.team_a = 0
+        self.team_b = 0
+        self.seat_wins: Dict[int, int] = {}
+        self.order: Optional[List[int]] = None  # 尚未计入战绩事件的完牌次序
+        self.level: Optional[str] = None
+        self._last_score_at = time.monotonic()
+        self.game_ends = 0
+        self.games_finished = 0
+        self.finished = False
+        self._scored = False
+
+    def feed(self, line: str) -> List[ServerEvent]:
+        """
+        解析一行输出
+
+        Args:
+            line: 服务器输出行
+
+        Returns:
+            本行产生的事件（通常0或1个）
+        """
+        line = line.strip()
+        if not line:
+            return []
+        self.tail.append(line)
+
+        events = []
+        if "完牌次序" in line:
+            match = ORDER_PATTERN.search(line)
+            if match:
+                self.order = [int(seat) for seat in match.group(1).split(",") if seat.strip()]
+                self.level = match.group(2)
+
+        if "号位胜利" in line:
+            matches = SEAT_WINS_PATTERN.findall(line)
+            if matches:
+                wins = {int(pos): int(count) for pos, count in matches}
+                team_a, team_b = seat_wins_to_teams(wins)
+                # 战绩行是批次内累计值，只记增量
+                delta_a = max(0, team_a - self.team_a)
+                delta_b = max(0, team_b - self.team_b)
+                seat_delta = {
+                    pos: count - self.seat_wins.get(pos, 0)
+                    for pos, count in wins.items() if count > self.seat_wins.get(pos, 0)
+                }
+                self.team_a, self.team_b = max(team_a, self.team_a), max(team_b, self.team_b)
+                self.seat_wins.update({pos: max(count, self.seat_wins.get(pos, 0)) for pos, count in wins.items()})
+                self._scored = True
+                if delta_a or delta_b:
+                    now = time.monotonic()
+                    event = self._event("score", line, delta_a, delta_b)
+                    event.seat_wins = seat_delta
+                    event.duration = now - self._last_score_at
+                    event.order, event.level = self.order, self.level
+                    self.order = None  # 只用于这一个战绩事件
+                    self._last_score_at = now
+                    events.append(event)
+
+        if BATCH_END_MARKER in line:
+            self.finished = True
+            events.append(self._event("batch_end", line))
+        elif not events:
+            for kind, pattern in self.patterns:
+                if pattern.search(line):
+                    if kind == "game_end":
+                        self.game_ends += 1
+                    events.append(self._event(kind, line))
+                    break
+
+        return events
+
+    def _event(self, kind: str, line: str, team_a: int = 0, team_b: int = 0) -> ServerEvent:
+        return ServerEvent(kind, line, self.batch, team_a, team_b, games=self._advance_games())
+
+    def _advance_games(self) -> int:
+        """根据单局结束行和战绩更新已完成场数，返回新增场数"""
+        finished = max(self.game_ends, self.team_a + self.team_b)
+        if self.expected_games is not None:
+            finished = min(finished, self.expected_games)
+        new_games = max(0, finished - self.games_finished)
+        self.games_finished += new_games
+        return new_games
+
+    def result(self) -> Optional[Tuple[int, int]]:
+        """本批次累计战绩 (team_a, team_b)，没有出现战绩行时返回None"""
+        if not self._scored:
+            return None
+        return self.team_a, self.team_b
+
+    def remaining_games(self) -> int:
+        """批次结束时尚未通过事件计入进度的场数"""
+        if self.expected_games is None:
+            return 0
+        return max(0, self.expected_games - self.games_finished)
@@ -0,0 +1,224 @@
+"""
+并行对局模块
+
+同时运行K组独立的"服务器+客户端"，每组使用不同端口：
+- 共享一个场次配额队列（每项为(批次编号, 场数)，场数不超过服务器单次运行上限；
+  可附带第三项客户端脚本列表，用于同一队列中混合不同对阵，见 tournament.py）
+- 每组循环领取配额 → 启动服务器和客户端 → 流式解析输出，事件实时回调 → 批次结束回调
+- 服务器中途退出时，未完成的场次作为新配额放回队列；本组连续多个批次没有进展时退出
+- 停止事件置位后各组在当前配额结束后退出；cleanup() 立即结束本组进程
+"""
+
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional, Tuple, Union
+
+from .executor import MAX_STALLED_BATCHES
+from .output_parser import ServerEvent, ServerOutputParser
+from .process_monitor import ProcessMonitor
+from .restart_manager import RestartManager, batch_seed
+
+
+logger = logging.getLogger(__name__)
+
+# 场次配额：(批次编号, 场数) 或 (批次编号, 场数, 客户端脚本列表)
+Quota = Union[Tuple[int, int], Tuple[int, int, List[str]]]
+
+# 事件回调：(组号, 服务器事件)
+EventCallback = Callable[[int, ServerEvent], None]
+
+# 批次结束回调：(组号, 本批次解析器, 启动开销秒数)
+ResultCallback = Callable[[int, ServerOutputParser, float], None]
+
+
+def split_quotas(total_games: int, per_batch: int) -> List[int]:
+    """
+    把目标场数切分成批次配额
+
+    Args:
+        total_games: 总场数
+        per_batch: 每批最多场数（服务器单次运行上限）
+
+    Returns:
+        配额列表，例如 split_quotas(7, 3) == [3, 3, 1]
+    """
+    per_batch = max(1, per_batch)
+    quotas = [per_batch] * (total_games // per_batch)
+    if total_games % per_batch:
+        quotas.append(total_games % per_batch)
+    return quotas
+
+
+class GameGroup:
+    """一组独立的服务器+客户端（占用一个端口）"""
+
+    def __init__(
+        self,
+        index: int,
+        port: int,
+        server_path: str,
+        client_scripts: List[str],
+        server_port_args: Optional[List[str]] = None,
+        persistent_clients: bool = False,
+        client_memory_limit_mb: float = 0,
+        seed: Optional[int] = None
+    ):
+        """
+        初始化对局组
+
+        Args:
+            index: 组号（从0开始）
+            port: 本组服务器端口
+            server_path: 服务器可执行文件路径
+            client_scripts: 客户端脚本路径列表
+            server_port_args: 指定服务器端口的命令行参数模板，如 ["--port", "{port}"]
+            persistent_clients: 是否使用常驻客户端
+            client_memory_limit_mb: 常驻客户端内存上限（MB）
+            seed: 运行种子，每批次的客户端种子由它和批次编号导出，None表示不设置
+        """
+        self.index = index
+        self.port = port
+        self.server_path = server_path
+        self.client_scripts = client_scripts
+        self.server_args = [arg.format(port=port) for arg in (server_port_args or [])]
+        self.restart_manager = RestartManager(ProcessMonitor(), persistent_clients, client_memory_limit_mb)
+        self.seed = seed
+        self.thread: Optional[threading.Thread] = None
+        self.batches_done = 0
+        self.stalled_batches = 0
+
+    def start(
+        self,
+        quotas: "queue.Queue[Quota]",
+        on_event: EventCallback,
+        on_result: ResultCallback,
+        stop_event: threading.Event
+    ) -> None:
+        """在后台线程中开始领取配额"""
+        self.thread = threading.Thread(
+            target=self._run,
+            args=(quotas, on_event, on_result, stop_event),
+            name=f"game-group-{self.index}",
+            daemon=True
+        )
+        self.thread.start()
+
+    def _run(self, quotas, on_event, on_result, stop_event) -> None:
+        """工作线程：直到配额耗尽、停止请求或服务器无法启动"""
+        tag = f"[组{self.index}:{self.port}]"
+        while not stop_event.is_set():
+            try:
+                quota = quotas.get_nowait()
+            except queue.Empty:
+                break
+            batch, batch_games = quota[0], quota[1]
+            scripts = quota[2] if len(quota) > 2 else self.client_scripts
+
+            parser = ServerOutputParser(batch, batch_games)
+            try:
+                overhead = self._play(batch_games, scripts, parser, on_event, stop_event)
+            except Exception as e:
+                logger.error(f"{tag} 批次执行出错: {e}", exc_info=True)
+                overhead = 0.0
+
+            if stop_event.is_set() and not parser.finished:
+                # 被中断的批次：已实时计入的场次保留，其余不计入
+                break
+
+            if parser.result() is None and parser.games_finished == 0 and self.batches_done == 0:
+                # 第一批就失败（服务器/端口不可用），把配额还给其他组
+                quotas.put(quota)
+                logger.error(f"{tag} 无法完成首个批次，本组退出")
+                break
+
+            self.batches_done += 1
+            on_result(self.index, parser, overhead)
+
+            if parser.finished or not parser.remaining_games():
+                self.stalled_batches = 0
+                continue
+            # 服务器中途退出：已逐局计入的场次保留，其余放回队列重新进行
+            quotas.put((batch, parser.remaining_games()) + tuple(quota[2:]))
+            self.stalled_batches = 0 if parser.games_finished else self.stalled_batches + 1
+            if self.stalled_batches >= MAX_STALLED_BATCHES:
+                logger.error(f"{tag} 连续 {self.stalled_batches} 个批次没有完成任何对局，本组退出")
+                break
+
+        self.restart_manager.shutdown(kill_strays=False)
+        logger.info(f"{tag} 结束，共完成 {self.batches_done} 个批次")
+
+    def _play(self, batch_games, scripts, parser, on_event, stop_event) -> float:
+        """运行一个批次，输出逐行交给解析器，返回启动开销"""
+        manager = self.restart_manager
+        manager.cleanup(kill_strays=False)
+
+        server_process = manager.restart_server(
+            self.server_path,
+            batch_games,
+            port=self.port,
+            server_args=self.server_args
+        )
+        if server_process is None:
+            return 0.0
+
+        clients = manager.restart_clients(
+            scripts,
+            env={"GD_SERVER_PORT": str(self.port)},
+            seed=batch_seed(self.seed, parser.batch) if self.seed is not None else None
+        )
+        if not clients:
+            return manager.get_startup_overhead()
+        overhead = manager.get_startup_overhead()
+
+        for line in manager.iter_server_output():
+            for event in parser.feed(line):
+                on_event(self.index, event)
+            if stop_event.is_set():
+                break
+
+        if not stop_event.is_set():
+            try:
+                server_process.wait(timeout=60)
+            except Exception:
+                server_process.kill()
+
+        return overhead
+
+    def is_alive(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def cleanup(self) -> None:
+        """立即结束本组进程（其输出流关闭后工作线程随之退出）"""
+        self.restart_manager.shutdown(kill_strays=False)
+
+
+def wait_groups(
+    groups: List[GameGroup],
+    should_stop: Optional[Callable[[], bool]] = None,
+    poll_interval: float = 0.5
+) -> bool:
+    """
+    等待所有组结束
+
+    使用带超时的join轮询，使主线程在等待期间仍能处理SIGINT等信号。
+
+    Args:
+        groups: 对局组列表
+        should_stop: 停止条件，返回True时立即返回
+        poll_interval: 轮询间隔（秒）
+
+    Returns:
+        所有组正常结束返回True，因停止条件提前返回False
+    """
+    while True:
+        alive = [group for group in groups if group.is_alive()]
+        if not alive:
+            return True
+        if should_stop is not None and should_stop():
+            return False
+        alive[0].join(poll_interval)
@@ -2,12 +2,157 @@
 进程监控模块
 
 提供进程状态检查、进程终止和重启决策功能。
+
+- ProcessTree 按PID跟踪一组对局启动的进程，每个进程由一个线程阻塞在
+  Popen.wait() 上，退出时立即回调（不轮询）
+- 按名称查询/结束进程时只遍历一次进程表，用 psutil.wait_procs 等待退出
 """
 
-import time
+import logging
 import subprocess
-from typing import List, Optional
-import psutil
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# 进程退出回调：(角色, 进程, 返回码)
+ExitCallback = Callable[[str, subprocess.Popen, int], None]
+
+
+def _psutil():
+    """延迟导入psutil（只在实际查询/终止进程时加载，缩短启动时间）"""
+    import psutil
+    return psutil
+
+
+def _kill_procs(procs: list, timeout: float = 5) -> list:
+    """
+    结束一组psutil进程及其全部子进程
+
+    先发送terminate，在timeout内等待退出，仍存活的再kill。
+
+    Returns:
+        kill之后仍未退出的进程
+    """
+    psutil = _psutil()
+    targets = {}
+    for proc in procs:
+        try:
+            for child in proc.children(recursive=True):
+                targets[child.pid] = child
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+        targets[proc.pid] = proc
+    if not targets:
+        return []
+
+    for proc in targets.values():
+        try:
+            proc.terminate()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    _, alive = psutil.wait_procs(list(targets.values()), timeout=timeout)
+    for proc in alive:
+        try:
+            proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    if alive:
+        _, alive = psutil.wait_procs(alive, timeout=3)
+    return alive
+
+
+class ProcessTree:
+    """
+    一组对局（服务器+客户端）启动的进程
+
+    每个进程一个守护线程等待其退出；非主动结束的退出立即通过on_exit回调通知，
+    结束时连同子进程一起终止，只影响本组进程。
+    """
+
+    def __init__(self, name: str = "", on_exit: Optional[ExitCallback] = None):
+        """
+        初始化进程树
+
+        Args:
+            name: 名称（用于日志和线程名）
+            on_exit: 进程意外退出时的回调 (角色, 进程, 返回码)，在等待线程中调用
+        """
+        self.name = name
+        self.on_exit = on_exit
+        self._processes: Dict[int, Tuple[str, subprocess.Popen]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, process: subprocess.Popen, role: str) -> None:
+        """
+        开始跟踪一个进程
+
+        Args:
+            process: 进程
+            role: 角色（如 "server"、"client1"）
+        """
+        with self._lock:
+            self._processes[process.pid] = (role, process)
+        threading.Thread(
+            target=self._watch,
+            args=(process, role),
+            name=f"watch-{self.name}-{role}",
+            daemon=True
+        ).start()
+
+    def discard(self, process: subprocess.Popen) -> None:
+        """停止跟踪（之后该进程退出不再回调，例如主动回收）"""
+        with self._lock:
+            self._processes.pop(process.pid, None)
+
+    def _watch(self, process: subprocess.Popen, role: str) -> None:
+        returncode = process.wait()
+        with self._lock:
+            tracked = self._processes.get(process.pid, (None, None))[1] is process
+            if tracked:
+                del self._processes[process.pid]
+        if tracked and self.on_exit is not None:
+            try:
+                self.on_exit(role, process, returncode)
+            except Exception as e:
+                logger.error(f"进程退出回调出错 ({role}): {e}", exc_info=True)
+
+    def processes(self) -> List[Tuple[str, subprocess.Popen]]:
+        """当前跟踪的进程 [(角色, 进程)]"""
+        with self._lock:
+            return list(self._processes.values())
+
+    def terminate(self, timeout: float = 5) -> None:
+        """
+        结束所有跟踪的进程及其子进程（不触发回调）
+
+        所有进程同时发送终止信号，共用一个等待时限，而不是逐个等待。
+
+        Args:
+            timeout: 等待进程响应终止信号的时间（秒），超时后强制结束
+        """
+        psutil = _psutil()
+        with self._lock:
+            tracked = list(self._processes.values())
+            self._processes.clear()
+
+        procs = []
+        for role, process in tracked:
+            if process.poll() is not None:
+                continue
+            logger.info(f"终止{role}进程, PID: {process.pid}")
+            try:
+                procs.append(psutil.Process(process.pid))
+            except psutil.NoSuchProcess:
+                pass
+        for proc in _kill_procs(procs, timeout):
+            logger.warning(f"进程 {proc.pid} 无法结束")
+        for _, process in tracked:
+            try:
+                process.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
 
 
 class ProcessMonitor:
@@ -18,7 +163,8 @@ class ProcessMonitor:
         初始化进程监控器
         
         Args:
-            check_interval: 进程状态检查间隔（秒），默认5秒
+            check_interval: 进程状态检查间隔（秒），默认5秒。
+                等待进程退出已改为按PID阻塞等待，保留该参数以兼容旧调用
         """
         self.check_interval = check_interval
     
@@ -41,6 +187,8 @@ class ProcessMonitor:
         if process_name is None and pid is None:
             raise ValueError("必须提供process_name或pid参数")
         
+        psutil = _psutil()
+        
         # 如果提供了PID，优先使用PID查询
         if pid is not None:
             try:
@@ -52,23 +200,41 @@ class ProcessMonitor:
         
         # 使用进程名称查询
         if process_name is not None:
-            try:
-                for proc in psutil.process_iter(['name', 'pid']):
-                    try:
-                        # 比较进程名称（不区分大小写）
-                        if proc.info['name'] and proc.info['name'].lower() == process_name.lower():
-                            return True
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-            except Exception:
-                return False
+            return bool(self._find_by_name([process_name], first_only=True))
         
         return False
     
+    def _find_by_name(self, process_names: List[str], first_only: bool = False) -> list:
+        """
+        遍历一次进程表，找出名称匹配的进程（不区分大小写）
+        
+        Args:
+            process_names: 进程名称列表
+            first_only: 找到第一个即返回
+            
+        Returns:
+            psutil.Process列表
+        """
+        psutil = _psutil()
+        names = {name.lower() for name in process_names}
+        found = []
+        try:
+            for proc in psutil.process_iter(['name']):
+                name = proc.info['name']
+                if name and name.lower() in names:
+                    found.append(proc)
+                    if first_only:
+                        break
+        except Exception:
+            pass
+        return found
+    
     def wait_for_termination(self, process_name: str, timeout: int = 60) -> bool:
         """
         等待进程终止
         
+        按PID等待当前匹配的进程（psutil.wait_procs），进程退出即返回，不按间隔轮询。
+        
         Args:
             process_name: 进程名称
             timeout: 超时时间（秒）
@@ -76,21 +242,34 @@ class ProcessMonitor:
         Returns:
             如果进程在超时前终止返回True，否则返回False
         """
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if not self.is_running(process_name=process_name):
-                return True
-            time.sleep(self.check_interval)
+        procs = self._find_by_name([process_name])
+        if not procs:
+            return True
+        _, alive = _psutil().wait_procs(procs, timeout=timeout)
+        return not alive
+    
+    def get_memory_mb(self, pid: int) -> Optional[float]:
+        """
+        查询进程的常驻内存（RSS）
         
-        return False
+        Args:
+            pid: 进程ID
+            
+        Returns:
+            内存占用（MB），进程不存在或无权限时返回None
+        """
+        psutil = _psutil()
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
     
     def kill_all(self, process_names: List[str]) -> None:
         """
         终止指定名称的所有进程
         
-        使用 taskkill 命令（Windows）终止进程。
-        验证进程已终止。
+        只遍历一次进程表，连同子进程一起终止（相当于 taskkill /T），
+        并等待这些进程真正退出。
         
         Args:
             process_names: 要终止的进程名称列表
@@ -98,46 +277,9 @@ class ProcessMonitor:
         if not process_names:
             return
         
-        for process_name in process_names:
-            try:
-                # 使用taskkill命令强制终止进程
-                # /F: 强制终止
-                # /IM: 按映像名称（进程名）
-                # /T: 终止进程树（包括子进程）
-                subprocess.run(
-                    ['taskkill', '/F', '/IM', process_name, '/T'],
-                    capture_output=True,
-                    timeout=10
-                )
-            except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-                # 如果taskkill失败，尝试使用psutil
-                try:
-                    for proc in psutil.process_iter(['name', 'pid']):
-                        try:
-                            if proc.info['name'] and proc.info['name'].lower() == process_name.lower():
-                                proc.kill()
-                        except (psutil.NoSuchProcess, psutil.AccessDenied):
-                            continue
-                except Exception:
-                    pass
-        
-        # 等待一小段时间确保进程终止
-        time.sleep(1)
-        
-        # 验证所有进程已终止
-        for process_name in process_names:
-            # 如果进程仍在运行，再次尝试终止
-            if self.is_running(process_name=process_name):
-                try:
-                    for proc in psutil.process_iter(['name', 'pid']):
-                        try:
-                            if proc.info['name'] and proc.info['name'].lower() == process_name.lower():
-                                proc.kill()
-                                proc.wait(timeout=3)
-                        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.TimeoutExpired):
-                            continue
-                except Exception:
-                    pass
+        alive = _kill_procs(self._find_by_name(process_names))
+        for proc in alive:
+            logger.warning(f"进程 {proc.pid} 无法结束")
     
     def should_restart(self, server_process_name: str, remaining_games: int) -> bool:
         """
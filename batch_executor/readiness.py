@@ -0,0 +1,156 @@
+"""
+就绪探测模块
+
+用事件驱动的就绪检测代替固定等待：
+- 探测服务器websocket端口是否可连接
+- 监视服务器stdout中的就绪行
+- 等待客户端写入"已连接"信号文件（环境变量 GD_READY_FILE）
+"""
+
+import os
+import queue
+import re
+import socket
+import subprocess
+import threading
+import time
+from typing import Iterator, Optional
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 23456
+
+# 轮询间隔（秒）
+POLL_INTERVAL = 0.05
+
+
+def is_port_open(port: int = DEFAULT_PORT, host: str = DEFAULT_HOST, timeout: float = 0.2) -> bool:
+    """
+    检查端口是否可以建立TCP连接
+
+    Args:
+        port: 端口号
+        host: 主机地址
+        timeout: 连接超时（秒）
+
+    Returns:
+        可连接返回True
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class ServerOutputPump:
+    """
+    后台读取服务器stdout
+
+    读取到的每一行放入队列，供执行器在游戏结束后（或实时）消费；
+    同时检查就绪行，匹配时设置 ready 事件。
+    """
+
+    def __init__(self, process: subprocess.Popen, ready_pattern: Optional[str] = None):
+        """
+        初始化输出泵并启动读取线程
+
+        Args:
+            process: 服务器进程（stdout=PIPE, text=True）
+            ready_pattern: 就绪行的正则表达式，None表示只依赖端口探测
+        """
+        self.process = process
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.ready = threading.Event()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._pump, daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        """读取线程"""
+        try:
+            if self.process.stdout:
+                for line in self.process.stdout:
+                    if isinstance(line, bytes):
+                        line = line.decode('utf-8', errors='ignore')
+                    if self.ready_pattern and not self.ready.is_set() and self.ready_pattern.search(line):
+                        self.ready.set()
+                    self._queue.put(line)
+        except Exception:
+            pass
+        finally:
+            self._queue.put(None)  # EOF标记
+
+    def lines(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        逐行返回服务器输出，直到进程关闭stdout
+
+        Args:
+            timeout: 两行之间的最长等待时间（秒），None表示一直等待
+
+        Raises:
+            queue.Empty: 超过timeout没有新输出
+        """
+        while True:
+            line = self._queue.get(timeout=timeout)
+            if line is None:
+                return
+            yield line
+
+
+def wait_server_ready(
+    process: subprocess.Popen,
+    pump: Optional[ServerOutputPump] = None,
+    port: int = DEFAULT_PORT,
+    timeout: float = 15.0
+) -> bool:
+    """
+    等待服务器就绪：端口可连接或stdout出现就绪行（以先到者为准）
+
+    Args:
+        process: 服务器进程
+        pump: 输出泵（提供就绪行事件）
+        port: websocket端口
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        就绪返回True；进程退出或超时返回False
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        if pump is not None and pump.ready.is_set():
+            return True
+        if is_port_open(port):
+            return True
+        time.sleep(POLL_INTERVAL)
+    return False
+
+
+def wait_client_ready(
+    process: subprocess.Popen,
+    ready_file: str,
+    timeout: float = 3.0
+) -> bool:
+    """
+    等待客户端写入就绪信号文件
+
+    不支持信号文件的客户端会一直等到timeout（即原来的固定间隔）。
+
+    Args:
+        process: 客户端进程
+        ready_file: 信号文件路径
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        收到信号返回True；进程退出或超时返回False
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(ready_file):
+            return True
+        if process.poll() is not None:
+            return False
+        time.sleep(POLL_INTERVAL)
+    return False
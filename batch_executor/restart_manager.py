@@ -2,41 +2,87 @@
 重启管理模块
 
 管理服务器和客户端的重启，包括启动、等待和清理功能。
+
+本组启动的进程按PID登记在ProcessTree中：客户端在批次进行中意外退出时立即得到通知，
+服务器在宽限时间内没有自行结束就被终止，使本批次立刻结束并进入下一次重启，
+而不是一直等到服务器超时。
 """
 
 import subprocess
+import shutil
+import tempfile
 import time
 import logging
 import os
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional
 from pathlib import Path
 
-from .process_monitor import ProcessMonitor
+from .client_pool import ClientPool
+from .process_monitor import ProcessMonitor, ProcessTree
+from .readiness import (
+    DEFAULT_PORT,
+    ServerOutputPump,
+    wait_client_ready,
+    wait_server_ready,
+)
 
 
 logger = logging.getLogger(__name__)
 
+SERVER_ROLE = "服务器"
+
+# 客户端退出后等待服务器自行结束的时间（秒），超时则终止服务器
+CLIENT_EXIT_GRACE = 10
+
+
+def batch_seed(seed: int, batch: int) -> int:
+    """
+    由运行种子和批次编号导出本批次的客户端种子
+    
+    只取决于批次编号（与并行组领取配额的顺序无关），恢复执行时同一批次得到同一种子。
+    """
+    return (seed * 1000003 + batch) % (2 ** 31)
+
 
 class RestartManager:
     """管理服务器和客户端的重启"""
     
-    def __init__(self, process_monitor: Optional[ProcessMonitor] = None):
+    def __init__(
+        self,
+        process_monitor: Optional[ProcessMonitor] = None,
+        persistent_clients: bool = False,
+        client_memory_limit_mb: float = 0
+    ):
         """
         初始化重启管理器
         
         Args:
             process_monitor: 进程监控器实例，如果未提供则创建新实例
+            persistent_clients: 是否使用常驻客户端（批次之间不重启客户端进程）
+            client_memory_limit_mb: 常驻客户端内存上限（MB），超过后回收，0表示不限制
         """
         self.process_monitor = process_monitor or ProcessMonitor()
+        self.process_tree = ProcessTree("batch", on_exit=self._on_process_exit)
+        self.client_pool: Optional[ClientPool] = (
+            ClientPool(self.process_monitor, client_memory_limit_mb, on_client_exit=self._on_client_exit)
+            if persistent_clients else None
+        )
         self.server_process: Optional[subprocess.Popen] = None
+        self.server_output: Optional[ServerOutputPump] = None
         self.client_processes: List[subprocess.Popen] = []
+        # 最近一次启动的耗时（秒）：{"server": x, "clients": y}
+        self.last_startup: Dict[str, float] = {}
+        self._ready_dir: Optional[str] = None
     
     def restart_server(
         self,
         server_path: str,
         game_count: int,
         max_retries: int = 3,
-        wait_time: int = 15
+        wait_time: int = 15,
+        port: int = DEFAULT_PORT,
+        ready_pattern: Optional[str] = None,
+        server_args: Optional[List[str]] = None
     ) -> Optional[subprocess.Popen]:
         """
         重启服务器
@@ -44,11 +90,18 @@ class RestartManager:
         构建服务器启动命令，使用subprocess.Popen启动，
         等待服务器就绪，实现重试逻辑。
         
+        就绪条件：websocket端口可连接，或stdout出现匹配ready_pattern的行，
+        以先到者为准；wait_time只是上限。服务器输出由后台线程读取，
+        通过 iter_server_output() 获取。
+        
         Args:
             server_path: 服务器可执行文件路径
             game_count: 游戏场数
             max_retries: 最大重试次数，默认3次
-            wait_time: 等待服务器就绪的时间（秒），默认15秒
+            wait_time: 等待服务器就绪的最长时间（秒），默认15秒
+            port: 服务器websocket端口
+            ready_pattern: 服务器就绪行的正则表达式（可选）
+            server_args: 追加到启动命令的额外参数（例如指定端口）
             
         Returns:
             成功启动的服务器进程，如果失败返回None
@@ -65,7 +118,7 @@ class RestartManager:
                     return None
                 
                 # 构建启动命令
-                command = [server_path, str(game_count)]
+                command = [server_path, str(game_count)] + list(server_args or [])
                 
                 # 获取服务器所在目录作为工作目录
                 server_dir = os.path.dirname(server_path) or "."
@@ -84,15 +137,24 @@ class RestartManager:
                 )
                 
                 logger.info(f"服务器进程已启动，PID: {process.pid}")
+                self.process_tree.add(process, SERVER_ROLE)
                 
-                # 等待服务器就绪
-                logger.info(f"等待服务器就绪 ({wait_time}秒)...")
-                time.sleep(wait_time)
+                # 等待服务器就绪（端口探测 / 就绪行）
+                started = time.monotonic()
+                pump = ServerOutputPump(process, ready_pattern)
+                logger.info(f"等待服务器就绪 (最长{wait_time}秒)...")
+                ready = wait_server_ready(process, pump, port, wait_time)
+                elapsed = time.monotonic() - started
                 
                 # 检查进程是否仍在运行
                 if process.poll() is None:
-                    logger.info("✓ 服务器启动成功，进程正在运行")
+                    if ready:
+                        logger.info(f"✓ 服务器已就绪，用时 {elapsed:.2f}秒")
+                    else:
+                        logger.warning(f"服务器在{wait_time}秒内未探测到就绪，进程仍在运行，继续执行")
                     self.server_process = process
+                    self.server_output = pump
+                    self.last_startup["server"] = elapsed
                     return process
                 else:
                     logger.warning(f"✗ 服务器进程意外终止，返回码: {process.returncode}")
@@ -114,25 +176,56 @@ class RestartManager:
         logger.error(f"服务器启动失败，已重试{max_retries}次")
         return None
     
+    def iter_server_output(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """
+        逐行读取当前服务器的输出（直到服务器关闭stdout）
+        
+        Args:
+            timeout: 两行之间的最长等待时间（秒）
+        """
+        if self.server_output is None:
+            return iter(())
+        return self.server_output.lines(timeout)
+    
     def restart_clients(
         self,
         client_scripts: List[str],
-        wait_between: int = 3
+        wait_between: int = 3,
+        env: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None
     ) -> List[subprocess.Popen]:
         """
         重启所有客户端
         
-        按顺序启动所有客户端，每个客户端之间等待指定时间。
+        按顺序启动所有客户端（座位按连接顺序分配），每个客户端连接成功
+        （写入GD_READY_FILE信号文件）后立即启动下一个；wait_between
+        只是上限，不支持信号的客户端仍等待wait_between秒。
         处理启动失败，继续启动其他客户端。
         
         Args:
             client_scripts: 客户端脚本路径列表
-            wait_between: 每个客户端之间的等待时间（秒），默认3秒
+            wait_between: 等待每个客户端连接的最长时间（秒），默认3秒
+            env: 额外的客户端环境变量（例如 GD_SERVER_PORT）
+            seed: 本批次的随机种子，第i个客户端使用 seed + i（GD_SEED），None表示不设置
             
         Returns:
             成功启动的客户端进程列表
         """
+        started = time.monotonic()
+        if self.client_pool is not None:
+            # 常驻客户端：只在崩溃/超出内存上限时重新创建进程，然后依次重连
+            self.client_pool.ensure_started(client_scripts, env)
+            processes = self.client_pool.connect_all(wait_between, seed)
+            self.last_startup["clients"] = time.monotonic() - started
+            logger.info(
+                f"{len(processes)}/{len(client_scripts)} 个常驻客户端已重连，"
+                f"用时 {self.last_startup['clients']:.2f}秒"
+            )
+            return processes
+        
         processes = []
+        self._remove_ready_dir()
+        self._ready_dir = tempfile.mkdtemp(prefix="gd_ready_")
         
         for i, script_path in enumerate(client_scripts):
             try:
@@ -141,20 +234,32 @@ class RestartManager:
                 # 确定如何启动客户端（Python脚本）
                 command = ['python', script_path]
                 
+                # 客户端连接成功后写入该文件（见 src/communication/startup.py）
+                ready_file = os.path.join(self._ready_dir, f"client{i + 1}.ready")
+                client_env = dict(os.environ, **(env or {}))
+                client_env["GD_READY_FILE"] = ready_file
+                if seed is not None:
+                    client_env["GD_SEED"] = str(seed + i)
+                
                 # 启动客户端进程
                 # 不捕获输出，让输出显示在控制台窗口中
                 process = subprocess.Popen(
                     command,
+                    env=client_env,
                     creationflags=subprocess.CREATE_NEW_CONSOLE if hasattr(subprocess, 'CREATE_NEW_CONSOLE') else 0
                 )
                 
                 logger.info(f"客户端 {i + 1} 已启动，PID: {process.pid}")
                 processes.append(process)
+                self.process_tree.add(process, f"客户端{i + 1}")
                 
-                # 等待后再启动下一个客户端
+                # 等待客户端连接后再启动下一个客户端（保证座位顺序）
                 if i < len(client_scripts) - 1:
-                    logger.info(f"等待{wait_between}秒后启动下一个客户端...")
-                    time.sleep(wait_between)
+                    client_start = time.monotonic()
+                    if wait_client_ready(process, ready_file, wait_between):
+                        logger.info(f"客户端 {i + 1} 已连接，用时 {time.monotonic() - client_start:.2f}秒")
+                    else:
+                        logger.info(f"客户端 {i + 1} 未发送连接信号，已等待{wait_between}秒")
                     
             except FileNotFoundError:
                 logger.error(f"客户端脚本不存在: {script_path}")
@@ -170,52 +275,100 @@ class RestartManager:
                 continue
         
         self.client_processes = processes
-        logger.info(f"成功启动 {len(processes)}/{len(client_scripts)} 个客户端")
+        self.last_startup["clients"] = time.monotonic() - started
+        logger.info(
+            f"成功启动 {len(processes)}/{len(client_scripts)} 个客户端，"
+            f"用时 {self.last_startup['clients']:.2f}秒"
+        )
         return processes
     
-    def cleanup(self) -> None:
+    def _on_process_exit(self, role: str, process: subprocess.Popen, returncode: int) -> None:
+        """本组进程退出回调（在等待线程中调用）"""
+        if role == SERVER_ROLE:
+            logger.debug(f"服务器进程 {process.pid} 已退出，返回码: {returncode}")
+            return
+        self._on_client_exit(role, returncode)
+    
+    def _on_client_exit(self, role: str, returncode: int) -> None:
+        """
+        客户端退出：服务器仍在运行时，给它宽限时间自行结束（正常的批次结束），
+        否则终止服务器，让本批次立即结束
+        """
+        server = self.server_process
+        if server is None or server.poll() is not None:
+            return
+        try:
+            server.wait(timeout=CLIENT_EXIT_GRACE)
+            return
+        except subprocess.TimeoutExpired:
+            pass
+        if server is self.server_process and server.poll() is None:
+            logger.warning(
+                f"{role}已退出（返回码 {returncode}），服务器{CLIENT_EXIT_GRACE}秒内未结束，"
+                f"终止服务器以立即重启本批次"
+            )
+            server.terminate()
+    
+    def get_startup_overhead(self) -> float:
+        """
+        最近一次批次启动的总耗时（服务器就绪 + 客户端依次连接）
+        
+        Returns:
+            耗时（秒）
+        """
+        return sum(self.last_startup.values())
+    
+    def _remove_ready_dir(self) -> None:
+        """删除客户端就绪信号目录"""
+        if self._ready_dir:
+            shutil.rmtree(self._ready_dir, ignore_errors=True)
+            self._ready_dir = None
+    
+    def cleanup(self, kill_strays: bool = True) -> None:
         """
         清理所有进程
         
         终止所有服务器和客户端进程，释放资源。
+        常驻客户端不在此结束（它们会在服务器重启后重连），见 shutdown()。
+        
+        Args:
+            kill_strays: 是否按进程名结束所有残留的服务器进程。
+                并行运行多组对局时应为False，只清理本组启动的进程。
         """
         logger.info("开始清理所有进程...")
         
-        # 终止所有客户端进程
-        for i, process in enumerate(self.client_processes):
-            try:
-                if process.poll() is None:  # 进程仍在运行
-                    logger.info(f"终止客户端进程 {i + 1}, PID: {process.pid}")
-                    process.terminate()
-                    try:
-                        process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        logger.warning(f"客户端进程 {process.pid} 未响应终止信号，强制结束")
-                        process.kill()
-            except Exception as e:
-                logger.error(f"终止客户端进程时发生错误: {e}")
-        
-        # 终止服务器进程
-        if self.server_process is not None:
-            try:
-                if self.server_process.poll() is None:  # 进程仍在运行
-                    logger.info(f"终止服务器进程, PID: {self.server_process.pid}")
-                    self.server_process.terminate()
-                    try:
-                        self.server_process.wait(timeout=5)
-                    except subprocess.TimeoutExpired:
-                        logger.warning(f"服务器进程 {self.server_process.pid} 未响应终止信号，强制结束")
-                        self.server_process.kill()
-            except Exception as e:
-                logger.error(f"终止服务器进程时发生错误: {e}")
+        # 同时终止本组的服务器和客户端（连同子进程），共用一个5秒的等待时限
+        try:
+            self.process_tree.terminate(timeout=5)
+        except Exception as e:
+            logger.error(f"终止进程时发生错误: {e}")
         
         # 使用进程监控器确保服务器进程已终止
         # 注意：不要杀死所有python.exe进程，因为GUI本身也是Python进程
-        process_names = ['guandan_offline_v1006.exe']
-        self.process_monitor.kill_all(process_names)
+        if kill_strays:
+            process_names = ['guandan_offline_v1006.exe']
+            self.process_monitor.kill_all(process_names)
         
         # 清空进程列表
         self.client_processes = []
         self.server_process = None
+        self.server_output = None
+        self.last_startup = {}
+        self._remove_ready_dir()
         
         logger.info("清理完成")
+    
+    def shutdown(self, kill_strays: bool = True) -> None:
+        """
+        结束全部进程（包括常驻客户端）
+        
+        Args:
+            kill_strays: 同 cleanup()
+        """
+        self.cleanup(kill_strays)
+        if self.client_pool is not None:
+            logger.info(
+                f"结束常驻客户端（共创建 {self.client_pool.spawned} 个进程，"
+                f"回收 {self.client_pool.recycled} 次）"
+            )
+            self.client_pool.close()
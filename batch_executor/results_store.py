@@ -0,0 +1,209 @@
+"""
+逐局战绩存储模块
+
+每局一行追加写入SQLite（WAL模式），用于事后分析：
+- 按批次、获胜座位、策略（双方客户端）、时间戳建索引
+- 每次追加是一个独立事务，进程崩溃时最多丢失正在写入的一局
+- 10万局以上的聚合查询走索引（按策略/座位/批次统计胜率）
+
+头游座位、完牌次序和级牌来自服务器的对局结束行（见 output_parser），无法对应到某一局时为空；
+决策延迟不在服务器输出中，需要时从客户端的决策日志（GD_DECISION_LOG）分析。
+
+命令行查看统计：
+    python -m batch_executor.results_store game_results.db --by strategy_a
+"""
+
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    batch INTEGER NOT NULL,
+    winner TEXT NOT NULL,
+    seat INTEGER,
+    strategy_a TEXT,
+    strategy_b TEXT,
+    level TEXT,
+    finish_order TEXT,
+    duration REAL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_games_batch ON games (run_id, batch);
+CREATE INDEX IF NOT EXISTS idx_games_seat ON games (seat, winner);
+CREATE INDEX IF NOT EXISTS idx_games_strategy ON games (strategy_a, strategy_b, winner);
+CREATE INDEX IF NOT EXISTS idx_games_ts ON games (ts);
+"""
+
+# 允许分组统计的列（防止拼接任意SQL）
+GROUP_COLUMNS = ("run_id", "batch", "seat", "strategy_a", "strategy_b", "level")
+
+# 旧版本数据库缺少的列（打开时补齐）
+ADDED_COLUMNS = {"level": "TEXT", "finish_order": "TEXT"}
+
+
+@dataclass
+class GameRecord:
+    """一局的结果"""
+    run_id: str
+    batch: int
+    winner: str  # "team_a" 或 "team_b"
+    seat: Optional[int] = None  # 头游座位（0-3，属于获胜方），未知时为None
+    strategy_a: Optional[str] = None  # Team A（0号、2号位）使用的客户端
+    strategy_b: Optional[str] = None  # Team B（1号、3号位）使用的客户端
+    level: Optional[str] = None  # 结束时所打的级牌
+    finish_order: Optional[str] = None  # 完牌次序，如 "0,2,1,3"
+    duration: Optional[float] = None  # 对局时长（秒）
+    ts: float = field(default_factory=time.time)
+
+
+class ResultsStore:
+    """SQLite逐局战绩存储（线程安全）"""
+
+    def __init__(self, path: str):
+        """
+        打开（或创建）战绩数据库
+
+        Args:
+            path: 数据库文件路径
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL：追加不阻塞读取；NORMAL在WAL下仍保证崩溃后数据库一致
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(games)")}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE games ADD COLUMN {column} {column_type}")
+        self._conn.commit()
+
+    def record_games(self, records: Iterable[GameRecord]) -> int:
+        """
+        追加若干局结果（一个事务）
+
+        Args:
+            records: 对局结果
+
+        Returns:
+            写入的局数
+        """
+        rows = [
+            (r.run_id, r.batch, r.winner, r.seat, r.strategy_a, r.strategy_b,
+             r.level, r.finish_order, r.duration, r.ts)
+            for r in records
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO games (run_id, batch, winner, seat, strategy_a, strategy_b, "
+                "level, finish_order, duration, ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def totals(self, run_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        胜场统计
+
+        Args:
+            run_id: 只统计某次运行，None表示全部
+
+        Returns:
+            {"team_a": x, "team_b": y, "total": x + y}
+        """
+        query = "SELECT winner, COUNT(*) FROM games"
+        params: tuple = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        query += " GROUP BY winner"
+        with self._lock:
+            counts = dict(self._conn.execute(query, params).fetchall())
+        team_a, team_b = counts.get("team_a", 0), counts.get("team_b", 0)
+        return {"team_a": team_a, "team_b": team_b, "total": team_a + team_b}
+
+    def summary_by(self, column: str, run_id: Optional[str] = None) -> List[Dict]:
+        """
+        按列分组统计胜率和平均时长
+
+        Args:
+            column: 分组列（见 GROUP_COLUMNS）
+            run_id: 只统计某次运行，None表示全部
+
+        Returns:
+            每组一项：{key, games, team_a, team_b, team_a_rate, avg_duration}
+        """
+        if column not in GROUP_COLUMNS:
+            raise ValueError(f"不支持的分组列: {column}，可选: {', '.join(GROUP_COLUMNS)}")
+        query = (
+            f"SELECT {column}, COUNT(*), "
+            "SUM(winner = 'team_a'), SUM(winner = 'team_b'), AVG(duration) FROM games"
+        )
+        params: tuple = ()
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params = (run_id,)
+        query += f" GROUP BY {column} ORDER BY {column}"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            {
+                "key": key,
+                "games": games,
+                "team_a": team_a,
+                "team_b": team_b,
+                "team_a_rate": team_a / games if games else 0.0,
+                "avg_duration": avg_duration,
+            }
+            for key, games, team_a, team_b, avg_duration in rows
+        ]
+
+    def close(self) -> None:
+        """关闭数据库（WAL内容合并回主文件）"""
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+
+
+def main():
+    """打印战绩数据库的分组统计"""
+    parser = argparse.ArgumentParser(description="逐局战绩统计")
+    parser.add_argument("db", help="战绩数据库文件")
+    parser.add_argument("--by", default="strategy_a", choices=GROUP_COLUMNS, help="分组列（默认: strategy_a）")
+    parser.add_argument("--run-id", default=None, help="只统计某次运行")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        totals = store.totals(args.run_id)
+        print(f"总场数: {totals['total']}  Team A: {totals['team_a']}  Team B: {totals['team_b']}")
+        print(f"{args.by:>16} | {'场数':>6} | {'Team A':>6} | {'Team B':>6} | {'A胜率':>7} | 平均时长")
+        for row in store.summary_by(args.by, args.run_id):
+            duration = f"{row['avg_duration']:.1f}s" if row["avg_duration"] is not None else "-"
+            print(
+                f"{str(row['key']):>16} | {row['games']:>6} | {row['team_a']:>6} | "
+                f"{row['team_b']:>6} | {row['team_a_rate'] * 100:>6.1f}% | {duration}"
+            )
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
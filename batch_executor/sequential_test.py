@@ -0,0 +1,190 @@
+"""
+序贯检验（SPRT）提前停止模块
+
+A/B对战时不必总是打满目标场数：每局结束后更新对数似然比（LLR），
+一方明显更强、或差距明显小于设定值时立即停止。
+
+检验方式（掼蛋每局必有胜负，按伯努利分布处理）：
+- 对Team A、Team B各做一个单边SPRT：H0 Elo差 = elo0，H1 Elo差 = elo1
+- A的检验接受H1 → Team A更强；B的检验接受H1 → Team B更强
+- 两个检验都接受H0 → 差距小于elo1（视为噪声），停止
+- 第一类/第二类错误率分别为 alpha / beta
+同时报告胜率的Wilson置信区间及对应的Elo差区间。
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+
+# 95%置信区间对应的正态分位数
+Z_95 = 1.959964
+
+
+def elo_to_score(elo: float) -> float:
+    """Elo差 → 期望胜率"""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def score_to_elo(score: float) -> float:
+    """期望胜率 → Elo差（胜率为0或1时返回±inf）"""
+    if score <= 0.0:
+        return -math.inf
+    if score >= 1.0:
+        return math.inf
+    return -400.0 * math.log10(1.0 / score - 1.0)
+
+
+def wilson_interval(wins: int, games: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    胜率的Wilson置信区间
+
+    Args:
+        wins: 胜场
+        games: 总场数
+        z: 正态分位数（默认95%）
+
+    Returns:
+        (下限, 上限)，没有对局时返回 (0.0, 1.0)
+    """
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denominator = 1 + z * z / games
+    center = (p + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+@dataclass
+class SPRTResult:
+    """检验结果"""
+    decision: Optional[str]  # "team_a" / "team_b" / "equal" / None（继续）
+    games: int
+    team_a_wins: int
+    llr_a: float
+    llr_b: float
+    lower_bound: float
+    upper_bound: float
+    win_rate: float
+    win_rate_ci: Tuple[float, float]
+    elo: float
+    elo_ci: Tuple[float, float]
+
+    def describe(self) -> str:
+        """多行文字报告"""
+        decision_text = {
+            "team_a": "Team A 更强",
+            "team_b": "Team B 更强",
+            "equal": "差距不显著（视为噪声）",
+            None: "尚无结论",
+        }[self.decision]
+        low, high = self.win_rate_ci
+        elo_low, elo_high = self.elo_ci
+        return (
+            f"序贯检验: {decision_text}\n"
+            f"  场数: {self.games}，Team A 胜率 {self.win_rate * 100:.1f}% "
+            f"(95% CI {low * 100:.1f}% ~ {high * 100:.1f}%)\n"
+            f"  Elo差(A-B): {self.elo:+.0f} (95% CI {elo_low:+.0f} ~ {elo_high:+.0f})\n"
+            f"  LLR: A {self.llr_a:+.2f} / B {self.llr_b:+.2f}，"
+            f"边界 [{self.lower_bound:.2f}, {self.upper_bound:.2f}]"
+        )
+
+
+class SequentialTest:
+    """双边SPRT（两个对称的单边检验）"""
+
+    def __init__(
+        self,
+        elo0: float = 0.0,
+        elo1: float = 50.0,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+        min_games: int = 20
+    ):
+        """
+        初始化检验
+
+        Args:
+            elo0: H0的Elo差
+            elo1: H1的Elo差（需要检测出的最小优势）
+            alpha: 第一类错误率（误判一方更强）
+            beta: 第二类错误率（漏判一方更强）
+            min_games: 最少对局数，之前不做结论
+
+        Raises:
+            ValueError: elo1不大于elo0，或alpha/beta不在(0, 1)之间
+        """
+        if elo1 <= elo0:
+            raise ValueError(f"elo1必须大于elo0，但得到 elo0={elo0}, elo1={elo1}")
+        for name, value in (("alpha", alpha), ("beta", beta)):
+            if not 0 < value < 1:
+                raise ValueError(f"{name}必须在(0, 1)之间，但得到 {value}")
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.alpha = alpha
+        self.beta = beta
+        self.min_games = min_games
+
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+        p0, p1 = elo_to_score(elo0), elo_to_score(elo1)
+        self._win_step = math.log(p1 / p0)
+        self._loss_step = math.log((1 - p1) / (1 - p0))
+
+        self.team_a_wins = 0
+        self.team_b_wins = 0
+        self.decision: Optional[str] = None
+
+    def _llr(self, wins: int, losses: int) -> float:
+        return wins * self._win_step + losses * self._loss_step
+
+    def update(self, team_a: int = 0, team_b: int = 0) -> Optional[str]:
+        """
+        计入新的对局结果
+
+        Args:
+            team_a: Team A新增胜场
+            team_b: Team B新增胜场
+
+        Returns:
+            结论（已有结论后保持不变），尚无结论返回None
+        """
+        self.team_a_wins += team_a
+        self.team_b_wins += team_b
+        if self.decision is None:
+            self.decision = self._decide()
+        return self.decision
+
+    def _decide(self) -> Optional[str]:
+        if self.team_a_wins + self.team_b_wins < self.min_games:
+            return None
+        llr_a = self._llr(self.team_a_wins, self.team_b_wins)
+        llr_b = self._llr(self.team_b_wins, self.team_a_wins)
+        if llr_a >= self.upper_bound:
+            return "team_a"
+        if llr_b >= self.upper_bound:
+            return "team_b"
+        if llr_a <= self.lower_bound and llr_b <= self.lower_bound:
+            return "equal"
+        return None
+
+    def result(self) -> SPRTResult:
+        """当前检验状态和置信区间"""
+        games = self.team_a_wins + self.team_b_wins
+        win_rate = self.team_a_wins / games if games else 0.5
+        low, high = wilson_interval(self.team_a_wins, games)
+        return SPRTResult(
+            decision=self.decision,
+            games=games,
+            team_a_wins=self.team_a_wins,
+            llr_a=self._llr(self.team_a_wins, self.team_b_wins),
+            llr_b=self._llr(self.team_b_wins, self.team_a_wins),
+            lower_bound=self.lower_bound,
+            upper_bound=self.upper_bound,
+            win_rate=win_rate,
+            win_rate_ci=(low, high),
+            elo=score_to_elo(win_rate),
+            elo_ci=(score_to_elo(low), score_to_elo(high)),
+        )
@@ -0,0 +1,526 @@
+"""
+循环赛模块
+
+在策略注册表中的所有策略之间进行循环赛，并维护Elo等级分：
+- 每个策略是一对客户端脚本（同队两个座位）
+- 每对策略交换座位各打一半场次（A队占0、2号位，B队占1、3号位），抵消座位优势
+- 所有对阵切分成批次放入同一个配额队列，由K个并行对局组领取（见 parallel.py）
+- 每局结束即更新等级分，结果保存到JSON文件，下次运行在此基础上继续累计
+- 等级分附带95%置信区间（按对手平均等级分和Wilson胜率区间估算）
+
+用法：
+    python -m batch_executor.tournament --server-path server.exe --games-per-pairing 20 --parallel 2
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import queue
+import random
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .input_validator import InputValidator
+from .output_parser import ServerEvent, ServerOutputParser
+from .parallel import GameGroup, split_quotas, wait_groups
+from .readiness import DEFAULT_PORT
+from .sequential_test import elo_to_score, score_to_elo, wilson_interval
+
+
+logger = logging.getLogger(__name__)
+
+# 项目根目录（注册表中的脚本路径相对于此目录）
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+INITIAL_RATING = 1500.0
+DEFAULT_K_FACTOR = 16.0
+
+
+@dataclass
+class Strategy:
+    """一个参赛策略：同队两个座位使用的客户端脚本"""
+    name: str
+    scripts: Tuple[str, str]
+    description: str = ""
+
+
+def _communication_script(*parts: str) -> str:
+    return str(PROJECT_ROOT.joinpath("src", "communication", *parts))
+
+
+# 内置策略注册表
+DEFAULT_STRATEGIES: Dict[str, Strategy] = {
+    strategy.name: strategy
+    for strategy in (
+        Strategy(
+            "hybrid_v4",
+            (_communication_script("yf1_v4.py"), _communication_script("yf2_v4.py")),
+            "HybridDecisionEngineV4",
+        ),
+        Strategy(
+            "knowledge",
+            (_communication_script("Test1.py"), _communication_script("Test2.py")),
+            "KnowledgeEnhancedDecisionEngine",
+        ),
+        Strategy(
+            "first_prize",
+            (_communication_script("first_prize", "client3.py"), _communication_script("first_prize", "client4.py")),
+            "一等奖代码（first_prize Action）",
+        ),
+        Strategy(
+            "random",
+            (_communication_script("Test3.py"), _communication_script("Test4.py")),
+            "Test3/Test4，随机选择合法动作（基准线）",
+        ),
+    )
+}
+
+
+def parse_strategy_spec(spec: str) -> Strategy:
+    """
+    解析命令行策略定义
+
+    Args:
+        spec: "名称=脚本1,脚本2"
+
+    Returns:
+        Strategy对象
+
+    Raises:
+        ValueError: 格式不正确
+    """
+    name, _, scripts = spec.partition("=")
+    paths = [path.strip() for path in scripts.split(",") if path.strip()]
+    if not name.strip() or len(paths) != 2:
+        raise ValueError(f"策略定义格式应为 名称=脚本1,脚本2，但得到: {spec}")
+    return Strategy(name.strip(), (paths[0], paths[1]))
+
+
+@dataclass
+class Pairing:
+    """一个对阵：team_a 占0、2号位，team_b 占1、3号位"""
+    team_a: str
+    team_b: str
+    games: int
+    team_a_wins: int = 0
+    team_b_wins: int = 0
+
+
+def schedule_round_robin(names: List[str], games_per_pairing: int) -> List[Pairing]:
+    """
+    生成座位平衡的循环赛对阵
+
+    每两个策略之间共 games_per_pairing 场，交换座位各打一半（奇数时先手方多一场）。
+
+    Args:
+        names: 策略名称列表
+        games_per_pairing: 每两个策略之间的总场数
+
+    Returns:
+        对阵列表，例如2个策略、6场 → [A vs B 3场, B vs A 3场]
+    """
+    pairings = []
+    for first, second in itertools.combinations(names, 2):
+        home = (games_per_pairing + 1) // 2
+        away = games_per_pairing - home
+        if home:
+            pairings.append(Pairing(first, second, home))
+        if away:
+            pairings.append(Pairing(second, first, away))
+    return pairings
+
+
+@dataclass
+class Rating:
+    """一个策略的等级分和累计战绩"""
+    rating: float = INITIAL_RATING
+    games: int = 0
+    wins: int = 0
+    opponent_rating_sum: float = 0.0  # 每局对手赛前等级分之和（用于估算置信区间）
+
+    def interval(self) -> Tuple[float, float]:
+        """
+        等级分的95%置信区间
+
+        按"对手平均等级分 + 胜率对应的Elo差"估算，胜率取Wilson区间；
+        全胜或全负时对应一侧为±inf。
+        """
+        if self.games == 0:
+            return -float("inf"), float("inf")
+        average_opponent = self.opponent_rating_sum / self.games
+        low, high = wilson_interval(self.wins, self.games)
+        return average_opponent + score_to_elo(low), average_opponent + score_to_elo(high)
+
+
+class RatingTable:
+    """增量更新的Elo等级分表（线程安全，可持久化）"""
+
+    def __init__(self, save_file: Optional[str] = "ratings.json", k_factor: float = DEFAULT_K_FACTOR):
+        """
+        初始化等级分表
+
+        Args:
+            save_file: 保存文件，None表示不持久化
+            k_factor: 每局的最大等级分变化
+        """
+        self.save_file = save_file
+        self.k_factor = k_factor
+        self.ratings: Dict[str, Rating] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Rating:
+        """取得策略的等级分（不存在时以初始分创建）"""
+        if name not in self.ratings:
+            self.ratings[name] = Rating()
+        return self.ratings[name]
+
+    def record_game(self, winner: str, loser: str) -> None:
+        """
+        记录一局结果并更新双方等级分
+
+        Args:
+            winner: 获胜策略
+            loser: 失败策略
+        """
+        with self._lock:
+            win, lose = self.get(winner), self.get(loser)
+            expected = elo_to_score(win.rating - lose.rating)
+            delta = self.k_factor * (1.0 - expected)
+            win.opponent_rating_sum += lose.rating
+            lose.opponent_rating_sum += win.rating
+            win.rating += delta
+            lose.rating -= delta
+            win.games += 1
+            lose.games += 1
+            win.wins += 1
+
+    def record_wins(self, team_a: str, team_b: str, team_a_wins: int, team_b_wins: int) -> None:
+        """一次记录多局结果（双方胜局交替记录，减少顺序对等级分的影响）"""
+        while team_a_wins or team_b_wins:
+            if team_a_wins:
+                self.record_game(team_a, team_b)
+                team_a_wins -= 1
+            if team_b_wins:
+                self.record_game(team_b, team_a)
+                team_b_wins -= 1
+
+    def standings(self) -> List[Tuple[str, Rating]]:
+        """按等级分从高到低排列"""
+        with self._lock:
+            return sorted(self.ratings.items(), key=lambda item: item[1].rating, reverse=True)
+
+    def generate_report(self) -> str:
+        """生成排名表"""
+        lines = ["等级分排名:", f"  {'策略':<14} {'等级分':>7} {'95% CI':>15} {'场数':>6} {'胜率':>7}"]
+        for name, rating in self.standings():
+            low, high = rating.interval()
+            interval = "-" if low == -float("inf") or high == float("inf") else f"{low:.0f} ~ {high:.0f}"
+            win_rate = rating.wins / rating.games * 100 if rating.games else 0.0
+            lines.append(
+                f"  {name:<14} {rating.rating:>7.0f} {interval:>15} {rating.games:>6} {win_rate:>6.1f}%"
+            )
+        return "\n".join(lines)
+
+    def save(self) -> None:
+        """持久化到文件（临时文件+原子重命名）"""
+        if not self.save_file:
+            return
+        with self._lock:
+            data = {
+                "k_factor": self.k_factor,
+                "updated": datetime.now().isoformat(),
+                "ratings": {name: asdict(rating) for name, rating in self.ratings.items()},
+            }
+        directory = os.path.dirname(self.save_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.save_file)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self) -> None:
+        """从文件加载之前的等级分（文件不存在时保持为空）"""
+        if not self.save_file or not os.path.exists(self.save_file):
+            return
+        with open(self.save_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self.ratings = {name: Rating(**values) for name, values in data.get("ratings", {}).items()}
+
+
+class Tournament:
+    """循环赛调度器"""
+
+    def __init__(
+        self,
+        server_path: str,
+        strategies: Dict[str, Strategy],
+        games_per_pairing: int = 6,
+        parallel: int = 1,
+        base_port: int = DEFAULT_PORT,
+        server_port_args: Optional[List[str]] = None,
+        persistent_clients: bool = False,
+        ratings_file: Optional[str] = "ratings.json",
+        results_file: Optional[str] = "game_results.db",
+        k_factor: float = DEFAULT_K_FACTOR,
+        single_run_limit: int = InputValidator.DEFAULT_SINGLE_RUN_LIMIT,
+        seed: Optional[int] = None
+    ):
+        """
+        初始化循环赛
+
+        Args:
+            server_path: 服务器可执行文件路径
+            strategies: 参赛策略 {名称: Strategy}，至少2个
+            games_per_pairing: 每两个策略之间的总场数
+            parallel: 并行对局组数
+            base_port: 第一组的端口，第i组使用 base_port + i
+            server_port_args: 指定服务器端口的命令行参数模板，如 ["--port", "{port}"]
+            persistent_clients: 是否使用常驻客户端（对阵变化时重建进程池）
+            ratings_file: 等级分文件，None表示不持久化
+            results_file: 逐局战绩数据库（SQLite），None表示不记录
+            k_factor: Elo K值
+            single_run_limit: 服务器单次运行的场数上限
+            seed: 运行种子，每批次的客户端种子由它和批次编号导出，None表示随机生成
+        """
+        if len(strategies) < 2:
+            raise ValueError(f"循环赛至少需要2个策略，但只有 {len(strategies)} 个")
+        if games_per_pairing <= 0:
+            raise ValueError(f"每对策略的场数必须是正整数，但得到 {games_per_pairing}")
+        if parallel <= 0:
+            raise ValueError(f"并行组数必须是正整数，但得到 {parallel}")
+
+        self.server_path = server_path
+        self.strategies = strategies
+        self.games_per_pairing = games_per_pairing
+        self.parallel = parallel
+        self.base_port = base_port
+        self.server_port_args = server_port_args or []
+        self.persistent_clients = persistent_clients
+        self.results_file = results_file
+        self.single_run_limit = single_run_limit
+        self.seed = seed if seed is not None else random.randrange(2 ** 31)
+
+        self.ratings = RatingTable(ratings_file, k_factor)
+        self.pairings = schedule_round_robin(list(strategies), games_per_pairing)
+        self.results_store = None
+        self._run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._batches: Dict[int, Pairing] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def _scripts(self, pairing: Pairing) -> List[str]:
+        """按座位顺序排列客户端脚本：0号A、1号B、2号A、3号B"""
+        team_a = self.strategies[pairing.team_a].scripts
+        team_b = self.strategies[pairing.team_b].scripts
+        return [team_a[0], team_b[0], team_a[1], team_b[1]]
+
+    def _build_quotas(self) -> "queue.Queue":
+        """把所有对阵切分成批次放入配额队列"""
+        quotas: "queue.Queue" = queue.Queue()
+        batch = 0
+        for pairing in self.pairings:
+            scripts = self._scripts(pairing)
+            for games in split_quotas(pairing.games, self.single_run_limit):
+                batch += 1
+                self._batches[batch] = pairing
+                quotas.put((batch, games, scripts))
+        return quotas
+
+    def _on_event(self, index: int, event: ServerEvent) -> None:
+        if event.kind != "score":
+            return
+        pairing = self._batches[event.batch]
+        with self._lock:
+            pairing.team_a_wins += event.team_a
+            pairing.team_b_wins += event.team_b
+            self.ratings.record_wins(pairing.team_a, pairing.team_b, event.team_a, event.team_b)
+        if self.results_store is not None:
+            self._record_results(pairing, event)
+
+    def _record_results(self, pairing: Pairing, event: ServerEvent) -> None:
+        """写入逐局数据库（strategy_a/strategy_b 为策略名称）"""
+        from .results_store import GameRecord
+
+        games = event.game_results()
+        duration = event.duration / len(games) if event.duration is not None and games else None
+        try:
+            self.results_store.record_games(
+                GameRecord(
+                    run_id=self._run_id,
+                    batch=event.batch,
+                    winner=winner,
+                    seat=seat,
+                    strategy_a=pairing.team_a,
+                    strategy_b=pairing.team_b,
+                    level=level,
+                    finish_order=",".join(map(str, order)) if order else None,
+                    duration=duration,
+                    ts=event.timestamp.timestamp()
+                )
+                for winner, seat, order, level in games
+            )
+        except Exception as e:
+            logger.error(f"写入战绩数据库失败: {e}")
+
+    def _on_result(self, index: int, parser: ServerOutputParser, overhead: float) -> None:
+        pairing = self._batches[parser.batch]
+        logger.info(
+            f"[组{index}] 批次{parser.batch} 结束: {pairing.team_a} vs {pairing.team_b} "
+            f"累计 {pairing.team_a_wins}:{pairing.team_b_wins}"
+        )
+        if not parser.finished and parser.remaining_games():
+            # 未完成的场次已由对局组放回配额队列（同一批次编号，仍计入本对阵）
+            logger.warning(f"[组{index}] 批次{parser.batch} 未正常结束，{parser.remaining_games()} 场将重新进行")
+        try:
+            with self._lock:
+                self.ratings.save()
+        except Exception as e:
+            logger.error(f"保存等级分失败: {e}", exc_info=True)
+
+    def stop(self) -> None:
+        """请求停止（各组在当前批次结束后退出）"""
+        self._stop_event.set()
+
+    def run(self) -> RatingTable:
+        """
+        运行循环赛
+
+        Returns:
+            更新后的等级分表
+        """
+        from .process_monitor import ProcessMonitor
+        from .restart_manager import RestartManager
+
+        self.ratings.load()
+        if self.results_file:
+            from .results_store import ResultsStore
+            self.results_store = ResultsStore(self.results_file)
+
+        quotas = self._build_quotas()
+        group_count = min(self.parallel, quotas.qsize())
+        logger.info(
+            f"循环赛: {len(self.strategies)} 个策略，{len(self.pairings)} 个对阵，"
+            f"{quotas.qsize()} 个批次，{group_count} 组并行（种子 {self.seed}）"
+        )
+        if group_count > 1 and not self.server_port_args:
+            logger.warning("未指定服务器端口参数(server_port_args)，各组服务器可能使用同一端口")
+
+        groups = [
+            GameGroup(
+                i, self.base_port + i, self.server_path, [], self.server_port_args,
+                self.persistent_clients, seed=self.seed
+            )
+            for i in range(group_count)
+        ]
+
+        # 启动前清理残留的服务器进程（之后各组只清理自己的进程）
+        RestartManager(ProcessMonitor()).cleanup()
+
+        start_time = time.monotonic()
+        try:
+            for group in groups:
+                group.start(quotas, self._on_event, self._on_result, self._stop_event)
+            wait_groups(groups, self._stop_event.is_set)
+        finally:
+            self._stop_event.set()
+            for group in groups:
+                group.cleanup()
+            for group in groups:
+                group.join(timeout=10)
+            with self._lock:
+                self.ratings.save()
+            if self.results_store is not None:
+                self.results_store.close()
+                self.results_store = None
+
+        if not quotas.empty():
+            logger.warning(f"循环赛未完成，剩余 {quotas.qsize()} 个批次")
+        logger.info(f"循环赛结束，用时 {time.monotonic() - start_time:.0f}秒")
+        for pairing in self.pairings:
+            logger.info(f"  {pairing.team_a} vs {pairing.team_b}: {pairing.team_a_wins}:{pairing.team_b_wins}")
+        logger.info(self.ratings.generate_report())
+        return self.ratings
+
+
+def main():
+    """命令行入口"""
+    from .logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="策略循环赛（Elo等级分）")
+    parser.add_argument("--server-path", required=True, help="服务器可执行文件路径")
+    parser.add_argument(
+        "--strategies", nargs="+", default=None,
+        help=f"参赛策略（默认全部: {' '.join(DEFAULT_STRATEGIES)}）"
+    )
+    parser.add_argument(
+        "--strategy", action="append", default=[],
+        help="追加自定义策略，格式 名称=脚本1,脚本2，可重复指定"
+    )
+    parser.add_argument("--games-per-pairing", type=int, default=6, help="每两个策略之间的总场数（默认: 6）")
+    parser.add_argument("--parallel", type=int, default=1, help="并行对局组数（默认: 1）")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_PORT, help=f"第一组的端口（默认: {DEFAULT_PORT}）")
+    parser.add_argument(
+        "--server-port-arg", action="append", default=None,
+        help="传给服务器的端口参数，{port}会被替换为本组端口，可重复指定"
+    )
+    parser.add_argument("--persistent-clients", action="store_true", help="客户端进程常驻")
+    parser.add_argument("--ratings-file", default="ratings.json", help="等级分文件（默认: ratings.json）")
+    parser.add_argument("--results-db", default="game_results.db", help="逐局战绩数据库（默认: game_results.db）")
+    parser.add_argument("--k-factor", type=float, default=DEFAULT_K_FACTOR, help=f"Elo K值（默认: {DEFAULT_K_FACTOR:g}）")
+    parser.add_argument("--seed", type=int, default=None, help="运行种子，决定每批次客户端的随机种子（默认随机）")
+    parser.add_argument("--log-dir", default="logs", help="日志文件目录（默认: logs）")
+    args = parser.parse_args()
+
+    setup_logging(log_dir=args.log_dir)
+
+    registry = dict(DEFAULT_STRATEGIES)
+    try:
+        for spec in args.strategy:
+            strategy = parse_strategy_spec(spec)
+            registry[strategy.name] = strategy
+    except ValueError as e:
+        parser.error(str(e))
+
+    names = args.strategies or list(registry)
+    unknown = [name for name in names if name not in registry]
+    if unknown:
+        parser.error(f"未知策略: {', '.join(unknown)}，可选: {', '.join(registry)}")
+    for name in names:
+        for script in registry[name].scripts:
+            if not os.path.exists(script):
+                logger.warning(f"策略 {name} 的客户端脚本不存在: {script}")
+
+    tournament = Tournament(
+        server_path=args.server_path,
+        strategies={name: registry[name] for name in names},
+        games_per_pairing=args.games_per_pairing,
+        parallel=args.parallel,
+        base_port=args.base_port,
+        server_port_args=args.server_port_arg,
+        persistent_clients=args.persistent_clients,
+        ratings_file=args.ratings_file,
+        results_file=args.results_db,
+        k_factor=args.k_factor,
+        seed=args.seed
+    )
+    try:
+        tournament.run()
+    except KeyboardInterrupt:
+        logger.info("用户中断，等级分已保存")
+
+
+if __name__ == "__main__":
+    main()
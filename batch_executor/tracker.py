@@ -55,6 +55,17 @@ class ScoreTracker:
         
         self.total_games += 1
     
+    def record_wins(self, team_a: int, team_b: int) -> None:
+        """一次记录多场结果
+        
+        Args:
+            team_a: Team A新增胜场
+            team_b: Team B新增胜场
+        """
+        self.team_a_wins += team_a
+        self.team_b_wins += team_b
+        self.total_games += team_a + team_b
+    
     def save(self) -> None:
         """持久化战绩到文件
         
@@ -16,6 +16,15 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from batch_executor.main import BatchExecutor
 from batch_executor.logging_config import setup_logging
+from batch_executor.log_buffer import LogBuffer
+
+
+# 日志先写入内存缓冲，界面每隔LOG_FLUSH_INTERVAL毫秒批量插入一次；
+# 文本控件只保留最近LOG_VIEW_LINES行，完整日志（最多LOG_BUFFER_SIZE条）在缓冲中
+LOG_FLUSH_INTERVAL = 100
+LOG_VIEW_LINES = 5000
+LOG_BUFFER_SIZE = 100000
+LOG_FILTER_ALL = "全部"
 
 
 class BatchExecutorGUI:
@@ -39,6 +48,11 @@ class BatchExecutorGUI:
         self.executor_thread = None
         self.is_running = False
         
+        # 日志缓冲和过滤条件（级别, 关键字）
+        self.log_buffer = LogBuffer(LOG_BUFFER_SIZE)
+        self._log_filter = (None, "")
+        self._progress_dirty = False
+        
         # 配置样式
         self.setup_styles()
         
@@ -47,6 +61,9 @@ class BatchExecutorGUI:
         
         # 加载默认配置
         self.load_default_config()
+        
+        # 开始定时刷新日志
+        self._flush_log()
     
     def setup_styles(self):
         """配置界面样式"""
@@ -191,6 +208,34 @@ class BatchExecutorGUI:
         log_frame = ttk.LabelFrame(self.root, text="执行日志", padding="10")
         log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
+        # 日志过滤/搜索（在内存缓冲中查找）
+        filter_frame = ttk.Frame(log_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(filter_frame, text="级别:").pack(side=tk.LEFT)
+        self.log_level_var = tk.StringVar(value=LOG_FILTER_ALL)
+        level_combo = ttk.Combobox(
+            filter_frame,
+            textvariable=self.log_level_var,
+            values=[LOG_FILTER_ALL, "INFO", "SUCCESS", "WARNING", "ERROR"],
+            state="readonly",
+            width=10
+        )
+        level_combo.pack(side=tk.LEFT, padx=5)
+        level_combo.bind("<<ComboboxSelected>>", lambda e: self.apply_log_filter())
+        
+        ttk.Label(filter_frame, text="搜索:").pack(side=tk.LEFT, padx=(10, 0))
+        self.log_search_var = tk.StringVar()
+        search_entry = ttk.Entry(filter_frame, textvariable=self.log_search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.bind("<Return>", lambda e: self.apply_log_filter())
+        
+        ttk.Button(filter_frame, text="查找", command=self.apply_log_filter).pack(side=tk.LEFT, padx=2)
+        ttk.Button(filter_frame, text="显示全部", command=self.reset_log_filter).pack(side=tk.LEFT, padx=2)
+        
+        self.log_count_label = ttk.Label(filter_frame, text="", foreground="gray")
+        self.log_count_label.pack(side=tk.RIGHT)
+        
         self.log_text = scrolledtext.ScrolledText(
             log_frame,
             wrap=tk.WORD,
@@ -273,17 +318,75 @@ class BatchExecutorGUI:
             self.server_path_var.set(filename)
     
     def log_message(self, message, level="INFO"):
-        """在日志区域显示消息（线程安全）"""
-        def _log():
-            self.log_text.insert(tk.END, message + "\n", level)
+        """在日志区域显示消息（线程安全，只写入缓冲，由_flush_log批量显示）"""
+        self.log_buffer.append(message, level)
+    
+    def _flush_log(self):
+        """定时把缓冲中的新日志批量插入文本控件，并刷新进度"""
+        try:
+            records = self.log_buffer.drain()
+            level, text = self._log_filter
+            if level is not None:
+                records = [r for r in records if r.level == level]
+            if text:
+                needle = text.lower()
+                records = [r for r in records if needle in r.message.lower()]
+            if records:
+                self._insert_log_records(records)
+            
+            if self._progress_dirty:
+                self._progress_dirty = False
+                self._refresh_progress()
+        finally:
+            self.root.after(LOG_FLUSH_INTERVAL, self._flush_log)
+    
+    def _insert_log_records(self, records):
+        """一次insert调用插入多条日志（相邻同级别的合并为一段），超出上限时删除最旧的行"""
+        args = []
+        for record in records[-LOG_VIEW_LINES:]:
+            if args and args[-1] == record.level:
+                args[-2] += record.message + "\n"
+            else:
+                args += [record.message + "\n", record.level]
+        
+        # 用户向上翻看时不自动滚动
+        at_bottom = self.log_text.yview()[1] >= 0.999
+        self.log_text.insert(tk.END, *args)
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > LOG_VIEW_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_VIEW_LINES}.0")
+        if at_bottom:
             self.log_text.see(tk.END)
-        
-        # 使用after确保在主线程中执行
-        self.root.after(0, _log)
+        self.log_count_label.config(text=f"缓冲 {len(self.log_buffer)} 条")
+    
+    def apply_log_filter(self):
+        """按级别和关键字在日志缓冲中查找，重新显示匹配的日志"""
+        level = self.log_level_var.get()
+        level = None if level == LOG_FILTER_ALL else level
+        text = self.log_search_var.get().strip()
+        self._log_filter = (level, text)
+        
+        # 缓冲中尚未显示的新日志已包含在查找结果中
+        self.log_buffer.drain()
+        matches = self.log_buffer.search(text, level)
+        self.log_text.delete(1.0, tk.END)
+        if matches:
+            self._insert_log_records(matches)
+        self.log_count_label.config(
+            text=f"匹配 {len(matches)} 条" + (f"（显示最近 {LOG_VIEW_LINES} 条）" if len(matches) > LOG_VIEW_LINES else "")
+        )
+    
+    def reset_log_filter(self):
+        """取消过滤，显示全部日志"""
+        self.log_level_var.set(LOG_FILTER_ALL)
+        self.log_search_var.set("")
+        self.apply_log_filter()
     
     def clear_log(self):
         """清空日志"""
+        self.log_buffer.clear()
         self.log_text.delete(1.0, tk.END)
+        self.log_count_label.config(text="")
     
     def validate_config(self):
         """验证配置"""
@@ -404,6 +507,9 @@ class BatchExecutorGUI:
                 enable_signal_handler=False
             )
             
+            # 单局结束/战绩更新时立即刷新进度（不等定时器）
+            self.executor.add_event_listener(self.on_server_event)
+            
             if diagnose_only:
                 self.log_message("正在诊断服务器配置...", "INFO")
                 # 执行诊断
@@ -490,6 +596,19 @@ class BatchExecutorGUI:
         if self.is_running:
             self.root.after(1000, self.update_progress_timer)
     
+    def on_server_event(self, event):
+        """服务器事件回调（在执行器线程中调用，只做标记，由_flush_log合并刷新）"""
+        if event.kind in ("score", "game_end"):
+            self._progress_dirty = True
+    
+    def _refresh_progress(self):
+        """按执行器当前状态刷新进度显示"""
+        state = self.executor.get_state() if self.executor else None
+        if state:
+            total = state.target_games
+            progress = (state.completed_games / total * 100) if total > 0 else 0
+            self.update_progress(state.completed_games, total, progress, state.restart_count)
+    
     def update_progress(self, completed, total, progress, restarts=0):
         """更新进度显示（手动调用）"""
         self.progress_var.set(progress)
@@ -539,7 +658,7 @@ class BatchExecutorGUI:
         if filename:
             try:
                 with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(self.log_text.get(1.0, tk.END))
+                    f.write(self.log_buffer.text())
                 messagebox.showinfo("成功", f"日志已保存到: {filename}")
             except Exception as e:
                 messagebox.showerror("错误", f"保存日志失败: {e}")
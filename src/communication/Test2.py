@@ -3,39 +3,45 @@
 Test2 - Knowledge Enhanced AI Client
 Uses knowledge base and decision engine
 """
+import time
+_STARTED_AT = time.perf_counter()
+
 import asyncio
-import websockets
 import json
 import sys
 from pathlib import Path
 
-# Add src directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# websockets, the state manager and the knowledge base are imported lazily
+# so the client connects while they load in the background.
+SRC_DIR = str(Path(__file__).parent.parent)
+
+
+def _ensure_src_path():
+    """Add src directory to path (at startup, not at import time)"""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
 
-from game_logic.enhanced_state import EnhancedGameStateManager
-from knowledge.knowledge_enhanced_decision import KnowledgeEnhancedDecisionEngine
 
 class BasicGuandanClient:
-    def __init__(self, user_info):
+    def __init__(self, user_info, startup=None):
+        _ensure_src_path()
+        from communication.recorder import GameRecorder
+        from communication.startup import BackgroundLoader, MemoryWatch, StartupProfile
+        from decision.decision_profiler import DecisionProfiler
+
         self.user_info = user_info
         self.websocket = None
+        self.startup = startup or StartupProfile.from_env(user_info, _STARTED_AT)
+        self.recorder = GameRecorder.from_env(user_info)
+        self.memory_watch = MemoryWatch.from_env(user_info)
+        self.profiler = DecisionProfiler.from_env(user_info, layer="KnowledgeEnhanced")
         
-        # Initialize state manager
-        self.state_manager = EnhancedGameStateManager()
-        
-        # Initialize knowledge-enhanced decision engine
-        self.decision_engine = KnowledgeEnhancedDecisionEngine(self.state_manager)
-        
-        # 调试：检查知识库是否加载
-        print(f"[{user_info}] Knowledge loader: {self.decision_engine.knowledge_loader}")
-        if self.decision_engine.knowledge_loader:
-            try:
-                rules_count = len(self.decision_engine.knowledge_loader.rules) if hasattr(self.decision_engine.knowledge_loader, 'rules') else 0
-                print(f"[{user_info}] Loaded {rules_count} knowledge rules")
-            except Exception as e:
-                print(f"[{user_info}] Error checking rules: {e}")
-        else:
-            print(f"[{user_info}] WARNING: Knowledge loader is None!")
+        # Initialize state manager and knowledge-enhanced decision engine in the background
+        self._engine_loader = BackgroundLoader(
+            self._create_decision_engine,
+            name=f"{user_info}-engine",
+            on_ready=lambda _: self.startup.mark("engine_ready")
+        ).start()
         
         # Keep old game_state for compatibility
         self.game_state = {
@@ -46,16 +52,67 @@ class BasicGuandanClient:
             "curRank": "2"
         }
     
+    def _create_decision_engine(self):
+        """Import and build state manager + decision engine (runs in the loader thread)"""
+        from game_logic.enhanced_state import EnhancedGameStateManager
+        from knowledge.knowledge_enhanced_decision import KnowledgeEnhancedDecisionEngine
+        
+        state_manager = EnhancedGameStateManager()
+        decision_engine = KnowledgeEnhancedDecisionEngine(state_manager)
+        
+        # 调试：检查知识库是否加载
+        print(f"[{self.user_info}] Knowledge loader: {decision_engine.knowledge_loader}")
+        if decision_engine.knowledge_loader:
+            try:
+                rules_count = len(decision_engine.knowledge_loader.rules) if hasattr(decision_engine.knowledge_loader, 'rules') else 0
+                print(f"[{self.user_info}] Loaded {rules_count} knowledge rules")
+            except Exception as e:
+                print(f"[{self.user_info}] Error checking rules: {e}")
+        else:
+            print(f"[{self.user_info}] WARNING: Knowledge loader is None!")
+        
+        return state_manager, decision_engine
+    
+    @property
+    def state_manager(self):
+        return self._engine_loader.result()[0]
+    
+    @property
+    def decision_engine(self):
+        return self._engine_loader.result()[1]
+    
+    async def wait_engine_ready(self):
+        """Wait for background loading without blocking the event loop"""
+        if not self._engine_loader.done():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._engine_loader.result)
+            print(self.startup.report())
+            self.startup.finish()
+        return self._engine_loader.result()
+    
     async def connect(self):
-        uri = f"ws://127.0.0.1:23456/game/{self.user_info}"
+        import websockets
+        from communication.startup import server_uri
+        
+        uri = server_uri(self.user_info)
         try:
-            self.websocket = await websockets.connect(uri)
-            print(f"[{self.user_info}] Connected successfully!")
+            self.websocket = self.recorder.wrap(await websockets.connect(uri))
+            elapsed = self.startup.mark("connected")
+            self.startup.check_budget("connected")
+            self.startup.notify_ready("connected")
+            print(f"[{self.user_info}] Connected successfully! ({elapsed:.2f}s after start)")
+            if self._engine_loader.done():
+                print(self.startup.report())
+                self.startup.finish()
             await self.handle_messages()
+            return True
         except Exception as e:
             print(f"[{self.user_info}] Connection error: {e}")
+            return False
     
     async def handle_messages(self):
+        import websockets
+        
         try:
             async for message in self.websocket:
                 try:
@@ -65,12 +122,14 @@ class BasicGuandanClient:
                     self.update_game_state(data)
                     
                     # Update state manager
+                    await self.wait_engine_ready()
                     self.state_manager.update_from_message(data)
 
                     if data.get("type") == "act":
                         # Use knowledge-enhanced decision engine
                         try:
-                            act_index = self.decision_engine.decide(data)
+                            with self.profiler:
+                                act_index = self.decision_engine.decide(data)
                             response = json.dumps({"actIndex": act_index})
                             await self.websocket.send(response)
                             print(f"[{self.user_info}] Sent response: {response} (Knowledge Enhanced)")
@@ -97,6 +156,17 @@ class BasicGuandanClient:
         finally:
             print(f"[{self.user_info}] Disconnected")
 
+    def reset_game(self):
+        """Reset per-game state (long-lived client, see startup.run_client)"""
+        self.game_state.update({"handCards": [], "myPos": None, "curPos": None, "stage": None, "curRank": "2"})
+        if self._engine_loader.done():
+            self.state_manager.reset()
+
+    def close(self):
+        """Flush the message recording and profiles (the engine keeps no open files)"""
+        self.recorder.close()
+        self.profiler.close()
+
     def print_game_state(self, data):
         """Print game state information"""
         if data.get("type") == "notify":
@@ -111,6 +181,7 @@ class BasicGuandanClient:
             elif stage == "gameResult":
                 victory_num = data.get("victoryNum", [])
                 print(f"[{self.user_info}] Game result, victory: {victory_num}")
+                self.memory_watch.checkpoint("gameResult")
 
         elif data.get("type") == "act":
             # Print action info
@@ -150,7 +221,8 @@ class BasicGuandanClient:
 
 async def main():
     client = BasicGuandanClient("Test2")
-    await client.connect()
+    from communication.startup import run_client
+    await run_client(client, client.user_info)
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,13 +1,23 @@
 # -*- coding: utf-8 -*-
 import asyncio
+import os
 import websockets
 import json
 import random
+import sys
+
+# 同目录模块按脚本方式导入（以 src.communication.Test4 导入时目录不在路径中）
+_COMM_DIR = os.path.dirname(os.path.abspath(__file__))
+if _COMM_DIR not in sys.path:
+    sys.path.insert(0, _COMM_DIR)
+
+from recorder import GameRecorder
 
 class BasicGuandanClient:
     def __init__(self, user_info):
         self.user_info = user_info
         self.websocket = None
+        self.recorder = GameRecorder.from_env(user_info)
         self.game_state = {
             "handCards": [],
             "myPos": None,
@@ -17,9 +27,10 @@ class BasicGuandanClient:
         }
     
     async def connect(self):
-        uri = f"ws://127.0.0.1:23456/game/{self.user_info}"
+        port = os.environ.get("GD_SERVER_PORT", "23456")
+        uri = f"ws://127.0.0.1:{port}/game/{self.user_info}"
         try:
-            self.websocket = await websockets.connect(uri)
+            self.websocket = self.recorder.wrap(await websockets.connect(uri))
             print(f"[{self.user_info}] Connected successfully!")
             await self.handle_messages()
         except Exception as e:
@@ -100,8 +111,13 @@ class BasicGuandanClient:
         return random.randint(0, len(action_list) - 1)
 
 async def main():
+    seed = os.environ.get("GD_SEED")
+    random.seed(int(seed) if seed else None)
     client = BasicGuandanClient("Test4")
-    await client.connect()
+    try:
+        await client.connect()
+    finally:
+        client.recorder.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -7,10 +7,14 @@
 from random import randint
 import copy
 from utils import *
+import logging
 # from utils import combine_handcards,rest_cards,is_inStraight,choose_bomb,cal_bomb_num,getindex,rankone,ranktwo,rankthree,rankfour
 # from utils import one_hand
 from random import random
 
+# 调试输出走logging（默认不输出，也不格式化参数）
+logger = logging.getLogger(__name__)
+
 # 英文到中文的映射
 ENG2CH = {
     "Single": "单张",
@@ -148,7 +152,7 @@ class Action(object):
                 if curVal <= 10:
                     return index
                 else:
-                    print(index)
+                    logger.debug("index: %s", index)
                     if card_val[actionList[index][1]] == curVal+1:
                         return index
             else:
@@ -985,7 +989,7 @@ class Action(object):
         actIndex = 0
         if curAction[0]=="PASS":
             curAction = greaterAction
-        print(curAction)
+        logger.debug("curAction: %s", curAction)
         numofmy = numofplayers[myPos]
         if numofmy <= 10:
             numofnext = numofplayers[(myPos+1)%4]
@@ -1115,7 +1119,7 @@ class Action(object):
 
         sorted_cards,single_actionlist, pair_actionlist, trips_actionlist, threepair_actionlist,threetwo_actionlist, twotrips_actionlist, straight_actionlist = self.getlist(
             handcards, rank)
-        print(len(single_actionlist), len(pair_actionlist), len(trips_actionlist), len(threetwo_actionlist), len(threepair_actionlist), len(twotrips_actionlist), len(straight_actionlist))
+        logger.debug("list sizes: %d %d %d %d %d %d %d", len(single_actionlist), len(pair_actionlist), len(trips_actionlist), len(threetwo_actionlist), len(threepair_actionlist), len(twotrips_actionlist), len(straight_actionlist))
 
         max_val = card_value_s2v[restcards[-1][0][-1]]
 
@@ -1370,10 +1374,10 @@ class Action(object):
             numofplayers = [history['0']["remain"],history['1']["remain"],history['2']["remain"],history['3']["remain"]]
             numofnext = numofplayers[(mypos + 1) % 4]
             if numofnext != 0:
-                print("下家剩余牌数: {}".format(numofnext))
+                logger.debug("下家剩余牌数: %s", numofnext)
             else:
                 numofpre = numofplayers[(mypos - 1) % 4]
-                print("下家已出完，上家剩余牌数: {}".format(numofpre))
+                logger.debug("下家已出完，上家剩余牌数: %s", numofpre)
             # print(msg['curAction'])
             self.act = self.passive(self.action, msg["handCards"], msg["curRank"], msg['curAction'],msg["greaterAction"],mypos,
                                     msg["greaterPos"],remaincards, numofplayers,pass_num,my_pass_num,remain_cards_classbynum)
@@ -1388,7 +1392,7 @@ class Action(object):
                             history['3']["remain"]]
             numofnext = numofplayers[(mypos + 1) % 4]
             if numofnext != 0:
-                print("下家剩余牌数: {}".format(numofnext))
+                logger.debug("下家剩余牌数: %s", numofnext)
             else:
                 numofpre = numofplayers[(mypos - 1) % 4]
             self.act = self.active(self.action, msg["handCards"], msg["curRank"],numofplayers,mypos,remaincards)
@@ -7,10 +7,14 @@
 from random import randint
 import copy
 from utils import *
+import logging
 # from utils import combine_handcards,rest_cards,is_inStraight,choose_bomb,cal_bomb_num,getindex,rankone,ranktwo,rankthree,rankfour
 # from utils import one_hand
 from random import random
 
+# 调试输出走logging（默认不输出，也不格式化参数）
+logger = logging.getLogger(__name__)
+
 # 涓鑻辨枃瀵圭収琛
 ENG2CH = {
     "Single": "鍗曞紶",
@@ -144,7 +148,7 @@ class Action(object):
                 if curVal <= 10:
                     return index
                 else:
-                    print(index)
+                    logger.debug("index: %s", index)
                     if card_val[actionList[index][1]] == curVal+1:
                         return index
             else:
@@ -976,7 +980,7 @@ class Action(object):
         actIndex = 0
         if curAction[0]=="PASS":
             curAction = greaterAction
-        print(curAction)
+        logger.debug("curAction: %s", curAction)
         numofmy = numofplayers[myPos]
         if numofmy <= 10:
             numofnext = numofplayers[(myPos+1)%4]
@@ -1106,7 +1110,7 @@ class Action(object):
 
         sorted_cards,single_actionlist, pair_actionlist, trips_actionlist, threepair_actionlist,threetwo_actionlist, twotrips_actionlist, straight_actionlist = self.getlist(
             handcards, rank)
-        print(len(single_actionlist), len(pair_actionlist), len(trips_actionlist), len(threetwo_actionlist), len(threepair_actionlist), len(twotrips_actionlist), len(straight_actionlist))
+        logger.debug("list sizes: %d %d %d %d %d %d %d", len(single_actionlist), len(pair_actionlist), len(trips_actionlist), len(threetwo_actionlist), len(threepair_actionlist), len(twotrips_actionlist), len(straight_actionlist))
 
         max_val = card_value_s2v[restcards[-1][0][-1]]
 
@@ -1361,10 +1365,10 @@ class Action(object):
             numofplayers = [history['0']["remain"],history['1']["remain"],history['2']["remain"],history['3']["remain"]]
             numofnext = numofplayers[(mypos + 1) % 4]
             if numofnext != 0:
-                print("下家还剩{}张牌".format(numofnext))
+                logger.debug("下家还剩%s张牌", numofnext)
             else:
                 numofpre = numofplayers[(mypos - 1) % 4]
-                print("下家已完牌，上家还剩{}张牌".format(numofpre))
+                logger.debug("下家已完牌，上家还剩%s张牌", numofpre)
             # print(msg['curAction'])
             self.act = self.passive(self.action, msg["handCards"], msg["curRank"], msg['curAction'],msg["greaterAction"],mypos,
                                     msg["greaterPos"],remaincards, numofplayers,pass_num,my_pass_num,remain_cards_classbynum)
@@ -1379,7 +1383,7 @@ class Action(object):
                             history['3']["remain"]]
             numofnext = numofplayers[(mypos + 1) % 4]
             if numofnext != 0:
-                print("下家还剩{}张牌".format(numofnext))
+                logger.debug("下家还剩%s张牌", numofnext)
             else:
                 numofpre = numofplayers[(mypos - 1) % 4]
             self.act = self.active(self.action, msg["handCards"], msg["curRank"],numofplayers,mypos,remaincards)
@@ -3,6 +3,8 @@
 # 閫傞厤绂荤嚎骞冲彴锛堢鍙23456锛孶RL鏍煎紡/game/client4锛
 
 import json
+import os
+import random
 import sys
 from pathlib import Path
 from ws4py.client.threadedclient import WebSocketClient
@@ -63,7 +65,10 @@ class FirstPrizeClient4(WebSocketClient):
 if __name__ == '__main__':
     try:
         # 绂荤嚎骞冲彴閰嶇疆锛堢鍙23456锛孶RL鏍煎紡/game/client4锛
-        ws = FirstPrizeClient4('ws://127.0.0.1:23456/game/client4')
+        seed = os.environ.get('GD_SEED')
+        random.seed(int(seed) if seed else None)
+        port = os.environ.get('GD_SERVER_PORT', '23456')
+        ws = FirstPrizeClient4(f'ws://127.0.0.1:{port}/game/client4')
         ws.connect()
         ws.run_forever()
     except KeyboardInterrupt:
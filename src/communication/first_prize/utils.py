@@ -1,8 +1,14 @@
 import copy
+import logging
+
+# 调试输出走logging（默认不输出，也不格式化参数）
+_logger = logging.getLogger(__name__)
+
+
 def is_inStraight(action, straight_member):
 
     flag = 0
-    print(straight_member)
+    _logger.debug("straight_member: %s", straight_member)
     if len(straight_member) != 0:
         for card in action[2]:
             if card in straight_member:
@@ -277,7 +283,7 @@ def rest_cards(handcards,remaincards,rank):
                 rest_cards.append(key + val)
                 rest_cards.append(key + val)
     if len(rest_cards)==0:
-        print(rest_cards)
+        _logger.debug("rest_cards: %s", rest_cards)
     card_value_s2v[str(rank)] = 15
     rest_cards = sorted(rest_cards,key = lambda item:card_value_s2v[item[1]])
     new_rest_cards = []
@@ -564,7 +570,7 @@ def getindex(tag, actList, actionList):
     my_act.append(myaction)
     my_act.append(mynumber)
     my_act.append(mycard)
-    print(my_act)
+    _logger.debug("my_act: %s", my_act)
     if my_act in actionList:
         return actionList.index(my_act)
     else:
@@ -582,7 +588,7 @@ def getindex1(tag, actList, actionList):
     my_act.append(myaction)
     my_act.append(mynumber)
     my_act.append(mycard)
-    print(my_act)
+    _logger.debug("my_act: %s", my_act)
     if my_act in actionList:
         return actionList.index(my_act)
     else:
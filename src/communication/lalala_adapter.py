@@ -1,48 +1,104 @@
 """
 适配器：将lalala的决策逻辑移植到websockets客户端
 """
+import time
+_STARTED_AT = time.perf_counter()
+
 import asyncio
-import websockets
 import json
 import ast
 import sys
 import os
 
-# 添加lalala目录到路径
+# 同目录模块按脚本方式导入（以 src.communication.lalala_adapter 导入时目录不在路径中）
+_COMM_DIR = os.path.dirname(os.path.abspath(__file__))
+if _COMM_DIR not in sys.path:
+    sys.path.insert(0, _COMM_DIR)
+
+from recorder import GameRecorder
+from startup import BackgroundLoader, StartupProfile, run_client, server_uri
+
+# lalala目录（在后台加载时才加入路径，见_load_lalala）
 LALALA_PATH = r"D:\NYGD\lalala"
-if LALALA_PATH not in sys.path:
-    sys.path.insert(0, LALALA_PATH)
 
-# 导入lalala的核心逻辑
-try:
-    from state import State
-    from action import Action
-    print("✓ 成功导入lalala核心模块")
-except ImportError as e:
-    print(f"✗ 导入lalala模块失败: {e}")
-    print(f"请确保 {LALALA_PATH} 存在且包含state.py和action.py")
-    sys.exit(1)
+
+def _load_lalala():
+    """
+    导入lalala的核心逻辑
+    
+    Returns:
+        (State, Action) 类
+    """
+    if LALALA_PATH not in sys.path:
+        sys.path.insert(0, LALALA_PATH)
+    try:
+        from state import State
+        from action import Action
+        print("✓ 成功导入lalala核心模块")
+    except ImportError as e:
+        print(f"✗ 导入lalala模块失败: {e}")
+        print(f"请确保 {LALALA_PATH} 存在且包含state.py和action.py")
+        raise
+    return State, Action
 
 
 class LalalaWebsocketsClient:
     """使用websockets库的lalala客户端"""
     
-    def __init__(self, user_info):
+    def __init__(self, user_info, startup=None):
         self.user_info = user_info
         self.websocket = None
+        self.startup = startup or StartupProfile.from_env(user_info, _STARTED_AT)
+        self.recorder = GameRecorder.from_env(user_info)
         
-        # 使用lalala的State和Action
-        self.state = State(user_info)
-        self.action = Action(user_info)
+        # 使用lalala的State和Action（后台加载，与连接服务器并行）
+        self._loader = BackgroundLoader(
+            self._create_state_action,
+            name=f"{user_info}-lalala",
+            on_ready=lambda _: self.startup.mark("engine_ready")
+        ).start()
+    
+    def _create_state_action(self):
+        State, Action = _load_lalala()
+        return State(self.user_info), Action(self.user_info)
+    
+    @property
+    def state(self):
+        return self._loader.result()[0]
+    
+    @property
+    def action(self):
+        return self._loader.result()[1]
+    
+    async def wait_ready(self):
+        """等待lalala模块加载完成（不阻塞事件循环）"""
+        if not self._loader.done():
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._loader.result)
+            except ImportError:
+                sys.exit(1)
+            print(self.startup.report())
+            self.startup.finish()
     
     async def connect(self):
-        uri = f"ws://127.0.0.1:23456/game/{self.user_info}"
+        import websockets
+        
+        uri = server_uri(self.user_info)
         try:
-            self.websocket = await websockets.connect(uri)
-            print(f"[{self.user_info}] 连接成功!")
+            self.websocket = self.recorder.wrap(await websockets.connect(uri))
+            elapsed = self.startup.mark("connected")
+            self.startup.check_budget("connected")
+            self.startup.notify_ready("connected")
+            print(f"[{self.user_info}] 连接成功! ({elapsed:.2f}s)")
+            if self._loader.done():
+                print(self.startup.report())
+                self.startup.finish()
             await self.handle_messages()
+            return True
         except Exception as e:
             print(f"[{self.user_info}] 连接错误: {e}")
+            return False
     
     def convert_card_format(self, data):
         """
@@ -145,6 +201,9 @@ class LalalaWebsocketsClient:
         return data
     
     async def handle_messages(self):
+        import websockets
+        
+        await self.wait_ready()
         try:
             async for message in self.websocket:
                 try:
@@ -211,6 +270,15 @@ class LalalaWebsocketsClient:
             traceback.print_exc()
         finally:
             print(f"[{self.user_info}] 断开连接")
+    
+    def reset_game(self):
+        """重置每局状态（常驻客户端，见 startup.run_client）：重新创建State和Action"""
+        if self._loader.done():
+            self._loader = BackgroundLoader(self._create_state_action, name=f"{self.user_info}-lalala").start()
+    
+    def close(self):
+        """写完对局记录（lalala没有需要释放的资源）"""
+        self.recorder.close()
 
 
 def run_lalala_client(client_name: str):
@@ -223,7 +291,7 @@ def run_lalala_client(client_name: str):
     print(f"[{client_name}] 启动lalala客户端（websockets版本）")
     
     client = LalalaWebsocketsClient(client_name)
-    asyncio.run(client.connect())
+    asyncio.run(run_client(client, client_name))
 
 
 if __name__ == "__main__":
@@ -16,6 +16,8 @@ import os
 from typing import Union, List, Dict, Optional
 import copy
 
+from decision import tuned_weights
+
 # 添加lalala目录到路径（使用原版lalala的底层模块）
 LALALA_PATH = r"D:\NYGD\lalala"
 if LALALA_PATH not in sys.path:
@@ -51,6 +53,8 @@ class YFAdapter:
         self.yf_state = None
         self.yf_action = None
         self.logger = logging.getLogger(f"YFAdapter-P{player_id}")
+        # Candidate scoring bonuses (defaults and GD_WEIGHTS overrides, see decision/tuned_weights.py)
+        self.score_bonuses = tuned_weights.section("yf")
         
         # 初始化YF的State和Action
         self._initialize_yf_state()
@@ -115,10 +119,11 @@ class YFAdapter:
             # 按评分排序（降序）
             candidates.sort(key=lambda x: x[1], reverse=True)
             
-            self.logger.debug(
-                f"YF generated {len(candidates)} candidate(s): "
-                f"{[(idx, f'{score:.1f}') for idx, score in candidates]}"
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "YF generated %d candidate(s): %s",
+                    len(candidates), [(idx, f'{score:.1f}') for idx, score in candidates]
+                )
             return candidates
             
         except Exception as e:
@@ -148,7 +153,7 @@ class YFAdapter:
             # 转换手牌格式
             if "handCards" in message:
                 message["handCards"] = self._convert_cards(message["handCards"])
-                self.logger.debug(f"Converted handCards: {len(message['handCards'])} cards")
+                self.logger.debug("Converted handCards: %d cards", len(message['handCards']))
             
             # 转换当前动作
             if "curAction" in message and isinstance(message["curAction"], list):
@@ -444,13 +449,13 @@ class YFAdapter:
             action_list_len = len(action_list)
             public_info = message.get("publicInfo", [])
             
-            # 使用INFO级别确保日志可见
-            self.logger.info(
-                f"[YF-P{self.player_id}] Decision context: "
-                f"myPos={my_pos}, curPos={cur_pos}, greaterPos={greater_pos}, "
-                f"teammate={(my_pos+2)%4 if my_pos is not None else None}, "
-                f"curAction={cur_action[0] if cur_action else 'None'}, "
-                f"actionList_size={action_list_len}"
+            # 热路径日志：DEBUG级别 + 惰性格式化
+            self.logger.debug(
+                "[YF-P%s] Decision context: myPos=%s, curPos=%s, greaterPos=%s, "
+                "teammate=%s, curAction=%s, actionList_size=%d",
+                self.player_id, my_pos, cur_pos, greater_pos,
+                (my_pos + 2) % 4 if my_pos is not None else None,
+                cur_action[0] if cur_action else 'None', action_list_len
             )
             
             act_index = self.yf_action.rule_parse(
@@ -464,10 +469,12 @@ class YFAdapter:
                 self.yf_state.tribute_result
             )
             
-            self.logger.info(
-                f"[YF-P{self.player_id}] Decided: action_index={act_index}, "
-                f"action={action_list[act_index] if 0 <= act_index < action_list_len else 'INVALID'}"
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "[YF-P%s] Decided: action_index=%s, action=%s",
+                    self.player_id, act_index,
+                    action_list[act_index] if 0 <= act_index < action_list_len else 'INVALID'
+                )
             
             # 检测过于保守的决策，触发Layer 2/3
             if act_index == 0 and len(action_list) > 1:  # 选择了PASS且有其他选择
@@ -525,11 +532,11 @@ class YFAdapter:
         
         Task 2.2: 为 YF 返回的动作添加基础评分
         
-        Scoring factors:
+        Scoring factors (defaults shown, tunable via self.score_bonuses):
         - Base score: 100.0 for YF's primary choice
         - Action type bonus: +10 for non-PASS actions
         - Card value bonus: +5-15 based on card rank
-        - Situation bonus: +5-20 based on game situation
+        - Situation bonus: +10-20 based on game situation
         
         Args:
             action_idx: Action index to score
@@ -539,7 +546,8 @@ class YFAdapter:
         Returns:
             Score for the action (higher is better)
         """
-        base_score = 100.0
+        bonuses = self.score_bonuses
+        base_score = bonuses["base"]
         action_list = message.get("actionList", [])
         
         if not action_list or action_idx >= len(action_list):
@@ -557,21 +565,21 @@ class YFAdapter:
         
         # Factor 1: Action type bonus
         if action_type != "PASS":
-            score += 10.0  # Non-PASS actions get bonus
+            score += bonuses["non_pass"]  # Non-PASS actions get bonus
         else:
             # PASS gets lower score (but still valid)
-            score -= 5.0
+            score += bonuses["pass"]
         
         # Factor 2: Card value bonus
         if action_type != "PASS" and cards != "PASS":
             # Higher rank cards get bonus
             rank_value = self._get_rank_value(rank)
             if rank_value >= 14:  # A, 2, B, R
-                score += 15.0
+                score += bonuses["high_rank"]
             elif rank_value >= 11:  # J, Q, K
-                score += 10.0
+                score += bonuses["face_rank"]
             elif rank_value >= 7:  # 7-10
-                score += 5.0
+                score += bonuses["mid_rank"]
         
         # Factor 3: Situation bonus
         public_info = message.get("publicInfo", [])
@@ -596,9 +604,9 @@ class YFAdapter:
                 )
                 
                 if opponent_min <= 5:
-                    score += 20.0  # 紧急情况，积极出牌
+                    score += bonuses["opponent_urgent"]  # 紧急情况，积极出牌
                 elif opponent_min <= 10:
-                    score += 10.0  # 对手牌不多，适度积极
+                    score += bonuses["opponent_close"]  # 对手牌不多，适度积极
         
         return score
     
@@ -659,7 +667,7 @@ class YFAdapter:
             # 为每个动作评分（使用较低的基准分）
             score = self._score_yf_action(idx, message, converted_message)
             # 降低非主要选择的评分（相对于主要选择）
-            score = score * 0.7  # 主要选择的70%
+            score = score * self.score_bonuses["additional_ratio"]  # 主要选择的70%（默认）
             
             evaluated.append((idx, score))
         
@@ -749,10 +757,7 @@ class YFAdapter:
             if not self._validate_state():
                 self.logger.warning("State validation failed after update")
             
-            self.logger.debug(
-                f"State updated: stage={message.get('stage')}, "
-                f"type={message.get('type')}"
-            )
+            self.logger.debug("State updated: stage=%s, type=%s", message.get('stage'), message.get('type'))
             
         except Exception as e:
             self.logger.error(f"Failed to update YF state: {e}", exc_info=True)
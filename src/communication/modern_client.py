@@ -11,6 +11,8 @@ if str(Path(__file__).parent.parent) not in sys.path:
 
 from game_logic.enhanced_state import EnhancedGameStateManager
 from decision.decision_engine import DecisionEngine
+from communication.recorder import GameRecorder
+from decision.decision_profiler import DecisionProfiler
 
 class ModernGuandanClient:
     def __init__(self, user_info, server_url=None):
@@ -21,12 +23,14 @@ class ModernGuandanClient:
         # Initialize advanced components
         self.state_manager = EnhancedGameStateManager()
         self.decision_engine = DecisionEngine(self.state_manager)
+        self.recorder = GameRecorder.from_env(user_info)
+        self.profiler = DecisionProfiler.from_env(user_info, layer="DecisionEngine")
         
     async def connect(self):
         try:
             print(f"[{self.user_info}] Connecting to {self.server_url}...")
             async with websockets.connect(self.server_url) as websocket:
-                self.websocket = websocket
+                self.websocket = self.recorder.wrap(websocket)
                 print(f"[{self.user_info}] Connected successfully!")
                 await self.handle_messages()
         except Exception as e:
@@ -44,7 +48,8 @@ class ModernGuandanClient:
                     
                     # Handle action request
                     if data.get("type") == "act":
-                        act_index = self.decision_engine.decide(data)
+                        with self.profiler:
+                            act_index = self.decision_engine.decide(data)
                         response = json.dumps({"actIndex": act_index})
                         await self.websocket.send(response)
                         print(f"[{self.user_info}] Sent action index: {act_index}")
@@ -67,7 +72,11 @@ async def main():
     args = parser.parse_args()
     
     client = ModernGuandanClient(args.user, args.url)
-    await client.connect()
+    try:
+        await client.connect()
+    finally:
+        client.recorder.close()
+        client.profiler.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
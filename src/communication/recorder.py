@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+对局消息记录 (Game Recorder)
+功能：
+- 记录客户端收到和发出的全部websocket消息（notify / act / actIndex）
+- 热路径只把 (方向, 时间, 原始消息) 放入队列，编码、压缩、写文件在后台线程完成
+- 按小局（episodeOver）、局（gameResult）或定时批量写入一个压缩块
+- 块头带局号/小局号和长度，读取时只扫描块头即可按局定位，无需解压整个文件
+
+环境变量：
+- GD_RECORD_DIR=path      记录目录（不设置则不记录）
+- GD_RECORD_CODEC=gzip    压缩方式 zstd / gzip（默认：安装了zstandard时用zstd，否则gzip）
+
+文件格式（每个客户端进程写若干段文件 {name}_{时间}_{pid}_{序号}.gdr）：
+    文件头  FILE_MAGIC
+    数据块  BLOCK_HEADER(标记, 压缩方式, 局号, 小局号, 消息数, 压缩后长度) + 压缩数据
+    压缩数据解压后为连续的 RECORD_HEADER(方向, 时间戳, 长度) + UTF-8消息
+
+查看记录：
+    python -m communication.recorder recordings/            # 索引统计
+    python -m communication.recorder recordings/ --game 3 --dump
+"""
+
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+logger = logging.getLogger("recorder")
+
+FILE_MAGIC = b"GDREC1\n"
+BLOCK_MARKER = b"GB"
+BLOCK_HEADER = struct.Struct("<2sBxIIII")  # 标记, 压缩方式, 局号, 小局号, 消息数, 压缩后长度
+RECORD_HEADER = struct.Struct("<BdI")  # 方向, 时间戳, 消息长度
+SEGMENT_SUFFIX = ".gdr"
+
+RECEIVED = 0
+SENT = 1
+DIRECTIONS = {RECEIVED: "recv", SENT: "send"}
+
+CODECS = {"gzip": 0, "zstd": 1}
+CODEC_NAMES = {code: name for name, code in CODECS.items()}
+
+# 每段文件的大小上限（超过后换新文件）
+SEGMENT_BYTES = 64 * 1024 * 1024
+# 未写入的消息最长滞留时间（秒），进程崩溃时最多丢失这段时间的记录
+FLUSH_INTERVAL = 5.0
+# 单个块最多包含的消息数
+BLOCK_RECORDS = 4096
+
+# 新连接标记：写完当前块，不同连接的消息不混在一个块里
+_SESSION = object()
+
+
+def default_codec() -> str:
+    """安装了zstandard时用zstd，否则用gzip"""
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return "gzip"
+    return "zstd"
+
+
+def _compressor(codec: str) -> Callable[[bytes], bytes]:
+    if codec == "zstd":
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress
+    return lambda data: gzip.compress(data, compresslevel=6)
+
+
+def _decompress(code: int, data: bytes) -> bytes:
+    if code == CODECS["zstd"]:
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("该记录使用zstd压缩，读取需要安装 zstandard") from None
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RecordingWebSocket:
+    """
+    websocket代理：收发消息时写入记录器，其他属性透传
+
+    支持客户端用到的 async for / recv() / send() / close()。
+    """
+
+    def __init__(self, websocket, recorder: "GameRecorder"):
+        self._websocket = websocket
+        self._recorder = recorder
+
+    def __getattr__(self, name):
+        return getattr(self._websocket, name)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        async for message in self._websocket:
+            self._recorder.received(message)
+            yield message
+
+    async def recv(self):
+        message = await self._websocket.recv()
+        self._recorder.received(message)
+        return message
+
+    async def send(self, message):
+        self._recorder.sent(message)
+        await self._websocket.send(message)
+
+
+class GameRecorder:
+    """
+    对局消息记录器（后台线程批量压缩写入）
+
+    用法：
+        recorder = GameRecorder.from_env("yf1_v4")
+        websocket = recorder.wrap(await websockets.connect(uri))
+        ...
+        recorder.close()
+    """
+
+    def __init__(self, directory: Optional[str], name: str, codec: Optional[str] = None,
+                 segment_bytes: int = SEGMENT_BYTES, flush_interval: float = FLUSH_INTERVAL,
+                 block_records: int = BLOCK_RECORDS):
+        """
+        初始化记录器
+
+        Args:
+            directory: 记录目录，None表示不记录（wrap()原样返回websocket）
+            name: 客户端名称（段文件名前缀）
+            codec: "zstd" / "gzip"，None表示自动选择
+            segment_bytes: 每段文件的大小上限
+            flush_interval: 未写入消息的最长滞留时间（秒）
+            block_records: 单个块最多包含的消息数
+        """
+        self.directory = directory
+        self.name = name
+        self.enabled = bool(directory)
+        self.codec = codec or default_codec()
+        if self.codec not in CODECS:
+            raise ValueError(f"不支持的压缩方式: {self.codec}，可选: {', '.join(CODECS)}")
+        self.segment_bytes = segment_bytes
+        self.flush_interval = flush_interval
+        self.block_records = block_records
+
+        self.recording_id = f"{name}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self.game = 0
+        self.episode = 0
+        self.messages = 0
+        self.blocks = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+
+        self._file = None
+        self._segment = 0
+        self._thread = None
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+            self._compress = _compressor(self.codec)
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name=f"{name}-recorder", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_env(cls, name: str) -> "GameRecorder":
+        """根据 GD_RECORD_DIR / GD_RECORD_CODEC 创建记录器"""
+        return cls(os.environ.get("GD_RECORD_DIR") or None, name, os.environ.get("GD_RECORD_CODEC") or None)
+
+    def wrap(self, websocket):
+        """
+        包装新建立的连接（每次连接调用一次）
+
+        Returns:
+            记录收发消息的代理；未启用记录时返回原websocket
+        """
+        if not self.enabled:
+            return websocket
+        self._queue.put(_SESSION)
+        return RecordingWebSocket(websocket, self)
+
+    def received(self, message):
+        """记录收到的消息（任意线程）"""
+        if self.enabled:
+            self._queue.put((RECEIVED, time.time(), message))
+
+    def sent(self, message):
+        """记录发出的消息（任意线程）"""
+        if self.enabled:
+            self._queue.put((SENT, time.time(), message))
+
+    def close(self):
+        """写完队列中剩余的消息并关闭文件"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def get_summary(self) -> dict:
+        """记录统计"""
+        return {
+            "recording": self.recording_id,
+            "codec": self.codec,
+            "messages": self.messages,
+            "games": self.game,
+            "blocks": self.blocks,
+            "raw_bytes": self.raw_bytes,
+            "written_bytes": self.written_bytes,
+        }
+
+    def _run(self):
+        parts: List[bytes] = []
+        count = 0
+        deadline = 0.0
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if count else None
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    count = self._write_block(parts, count)
+                    continue
+                if item is None:
+                    break
+                if item is _SESSION:
+                    count = self._write_block(parts, count)
+                    continue
+
+                direction, ts, message = item
+                data = message.encode("utf-8") if isinstance(message, str) else bytes(message)
+                parts.append(RECORD_HEADER.pack(direction, ts, len(data)))
+                parts.append(data)
+                count += 1
+                if count == 1:
+                    deadline = time.monotonic() + self.flush_interval
+
+                # 只在后台线程做子串判断，不解析JSON
+                if direction == RECEIVED and b"episodeOver" in data:
+                    count = self._write_block(parts, count)
+                    self.episode += 1
+                elif direction == RECEIVED and b"gameResult" in data:
+                    count = self._write_block(parts, count)
+                    self.game += 1
+                    self.episode = 0
+                elif count >= self.block_records:
+                    count = self._write_block(parts, count)
+            self._write_block(parts, count)
+        except Exception as e:
+            logger.error("[%s] recorder stopped: %s", self.name, e)
+            self.enabled = False
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _write_block(self, parts: List[bytes], count: int) -> int:
+        """压缩并写入一个块，返回新的待写消息数（0）"""
+        if not count:
+            return 0
+        payload = b"".join(parts)
+        parts.clear()
+        compressed = self._compress(payload)
+        if self._file is None or self._file.tell() >= self.segment_bytes:
+            self._open_segment()
+        self._file.write(BLOCK_HEADER.pack(
+            BLOCK_MARKER, CODECS[self.codec], self.game, self.episode, count, len(compressed)
+        ))
+        self._file.write(compressed)
+        self._file.flush()
+
+        self.messages += count
+        self.blocks += 1
+        self.raw_bytes += len(payload)
+        self.written_bytes += BLOCK_HEADER.size + len(compressed)
+        return 0
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        self._segment += 1
+        path = os.path.join(self.directory, f"{self.recording_id}_{self._segment:04d}{SEGMENT_SUFFIX}")
+        self._file = open(path, "wb")
+        self._file.write(FILE_MAGIC)
+
+
+# ==================== 读取 ====================
+
+@dataclass
+class BlockInfo:
+    """块索引（读取块头得到，不解压）"""
+    path: str
+    offset: int  # 压缩数据在文件中的位置
+    recording: str
+    codec: int
+    game: int
+    episode: int
+    count: int
+    length: int
+
+
+@dataclass
+class RecordedMessage:
+    """一条记录的消息"""
+    recording: str
+    game: int
+    episode: int
+    direction: str  # "recv" / "send"
+    ts: float
+    text: str
+
+    def data(self) -> dict:
+        """解析消息JSON"""
+        return json.loads(self.text)
+
+
+def recording_of(path: str) -> str:
+    """段文件路径 → 记录ID（去掉目录、段序号和后缀）"""
+    stem = os.path.basename(path)[:-len(SEGMENT_SUFFIX)]
+    return stem.rsplit("_", 1)[0]
+
+
+def list_segments(path: str, name: Optional[str] = None) -> List[str]:
+    """
+    列出段文件（按记录ID、段序号排序）
+
+    Args:
+        path: 段文件或记录目录
+        name: 只列出该客户端的记录
+    """
+    if os.path.isfile(path):
+        return [path]
+    pattern = f"{name}_*{SEGMENT_SUFFIX}" if name else f"*{SEGMENT_SUFFIX}"
+    return sorted(glob.glob(os.path.join(path, pattern)))
+
+
+def read_index(segments: List[str]) -> List[BlockInfo]:
+    """
+    扫描块头建立索引（跳过压缩数据，不解压）
+
+    Raises:
+        ValueError: 文件不是对局记录
+    """
+    index = []
+    for path in segments:
+        recording = recording_of(path)
+        with open(path, "rb") as f:
+            if f.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise ValueError(f"不是对局记录文件: {path}")
+            while True:
+                header = f.read(BLOCK_HEADER.size)
+                if len(header) < BLOCK_HEADER.size:
+                    break  # 文件结束（或写入中断留下的残块）
+                marker, codec, game, episode, count, length = BLOCK_HEADER.unpack(header)
+                if marker != BLOCK_MARKER:
+                    logger.warning("corrupt block header in %s at %d", path, f.tell() - BLOCK_HEADER.size)
+                    break
+                offset = f.tell()
+                f.seek(length, os.SEEK_CUR)
+                if f.tell() > os.fstat(f.fileno()).st_size:
+                    break
+                index.append(BlockInfo(path, offset, recording, codec, game, episode, count, length))
+    return index
+
+
+def read_block(block: BlockInfo) -> List[RecordedMessage]:
+    """解压一个块"""
+    with open(block.path, "rb") as f:
+        f.seek(block.offset)
+        payload = _decompress(block.codec, f.read(block.length))
+    messages = []
+    position = 0
+    for _ in range(block.count):
+        direction, ts, length = RECORD_HEADER.unpack_from(payload, position)
+        position += RECORD_HEADER.size
+        text = payload[position:position + length].decode("utf-8")
+        position += length
+        messages.append(RecordedMessage(block.recording, block.game, block.episode, DIRECTIONS[direction], ts, text))
+    return messages
+
+
+def iter_messages(path: str, name: Optional[str] = None, game: Optional[int] = None,
+                  episode: Optional[int] = None) -> Iterator[RecordedMessage]:
+    """
+    按时间顺序读取记录的消息（只解压匹配的块）
+
+    Args:
+        path: 段文件或记录目录
+        name: 只读取该客户端的记录
+        game: 只读取该局
+        episode: 只读取该小局
+    """
+    for block in read_index(list_segments(path, name)):
+        if game is not None and block.game != game:
+            continue
+        if episode is not None and block.episode != episode:
+            continue
+        yield from read_block(block)
+
+
+def main():
+    """打印记录索引统计，或按局导出消息"""
+    import argparse
+    parser = argparse.ArgumentParser(description="对局消息记录查看")
+    parser.add_argument("path", help="段文件或记录目录")
+    parser.add_argument("--name", default=None, help="只查看该客户端的记录")
+    parser.add_argument("--game", type=int, default=None, help="只查看该局")
+    parser.add_argument("--episode", type=int, default=None, help="只查看该小局")
+    parser.add_argument("--dump", action="store_true", help="输出消息（每行一条JSON）")
+    args = parser.parse_args()
+
+    if args.dump:
+        for message in iter_messages(args.path, args.name, args.game, args.episode):
+            print(json.dumps({
+                "recording": message.recording, "game": message.game, "episode": message.episode,
+                "direction": message.direction, "ts": message.ts, "message": message.text,
+            }, ensure_ascii=False))
+        return
+
+    summary: Dict[str, Dict] = {}
+    for block in read_index(list_segments(args.path, args.name)):
+        item = summary.setdefault(block.recording, {"games": set(), "episodes": set(), "messages": 0, "bytes": 0})
+        item["games"].add(block.game)
+        item["episodes"].add((block.game, block.episode))
+        item["messages"] += block.count
+        item["bytes"] += BLOCK_HEADER.size + block.length
+    print(f"{'记录':<40} | {'局数':>5} | {'小局':>5} | {'消息':>8} | 压缩后")
+    for recording, item in summary.items():
+        print(
+            f"{recording:<40} | {len(item['games']):>5} | {len(item['episodes']):>5} | "
+            f"{item['messages']:>8} | {item['bytes'] / 1024:.1f} KB"
+        )
+
+
+if __name__ == "__main__":
+    main()
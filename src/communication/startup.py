@@ -0,0 +1,681 @@
+# -*- coding: utf-8 -*-
+"""
+Client Startup Helpers
+客户端启动辅助模块
+
+核心功能：
+1. 导入耗时分析（类似 python -X importtime，按模块统计自身/累计耗时）
+2. 启动时间预算（连接就绪超出预算时告警）
+3. 后台加载重型模块（决策引擎、知识库等），与连接服务器并行进行
+4. 常驻客户端：由批量执行器通过stdin下发命令，服务器重启后断线重连
+
+环境变量（由批量执行器启动的客户端进程会继承）：
+- GD_PROFILE_IMPORTS=1   开启导入耗时分析，客户端就绪后输出报告
+- GD_STARTUP_BUDGET=2.0  启动时间预算（秒），从进程启动到连接成功
+- GD_READY_FILE=path     连接成功后写入该文件，通知批量执行器可以启动下一个客户端
+- GD_SERVER_PORT=23456   服务器websocket端口（并行运行多组对局时每组不同）
+- GD_SUPERVISED=1        常驻模式：从stdin读取 connect / reset / stop 命令
+- GD_RECORD_DIR=path     记录收发的全部消息（见 recorder.py）
+- GD_LEARNED_MODEL=path  V4客户端启用学习型候选层，加载该模型文件（见 decision/learned_evaluator.py）
+- GD_PROFILE_DIR=path    决策采样分析，输出按层汇总的调用栈（见 decision/decision_profiler.py）
+- GD_MEMORY_STATS=path   每局结束时把内存检查点（RSS、分配增长最多的位置）追加到该JSON-lines文件
+- GD_MEMORY_TRACE=N      开启tracemalloc（每个分配记录N层调用栈），检查点之间比较快照
+- GD_MEMORY_WARN_MB=MB   RSS超过该值时告警
+- GD_MEMORY_RECYCLE_MB=MB RSS超过该值时，常驻客户端在本次会话结束后退出，由批量执行器重新创建
+"""
+
+import asyncio
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+DEFAULT_STARTUP_BUDGET = 2.0
+DEFAULT_SERVER_PORT = 23456
+
+logger = logging.getLogger("startup")
+
+
+def server_uri(user_info: str, host: str = "127.0.0.1") -> str:
+    """Websocket URI of the game server (port taken from GD_SERVER_PORT)."""
+    port = os.environ.get("GD_SERVER_PORT") or DEFAULT_SERVER_PORT
+    return f"ws://{host}:{port}/game/{user_info}"
+
+
+class _TimingLoader(importlib.abc.Loader):
+    """Loader proxy that times exec_module() of the wrapped loader."""
+
+    def __init__(self, loader, fullname: str, profiler: "ImportProfiler"):
+        self._loader = loader
+        self._fullname = fullname
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter(self._fullname)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._fullname)
+
+    def __getattr__(self, name):
+        # get_data / is_package / get_resource_reader 等全部透传
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps the loader found by the remaining finders."""
+
+    def __init__(self, profiler: "ImportProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader, fullname, self._profiler)
+            return spec
+        return None
+
+
+class ImportProfiler:
+    """
+    Per-module import timing, in the spirit of ``python -X importtime``.
+
+    Records self and cumulative time (microseconds) of every module first
+    imported while installed. Nested imports are attributed per thread, so
+    modules loaded by a BackgroundLoader are measured correctly.
+    """
+
+    def __init__(self):
+        self.records: List[Dict] = []
+        self._finder = _TimingFinder(self)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Start recording imports."""
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        """Stop recording imports."""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    def _enter(self, fullname: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # [name, start, child_time]
+        stack.append([fullname, time.perf_counter(), 0.0])
+
+    def _exit(self, fullname: str):
+        stack = self._local.stack
+        name, start, child_time = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.records.append({
+                "module": name,
+                "self_us": int((cumulative - child_time) * 1e6),
+                "cumulative_us": int(cumulative * 1e6),
+                "depth": len(stack),
+                "thread": threading.current_thread().name,
+            })
+
+    def total_us(self) -> int:
+        """Total time spent in top-level imports."""
+        return sum(r["cumulative_us"] for r in self.records if r["depth"] == 0)
+
+    def report(self, top: int = 20) -> str:
+        """
+        Format the slowest imports as a table.
+
+        Args:
+            top: Number of modules to show (sorted by cumulative time)
+
+        Returns:
+            Report text
+        """
+        rows = sorted(self.records, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+        lines = [
+            f"Import time report: {len(self.records)} modules, "
+            f"total {self.total_us() / 1000:.1f} ms",
+            f"{'self [us]':>10} | {'cumulative':>10} | module",
+        ]
+        for r in rows:
+            lines.append(
+                f"{r['self_us']:>10} | {r['cumulative_us']:>10} | "
+                f"{'  ' * r['depth']}{r['module']} ({r['thread']})"
+            )
+        return "\n".join(lines)
+
+
+class StartupProfile:
+    """
+    Startup milestones and time budget for a client process.
+
+    Milestones are measured from ``started_at`` (the entry script should pass
+    the ``time.perf_counter()`` value taken on its first line).
+    """
+
+    def __init__(self, name: str, started_at: Optional[float] = None,
+                 budget: float = DEFAULT_STARTUP_BUDGET, profile_imports: bool = False):
+        """
+        Args:
+            name: Client name used in log lines
+            started_at: perf_counter() value at process start
+            budget: Target seconds from start to "connected"
+            profile_imports: Whether to record per-module import timings
+        """
+        self.name = name
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.budget = budget
+        self.milestones: Dict[str, float] = {}
+        self.import_profiler = ImportProfiler() if profile_imports else None
+        if self.import_profiler:
+            self.import_profiler.install()
+
+    @classmethod
+    def from_env(cls, name: str, started_at: Optional[float] = None) -> "StartupProfile":
+        """Create a profile configured from GD_PROFILE_IMPORTS / GD_STARTUP_BUDGET."""
+        try:
+            budget = float(os.environ.get("GD_STARTUP_BUDGET", DEFAULT_STARTUP_BUDGET))
+        except ValueError:
+            budget = DEFAULT_STARTUP_BUDGET
+        profile_imports = os.environ.get("GD_PROFILE_IMPORTS", "") not in ("", "0")
+        return cls(name, started_at, budget, profile_imports)
+
+    def mark(self, event: str) -> float:
+        """
+        Record a milestone.
+
+        Returns:
+            Seconds since process start
+        """
+        elapsed = time.perf_counter() - self.started_at
+        self.milestones.setdefault(event, elapsed)
+        return elapsed
+
+    def check_budget(self, event: str = "connected") -> bool:
+        """
+        Check that a milestone was reached within the budget.
+
+        Returns:
+            True if within budget (or milestone not reached yet)
+        """
+        elapsed = self.milestones.get(event)
+        if elapsed is None:
+            return True
+        if elapsed > self.budget:
+            logger.warning(
+                "[%s] startup budget exceeded: %s after %.3fs (budget %.2fs)",
+                self.name, event, elapsed, self.budget
+            )
+            return False
+        return True
+
+    def notify_ready(self, event: str = "connected") -> bool:
+        """
+        Signal readiness to the launcher by writing GD_READY_FILE.
+
+        The file is written to a temporary name and renamed, so the launcher
+        never observes a partially written file.
+
+        Returns:
+            True if a ready file was written
+        """
+        path = os.environ.get("GD_READY_FILE")
+        if not path:
+            return False
+        elapsed = self.milestones.get(event, self.mark(event))
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(f"{os.getpid()} {event} {elapsed:.3f}\n")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("[%s] could not write ready file %s: %s", self.name, path, e)
+            return False
+        return True
+
+    def report(self, top: int = 20) -> str:
+        """Format milestones (and the import table when profiling)."""
+        lines = [f"[{self.name}] Startup report (budget {self.budget:.2f}s):"]
+        for event, elapsed in sorted(self.milestones.items(), key=lambda kv: kv[1]):
+            lines.append(f"  {event:<16} {elapsed:.3f}s")
+        if self.import_profiler:
+            lines.append(self.import_profiler.report(top))
+        return "\n".join(lines)
+
+    def finish(self):
+        """Stop import profiling (called once the client is fully ready)."""
+        if self.import_profiler:
+            self.import_profiler.uninstall()
+
+
+def current_rss_mb() -> Optional[float]:
+    """Resident set size of this process in MB (None if it cannot be read)."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+class MemoryWatch:
+    """
+    Memory checkpoints for long-lived client processes.
+
+    Each checkpoint (normally one per game) records RSS and, with tracemalloc
+    enabled, the allocation sites that grew most since the previous
+    checkpoint. Checkpoints are appended to a JSON-lines stats file. Crossing
+    the warn threshold logs the top growth sites; crossing the recycle
+    threshold asks ``run_client`` to exit once the current session has ended,
+    so the batch executor replaces the process between games.
+    """
+
+    OK = "ok"
+    WARN = "warn"
+    RECYCLE = "recycle"
+
+    def __init__(self, name: str, stats_path: Optional[str] = None, trace_frames: int = 0,
+                 warn_mb: float = 0, recycle_mb: float = 0, top: int = 10):
+        """
+        Args:
+            name: Client name used in log lines and stats records
+            stats_path: JSON-lines file for checkpoints (None: not written)
+            trace_frames: tracemalloc frames per allocation (0: RSS only)
+            warn_mb: RSS (MB) above which a warning is logged (0: off)
+            recycle_mb: RSS (MB) above which the client asks to be recycled (0: off)
+            top: Number of growth sites recorded per checkpoint
+        """
+        self.name = name
+        self.stats_path = stats_path
+        self.trace_frames = trace_frames
+        self.warn_mb = warn_mb
+        self.recycle_mb = recycle_mb
+        self.top = top
+        self.enabled = bool(stats_path or trace_frames or warn_mb or recycle_mb)
+        self.checkpoints = 0
+        self.status = self.OK
+        self.baseline_rss: Optional[float] = None
+        self.peak_rss: Optional[float] = None
+        self._snapshot = None
+        if self.enabled:
+            self.baseline_rss = self.peak_rss = current_rss_mb()
+            if trace_frames:
+                import tracemalloc
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(trace_frames)
+                self._snapshot = self._take_snapshot()
+
+    @classmethod
+    def from_env(cls, name: str) -> "MemoryWatch":
+        """Create a watch configured from the GD_MEMORY_* variables (disabled if none set)."""
+        def number(key: str) -> float:
+            try:
+                return float(os.environ.get(key) or 0)
+            except ValueError:
+                logger.warning("[%s] invalid %s=%r, ignored", name, key, os.environ.get(key))
+                return 0
+
+        return cls(
+            name,
+            stats_path=os.environ.get("GD_MEMORY_STATS") or None,
+            trace_frames=int(number("GD_MEMORY_TRACE")),
+            warn_mb=number("GD_MEMORY_WARN_MB"),
+            recycle_mb=number("GD_MEMORY_RECYCLE_MB"),
+        )
+
+    @staticmethod
+    def _take_snapshot():
+        import tracemalloc
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+
+    def _growth(self) -> List[Dict]:
+        """Allocation sites that grew most since the previous snapshot."""
+        snapshot = self._take_snapshot()
+        key = "traceback" if self.trace_frames > 1 else "lineno"
+        diffs = snapshot.compare_to(self._snapshot, key)
+        self._snapshot = snapshot
+        growth = []
+        for diff in diffs:
+            if diff.size_diff <= 0:
+                continue
+            growth.append({
+                "site": " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in diff.traceback),
+                "size_kb": round(diff.size_diff / 1024, 1),
+                "count": diff.count_diff,
+                "total_kb": round(diff.size / 1024, 1),
+            })
+            if len(growth) >= self.top:
+                break
+        return growth
+
+    def checkpoint(self, label: str) -> Optional[Dict]:
+        """
+        Record a checkpoint (call between games).
+
+        Returns:
+            The recorded stats entry, or None when disabled
+        """
+        if not self.enabled:
+            return None
+        self.checkpoints += 1
+        rss = current_rss_mb()
+        entry = {
+            "ts": round(time.time(), 3),
+            "client": self.name,
+            "pid": os.getpid(),
+            "checkpoint": self.checkpoints,
+            "label": label,
+            "rss_mb": None if rss is None else round(rss, 1),
+        }
+        if rss is not None:
+            self.peak_rss = max(self.peak_rss or rss, rss)
+            entry["peak_rss_mb"] = round(self.peak_rss, 1)
+            if self.baseline_rss is not None:
+                entry["rss_growth_mb"] = round(rss - self.baseline_rss, 1)
+        if self._snapshot is not None:
+            import tracemalloc
+            traced, peak = tracemalloc.get_traced_memory()
+            entry["traced_mb"] = round(traced / (1024 * 1024), 1)
+            entry["traced_peak_mb"] = round(peak / (1024 * 1024), 1)
+            entry["growth"] = self._growth()
+
+        if rss is not None and self.recycle_mb and rss > self.recycle_mb:
+            self.status = self.RECYCLE
+        elif rss is not None and self.warn_mb and rss > self.warn_mb and self.status == self.OK:
+            self.status = self.WARN
+        entry["status"] = self.status
+        if self.status != self.OK and rss is not None and rss > (self.warn_mb or self.recycle_mb):
+            sites = ", ".join(f"{g['site']} +{g['size_kb']}KB" for g in entry.get("growth", [])[:3])
+            logger.warning(
+                "[%s] memory %s: RSS %.0fMB (+%.0fMB since start)%s",
+                self.name, self.status, rss, entry.get("rss_growth_mb", 0.0),
+                f"; top growth: {sites}" if sites else ""
+            )
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: Dict):
+        if not self.stats_path:
+            return
+        import json
+        try:
+            directory = os.path.dirname(self.stats_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.stats_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning("[%s] could not write memory stats %s: %s", self.name, self.stats_path, e)
+
+    @property
+    def recycle_requested(self) -> bool:
+        return self.status == self.RECYCLE
+
+
+class BackgroundLoader:
+    """
+    Run a (slow) factory in a daemon thread.
+
+    The entry points use it to import and construct the decision stack while
+    the websocket connection is being established.
+    """
+
+    def __init__(self, factory: Callable[[], object], name: str = "loader",
+                 on_ready: Optional[Callable[[object], None]] = None):
+        """
+        Args:
+            factory: Zero-argument callable producing the loaded object
+            name: Thread name
+            on_ready: Optional callback invoked with the result in the loader thread
+        """
+        self._factory = factory
+        self._on_ready = on_ready
+        self._done = threading.Event()
+        self._result = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> "BackgroundLoader":
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self._result = self._factory()
+            if self._on_ready is not None:
+                self._on_ready(self._result)
+        except BaseException as e:  # 在调用result()时重新抛出
+            self._error = e
+        finally:
+            self._done.set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def result(self, timeout: Optional[float] = None):
+        """
+        Wait for the factory and return its result.
+
+        Raises:
+            TimeoutError: If not finished within timeout
+            Exception: Whatever the factory raised
+        """
+        if not self._thread.is_alive() and not self._done.is_set():
+            # 未显式start()时同步加载
+            self._run()
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self._thread.name} not ready after {timeout}s")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def apply_seed(seed: Optional[int] = None):
+    """
+    Seed the client's random number generators.
+
+    ``seed`` defaults to GD_SEED (set per batch by the batch executor) so a
+    resumed run replays the same client-side random choices; with neither set
+    the generators keep their OS-entropy seeding.
+    """
+    if seed is None:
+        value = os.environ.get("GD_SEED", "")
+        if not value:
+            return
+        seed = int(value)
+    import random
+    random.seed(seed)
+    numpy = sys.modules.get("numpy")
+    if numpy is not None:
+        numpy.random.seed(seed % 2 ** 32)
+
+
+def reconnect_delays(initial: float = 0.1, maximum: float = 2.0,
+                     factor: float = 2.0) -> Iterator[float]:
+    """Exponential backoff delays: initial, initial*factor, ... capped at maximum."""
+    delay = initial
+    while True:
+        yield delay
+        delay = min(delay * factor, maximum)
+
+
+class SupervisorChannel:
+    """
+    Line-based command channel from the batch executor (the client's stdin).
+
+    Commands:
+        connect  (re)connect to the server, retrying with backoff
+        reset    reset per-game state before the next game
+                 ("reset <seed>" also reseeds the random generators)
+        stop     disconnect and exit
+
+    A reader thread forwards lines into an asyncio queue on the client's
+    event loop; EOF on stdin (supervisor gone) is treated as ``stop``.
+    """
+
+    COMMANDS = ("connect", "reset", "stop")
+
+    def __init__(self, stream=None):
+        self._stream = stream if stream is not None else sys.stdin
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["SupervisorChannel"]:
+        """Return a channel when GD_SUPERVISED is set, else None."""
+        if os.environ.get("GD_SUPERVISED", "") in ("", "0"):
+            return None
+        return cls()
+
+    def start(self):
+        """Start reading commands (must be called inside the event loop)."""
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        threading.Thread(target=self._read, name="supervisor", daemon=True).start()
+
+    def _read(self):
+        try:
+            for line in self._stream:
+                command = line.strip().lower()
+                if command:
+                    self._loop.call_soon_threadsafe(self._queue.put_nowait, command)
+        finally:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, "stop")
+
+    async def next_command(self) -> str:
+        return await self._queue.get()
+
+    def post(self, command: str):
+        """Queue a command from inside the client (e.g. ``recycle``); event loop thread only."""
+        self._queue.put_nowait(command)
+
+
+async def _connect_with_backoff(client, name: str):
+    """Reconnect until one session has run (client.connect() returned True)."""
+    for delay in reconnect_delays():
+        if await client.connect():
+            return
+        logger.info("[%s] server not reachable, retrying in %.1fs", name, delay)
+        await asyncio.sleep(delay)
+
+
+async def _run_session(client, name: str, memory: MemoryWatch, supervisor: SupervisorChannel):
+    """One supervised session, then a memory checkpoint; ask to recycle above the limit."""
+    checkpoints = memory.checkpoints
+    await _connect_with_backoff(client, name)
+    if memory.checkpoints == checkpoints:
+        # 客户端没有按局记录检查点时，每个会话记录一次
+        memory.checkpoint("session")
+    if memory.recycle_requested:
+        supervisor.post("recycle")
+
+
+async def run_client(client, name: str):
+    """
+    Run a client either once (default) or as a supervised long-lived worker.
+
+    The client must provide ``connect() -> bool`` (True once a session ran),
+    ``reset_game()``, ``close()`` and a ``websocket`` attribute. Under
+    GD_SUPERVISED the process survives server restarts: each ``connect``
+    command starts a new session, so a batch restart costs only the server
+    launch instead of interpreter start-up, imports and knowledge loading.
+
+    A client may also provide ``memory_watch`` (a MemoryWatch it checkpoints
+    after every game). Once RSS exceeds GD_MEMORY_RECYCLE_MB the supervised
+    process exits after the current session and the pool starts a fresh one.
+    """
+    apply_seed()
+    memory = getattr(client, "memory_watch", None) or MemoryWatch.from_env(name)
+    supervisor = SupervisorChannel.from_env()
+    if supervisor is None:
+        try:
+            await client.connect()
+        finally:
+            if memory.checkpoints == 0:
+                memory.checkpoint("session")
+            client.close()
+        return
+
+    supervisor.start()
+    session: Optional[asyncio.Task] = None
+    try:
+        while True:
+            command, _, argument = (await supervisor.next_command()).partition(" ")
+            if command == "connect":
+                if session is None or session.done():
+                    session = asyncio.create_task(_run_session(client, name, memory, supervisor))
+            elif command == "reset":
+                if argument:
+                    apply_seed(int(argument))
+                client.reset_game()
+            elif command == "stop":
+                break
+            elif command == "recycle":
+                logger.warning(
+                    "[%s] exiting for recycle: RSS above GD_MEMORY_RECYCLE_MB=%.0f",
+                    name, memory.recycle_mb
+                )
+                break
+            else:
+                logger.warning("[%s] unknown supervisor command: %s", name, command)
+    finally:
+        if session is not None and not session.done():
+            if client.websocket is not None:
+                await client.websocket.close()
+            session.cancel()
+        client.close()
+
+
+def main():
+    """Profile importing modules: python startup.py <module> [<module> ...] [--budget S]"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Import time profile for client modules")
+    parser.add_argument("modules", nargs="+", help="Modules to import, e.g. decision.hybrid_decision_engine_v4")
+    parser.add_argument("--budget", type=float, default=DEFAULT_STARTUP_BUDGET, help="Time budget (seconds)")
+    parser.add_argument("--top", type=int, default=30, help="Number of modules in the report")
+    args = parser.parse_args()
+
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+
+    profile = StartupProfile("profile", budget=args.budget, profile_imports=True)
+    for module in args.modules:
+        importlib.import_module(module)
+        profile.mark(module)
+    profile.finish()
+    print(profile.report(args.top))
+    within = all(elapsed <= args.budget for elapsed in profile.milestones.values())
+    sys.exit(0 if within else 1)
+
+
+if __name__ == "__main__":
+    main()
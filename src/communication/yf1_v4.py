@@ -3,17 +3,23 @@
 yf1_v4 - YiFei AI V4 Client (Player 0)
 Uses HybridDecisionEngineV4 with 4-layer fallback protection
 """
+import time
+_STARTED_AT = time.perf_counter()
+
 import asyncio
-import websockets
 import json
+import os
 import sys
 import logging
 from pathlib import Path
 
-# Add paths
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# websockets and the decision stack are imported lazily (see connect() and
+# _create_decision_engine()) so the client connects before they finish loading.
+SRC_DIR = str(Path(__file__).parent.parent)
 
-from decision.hybrid_decision_engine_v4 import HybridDecisionEngineV4
+# Time allowed per decision, measured from message receipt (or from engine
+# readiness when the request arrives while the engine is loading)
+DECISION_BUDGET = 0.8
 
 # Configure logging
 logging.basicConfig(
@@ -23,26 +29,37 @@ logging.basicConfig(
 )
 
 
+def _ensure_src_path():
+    """Add src/ to sys.path (at startup, not at import time)"""
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+
+
 class YF1_V4_Client:
     """
     YiFei AI V4 Client - Player 0
     Uses HybridDecisionEngineV4 for robust decision making
     """
     
-    def __init__(self, player_id=0):
+    def __init__(self, player_id=0, startup=None):
+        _ensure_src_path()
+        from communication.recorder import GameRecorder
+        from communication.startup import BackgroundLoader, MemoryWatch, StartupProfile
+
         self.player_id = player_id
         self.user_info = "yf1_v4"
         self.websocket = None
         self.logger = logging.getLogger(f"yf1_v4")
+        self.startup = startup or StartupProfile.from_env(self.user_info, _STARTED_AT)
+        self.recorder = GameRecorder.from_env(self.user_info)
+        self.memory_watch = MemoryWatch.from_env(self.user_info)
         
-        # Initialize HybridDecisionEngineV4
-        config = {
-            "enable_lalala": True,
-            "enable_fallback": True,
-            "log_level": "INFO",
-            "performance_threshold": 1.0
-        }
-        self.decision_engine = HybridDecisionEngineV4(player_id, config)
+        # Initialize HybridDecisionEngineV4 in the background while connecting
+        self._engine_loader = BackgroundLoader(
+            self._create_decision_engine,
+            name=f"{self.user_info}-engine",
+            on_ready=lambda _: self.startup.mark("engine_ready")
+        ).start()
         
         # Statistics
         self.decision_count = 0
@@ -50,22 +67,72 @@ class YF1_V4_Client:
         
         self.logger.info(f"✓ yf1_v4 initialized (Player {player_id})")
     
+    def _create_decision_engine(self):
+        """Import and build the decision engine (runs in the loader thread)"""
+        from decision.hybrid_decision_engine_v4 import HybridDecisionEngineV4
+        from decision.decision_profiler import env_config as profiler_config
+        
+        config = {
+            "enable_lalala": True,
+            "enable_fallback": True,
+            "log_level": "INFO",
+            "performance_threshold": 1.0,
+            "decision_budget": DECISION_BUDGET,
+            "log_mode": os.environ.get("GD_LOG_MODE", "debug"),
+            "decision_log": os.environ.get("GD_DECISION_LOG"),
+            "learned_model": os.environ.get("GD_LEARNED_MODEL") or None
+        }
+        config.update(profiler_config())  # GD_PROFILE_DIR etc.
+        return HybridDecisionEngineV4(self.player_id, config)
+    
+    @property
+    def decision_engine(self):
+        """HybridDecisionEngineV4 (blocks until background loading finishes)"""
+        return self._engine_loader.result()
+    
+    async def wait_engine_ready(self):
+        """Wait for the decision engine without blocking the event loop"""
+        if not self._engine_loader.done():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._engine_loader.result)
+            self.logger.info(self.startup.report())
+            self.startup.finish()
+        return self._engine_loader.result()
+    
     async def connect(self):
-        """Connect to game server"""
-        uri = f"ws://127.0.0.1:23456/game/{self.user_info}"
+        """
+        Connect to game server and run one session
+        
+        Returns:
+            True if a session ran (connection succeeded)
+        """
+        import websockets
+        from communication.startup import server_uri
+        
+        uri = server_uri(self.user_info)
         try:
-            self.websocket = await websockets.connect(
+            self.websocket = self.recorder.wrap(await websockets.connect(
                 uri,
                 ping_timeout=None,  # Disable ping timeout
                 close_timeout=10
-            )
-            self.logger.info(f"✓ Connected to server: {uri}")
+            ))
+            elapsed = self.startup.mark("connected")
+            self.startup.check_budget("connected")
+            self.startup.notify_ready("connected")
+            self.logger.info(f"✓ Connected to server: {uri} ({elapsed:.2f}s after start)")
+            if self._engine_loader.done():
+                self.logger.info(self.startup.report())
+                self.startup.finish()
             await self.handle_messages()
+            return True
         except Exception as e:
             self.logger.error(f"✗ Connection error: {e}")
+            return False
     
     async def handle_messages(self):
         """Handle incoming messages from server"""
+        import websockets
+        
         try:
             async for message in self.websocket:
                 try:
@@ -84,6 +151,18 @@ class YF1_V4_Client:
         finally:
             self.logger.info("Disconnected from server")
     
+    def reset_game(self):
+        """Reset per-game state (long-lived client, see startup.run_client)"""
+        self.decision_count = 0
+        if self._engine_loader.done():
+            self.decision_engine.reset_game()
+    
+    def close(self):
+        """Release engine resources and flush the message recording before the process exits"""
+        if self._engine_loader.done():
+            self.decision_engine.close()
+        self.recorder.close()
+    
     async def process_message(self, data: dict):
         """Process a message from the server"""
         message_type = data.get("type", "")
@@ -95,7 +174,15 @@ class YF1_V4_Client:
             self.handle_notification(data)
     
     async def handle_action_request(self, data: dict):
-        """Handle action request from server"""
+        """
+        Handle action request from server
+        
+        The decision budget is measured from message receipt. A request that
+        arrives while the engine is still loading gets its full budget once
+        the engine is ready, so the first decision does not start past its
+        deadline and fall through to the emergency path.
+        """
+        deadline = time.perf_counter() + DECISION_BUDGET
         self.decision_count += 1
         action_list = data.get("actionList", [])
         
@@ -106,7 +193,11 @@ class YF1_V4_Client:
         
         try:
             # Use HybridDecisionEngineV4 to make decision
-            act_index = self.decision_engine.decide(data)
+            loading = not self._engine_loader.done()
+            decision_engine = await self.wait_engine_ready()
+            if loading:
+                deadline = time.perf_counter() + DECISION_BUDGET
+            act_index = decision_engine.decide(data, deadline=deadline)
             
             # Validate action index
             if not self.validate_action(act_index, action_list):
@@ -123,6 +214,8 @@ class YF1_V4_Client:
     def handle_notification(self, data: dict):
         """Handle notification from server"""
         stage = data.get("stage", "")
+        if self._engine_loader.done():
+            self.decision_engine.observe(data)  # card tracking for the learned layer
         
         if stage == "gameResult":
             self.game_count += 1
@@ -145,12 +238,35 @@ class YF1_V4_Client:
                 if total > 0:
                     rate = success / total * 100
                     self.logger.info(f"  {layer}: {success}/{total} ({rate:.1f}%)")
+            latency = stats["latency"]
+            self.logger.info(
+                f"Decision latency: p50={latency['p50'] * 1000:.0f}ms, "
+                f"p99={latency['p99'] * 1000:.0f}ms, max={latency['max'] * 1000:.0f}ms; "
+                f"skipped for time: {stats['deadline_skips']}"
+            )
+            fast_path = stats["fast_path"]
+            self.logger.info(
+                f"Fast path: {fast_path['rate'] * 100:.1f}% of decisions {fast_path['hits']}, "
+                f"saved ~{fast_path['time_saved']:.2f}s"
+            )
+            if "profiler" in stats:
+                profiler = stats["profiler"]
+                self.logger.info(
+                    f"Profiler: {profiler['sampled']} sampled + {profiler['slow']} slow decisions, "
+                    f"samples per layer: {profiler['layers']}"
+                )
+            if stats["circuit_breakers"]:
+                self.logger.info(
+                    f"Circuit breakers: {stats['circuit_breakers']}, "
+                    f"skipped: {stats['breaker_skips']}"
+                )
             
             self.logger.info("=" * 60)
             
             # Reset for next game
             self.decision_count = 0
             self.decision_engine.reset_statistics()
+            self.memory_watch.checkpoint(f"game {self.game_count}")
     
     def validate_action(self, act_index: int, action_list: list) -> bool:
         """Validate that action index is in valid range"""
@@ -166,9 +282,9 @@ class YF1_V4_Client:
 async def main():
     """Main entry point"""
     client = YF1_V4_Client(player_id=0)
-    await client.connect()
+    from communication.startup import run_client
+    await run_client(client, client.user_info)
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-    asyncio.run(main())
@@ -37,18 +37,19 @@ class DecisionEngine:
         self.evaluator = MultiFactorEvaluator(state_manager, self.combiner, self.cooperation)
         self.timer = DecisionTimer(max_decision_time)
     
-    def decide(self, message: Dict) -> int:
+    def decide(self, message: Dict, deadline: Optional[float] = None) -> int:
         """
         核心决策方法
         
         Args:
             message: 游戏状态消息
+            deadline: 绝对截止时间（time.perf_counter()时间点），默认为开始后max_time
         
         Returns:
             决策结果索引
         """
         # 开始计时
-        self.timer.start()
+        self.timer.start(deadline)
         
         action_list = message.get("actionList", [])
         if not action_list:
@@ -98,23 +99,18 @@ class DecisionEngine:
         rank = message.get("curRank", "2")
         
         # 多因素评估所有动作
-        evaluations = self.evaluator.evaluate_all_actions(action_list, None)
+        evaluations = self.evaluator.evaluate_all_actions(action_list, None, self.timer)
         
-        # 如果超时，返回评估分最高的动作
-        if self.timer.check_timeout():
-            if evaluations:
-                return evaluations[0][0]
-            return 0
-        
-        # 选择非PASS的最佳动作
+        # 选择非PASS的最佳动作（超时时评估结果只包含已评估的部分）
         for idx, score in evaluations:
             action = action_list[idx]
             if action[0] != "PASS":
-                # 再次检查超时
-                if self.timer.check_timeout():
-                    return idx
                 return idx
         
+        # 超时且尚未评估到非PASS动作，快速决策
+        if self.timer.check_timeout():
+            return self._quick_decision(action_list, None)
+        
         return 0
     
     def passive_decision(self, message: Dict, action_list: List[List]) -> int:
@@ -172,7 +168,7 @@ class DecisionEngine:
         
         # 5. 多因素评估
         if not self.timer.check_timeout():
-            evaluations = self.evaluator.evaluate_all_actions(action_list, target_action)
+            evaluations = self.evaluator.evaluate_all_actions(action_list, target_action, self.timer)
             for idx, score in evaluations:
                 if action_list[idx][0] != "PASS":
                     return idx
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+决策日志 (Decision Log)
+功能：
+- 结构化决策记录（JSON-lines），经 QueueHandler 入队，由后台 QueueListener 线程写文件
+- 惰性格式化：记录以 dict 入队，json 序列化在后台线程完成
+- 按类别采样（例如 decision 每10条记1条，error 全部记录）
+- production 模式：采样 + 热路径文本日志降级；统计调用方开销（微秒/次）
+
+环境变量：
+- GD_DECISION_LOG=path   决策记录输出文件（不设置则不写文件）
+- GD_LOG_MODE=production 开启生产模式（默认 debug）
+"""
+
+import json
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+
+# 各模式下的默认采样率（0.0 不记录，1.0 全部记录）
+DEBUG_SAMPLE_RATES = {
+    "decision": 1.0,
+    "fast_path": 1.0,
+    "layer": 1.0,
+    "error": 1.0,
+}
+
+PRODUCTION_SAMPLE_RATES = {
+    "decision": 0.1,
+    "fast_path": 0.01,
+    "layer": 0.0,
+    "error": 1.0,
+}
+
+# 生产模式下每次record()调用方开销预算（微秒）
+DEFAULT_BUDGET_US = 5.0
+
+
+class _LazyQueueHandler(QueueHandler):
+    """入队时不做任何格式化的QueueHandler（格式化留给后台线程）"""
+
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesHandler(logging.Handler):
+    """把dict类型的日志消息按行写成JSON对象"""
+
+    def __init__(self, path: str, flush_every: int = 64):
+        """
+        Args:
+            path: 输出文件（追加写入）
+            flush_every: 每N条记录刷新一次文件
+        """
+        super().__init__()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.stream = open(path, "a", encoding="utf-8")
+        self.flush_every = flush_every
+        self._pending = 0
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            payload = record.msg if isinstance(record.msg, dict) else {"message": record.getMessage()}
+            payload.setdefault("ts", round(record.created, 3))
+            self.stream.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self.stream.flush()
+                self._pending = 0
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        try:
+            if not self.stream.closed:
+                self.stream.flush()
+                self.stream.close()
+        finally:
+            super().close()
+
+
+class DecisionLog:
+    """
+    低开销决策记录器
+
+    用法：
+        log = DecisionLog("logs/decisions.jsonl", mode="production")
+        log.record("decision", player=0, action=3, layer="YF", ms=1.2)
+        log.close()
+    """
+
+    def __init__(self, path: Optional[str] = None, mode: str = "debug",
+                 sample_rates: Optional[Dict[str, float]] = None,
+                 budget_us: float = DEFAULT_BUDGET_US):
+        """
+        初始化决策记录器
+
+        Args:
+            path: JSON-lines输出文件，None表示只统计不写文件
+            mode: "debug" 或 "production"
+            sample_rates: 覆盖默认的按类别采样率
+            budget_us: 每次record()调用方开销预算（微秒）
+        """
+        self.mode = mode
+        self.production = mode == "production"
+        self.sample_rates = dict(PRODUCTION_SAMPLE_RATES if self.production else DEBUG_SAMPLE_RATES)
+        if sample_rates:
+            self.sample_rates.update(sample_rates)
+        self.budget_us = budget_us
+
+        self._counters: Dict[str, int] = {}
+        self._strides: Dict[str, int] = {}
+        self.calls = 0
+        self.written = 0
+        self.overhead_ns = 0
+
+        self._listener = None
+        self._logger = None
+        if path:
+            self._queue = queue.SimpleQueue()
+            self._file_handler = JsonLinesHandler(path)
+            self._listener = QueueListener(self._queue, self._file_handler)
+            self._listener.start()
+
+            self._logger = logging.getLogger(f"decision_log.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            self._logger.addHandler(_LazyQueueHandler(self._queue))
+
+    @classmethod
+    def from_env(cls, default_path: Optional[str] = None) -> "DecisionLog":
+        """根据 GD_DECISION_LOG / GD_LOG_MODE 创建记录器"""
+        return cls(
+            path=os.environ.get("GD_DECISION_LOG", default_path),
+            mode=os.environ.get("GD_LOG_MODE", "debug")
+        )
+
+    def sampled(self, category: str) -> bool:
+        """
+        确定性采样：采样率r时每 round(1/r) 条记录1条
+
+        Args:
+            category: 记录类别
+
+        Returns:
+            本条是否记录
+        """
+        rate = self.sample_rates.get(category, 1.0)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+
+        stride = self._strides.get(category)
+        if stride is None:
+            stride = self._strides[category] = max(1, int(round(1.0 / rate)))
+        count = self._counters.get(category, 0) + 1
+        self._counters[category] = count
+        return (count - 1) % stride == 0
+
+    def record(self, category: str, **fields):
+        """
+        记录一条结构化决策记录（字段在后台线程序列化）
+
+        Args:
+            category: 记录类别（decision / fast_path / layer / error ...）
+            **fields: 记录字段，必须是可JSON序列化的值（调用后不要再修改）
+        """
+        start = time.perf_counter_ns()
+        self.calls += 1
+        if self._logger is not None and self.sampled(category):
+            fields["category"] = category
+            self._logger.info(fields)
+            self.written += 1
+        self.overhead_ns += time.perf_counter_ns() - start
+
+    def overhead_per_call_us(self) -> float:
+        """调用方平均开销（微秒/次）"""
+        if self.calls == 0:
+            return 0.0
+        return self.overhead_ns / self.calls / 1000.0
+
+    def within_budget(self) -> bool:
+        """平均开销是否在预算内"""
+        return self.overhead_per_call_us() <= self.budget_us
+
+    def get_summary(self) -> dict:
+        """获取记录器统计"""
+        return {
+            "mode": self.mode,
+            "calls": self.calls,
+            "written": self.written,
+            "overhead_us": round(self.overhead_per_call_us(), 2),
+            "budget_us": self.budget_us,
+            "within_budget": self.within_budget(),
+        }
+
+    def close(self):
+        """停止后台写入线程并关闭文件（会写完队列中剩余记录）"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._file_handler.close()
+            self._listener = None
+            self._logger.handlers.clear()
+            self._logger = None
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+决策采样分析 (Decision Profiler)
+功能：
+- 只分析部分决策：每N个决策完整采样1个，以及任何超过延迟阈值的决策
+- 后台线程按固定间隔读取决策线程的调用栈（sys._current_frames），决策线程本身不做额外工作
+- 调用栈按决策层汇总，写成 collapsed-stack 文本（flamegraph.pl、speedscope 可直接读取）
+
+未采样的决策只有 begin()/end() 的几次赋值开销：采样线程在决策开始时被唤醒，
+采样决策立即开始采集，其余决策等到超过延迟阈值才开始采集（慢决策记录阈值之后的部分），
+在阈值之前结束的决策不会被采集。
+
+输出（每个进程一组，定期整体重写）：
+    {目录}/{名称}_{pid}_{层}.folded    该层的调用栈，每行 "帧;帧;...;帧 次数"
+    {目录}/{名称}_{pid}_all.folded     全部调用栈，第一帧为层名
+
+环境变量：
+- GD_PROFILE_DIR=dir         开启采样分析并指定输出目录（不设置则关闭）
+- GD_PROFILE_EVERY=N         每N个决策完整采样1个（默认 20，0 表示只采集慢决策）
+- GD_PROFILE_SLOW_MS=ms      超过该耗时的决策从阈值起采集（默认 300，0 表示不按耗时采集）
+- GD_PROFILE_INTERVAL_MS=ms  采样间隔（默认 1）
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+
+DEFAULT_EVERY = 20
+DEFAULT_SLOW_THRESHOLD = 0.3
+DEFAULT_INTERVAL = 0.001
+# 空闲时写出汇总文件的间隔（秒）
+FLUSH_INTERVAL = 10.0
+# 不在任何层内时的调用栈归属
+PIPELINE_LAYER = "Pipeline"
+
+logger = logging.getLogger(__name__)
+
+
+def env_config() -> dict:
+    """从环境变量读取 HybridDecisionEngineV4 的采样分析配置（profile_* 键）"""
+    config = {"profile_dir": os.environ.get("GD_PROFILE_DIR") or None}
+    if "GD_PROFILE_EVERY" in os.environ:
+        config["profile_every"] = int(os.environ["GD_PROFILE_EVERY"])
+    if "GD_PROFILE_SLOW_MS" in os.environ:
+        config["profile_slow"] = float(os.environ["GD_PROFILE_SLOW_MS"]) / 1000.0
+    if "GD_PROFILE_INTERVAL_MS" in os.environ:
+        config["profile_interval"] = float(os.environ["GD_PROFILE_INTERVAL_MS"]) / 1000.0
+    return config
+
+
+class DecisionProfiler:
+    """
+    决策采样分析器（directory为None时所有方法都是空操作）
+
+    用法：
+        profiler = DecisionProfiler("profiles", "v4_p0", every=20, slow_threshold=0.3)
+        profiler.begin()
+        try:
+            profiler.layer = "YF"      # 之后的采样归入YF层
+            ...
+        finally:
+            profiler.end()
+
+        with profiler:                 # 或者整个决策归入默认层
+            engine.decide(message)
+        profiler.close()
+    """
+
+    def __init__(self, directory: Optional[str], name: str, every: int = DEFAULT_EVERY,
+                 slow_threshold: float = DEFAULT_SLOW_THRESHOLD, interval: float = DEFAULT_INTERVAL,
+                 layer: str = PIPELINE_LAYER):
+        """
+        Args:
+            directory: 输出目录，None表示关闭
+            name: 输出文件名前缀
+            every: 每N个决策完整采样1个（0表示不按次数采样）
+            slow_threshold: 延迟阈值（秒，0表示不按耗时采样）
+            interval: 采样间隔（秒）
+            layer: 默认层名（不在任何层内时）
+        """
+        self.enabled = bool(directory)
+        self.directory = directory
+        self.name = name
+        self.every = every
+        self.slow_threshold = slow_threshold
+        self.interval = interval
+        self.default_layer = layer
+        self.layer = layer
+
+        self.decisions = 0
+        self.sampled = 0
+        self.slow = 0
+        self.samples = 0
+        self._dirty = False
+        self._stacks: Dict[str, Counter] = {}
+        self._layer_samples = Counter()
+        self._labels: Dict[object, str] = {}
+        # 当前决策：(决策序号, 线程ID, 决策入口帧, 开始时间, 是否完整采样)
+        self._current = None
+        self._wake = threading.Event()
+        self._halt = threading.Event()
+        self._thread = None
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+            self._prefix = os.path.join(directory, f"{name}_{os.getpid()}")
+            self._thread = threading.Thread(target=self._run, name=f"{name}-profiler", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_env(cls, name: str, layer: str = PIPELINE_LAYER) -> "DecisionProfiler":
+        """根据 GD_PROFILE_* 环境变量创建（未设置 GD_PROFILE_DIR 时关闭）"""
+        config = env_config()
+        return cls(
+            config["profile_dir"], name,
+            every=config.get("profile_every", DEFAULT_EVERY),
+            slow_threshold=config.get("profile_slow", DEFAULT_SLOW_THRESHOLD),
+            interval=config.get("profile_interval", DEFAULT_INTERVAL),
+            layer=layer
+        )
+
+    def begin(self, depth: int = 1):
+        """
+        决策开始（在决策线程中调用）
+
+        Args:
+            depth: 作为调用栈根的帧（1为调用者）
+        """
+        if not self.enabled:
+            return
+        self.decisions += 1
+        self.layer = self.default_layer
+        sampled = self.every > 0 and self.decisions % self.every == 0
+        if not sampled and self.slow_threshold <= 0:
+            return
+        self._current = (self.decisions, threading.get_ident(), sys._getframe(depth), time.perf_counter(), sampled)
+        self._wake.set()
+
+    def end(self):
+        """决策结束"""
+        self._current = None
+
+    def __enter__(self):
+        """with profiler: 把一次决策包在 begin()/end() 之间"""
+        self.begin(2)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.end()
+
+    def _run(self):
+        flushed_at = time.monotonic()
+        while not self._halt.is_set():
+            if self._wake.wait(FLUSH_INTERVAL):
+                self._wake.clear()
+                self._follow()
+            if time.monotonic() - flushed_at >= FLUSH_INTERVAL:
+                self._flush()
+                flushed_at = time.monotonic()
+        self._flush()
+
+    def _follow(self):
+        """采集当前决策，直到它结束"""
+        current = self._current
+        if current is None:
+            return
+        _, thread_id, root, start, sampled = current
+        if sampled:
+            self.sampled += 1
+        else:
+            # 等到延迟阈值；期间决策结束则不采集
+            if self._halt.wait(max(0.0, start + self.slow_threshold - time.perf_counter())):
+                return
+            if self._current is not current:
+                return
+            self.slow += 1
+        while self._current is current and not self._halt.is_set():
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            self._add(self.layer, frame, root)
+            del frame
+            time.sleep(self.interval)
+
+    def _add(self, layer: str, frame, root):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = (
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                ).replace(";", ",")
+            names.append(label)
+            if frame is root:
+                break
+            frame = frame.f_back
+        names.reverse()
+        self._stacks.setdefault(layer, Counter())[";".join(names)] += 1
+        self._layer_samples[layer] += 1
+        self.samples += 1
+        self._dirty = True
+
+    def _flush(self):
+        """整体重写汇总文件（在采样线程中调用）"""
+        if not self._dirty:
+            return
+        self._dirty = False
+        try:
+            combined = Counter()
+            for layer, stacks in list(self._stacks.items()):
+                self._write(f"{self._prefix}_{layer}.folded", stacks)
+                for stack, count in stacks.items():
+                    combined[f"{layer};{stack}"] += count
+            self._write(f"{self._prefix}_all.folded", combined)
+        except OSError as e:
+            logger.warning("写入采样分析结果失败: %s", e)
+
+    @staticmethod
+    def _write(path: str, stacks: Counter):
+        temp = path + ".tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        os.replace(temp, path)
+
+    def get_summary(self) -> dict:
+        """采样统计"""
+        return {
+            "enabled": self.enabled,
+            "decisions": self.decisions,
+            "sampled": self.sampled,
+            "slow": self.slow,
+            "samples": self.samples,
+            "layers": dict(self._layer_samples),
+        }
+
+    def close(self):
+        """停止采样线程并写出汇总文件"""
+        if self._thread is not None:
+            self._current = None
+            self._halt.set()
+            self._wake.set()
+            self._thread.join(timeout=5)
+            self._thread = None
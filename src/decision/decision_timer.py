@@ -22,10 +22,20 @@ class DecisionTimer:
         """
         self.max_time = max_time
         self.start_time: Optional[float] = None
+        self.deadline: Optional[float] = None
     
-    def start(self):
-        """瀵婵瀣鈩冩"""
-        self.start_time = time.time()
+    def start(self, deadline: Optional[float] = None):
+        """
+        开始计时
+
+        Args:
+            deadline: 绝对截止时间（time.perf_counter()时间点），
+                      默认为 start + max_time
+        """
+        self.start_time = time.perf_counter()
+        if deadline is None:
+            deadline = self.start_time + self.max_time
+        self.deadline = deadline
     
     def check_timeout(self) -> bool:
         """
@@ -34,11 +44,10 @@ class DecisionTimer:
         Returns:
             婵″倹鐏夌搾鍛妞傛潻鏂挎礀True閿涘苯鎯侀崚娆掔箲閸ユ楷alse
         """
-        if self.start_time is None:
+        if self.deadline is None:
             return False
         
-        elapsed = time.time() - self.start_time
-        return elapsed >= self.max_time
+        return time.perf_counter() >= self.deadline
     
     def get_elapsed_time(self) -> float:
         """
@@ -49,7 +58,7 @@ class DecisionTimer:
         """
         if self.start_time is None:
             return 0.0
-        return time.time() - self.start_time
+        return time.perf_counter() - self.start_time
     
     def get_remaining_time(self) -> float:
         """
@@ -58,12 +67,22 @@ class DecisionTimer:
         Returns:
             閸撯晙缍戦弮鍫曟？閿涘牏鎺炵礆
         """
-        if self.start_time is None:
+        if self.deadline is None:
             return self.max_time
-        elapsed = self.get_elapsed_time()
-        return max(0.0, self.max_time - elapsed)
+        return max(0.0, self.deadline - time.perf_counter())
+    
+    def has_time_for(self, estimate: float, reserve: float = 0.0) -> bool:
+        """
+        剩余时间是否足够执行一个预计耗时为estimate的步骤
+
+        Args:
+            estimate: 步骤预计耗时（秒）
+            reserve: 需要为后续步骤保留的时间（秒）
+        """
+        return self.get_remaining_time() > estimate + reserve
     
     def reset(self):
         """闁插秶鐤嗙拋鈩冩傞崳"""
         self.start_time = None
+        self.deadline = None
 
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+快速路径 (Fast Path)
+功能：
+- 在完整决策流程之前识别平凡决策（强制动作、一手出完、选项等价）
+- 单次扫描动作列表，O(len(actionList))
+- 命中时直接返回，跳过候选生成、知识增强等全部层
+
+规则（按顺序）：
+1. forced      只有一个可选动作
+2. wins_hand   某个动作恰好出完全部手牌（与first_prize active()的判断一致）
+3. tribute     进贡阶段：与first_prize tribute()相同的级牌保留规则
+4. equivalent  还贡阶段所有选项点数相同（只差花色）
+
+出牌还是PASS（例如只有 PASS + 一个动作时）属于策略选择，
+涉及关键规则和知识层（保护队友、"火不打四"等），不走快速路径。
+"""
+
+from typing import List, Optional, Tuple
+
+
+def classify_trivial(message: dict) -> Optional[Tuple[int, str]]:
+    """
+    识别平凡决策
+
+    Args:
+        message: 游戏状态消息（type == "act"）
+
+    Returns:
+        (动作索引, 命中规则名)，非平凡决策返回None
+    """
+    action_list = message.get("actionList")
+    if not isinstance(action_list, list):
+        return None
+
+    # 1. 只有一个（或没有）可选动作
+    if len(action_list) <= 1:
+        return 0, "forced"
+
+    stage = message.get("stage", "play")
+
+    if stage == "tribute":
+        return _tribute_choice(action_list, message.get("curRank", "2")), "tribute"
+
+    if stage == "back":
+        if _all_same_rank(action_list):
+            return 0, "equivalent"
+        return None
+
+    if stage != "play":
+        return None
+
+    # 2. 一手出完
+    hand_size = len(message.get("handCards") or [])
+    for idx, action in enumerate(action_list):
+        if not isinstance(action, list) or len(action) < 3 or action[0] == "PASS":
+            continue
+        cards = action[2]
+        if isinstance(cards, list) and hand_size and len(cards) == hand_size:
+            return idx, "wins_hand"
+
+    return None
+
+
+def _tribute_choice(action_list: List, cur_rank: str) -> int:
+    """进贡：若第一个选项包含红桃级牌，则选择第二个选项保留级牌"""
+    first_action = action_list[0]
+    if isinstance(first_action, list) and len(first_action) > 2:
+        if f"H{cur_rank}" in first_action[2]:
+            return 1
+    return 0
+
+
+def _all_same_rank(action_list: List) -> bool:
+    """所有选项的点数是否相同"""
+    ranks = set()
+    for action in action_list:
+        if not isinstance(action, list) or len(action) < 2:
+            return False
+        ranks.add(action[1])
+    return len(ranks) == 1
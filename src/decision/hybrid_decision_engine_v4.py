@@ -8,13 +8,27 @@ Hybrid Decision Engine V4
 2. Layer 2: DecisionEngine (Fallback 1) - Evaluation-based
 3. Layer 3: Knowledge Enhanced (Fallback 2) - Knowledge base
 4. Layer 4: Random Selection (Guaranteed) - Always succeeds
+
+Optional candidate layer "Learned" (config["learned_model"]): a NumPy
+model scoring every legal action in one batch (decision.learned_evaluator).
 """
 
 import logging
 import random
 import time
+from collections import deque
 from typing import Dict, List, Optional
 
+from decision.decision_timer import DecisionTimer
+from decision.decision_log import DecisionLog
+from decision.decision_profiler import DEFAULT_EVERY, DEFAULT_SLOW_THRESHOLD, DEFAULT_INTERVAL, DecisionProfiler
+from decision.fast_path import classify_trivial
+
+
+# Candidate layers in merge precedence order: when two layers propose the
+# same action with the same score, the earlier layer is reported as its source
+CANDIDATE_LAYERS = ("YF", "DecisionEngine", "Learned")
+
 
 class HybridDecisionEngineV4:
     """
@@ -39,13 +53,40 @@ class HybridDecisionEngineV4:
         self.yf_adapter = None
         self.decision_engine = None
         self.knowledge_enhanced = None
+        self.learned = None
+        self.learned_state = None  # card tracking for the learned layer's features (see observe())
+        
+        # Structured decision records (JSON-lines via a background writer)
+        # log_mode "production": sampled records, per-decision text logs off
+        self.decision_log = DecisionLog(
+            path=config.get("decision_log"),
+            mode=config.get("log_mode", "debug"),
+            sample_rates=config.get("log_sample_rates")
+        )
+        
+        # Opt-in sampling profiler: 1-in-N decisions plus any decision over the
+        # latency threshold, aggregated per layer into collapsed-stack files
+        self.profiler = DecisionProfiler(
+            config.get("profile_dir"), f"v4_p{player_id}",
+            every=config.get("profile_every", DEFAULT_EVERY),
+            slow_threshold=config.get("profile_slow", DEFAULT_SLOW_THRESHOLD),
+            interval=config.get("profile_interval", DEFAULT_INTERVAL)
+        )
         
         # Performance monitoring
-        self.stats = DecisionStatistics()
+        self.stats = DecisionStatistics(window=config.get("breaker_window", 20))
+        self.breaker = LayerCircuitBreaker(
+            min_samples=config.get("breaker_min_samples", 5),
+            max_error_rate=config.get("breaker_error_rate", 0.5),
+            max_latency=config.get("breaker_latency", 0.3),
+            cooldown=config.get("breaker_cooldown", 30)
+        )
+        self._layer_cost: Dict[str, Optional[float]] = {}  # 各层耗时估计（秒，本局）
+        self._proposers: Dict[int, List[str]] = {}  # 本次决策中提出各动作的候选层
         
         # Logging setup
         self.logger = logging.getLogger(f"HybridV4-P{player_id}")
-        self.logger.setLevel(logging.INFO)
+        self.logger.setLevel(logging.WARNING if self.decision_log.production else logging.INFO)
         
         # Add console handler if not already present
         if not self.logger.handlers:
@@ -59,7 +100,7 @@ class HybridDecisionEngineV4:
         
         self.logger.info("HybridDecisionEngineV4 initialized")
     
-    def decide(self, message: dict) -> int:
+    def decide(self, message: dict, deadline: Optional[float] = None) -> int:
         """
         Make a decision using enhanced architecture (增强模式).
         
@@ -70,33 +111,70 @@ class HybridDecisionEngineV4:
         3. Select Best Action - Choose highest scored candidate
         4. Random Fallback (Guaranteed) - Always succeeds as last resort
         
+        Forced or equivalent moves (see decision.fast_path) are returned before
+        the pipeline runs. One absolute deadline is carried through every step. A step whose
+        estimated cost does not fit in the remaining budget is skipped (and
+        counted in stats.deadline_skips); the best answer so far is returned.
+        
         Args:
             message: Game state message from server
+            deadline: Absolute deadline (time.perf_counter() value).
+                      Defaults to now + config["decision_budget"] (0.8s)
             
         Returns:
             Action index (0 for PASS, 1+ for play actions)
         """
-        start_time = time.time()
-        performance_threshold = self.config.get("performance_threshold", 1.0)
+        timer = DecisionTimer(self.config.get("decision_budget", 0.8))
+        timer.start(deadline)
+        
+        # Fast path: forced/dominant moves skip the whole pipeline
+        if self.config.get("enable_fast_path", True):
+            try:
+                trivial = classify_trivial(message)
+            except Exception as e:
+                self.logger.error(f"Fast path classification failed: {e}", exc_info=True)
+                trivial = None
+            
+            if trivial is not None:
+                action, reason = trivial
+                duration = timer.get_elapsed_time()
+                self.stats.record_fast_path(reason, duration)
+                self.stats.record_latency(duration)
+                self.decision_log.record(
+                    "fast_path", player=self.player_id, action=action,
+                    reason=reason, ms=round(duration * 1000, 3)
+                )
+                self.logger.debug("Fast path (%s): action=%s, time=%.4fs", reason, action, duration)
+                return action
         
+        self.profiler.begin()
+        try:
+            return self._decide(message, timer)
+        finally:
+            self.profiler.end()
+            self.stats.record_latency(timer.get_elapsed_time(), pipeline=True)
+    
+    def _decide(self, message: dict, timer: DecisionTimer) -> int:
+        """Run the decision pipeline against the timer's deadline."""
         # ========== Step 0: Critical Rules Check (Task 1.2.1 & 1.2.2) ==========
         # 在 decide() 开头添加关键规则检查
         # 如果关键规则触发，直接返回动作
         try:
-            critical_start = time.time()
+            critical_start = time.perf_counter()
             critical_action = self._apply_critical_rules(message)
-            critical_duration = time.time() - critical_start
+            critical_duration = time.perf_counter() - critical_start
             
             if critical_action is not None:
-                duration = time.time() - start_time
+                duration = timer.get_elapsed_time()
                 self.stats.record_success("CriticalRules", duration)
-                self.logger.info(
-                    f"✓ Critical Rule triggered: action={critical_action}, "
-                    f"time={duration:.3f}s"
+                self.decision_log.record(
+                    "decision", player=self.player_id, action=critical_action,
+                    layer="CriticalRules", ms=round(duration * 1000, 3)
                 )
+                self.logger.info("✓ Critical Rule triggered: action=%s, time=%.3fs", critical_action, duration)
                 return critical_action
             
-            self.logger.debug(f"No critical rules triggered ({critical_duration:.3f}s)")
+            self.logger.debug("No critical rules triggered (%.3fs)", critical_duration)
             
         except Exception as e:
             # Critical rules should not fail, but log if they do
@@ -107,47 +185,53 @@ class HybridDecisionEngineV4:
         # 修改 Layer 1/2 为候选生成模式
         # 从 Layer 1 (YF) 和 Layer 2 (DecisionEngine) 生成多个候选动作
         try:
-            candidates_start = time.time()
-            candidates = self._generate_candidates(message)
-            candidates_duration = time.time() - candidates_start
+            candidates_start = time.perf_counter()
+            candidates = self._generate_candidates(message, timer)
+            candidates_duration = time.perf_counter() - candidates_start
             
             if not candidates:
                 # No candidates generated, fall back to random
                 self.logger.warning("No candidates generated, using random fallback")
                 action = self._random_valid_action(message)
-                duration = time.time() - start_time
+                duration = timer.get_elapsed_time()
                 self.stats.record_success("Random", duration)
                 return action
             
             self.logger.debug(
-                f"Generated {len(candidates)} candidates in {candidates_duration:.3f}s "
-                f"(from Layer 1+2)"
+                "Generated %d candidates in %.3fs (from Layer 1+2)", len(candidates), candidates_duration
             )
             
         except Exception as e:
             # Candidate generation failed, fall back to random
             self.logger.error(f"Candidate generation failed: {e}", exc_info=True)
+            self.decision_log.record("error", player=self.player_id, step="candidates", error=str(e))
             action = self._random_valid_action(message)
-            duration = time.time() - start_time
+            duration = timer.get_elapsed_time()
             self.stats.record_success("Random", duration)
             return action
         
         # ========== Step 2: Knowledge Enhancement (Task 1.2.4) ==========
         # 添加 Layer 3 增强评分
         # 对所有候选动作应用知识库规则进行评分增强
+        enhance_start = time.perf_counter()
         try:
-            enhance_start = time.time()
-            enhanced_candidates = self._enhance_candidates(candidates, message)
-            enhance_duration = time.time() - enhance_start
+            enhanced_candidates = self._run_layer(
+                "KnowledgeEnhanced",
+                lambda: self._enhance_candidates(candidates, message),
+                timer
+            )
+            enhance_duration = time.perf_counter() - enhance_start
             
-            if not enhanced_candidates:
+            if enhanced_candidates is None:
+                # 熔断或时间不足：跳过增强，直接使用原始候选
+                enhanced_candidates = candidates
+            elif not enhanced_candidates:
                 # Enhancement failed, use original candidates
                 self.logger.warning("Enhancement failed, using original candidates")
                 enhanced_candidates = candidates
             else:
                 self.logger.debug(
-                    f"Enhanced {len(enhanced_candidates)} candidates in {enhance_duration:.3f}s "
-                    f"(Layer 3 applied)"
+                    "Enhanced %d candidates in %.3fs (Layer 3 applied)", len(enhanced_candidates), enhance_duration
                 )
                 self.stats.record_success("KnowledgeEnhanced", enhance_duration)
             
@@ -160,11 +244,9 @@ class HybridDecisionEngineV4:
         # 选择最优动作返回
         # 从增强后的候选列表中选择评分最高的动作
         try:
-            select_start = time.time()
             best_action = self._select_best(enhanced_candidates)
-            select_duration = time.time() - select_start
             
-            duration = time.time() - start_time
+            duration = timer.get_elapsed_time()
             
             # Determine which layer provided the final decision
             # (for statistics tracking)
@@ -180,10 +262,17 @@ class HybridDecisionEngineV4:
             # Log decision details
             best_score = next((score for idx, score, _ in enhanced_candidates if idx == best_action), 0)
             best_layer = next((layer for idx, _, layer in enhanced_candidates if idx == best_action), "Unknown")
+            # 每个提出了最终动作的候选层都计入收益
+            for layer in self._proposers.get(best_action, [best_layer]):
+                self.stats.record_selected(layer)
             
+            self.decision_log.record(
+                "decision", player=self.player_id, action=best_action, score=best_score,
+                layer=best_layer, candidates=len(candidates), ms=round(duration * 1000, 3)
+            )
             self.logger.info(
-                f"✓ Decision complete: action={best_action} (score={best_score:.1f}, "
-                f"layer={best_layer}), candidates={len(candidates)}, time={duration:.3f}s"
+                "✓ Decision complete: action=%s (score=%.1f, layer=%s), candidates=%d, time=%.3fs",
+                best_action, best_score, best_layer, len(candidates), duration
             )
             
             return best_action
@@ -191,65 +280,197 @@ class HybridDecisionEngineV4:
         except Exception as e:
             # Selection failed, fall back to random
             self.logger.error(f"Action selection failed: {e}", exc_info=True)
+            self.decision_log.record("error", player=self.player_id, step="select", error=str(e))
             action = self._random_valid_action(message)
-            duration = time.time() - start_time
+            duration = timer.get_elapsed_time()
             self.stats.record_success("Random", duration)
             return action
     
+    # ========== Deadline Scheduling ==========
+    
+    def _has_time_for(self, layer: str, timer: DecisionTimer) -> bool:
+        """
+        Check whether a layer fits in the remaining budget.
+        
+        The layer's estimated cost (moving average of past runs) plus
+        config["deadline_reserve"] (time kept for selection and sending)
+        must fit before the deadline. Skips are recorded in statistics.
+        
+        Args:
+            layer: Layer name
+            timer: Decision timer carrying the deadline
+            
+        Returns:
+            True if the layer should run
+        """
+        reserve = self.config.get("deadline_reserve", 0.05)
+        if timer.has_time_for(self._layer_cost.get(layer) or 0.0, reserve):
+            return True
+        
+        self.stats.record_deadline_skip(layer)
+        self.decision_log.record(
+            "layer", player=self.player_id, layer=layer, event="deadline_skip",
+            left_ms=round(timer.get_remaining_time() * 1000, 3)
+        )
+        self.logger.debug(
+            "Skipping %s for time: %.0fms left, estimated %.0fms",
+            layer, timer.get_remaining_time() * 1000, (self._layer_cost.get(layer) or 0.0) * 1000
+        )
+        return False
+    
+    def _run_layer(self, layer: str, call, timer: Optional[DecisionTimer]):
+        """
+        Run one layer behind its circuit breaker and the deadline.
+        
+        Failures are detected through stats.record_failure() (the _try_*
+        methods record their own exceptions); slow calls count against the
+        breaker's latency threshold. The first call of each layer includes
+        its lazy initialization and is left out of the breaker window, as
+        it is left out of the cost estimate (see _observe_cost()).
+        
+        Args:
+            layer: Layer name
+            call: Zero-argument callable running the layer
+            timer: Decision timer (None: no deadline)
+            
+        Returns:
+            The layer's result, or None if the layer was skipped
+        """
+        if not self.breaker.allow(layer):
+            self.stats.record_breaker_skip(layer)
+            return None
+        if timer is not None and not self._has_time_for(layer, timer):
+            self.breaker.release(layer)
+            return None
+        
+        failures_before = self.stats.layer_usage[layer]["failure"]
+        initializing = layer not in self._layer_cost
+        outer_layer, self.profiler.layer = self.profiler.layer, layer
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as e:
+            self.stats.record_failure(layer, str(e))
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.profiler.layer = outer_layer
+            failed = self.stats.layer_usage[layer]["failure"] > failures_before
+            self._observe_cost(layer, duration)
+            state = None
+            if not initializing:
+                self.stats.record_layer_call(layer, not failed, duration)
+                state = self.breaker.record(layer, self.stats.get_layer_window(layer))
+            if state is not None:
+                self.decision_log.record("layer", player=self.player_id, layer=layer, event=state)
+                self.logger.warning("Circuit breaker: %s -> %s", layer, state)
+                if state == LayerCircuitBreaker.CLOSED:
+                    # 探测成功，丢弃熔断前的历史记录
+                    self.stats.clear_layer_window(layer)
+        return result
+    
+    def _candidate_layer_order(self) -> List[str]:
+        """
+        Order candidate layers by observed benefit/cost in the current game.
+        
+        Benefit is the number of decisions whose final action the layer
+        proposed; cost is its estimated latency. Until every layer has been
+        selected at least once, the default order (YF first) is kept.
+        The Learned layer takes part when config["learned_model"] is set.
+        
+        The order only decides which layers still fit when the deadline is
+        near; candidates are merged independently of it. With
+        config["adaptive_layer_order"] = False the default order is always
+        used (replay and self-play: no dependence on measured latency).
+        
+        Returns:
+            Candidate layer names in call order
+        """
+        order = [layer for layer in CANDIDATE_LAYERS
+                 if layer != "Learned" or self.config.get("learned_model")]
+        selected = self.stats.selected_layers
+        if not self.config.get("adaptive_layer_order", True):
+            return order
+        if not all(selected.get(layer) for layer in order):
+            return order
+        
+        def value(layer: str) -> float:
+            cost = self._layer_cost.get(layer) or 0.001
+            return selected[layer] / max(cost, 0.001)
+        
+        return sorted(order, key=value, reverse=True)
+    
+    def _observe_cost(self, layer: str, duration: float):
+        """
+        Update a layer's estimated cost (exponential moving average).
+        
+        The first run of each layer is ignored because it includes the
+        lazy initialization of the layer.
+        """
+        if layer not in self._layer_cost:
+            self._layer_cost[layer] = None
+        elif self._layer_cost[layer] is None:
+            self._layer_cost[layer] = duration
+        else:
+            self._layer_cost[layer] = 0.8 * self._layer_cost[layer] + 0.2 * duration
+    
     # ========== Enhanced Architecture Methods ==========
     
-    def _generate_candidates(self, message: dict) -> List[tuple]:
+    def _generate_candidates(self, message: dict, timer: Optional[DecisionTimer] = None) -> List[tuple]:
         """
         Generate candidate actions from Layer 1 (YF) and Layer 2 (DecisionEngine).
         
         Enhanced mode: Generate multiple candidates from each layer for better selection.
         
         Returns list of (action_index, base_score, source_layer) tuples.
+        Layers run in _candidate_layer_order(), but the merge does not depend
+        on it: an action proposed by several layers keeps its highest score
+        (ties go to the earlier layer in CANDIDATE_LAYERS), candidates are
+        listed in CANDIDATE_LAYERS order, and every proposing layer is
+        remembered in self._proposers for benefit accounting.
         
         Args:
             message: Game state message
+            timer: Decision timer; layers that do not fit before its deadline are skipped
             
         Returns:
             List of candidates: [(action_idx, score, layer), ...]
         """
         candidates = []
-        candidate_indices = set()  # Track unique candidates to avoid duplicates
-        
-        # ========== Layer 1: YF Strategy (Task 1.3.1) ==========
-        # 修改为调用返回候选列表的方法
-        try:
-            yf_candidates = self._try_yf(message)  # 现在返回 List[tuple] (action_idx, score)
-            
-            for action_idx, score in yf_candidates:
-                if action_idx not in candidate_indices:
-                    # YF的候选，保持原有评分，标记来源为YF
-                    candidates.append((action_idx, score, "YF"))
-                    candidate_indices.add(action_idx)
-                    self.logger.debug(f"YF candidate: action={action_idx}, score={score:.1f}")
-            
-            if yf_candidates:
-                self.logger.debug(f"YF generated {len(yf_candidates)} candidate(s)")
-            
-        except Exception as e:
-            self.logger.warning(f"YF candidate generation failed: {e}")
+        self._proposers = {}
+        proposed = {}  # layer -> [(action_idx, score), ...]
+        
+        # Layer 1: YF Strategy (Task 1.3.1), Layer 2: DecisionEngine (Task 1.3.2)
+        # 调用顺序按本局观察到的成本/收益自适应调整（见 _candidate_layer_order），只影响临近截止时间时跳过哪一层
+        layer_calls = {
+            "YF": lambda: self._try_yf(message),
+            "DecisionEngine": lambda: self._try_decision_engine(message, timer),
+            "Learned": lambda: self._try_learned(message),
+        }
         
-        # ========== Layer 2: DecisionEngine (Task 1.3.2) ==========
-        # 修改为调用返回候选列表的方法
-        try:
-            de_candidates = self._try_decision_engine(message)  # 现在返回 List[tuple] (action_idx, score)
-            
-            for action_idx, score in de_candidates:
-                if action_idx not in candidate_indices:
-                    # DecisionEngine的候选，保持原有评分，标记来源为DecisionEngine
-                    candidates.append((action_idx, score, "DecisionEngine"))
-                    candidate_indices.add(action_idx)
-                    self.logger.debug(f"DecisionEngine candidate: action={action_idx}, score={score:.1f}")
-            
-            if de_candidates:
-                self.logger.debug(f"DecisionEngine generated {len(de_candidates)} candidate(s)")
-            
-        except Exception as e:
-            self.logger.warning(f"DecisionEngine candidate generation failed: {e}")
+        for layer in self._candidate_layer_order():
+            try:
+                layer_candidates = self._run_layer(layer, layer_calls[layer], timer) or []
+                if layer_candidates:
+                    proposed[layer] = layer_candidates
+                    self.logger.debug("%s generated %s candidate(s)", layer, len(layer_candidates))
+                
+            except Exception as e:
+                self.logger.warning(f"{layer} candidate generation failed: {e}")
+        
+        # 按固定的层优先级合并：同一动作取最高分（同分时保留优先级高的层），与调用顺序无关
+        best = {}  # action_idx -> position in candidates
+        for layer in CANDIDATE_LAYERS:
+            for action_idx, score in proposed.get(layer, ()):
+                proposers = self._proposers.setdefault(action_idx, [])
+                if layer not in proposers:
+                    proposers.append(layer)
+                if action_idx not in best:
+                    best[action_idx] = len(candidates)
+                    candidates.append((action_idx, score, layer))
+                elif score > candidates[best[action_idx]][1]:
+                    candidates[best[action_idx]] = (action_idx, score, layer)
+                self.logger.debug("%s candidate: action=%s, score=%.1f", layer, action_idx, score)
         
         # ========== Fallback: If no candidates ==========
         # If no candidates, add all valid actions with low scores
@@ -260,7 +481,7 @@ class HybridDecisionEngineV4:
                     candidates.append((idx, 50.0, "Fallback"))
                 self.logger.warning(f"Using fallback: all {len(action_list)} actions as candidates")
         
-        self.logger.debug(f"Generated {len(candidates)} total candidates from Layer 1+2")
+        self.logger.debug("Generated %s total candidates from Layer 1+2", len(candidates))
         return candidates
     
     def _enhance_candidates(self, candidates: List[tuple], message: dict) -> List[tuple]:
@@ -272,7 +493,8 @@ class HybridDecisionEngineV4:
             message: Game state message
             
         Returns:
-            Enhanced list of (action_idx, enhanced_score, layer) tuples
+            Enhanced list of (action_idx, enhanced_score, layer) tuples;
+            an empty list if enhancement failed (the failure is recorded here)
         """
         try:
             # Initialize knowledge layer if needed
@@ -298,8 +520,11 @@ class HybridDecisionEngineV4:
             return enhanced_candidates
             
         except Exception as e:
-            self.logger.error(f"Knowledge enhancement error: {e}", exc_info=True)
-            return candidates
+            # 只在首次失败时输出完整堆栈，避免每次决策都格式化traceback
+            self.logger.error(f"Knowledge enhancement error: {e}",
+                              exc_info=self.stats.is_first_failure("KnowledgeEnhanced"))
+            self.stats.record_failure("KnowledgeEnhanced", str(e))
+            return []
     
     def _select_best(self, candidates: List[tuple]) -> int:
         """
@@ -320,9 +545,7 @@ class HybridDecisionEngineV4:
         # Return best action
         best_action, best_score, best_layer = sorted_candidates[0]
         
-        self.logger.debug(
-            f"Best action: {best_action} (score={best_score:.1f}, layer={best_layer})"
-        )
+        self.logger.debug("Best action: %s (score=%.1f, layer=%s)", best_action, best_score, best_layer)
         
         return best_action
     
@@ -378,18 +601,19 @@ class HybridDecisionEngineV4:
                         self.logger.warning(f"Invalid action {action_idx} for empty actionList")
             
             if valid_candidates:
-                self.logger.debug(f"YF generated {len(valid_candidates)} valid candidate(s)")
+                self.logger.debug("YF generated %s valid candidate(s)", len(valid_candidates))
                 return valid_candidates
             else:
                 self.logger.warning("YF candidates all invalid, returning empty list")
                 return []
                 
         except Exception as e:
-            # 错误处理：捕获异常，返回空列表
-            self.logger.error(f"YF decision error: {e}", exc_info=True)
+            # 错误处理：捕获异常，返回空列表（只在首次失败时输出完整堆栈）
+            self.logger.error(f"YF decision error: {e}", exc_info=self.stats.is_first_failure("YF"))
+            self.stats.record_failure("YF", str(e))
             return []
     
-    def _try_decision_engine(self, message: dict) -> List[tuple]:
+    def _try_decision_engine(self, message: dict, timer: Optional[DecisionTimer] = None) -> List[tuple]:
         """
         Try DecisionEngine layer and return candidate actions.
         
@@ -397,6 +621,7 @@ class HybridDecisionEngineV4:
         
         Args:
             message: Game state message
+            timer: Decision timer; evaluation stops at its deadline
             
         Returns:
             List of (action_idx, score) tuples, sorted by score descending
@@ -416,19 +641,22 @@ class HybridDecisionEngineV4:
                 self.logger.info("DecisionEngine initialized (lazy)")
             
             # 获取所有评估结果（top-k）
-            evaluations = self._get_top_evaluations(message, top_k=5)
+            evaluations = self._get_top_evaluations(message, top_k=5, timer=timer)
             
             if evaluations:
                 # 将评估结果转换为候选列表
                 # 评估结果已经是 (action_idx, score) 格式
                 candidates = evaluations
-                self.logger.debug(
-                    f"DecisionEngine generated {len(candidates)} candidates: "
-                    f"{[idx for idx, _ in candidates[:3]]}..."
-                )
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "DecisionEngine generated %d candidates: %s...",
+                        len(candidates), [idx for idx, _ in candidates[:3]]
+                    )
             else:
                 # 如果获取评估失败，尝试使用decide()方法获取单一动作
-                action = self.decision_engine.decide(message)
+                action = self.decision_engine.decide(
+                    message, deadline=timer.deadline if timer is not None else None
+                )
                 
                 # 验证返回的action有效性
                 action_list = message.get("actionList", [])
@@ -448,7 +676,7 @@ class HybridDecisionEngineV4:
                 # 检查action是否在有效范围内
                 if 0 <= action < len(action_list):
                     candidates.append((action, 80.0))
-                    self.logger.debug(f"DecisionEngine fallback: single candidate {action}")
+                    self.logger.debug("DecisionEngine fallback: single candidate %s", action)
                 else:
                     self.logger.warning(f"Action {action} out of range [0, {len(action_list)})")
                     return []
@@ -456,11 +684,14 @@ class HybridDecisionEngineV4:
             return candidates
                 
         except Exception as e:
-            # 错误处理：捕获异常，返回空列表
-            self.logger.error(f"DecisionEngine decision error: {e}", exc_info=True)
+            # 错误处理：捕获异常，返回空列表（只在首次失败时输出完整堆栈）
+            self.logger.error(f"DecisionEngine decision error: {e}",
+                              exc_info=self.stats.is_first_failure("DecisionEngine"))
+            self.stats.record_failure("DecisionEngine", str(e))
             return []
     
-    def _get_top_evaluations(self, message: dict, top_k: int = 3) -> List[tuple]:
+    def _get_top_evaluations(self, message: dict, top_k: int = 3,
+                             timer: Optional[DecisionTimer] = None) -> List[tuple]:
         """
         Get top-k evaluated actions from DecisionEngine.
         
@@ -470,6 +701,7 @@ class HybridDecisionEngineV4:
         Args:
             message: Game state message
             top_k: Number of top candidates to return
+            timer: Decision timer; only actions evaluated before its deadline are ranked
             
         Returns:
             List of (action_idx, score) tuples, sorted by score descending
@@ -493,7 +725,7 @@ class HybridDecisionEngineV4:
             
             # Use DecisionEngine's evaluator to get all evaluations
             evaluations = self.decision_engine.evaluator.evaluate_all_actions(
-                action_list, cur_action
+                action_list, cur_action, timer
             )
             
             # Sort by score descending and take top-k
@@ -503,7 +735,45 @@ class HybridDecisionEngineV4:
             return top_evaluations
             
         except Exception as e:
-            self.logger.debug(f"Failed to get top evaluations: {e}")
+            self.logger.debug("Failed to get top evaluations: %s", e)
+            return []
+    
+    def _learned_state_manager(self):
+        """State manager feeding card tracking to the learned layer (created on first use)."""
+        if self.learned_state is None:
+            from game_logic.enhanced_state import EnhancedGameStateManager
+            self.learned_state = EnhancedGameStateManager()
+        return self.learned_state
+    
+    def _try_learned(self, message: dict) -> List[tuple]:
+        """
+        Score all legal actions with the learned model and return the top candidates.
+        
+        The model file is config["learned_model"]; config["learned_top_k"]
+        (default 3) candidates are returned, scored as softmax probability x 100.
+        
+        Args:
+            message: Game state message
+            
+        Returns:
+            List of (action_idx, score) tuples, sorted by score descending
+            Returns empty list if the model cannot be loaded or fails
+        """
+        try:
+            if self.learned is None:
+                from decision.learned_evaluator import LearnedEvaluator
+                self.learned = LearnedEvaluator.load(self.config["learned_model"])
+                self.logger.info("LearnedEvaluator loaded (lazy): %s", self.config["learned_model"])
+            
+            state = self._learned_state_manager()
+            state.update_from_message(message)
+            return self.learned.top_candidates(
+                message, state.card_tracker, self.config.get("learned_top_k", 3)
+            )
+        
+        except Exception as e:
+            self.logger.error(f"Learned layer error: {e}", exc_info=self.stats.is_first_failure("Learned"))
+            self.stats.record_failure("Learned", str(e))
             return []
     
     def _try_knowledge_enhanced(self, message: dict) -> Optional[int]:
@@ -595,7 +865,7 @@ class HybridDecisionEngineV4:
             action_index = random.randint(0, list_length - 1)
             action_index = action_index % list_length  # Extra safety
             
-            self.logger.debug(f"Random selection from {list_length} actions: {action_index}")
+            self.logger.debug("Random selection from %s actions: %s", list_length, action_index)
             return action_index
             
         except Exception as e:
@@ -614,13 +884,67 @@ class HybridDecisionEngineV4:
         Returns:
             Statistics dictionary
         """
-        return self.stats.get_summary()
+        summary = self.stats.get_summary()
+        summary["circuit_breakers"] = self.breaker.get_states()
+        summary["decision_log"] = self.decision_log.get_summary()
+        if self.profiler.enabled:
+            summary["profiler"] = self.profiler.get_summary()
+        return summary
     
     def reset_statistics(self):
         """Reset statistics for new game."""
         self.stats.reset()
         self.logger.info("Statistics reset")
     
+    def observe(self, message: dict):
+        """
+        Feed a notify message (plays, episode end) to layers that track the game.
+        
+        Only the learned layer keeps its own card tracker; without a
+        learned model this is a no-op. Messages before the seat is known
+        (the "beginning" notify carries myPos) are ignored.
+        """
+        if self.config.get("learned_model"):
+            state = self._learned_state_manager()
+            if state.my_pos is not None or "myPos" in message:
+                state.update_from_message(message)
+    
+    def reset_game(self):
+        """
+        Reset per-game state so a long-lived client can start a new game.
+        
+        Clears statistics, layer cost estimates, the YF adapter's game
+        history and the shared state manager of the lazily built layers.
+        Circuit breaker state is kept: layer health is a property of the
+        process, not of one game (see reset_breakers()).
+        """
+        self.stats.reset()
+        # 各层已初始化：下一次调用的耗时直接作为估计值（不再当作延迟初始化丢弃）
+        self._layer_cost = dict.fromkeys(self._layer_cost)
+        if self.yf_adapter is not None:
+            self.yf_adapter.reset()
+        for layer in (self.decision_engine, self.knowledge_enhanced):
+            state = getattr(layer, "state", None)
+            if state is not None and hasattr(state, "reset"):
+                state.reset()
+        if self.learned_state is not None:
+            self.learned_state.reset()
+        self.logger.info("Game state reset")
+    
+    def reset_breakers(self):
+        """
+        Close every circuit breaker.
+        
+        Used where each game must start from the same engine state
+        (replay, self-play); live clients keep breaker state across games.
+        """
+        self.breaker.reset()
+    
+    def close(self):
+        """Flush and stop the decision log writer and the profiler."""
+        self.decision_log.close()
+        self.profiler.close()
+    
     # ========== Critical Rules Layer ==========
     
     def _apply_critical_rules(self, message: dict) -> Optional[int]:
@@ -970,16 +1294,30 @@ class DecisionStatistics:
     Track decision performance and layer usage statistics.
     """
     
-    def __init__(self):
+    def __init__(self, window: int = 20):
+        """
+        Args:
+            window: Size of the rolling per-layer call window (circuit breaker input)
+        """
+        self.window = window
         self.layer_usage = {
             "CriticalRules": {"success": 0, "failure": 0, "total_time": 0.0},
             "YF": {"success": 0, "failure": 0, "total_time": 0.0},
             "DecisionEngine": {"success": 0, "failure": 0, "total_time": 0.0},
             "KnowledgeEnhanced": {"success": 0, "failure": 0, "total_time": 0.0},
+            "Learned": {"success": 0, "failure": 0, "total_time": 0.0},
             "Random": {"success": 0, "failure": 0, "total_time": 0.0}
         }
         self.error_log = []
         self.decision_count = 0
+        self.deadline_skips = {}  # layer -> 因时间不足跳过的次数
+        self.latencies = []  # 每次decide()的总耗时（秒）
+        self.pipeline_time = 0.0  # 完整决策流程的累计耗时
+        self.pipeline_count = 0
+        self.fast_path = {"hits": {}, "total_time": 0.0, "time_saved": 0.0}
+        self.layer_windows = {}  # layer -> deque[(ok, duration)]，最近window次调用
+        self.breaker_skips = {}  # layer -> 熔断期间跳过的次数
+        self.selected_layers = {}  # layer -> 最终动作来自该层的次数（本局）
     
     def record_success(self, layer: str, duration: float):
         """
@@ -1010,6 +1348,115 @@ class DecisionStatistics:
                 "timestamp": time.time()
             })
     
+    def is_first_failure(self, layer: str) -> bool:
+        """Whether the layer has not failed yet (used to log a traceback once)."""
+        return self.layer_usage.get(layer, {}).get("failure", 0) == 0
+    
+    def record_layer_call(self, layer: str, ok: bool, duration: float):
+        """
+        Append a layer call to its rolling window.
+        
+        Args:
+            layer: Layer name
+            ok: Whether the call succeeded
+            duration: Call duration in seconds
+        """
+        window = self.layer_windows.get(layer)
+        if window is None:
+            window = self.layer_windows[layer] = deque(maxlen=self.window)
+        window.append((ok, duration))
+    
+    def get_layer_window(self, layer: str) -> List[tuple]:
+        """
+        Get the rolling window of recent calls for a layer.
+        
+        Returns:
+            List of (ok, duration) tuples, oldest first
+        """
+        return list(self.layer_windows.get(layer, ()))
+    
+    def clear_layer_window(self, layer: str):
+        """Drop the rolling window of a layer."""
+        self.layer_windows.pop(layer, None)
+    
+    def record_breaker_skip(self, layer: str):
+        """Record that a layer was skipped because its circuit is open."""
+        self.breaker_skips[layer] = self.breaker_skips.get(layer, 0) + 1
+    
+    def record_selected(self, layer: str):
+        """Record the layer that produced the final action."""
+        self.selected_layers[layer] = self.selected_layers.get(layer, 0) + 1
+    
+    def record_deadline_skip(self, layer: str):
+        """
+        Record that a layer was skipped because the deadline was near.
+        
+        Args:
+            layer: Layer name
+        """
+        self.deadline_skips[layer] = self.deadline_skips.get(layer, 0) + 1
+    
+    def record_latency(self, duration: float, pipeline: bool = False):
+        """
+        Record total decide() latency.
+        
+        Args:
+            duration: Decision duration in seconds
+            pipeline: True if the full pipeline ran (not the fast path)
+        """
+        self.latencies.append(duration)
+        if pipeline:
+            self.pipeline_time += duration
+            self.pipeline_count += 1
+    
+    def record_fast_path(self, reason: str, duration: float):
+        """
+        Record a fast-path decision.
+        
+        Time saved is estimated as the mean full-pipeline latency so far
+        minus the fast-path duration.
+        
+        Args:
+            reason: Fast path rule that fired
+            duration: Decision duration in seconds
+        """
+        hits = self.fast_path["hits"]
+        hits[reason] = hits.get(reason, 0) + 1
+        self.fast_path["total_time"] += duration
+        if self.pipeline_count:
+            saved = self.pipeline_time / self.pipeline_count - duration
+            self.fast_path["time_saved"] += max(0.0, saved)
+    
+    def get_fast_path_rate(self) -> float:
+        """
+        Fraction of decisions answered by the fast path.
+        
+        Returns:
+            Fast path rate (0.0 to 1.0)
+        """
+        total = len(self.latencies)
+        if total == 0:
+            return 0.0
+        return sum(self.fast_path["hits"].values()) / total
+    
+    def get_latency_percentiles(self) -> dict:
+        """
+        Get decision latency percentiles.
+        
+        Returns:
+            Dictionary with p50/p99/max latency in seconds
+        """
+        if not self.latencies:
+            return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+        
+        ordered = sorted(self.latencies)
+        last = len(ordered) - 1
+        return {
+            "p50": ordered[int(last * 0.50)],
+            "p99": ordered[int(last * 0.99)],
+            "max": ordered[-1]
+        }
+    
     def get_layer_success_rate(self, layer: str) -> float:
         """
         Calculate success rate for a layer.
@@ -1045,6 +1492,16 @@ class DecisionStatistics:
                 layer: self.get_layer_success_rate(layer)
                 for layer in self.layer_usage.keys()
             },
+            "deadline_skips": dict(self.deadline_skips),
+            "breaker_skips": dict(self.breaker_skips),
+            "selected_layers": dict(self.selected_layers),
+            "fast_path": {
+                "hits": dict(self.fast_path["hits"]),
+                "rate": self.get_fast_path_rate(),
+                "total_time": self.fast_path["total_time"],
+                "time_saved": self.fast_path["time_saved"]
+            },
+            "latency": self.get_latency_percentiles(),
             "recent_errors": self.error_log[-10:]  # Last 10 errors
         }
     
@@ -1055,10 +1512,118 @@ class DecisionStatistics:
             "YF": {"success": 0, "failure": 0, "total_time": 0.0},
             "DecisionEngine": {"success": 0, "failure": 0, "total_time": 0.0},
             "KnowledgeEnhanced": {"success": 0, "failure": 0, "total_time": 0.0},
+            "Learned": {"success": 0, "failure": 0, "total_time": 0.0},
             "Random": {"success": 0, "failure": 0, "total_time": 0.0}
         }
         self.error_log = []
         self.decision_count = 0
+        self.deadline_skips = {}
+        self.latencies = []
+        self.pipeline_time = 0.0
+        self.pipeline_count = 0
+        self.fast_path = {"hits": {}, "total_time": 0.0, "time_saved": 0.0}
+        self.layer_windows = {}
+        self.breaker_skips = {}
+        self.selected_layers = {}
+
+
+class LayerCircuitBreaker:
+    """
+    Per-layer circuit breaker driven by DecisionStatistics rolling windows.
+    
+    closed    -> layer runs normally
+    open      -> layer is skipped (error rate or mean latency over threshold)
+    half_open -> after `cooldown` decisions one probe call is allowed;
+                 a healthy probe closes the circuit, a bad one reopens it
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, min_samples: int = 5, max_error_rate: float = 0.5,
+                 max_latency: float = 0.3, cooldown: int = 30):
+        """
+        Args:
+            min_samples: Minimum calls in the window before the circuit can open
+            max_error_rate: Error rate (0.0-1.0) that opens the circuit
+            max_latency: Mean call latency (seconds) that opens the circuit
+            cooldown: Number of skipped calls before a probe is allowed
+        """
+        self.min_samples = min_samples
+        self.max_error_rate = max_error_rate
+        self.max_latency = max_latency
+        self.cooldown = cooldown
+        self.states: Dict[str, str] = {}
+        self._skipped: Dict[str, int] = {}
+    
+    def allow(self, layer: str) -> bool:
+        """
+        Check whether a layer may run now.
+        
+        Args:
+            layer: Layer name
+            
+        Returns:
+            True if the layer should be called (normally or as a probe)
+        """
+        state = self.states.get(layer, self.CLOSED)
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            return False  # 已有探测调用在进行
+        
+        self._skipped[layer] = self._skipped.get(layer, 0) + 1
+        if self._skipped[layer] > self.cooldown:
+            self.states[layer] = self.HALF_OPEN
+            return True
+        return False
+    
+    def release(self, layer: str):
+        """Give back a probe slot that was not used (e.g. skipped for time)."""
+        if self.states.get(layer) == self.HALF_OPEN:
+            self.states[layer] = self.OPEN
+    
+    def record(self, layer: str, window: List[tuple]) -> Optional[str]:
+        """
+        Update the circuit after a call.
+        
+        Args:
+            layer: Layer name
+            window: Rolling window of (ok, duration), the last entry being this call
+            
+        Returns:
+            New state if it changed, None otherwise
+        """
+        if not window:
+            return None
+        state = self.states.get(layer, self.CLOSED)
+        
+        if state == self.HALF_OPEN:
+            ok, duration = window[-1]
+            new_state = self.CLOSED if ok and duration <= self.max_latency else self.OPEN
+        elif state == self.CLOSED and len(window) >= self.min_samples:
+            error_rate = sum(1 for ok, _ in window if not ok) / len(window)
+            mean_latency = sum(duration for _, duration in window) / len(window)
+            if error_rate >= self.max_error_rate or mean_latency > self.max_latency:
+                new_state = self.OPEN
+            else:
+                return None
+        else:
+            return None
+        
+        self.states[layer] = new_state
+        self._skipped[layer] = 0
+        return new_state if new_state != state else None
+    
+    def get_states(self) -> Dict[str, str]:
+        """Get the current state of every layer that has been tracked."""
+        return dict(self.states)
+    
+    def reset(self):
+        """Close every circuit and forget skip counts."""
+        self.states = {}
+        self._skipped = {}
 
 
 
@@ -1073,7 +1638,12 @@ def _add_methods_to_engine():
     
     def get_statistics(self):
         """Get decision statistics."""
-        return self.stats.get_summary()
+        summary = self.stats.get_summary()
+        summary["circuit_breakers"] = self.breaker.get_states()
+        summary["decision_log"] = self.decision_log.get_summary()
+        if self.profiler.enabled:
+            summary["profiler"] = self.profiler.get_summary()
+        return summary
     
     HybridDecisionEngineV4.reset_statistics = reset_statistics
     HybridDecisionEngineV4.get_statistics = get_statistics
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+学习型动作评估 (Learned Evaluator)
+功能：
+- 从权重文件（.npz）加载小型MLP/线性模型，一次前向计算为 actionList 中的全部合法动作打分
+- 输入为 game_logic.features 的 (状态特征 + 动作特征) 矩阵，输出每个动作的logit
+- 只依赖NumPy（CPU），常见的几十个合法动作时，单次决策的特征提取 + 前向计算约0.1ms
+
+模型文件（train_evaluator.py 写出）：
+    w0, b0, w1, b1, ...   各层权重（最后一层输出1维，隐藏层ReLU；只有 w0/b0 时为线性模型）
+    mean, std             输入标准化参数（加载时并入第一层）
+    state_features, action_features    训练时的特征名（与当前 FeatureExtractor 不一致时拒绝加载）
+
+用法：
+    evaluator = LearnedEvaluator.load("models/evaluator.npz")
+    logits = evaluator.score_actions(message, tracker=state_manager.card_tracker)
+    candidates = evaluator.top_candidates(message, tracker, top_k=3)    # [(下标, 分数), ...]
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from game_logic.features import ACTION_FEATURES, STATE_FEATURES, FeatureExtractor
+
+
+# 候选分数 = 动作的softmax概率 × SCORE_SCALE（与DecisionEngine评分处于同一量级）
+SCORE_SCALE = 100.0
+
+logger = logging.getLogger(__name__)
+
+
+class LearnedEvaluator:
+    """批量动作评估模型（无内部状态，记牌信息由调用方提供）"""
+
+    def __init__(self, weights: Sequence[Tuple[np.ndarray, np.ndarray]],
+                 mean: Optional[np.ndarray] = None, std: Optional[np.ndarray] = None,
+                 metadata: Optional[Dict] = None):
+        """
+        Args:
+            weights: [(W, b), ...]，W 形状为 (输入, 输出)，最后一层输出1维
+            mean, std: 输入标准化参数（None 表示不标准化）
+            metadata: 训练信息（写回模型文件时保留）
+        """
+        self.weights = [(np.asarray(w, np.float32), np.asarray(b, np.float32)) for w, b in weights]
+        self.mean = None if mean is None else np.asarray(mean, np.float32)
+        self.std = None if std is None else np.asarray(std, np.float32)
+        self.metadata = dict(metadata or {})
+        self.extractor = FeatureExtractor()
+
+        # 标准化并入第一层：((x - mean) / std) @ W + b = x @ (W / std) + (b - (mean / std) @ W)
+        layers = list(self.weights)
+        if self.mean is not None and self.std is not None:
+            w, b = layers[0]
+            scaled = w / self.std[:, None]
+            layers[0] = (scaled, b - self.mean @ scaled)
+        self._layers = layers
+        # 第一层按输入拆分：状态部分每个局面只算一次，不必复制到每个候选动作
+        w, b = layers[0]
+        self._state_weights = np.ascontiguousarray(w[:len(STATE_FEATURES)])
+        self._action_weights = np.ascontiguousarray(w[len(STATE_FEATURES):])
+
+    @property
+    def input_dim(self) -> int:
+        return self.weights[0][0].shape[0]
+
+    @classmethod
+    def load(cls, path: str) -> "LearnedEvaluator":
+        """
+        加载模型文件
+
+        Raises:
+            ValueError: 文件中的特征名与当前特征编码不一致
+        """
+        with np.load(path, allow_pickle=False) as data:
+            names = (tuple(data["state_features"]), tuple(data["action_features"]))
+            if names != (STATE_FEATURES, ACTION_FEATURES):
+                raise ValueError(f"{path}: 模型的特征编码与 game_logic.features 不一致，需要重新训练")
+            weights = []
+            while f"w{len(weights)}" in data:
+                i = len(weights)
+                weights.append((data[f"w{i}"], data[f"b{i}"]))
+            if not weights:
+                raise ValueError(f"{path}: 没有模型权重")
+            metadata = {key[5:]: data[key].item() for key in data.files if key.startswith("meta_")}
+            model = cls(weights, data["mean"] if "mean" in data else None,
+                        data["std"] if "std" in data else None, metadata)
+        if model.input_dim != len(STATE_FEATURES) + len(ACTION_FEATURES):
+            raise ValueError(f"{path}: 输入维度 {model.input_dim} 与特征维度不一致")
+        return model
+
+    def save(self, path: str):
+        """写出模型文件（原始权重和标准化参数，以及训练信息 meta_*）"""
+        arrays = {"state_features": np.array(STATE_FEATURES), "action_features": np.array(ACTION_FEATURES)}
+        for i, (w, b) in enumerate(self.weights):
+            arrays[f"w{i}"] = w
+            arrays[f"b{i}"] = b
+        if self.mean is not None:
+            arrays["mean"] = self.mean
+            arrays["std"] = self.std
+        for key, value in self.metadata.items():
+            arrays[f"meta_{key}"] = np.array(value)
+        np.savez(path, **arrays)
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """(M, 输入) → 每行的logit (M,)"""
+        return self._forward_from(x @ self._layers[0][0] + self._layers[0][1])
+
+    def _forward_from(self, h: np.ndarray) -> np.ndarray:
+        """第一层线性输出 → logit"""
+        for w, b in self._layers[1:]:
+            np.maximum(h, 0, out=h)
+            h = h @ w + b
+        return h[:, 0]
+
+    def score_actions(self, message: dict, tracker=None) -> np.ndarray:
+        """act消息中全部合法动作的logit（与 actionList 下标对应）"""
+        state, actions = self.extractor.extract(message, tracker)
+        bias = state @ self._state_weights + self._layers[0][1]
+        return self._forward_from(actions @ self._action_weights + bias)
+
+    def top_candidates(self, message: dict, tracker=None, top_k: int = 3) -> List[Tuple[int, float]]:
+        """
+        分数最高的 top_k 个动作
+
+        Returns:
+            [(动作下标, softmax概率 × SCORE_SCALE), ...]，按分数降序
+        """
+        if not message.get("actionList"):
+            return []
+        logits = self.score_actions(message, tracker)
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        order = np.argsort(-probs)[:top_k]
+        return [(int(i), float(probs[i] * SCORE_SCALE)) for i in order]
@@ -17,6 +17,7 @@ if str(Path(__file__).parent.parent) not in sys.path:
 from game_logic.enhanced_state import EnhancedGameStateManager
 from game_logic.hand_combiner import HandCombiner
 from decision.cooperation import CooperationStrategy
+from decision import tuned_weights
 
 
 class MultiFactorEvaluator:
@@ -37,31 +38,29 @@ class MultiFactorEvaluator:
         self.combiner = combiner
         self.cooperation = cooperation
         
-        # 评估权重配置
-        self.weights = {
-            "remaining_cards": 0.25,
-            "card_type_value": 0.20,
-            "cooperation": 0.20,
-            "risk": 0.15,
-            "timing": 0.10,
-            "hand_structure": 0.10
-        }
+        # 评估权重配置（默认值见 tuned_weights.PARAMETERS，可由 GD_WEIGHTS 调参文件覆盖）
+        self.weights = tuned_weights.section("evaluation")
     
     def evaluate_all_actions(self, action_list: List[List], 
-                            target_action: Optional[List] = None) -> List[Tuple[int, float]]:
+                            target_action: Optional[List] = None,
+                            timer=None) -> List[Tuple[int, float]]:
         """
         评估所有可选动作
         
         Args:
             action_list: 动作列表
             target_action: 目标动作（被动出牌时）
+            timer: 决策计时器（可选），超时后停止评估剩余动作
         
         Returns:
             评估结果列表 [(索引, 分数), ...]，按分数降序排列
+            （超时时只包含已评估的动作）
         """
         evaluations = []
         
         for idx, action in enumerate(action_list):
+            if timer is not None and evaluations and timer.check_timeout():
+                break
             if action[0] == "PASS":
                 score = 0.0
             else:
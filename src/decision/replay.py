@@ -0,0 +1,481 @@
+# -*- coding: utf-8 -*-
+"""
+决策回放 (Decision Replay)
+功能：
+- 把对局记录（见 communication.recorder）中的消息按原顺序送入决策引擎，重新做出每个决策
+- 与记录中实际发出的actIndex、或另一个引擎（版本/权重）逐个比较，列出不一致的决策
+- 统计每个决策的耗时分布（p50/p90/p99/max）
+- 以局为单位分发到多个进程并行回放
+
+确定性：
+- 每个决策前按 (种子, 记录, 局号, 决策序号) 重置random，两个引擎看到相同的随机序列
+- V4引擎使用充足的时间预算、关闭延迟熔断、固定候选层顺序（adaptive_layer_order=False），
+  结果不受机器快慢影响
+- 每局从重置后的引擎开始（V4同时清除耗时估计和熔断状态），结果与进程数和回放顺序无关，
+  各局可以独立、并行回放
+
+用法：
+    python -m decision.replay recordings/ --engine v4
+    python -m decision.replay recordings/ --engine v4 --baseline knowledge --workers 8
+    python -m decision.replay recordings/ --engine decision:risk=0.25,timing=0.05 --baseline decision
+    python -m decision.replay recordings/ --engine knowledge:knowledge.active_play=40 --baseline knowledge
+    python -m decision.replay recordings/ --engine v4 --baseline yf    # 与 first_prize 规则比较
+"""
+
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# 将 src 目录添加到系统路径
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from communication.recorder import BlockInfo, list_segments, read_block, read_index
+from decision import tuned_weights
+
+
+# 可回放的引擎（yf: first_prize 的 State/Action 规则，random: 均匀随机选择合法动作）
+ENGINE_KINDS = ("v4", "knowledge", "decision", "yf", "random")
+
+FIRST_PRIZE_DIR = str(Path(__file__).parent.parent / "communication" / "first_prize")
+
+# 回放时的决策时间预算（秒）：足够大，不因超时跳过任何一层
+REPLAY_BUDGET = 60.0
+
+# 报告中列出的不一致决策条数
+MAX_REPORTED_MISMATCHES = 20
+
+
+@dataclass(frozen=True)
+class EngineSpec:
+    """引擎规格：类型 + 调参参数覆盖（见 tuned_weights，不带分组的名称为多因素评估权重）"""
+    kind: str
+    weights: Tuple[Tuple[str, float], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> "EngineSpec":
+        """
+        解析 "类型[:参数=值,...]"，例如 "knowledge:risk=0.25,knowledge.active_play=40"
+
+        Raises:
+            ValueError: 类型未知、权重格式错误或参数未登记
+        """
+        kind, _, weights_text = text.partition(":")
+        if kind not in ENGINE_KINDS:
+            raise ValueError(f"未知引擎: {kind}，可选: {', '.join(ENGINE_KINDS)}")
+        weights = []
+        for item in filter(None, weights_text.split(",")):
+            key, sep, value = item.partition("=")
+            if not sep:
+                raise ValueError(f"权重格式应为 名称=值: {item}")
+            weights.append((key.strip(), float(value)))
+        tuned_weights.validate(dict(_qualified(weights)))
+        return cls(kind, tuple(weights))
+
+    def __str__(self):
+        if not self.weights:
+            return self.kind
+        return f"{self.kind}:" + ",".join(f"{key}={value:g}" for key, value in self.weights)
+
+
+def _qualified(weights) -> List[Tuple[str, float]]:
+    """不带分组的名称补全为 evaluation.名称"""
+    return [(key if "." in key else "evaluation." + key, value) for key, value in weights]
+
+
+class ReplayEngine:
+    """按客户端的方式驱动一个决策引擎（哪些消息更新状态、何时决策）"""
+
+    def __init__(self, spec: EngineSpec, player_id: int):
+        self.spec = spec
+        self.player_id = player_id
+        self.state = None
+        self.engine = None
+        self._weighted = False  # 是否已写入过 spec 的参数覆盖
+        if spec.kind == "v4":
+            from decision.hybrid_decision_engine_v4 import HybridDecisionEngineV4
+            # 与yf1_v4相同的配置，但时间预算充足、不按延迟熔断、候选层顺序固定、只记录警告
+            self.engine = HybridDecisionEngineV4(player_id, {
+                "enable_lalala": True,
+                "enable_fallback": True,
+                "performance_threshold": 1.0,
+                "decision_budget": REPLAY_BUDGET,
+                "breaker_latency": float("inf"),
+                "adaptive_layer_order": False,
+                "log_mode": "production",
+                "learned_model": os.environ.get("GD_LEARNED_MODEL") or None,
+            })
+        elif spec.kind == "yf":
+            self._yf_state()
+        elif spec.kind != "random":
+            from game_logic.enhanced_state import EnhancedGameStateManager
+            self.state = EnhancedGameStateManager()
+            if spec.kind == "knowledge":
+                from knowledge.knowledge_enhanced_decision import KnowledgeEnhancedDecisionEngine
+                self.engine = KnowledgeEnhancedDecisionEngine(self.state, max_decision_time=REPLAY_BUDGET)
+            else:
+                from decision.decision_engine import DecisionEngine
+                self.engine = DecisionEngine(self.state, max_decision_time=REPLAY_BUDGET)
+
+    def _yf_state(self):
+        # 与 first_prize/client3.py 相同的导入方式（State/Action 依赖该目录下的 utils）
+        if FIRST_PRIZE_DIR not in sys.path:
+            sys.path.insert(0, FIRST_PRIZE_DIR)
+        from state import State
+        from action import Action
+        name = f"replay_p{self.player_id}"
+        self.state = State(name)
+        self.engine = Action(name)
+
+    def reset(self):
+        """开始新的一局"""
+        if self.spec.kind == "yf":
+            self._yf_state()
+        elif self.state is not None:
+            self.state.reset()
+        elif self.engine is not None:
+            # V4：熔断状态也按局重置，前面各局的出错不影响本局
+            self.engine.reset_game()
+            self.engine.reset_breakers()
+
+    def observe(self, data: dict):
+        """
+        收到一条消息（Test1/modern_client用全部消息更新状态；yf1_v4只把notify交给学习层；
+        first_prize 客户端用全部消息更新 State，State.parse 的打印输出被丢弃）
+        """
+        if self.spec.kind == "yf":
+            with contextlib.redirect_stdout(None):
+                try:
+                    self.state.parse(data)
+                except KeyError:
+                    pass  # State 不处理的消息阶段（client3 同样忽略）
+        elif self.state is not None:
+            self.state.update_from_message(data)
+        elif self.engine is not None and data.get("type") == "notify":
+            self.engine.observe(data)
+
+    def decide(self, data: dict) -> int:
+        """对act消息做出决策"""
+        if self.spec.kind == "random":
+            return random.randrange(len(data["actionList"]))
+        if self.spec.kind == "yf":
+            state = self.state
+            return self.engine.rule_parse(
+                data, state._myPos, state.remain_cards, state.history, state.remain_cards_classbynum,
+                state.pass_num, state.my_pass_num, state.tribute_result
+            )
+        if self.spec.weights or self._weighted:
+            self._apply_weights()
+        if self.state is None:
+            return self.engine.decide(data, deadline=time.perf_counter() + REPLAY_BUDGET)
+        return self.engine.decide(data)
+
+    def _apply_weights(self):
+        # V4的DecisionEngine/知识层/YF层是首次使用时才创建的，每次决策前检查；
+        # 先恢复默认值再覆盖，同一个引擎可以换用不同的 spec（自我对弈、调参）
+        params = tuned_weights.current()
+        params.update(_qualified(self.spec.weights))
+        layers = [self.engine, getattr(self.engine, "decision_engine", None),
+                  getattr(self.engine, "knowledge_enhanced", None), getattr(self.engine, "yf_adapter", None)]
+        for layer in layers:
+            if layer is not None:
+                tuned_weights.apply(layer, params)
+        self._weighted = bool(self.spec.weights)
+
+
+@dataclass
+class GameTask:
+    """一局回放任务（发送到工作进程）"""
+    recording: str
+    game: int
+    blocks: List[BlockInfo]
+    engine: EngineSpec
+    baseline: Optional[EngineSpec] = None
+    seed: int = 0
+
+
+@dataclass
+class GameResult:
+    """一局回放结果"""
+    recording: str
+    game: int
+    decisions: int = 0
+    agreed_recorded: int = 0
+    agreed_baseline: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+    baseline_latencies: List[float] = field(default_factory=list)
+    stages: Dict[str, List[int]] = field(default_factory=dict)  # 阶段 → [决策数, 与参照一致数]
+    mismatches: List[dict] = field(default_factory=list)
+
+
+# 工作进程内缓存的引擎（按规格和座位），避免每局重新加载知识库
+_engines: Dict[Tuple[EngineSpec, int], ReplayEngine] = {}
+
+
+def _engine(spec: EngineSpec, player_id: int) -> ReplayEngine:
+    key = (spec, player_id)
+    if key not in _engines:
+        _engines[key] = ReplayEngine(spec, player_id)
+    return _engines[key]
+
+
+def _timed_decide(engine: ReplayEngine, text: str, seed: str) -> Tuple[Optional[int], float]:
+    """用独立解析的消息（引擎可能修改消息）和固定随机种子做一次决策"""
+    random.seed(seed)
+    data = json.loads(text)
+    start = time.perf_counter()
+    try:
+        choice = engine.decide(data)
+    except Exception:
+        choice = None
+    return choice, time.perf_counter() - start
+
+
+def replay_game(task: GameTask) -> GameResult:
+    """
+    回放一局（在工作进程中运行）
+
+    Args:
+        task: 回放任务
+
+    Returns:
+        本局的比较结果和耗时
+    """
+    messages = [message for block in task.blocks for message in read_block(block)]
+    player_id = 0
+    for message in messages:
+        if message.direction == "recv" and '"myPos"' in message.text:
+            player_id = message.data().get("myPos", 0)
+            break
+
+    engine = _engine(task.engine, player_id)
+    baseline = _engine(task.baseline, player_id) if task.baseline else None
+    for replay_engine in (engine, baseline):
+        if replay_engine is not None:
+            replay_engine.reset()
+
+    result = GameResult(task.recording, task.game)
+    for i, message in enumerate(messages):
+        if message.direction != "recv":
+            continue
+        data = message.data()
+        engine.observe(data)
+        if baseline is not None:
+            baseline.observe(json.loads(message.text))
+        if data.get("type") != "act":
+            continue
+
+        # 记录中紧随其后的发送消息就是当时的选择
+        recorded = None
+        for j in range(i + 1, len(messages)):
+            reply = messages[j]
+            if reply.direction == "send":
+                recorded = json.loads(reply.text).get("actIndex")
+                break
+            if '"act"' in reply.text:
+                break
+
+        seed = f"{task.seed}:{task.recording}:{task.game}:{result.decisions}"
+        choice, latency = _timed_decide(engine, message.text, seed)
+        result.latencies.append(latency)
+        reference = recorded
+        if baseline is not None:
+            reference, baseline_latency = _timed_decide(baseline, message.text, seed)
+            result.baseline_latencies.append(baseline_latency)
+            result.agreed_baseline += choice == reference
+        result.agreed_recorded += choice == recorded
+        result.errors += choice is None
+
+        stage = data.get("stage", "play")
+        counts = result.stages.setdefault(stage, [0, 0])
+        counts[0] += 1
+        counts[1] += choice == reference
+        if choice != reference:
+            result.mismatches.append({
+                "recording": task.recording,
+                "game": task.game,
+                "episode": message.episode,
+                "decision": result.decisions,
+                "stage": stage,
+                "actions": len(data.get("actionList", [])),
+                "recorded": recorded,
+                "reference": reference,
+                "choice": choice,
+            })
+        result.decisions += 1
+    return result
+
+
+def plan_tasks(path: str, engine: EngineSpec, baseline: Optional[EngineSpec] = None,
+               name: Optional[str] = None, games: Optional[int] = None, seed: int = 0) -> List[GameTask]:
+    """
+    按局划分回放任务（只读取块头）
+
+    Args:
+        path: 记录目录或段文件
+        engine: 被测引擎
+        baseline: 参照引擎，None表示与记录比较
+        name: 只回放该客户端的记录
+        games: 最多回放的局数
+        seed: 随机种子
+    """
+    tasks: Dict[Tuple[str, int], GameTask] = {}
+    for block in read_index(list_segments(path, name)):
+        key = (block.recording, block.game)
+        if key not in tasks:
+            if games is not None and len(tasks) >= games:
+                continue
+            tasks[key] = GameTask(block.recording, block.game, [], engine, baseline, seed)
+        tasks[key].blocks.append(block)
+    return list(tasks.values())
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        "p50": ordered[int(last * 0.50)],
+        "p90": ordered[int(last * 0.90)],
+        "p99": ordered[int(last * 0.99)],
+        "max": ordered[-1],
+    }
+
+
+@dataclass
+class ReplayReport:
+    """全部回放结果汇总"""
+    engine: EngineSpec
+    baseline: Optional[EngineSpec]
+    games: int = 0
+    decisions: int = 0
+    agreed_recorded: int = 0
+    agreed_baseline: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    baseline_latencies: List[float] = field(default_factory=list)
+    stages: Dict[str, List[int]] = field(default_factory=dict)
+    mismatches: List[dict] = field(default_factory=list)
+
+    def add(self, result: GameResult):
+        self.games += 1
+        self.decisions += result.decisions
+        self.agreed_recorded += result.agreed_recorded
+        self.agreed_baseline += result.agreed_baseline
+        self.errors += result.errors
+        self.latencies.extend(result.latencies)
+        self.baseline_latencies.extend(result.baseline_latencies)
+        for stage, (decisions, agreed) in result.stages.items():
+            counts = self.stages.setdefault(stage, [0, 0])
+            counts[0] += decisions
+            counts[1] += agreed
+        self.mismatches.extend(result.mismatches)
+
+    def describe(self) -> str:
+        """多行文字报告"""
+        reference = f"参照引擎 {self.baseline}" if self.baseline else "记录"
+        rate = self.decisions / self.elapsed if self.elapsed > 0 else 0.0
+        lines = [
+            f"回放: 引擎 {self.engine}，比较对象: {reference}",
+            f"  局数 {self.games}，决策 {self.decisions}，用时 {self.elapsed:.1f}s（{rate:.0f} 决策/秒），出错 {self.errors}",
+            f"  与记录一致: {self.agreed_recorded}/{self.decisions}（{_ratio(self.agreed_recorded, self.decisions)}）",
+        ]
+        if self.baseline:
+            lines.append(
+                f"  与参照引擎一致: {self.agreed_baseline}/{self.decisions}"
+                f"（{_ratio(self.agreed_baseline, self.decisions)}）"
+            )
+        for stage, (decisions, agreed) in sorted(self.stages.items()):
+            lines.append(f"    {stage:<8} {agreed}/{decisions}（{_ratio(agreed, decisions)}）")
+        for label, values in (("引擎", self.latencies), ("参照", self.baseline_latencies)):
+            if values:
+                p = _percentiles(values)
+                lines.append(
+                    f"  {label}决策耗时: p50={p['p50'] * 1000:.2f}ms p90={p['p90'] * 1000:.2f}ms "
+                    f"p99={p['p99'] * 1000:.2f}ms max={p['max'] * 1000:.2f}ms"
+                )
+        if self.mismatches:
+            lines.append(f"  不一致的决策（前{min(len(self.mismatches), MAX_REPORTED_MISMATCHES)}条）:")
+            for item in self.mismatches[:MAX_REPORTED_MISMATCHES]:
+                lines.append(
+                    f"    {item['recording']} 局{item['game']} 小局{item['episode']} 决策{item['decision']} "
+                    f"[{item['stage']}] 参照={item['reference']} 引擎={item['choice']}（共{item['actions']}个动作）"
+                )
+        return "\n".join(lines)
+
+
+def _ratio(part: int, total: int) -> str:
+    return f"{part / total * 100:.1f}%" if total else "-"
+
+
+def run_replay(tasks: List[GameTask], workers: int = 1) -> ReplayReport:
+    """
+    回放全部任务
+
+    Args:
+        tasks: plan_tasks() 的结果
+        workers: 进程数，1表示在当前进程中回放
+
+    Returns:
+        汇总报告（局的顺序与任务顺序一致）
+    """
+    if not tasks:
+        raise ValueError("没有可回放的对局记录")
+    report = ReplayReport(tasks[0].engine, tasks[0].baseline)
+    start = time.perf_counter()
+    if workers <= 1:
+        for task in tasks:
+            report.add(replay_game(task))
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(replay_game, tasks, chunksize=chunksize):
+                report.add(result)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main():
+    """回放对局记录并报告决策差异和耗时"""
+    import argparse
+    parser = argparse.ArgumentParser(description="对局记录决策回放")
+    parser.add_argument("path", help="记录目录或段文件（GD_RECORD_DIR）")
+    parser.add_argument("--engine", default="v4", help="被测引擎: v4 / knowledge / decision / yf / random，可加 :参数=值,...")
+    parser.add_argument("--baseline", default=None, help="参照引擎（默认与记录中的选择比较）")
+    parser.add_argument("--name", default=None, help="只回放该客户端的记录，例如 yf1_v4")
+    parser.add_argument("--games", type=int, default=None, help="最多回放的局数")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数（默认: CPU核数）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认: 0）")
+    parser.add_argument("--output", default=None, help="把全部不一致的决策写入该文件（JSON-lines）")
+    args = parser.parse_args()
+
+    try:
+        engine = EngineSpec.parse(args.engine)
+        baseline = EngineSpec.parse(args.baseline) if args.baseline else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    tasks = plan_tasks(args.path, engine, baseline, args.name, args.games, args.seed)
+    print(f"共 {len(tasks)} 局，{args.workers} 个进程回放...")
+    report = run_replay(tasks, args.workers)
+    print(report.describe())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for item in report.mismatches:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        print(f"不一致的决策已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+自我对弈数据生成 (Self-play Data Generation)
+功能：
+- 不连接服务器，用 game_logic.simulator 发牌、推进出牌，按客户端的方式驱动4个引擎（见 replay.ReplayEngine）
+- 座位规格可混合 v4 / yf（first_prize 规则）/ knowledge / decision / random，
+  "v4@0.1" 表示该座位10%的决策均匀随机选择（ε-探索，增加训练数据的多样性）
+- 每个决策写成 rep_dataset 的一行（状态、合法动作、实际选择、特征数组），并附加小局结果列：
+    outcome (N,)       决策者所在方胜(+1)/负(-1)
+    level_delta (N,)   决策者所在方的升级数（负方为胜方升级数的相反数）
+    place (N,)         决策者的完牌名次（1-4）
+    explore (N,)       该决策是否为随机探索（训练时排除）
+    player (N,)        座位规格编号（对应 manifest 中的 players）
+- 以任务（若干局）为单位分发到多个进程，每个任务写自己的 .npz 分片（task-00000-part-00000.npz），
+  主进程只汇总统计和 manifest.json
+- 背压：在途任务数不超过 进程数×2，主进程按完成顺序收集，内存占用与总局数无关
+
+确定性：
+- 任务 i 的发牌、级牌、探索和引擎使用的 random 只由 (种子, i) 决定，与进程数和完成顺序无关
+- 引擎使用 ReplayEngine 的配置（V4：时间预算充足、不按延迟熔断、候选层顺序固定），
+  每局开始时重置（V4同时清除耗时估计和熔断状态），工作进程中先前的任务不影响后面的决策
+- 玩家 p 在第 g 局坐在座位 (p + g) % 4，队友关系不变、各座位轮流坐
+
+简化：不进贡/还贡（见 simulator.py）。
+
+用法：
+    python -m decision.selfplay -o ../selfplay --players v4,yf,v4@0.1,yf --games 10000
+    python -m decision.selfplay -o ../selfplay --players yf,random --games 100000 --workers 32
+"""
+
+import contextlib
+import json
+import logging
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 将 src 目录添加到系统路径
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from decision.replay import EngineSpec, ReplayEngine
+from game_logic.rep_dataset import DEFAULT_SHARD_ROWS, DatasetWriter, write_manifest
+from game_logic.rep_parser import ReplayDecision
+from game_logic.simulator import SelfPlayGame
+
+
+# 附加的每行结果列
+RESULT_COLUMNS = {
+    "outcome": "int8",
+    "level_delta": "int8",
+    "place": "int8",
+    "explore": "int8",
+    "player": "int8",
+}
+DEFAULT_GAMES_PER_TASK = 20
+
+
+@dataclass(frozen=True)
+class PlayerSpec:
+    """一个座位的引擎规格 + 探索概率"""
+    engine: EngineSpec
+    epsilon: float = 0.0
+
+    @classmethod
+    def parse(cls, text: str) -> "PlayerSpec":
+        """
+        解析 "引擎规格[@探索概率]"，例如 "v4@0.1"、"decision:risk=0.25@0.05"
+
+        Raises:
+            ValueError: 引擎规格错误或探索概率不在 [0, 1]
+        """
+        engine_text, sep, epsilon_text = text.strip().rpartition("@")
+        if not sep:
+            engine_text, epsilon_text = text.strip(), "0"
+        epsilon = float(epsilon_text)
+        if not 0.0 <= epsilon <= 1.0:
+            raise ValueError(f"探索概率应在 [0, 1] 之间: {text}")
+        return cls(EngineSpec.parse(engine_text), epsilon)
+
+    def __str__(self):
+        return f"{self.engine}@{self.epsilon:g}" if self.epsilon else str(self.engine)
+
+
+def parse_players(text: str) -> Tuple[PlayerSpec, ...]:
+    """
+    逗号分隔的座位规格；两个规格表示 "甲,乙,甲,乙"（甲方对乙方），否则必须是4个
+
+    Raises:
+        ValueError: 规格错误或个数不对
+    """
+    # 引擎权重也用逗号分隔，只在不含 "=" 的位置切分
+    items: List[str] = []
+    for item in text.split(","):
+        if items and "=" in item and ":" not in item:
+            items[-1] += "," + item
+        else:
+            items.append(item)
+    players = tuple(PlayerSpec.parse(item) for item in items if item.strip())
+    if len(players) == 2:
+        players = players * 2
+    if len(players) != 4:
+        raise ValueError(f"需要4个（或2个）座位规格: {text}")
+    return players
+
+
+@dataclass
+class SelfPlayTask:
+    """一批自我对弈（发送到工作进程）"""
+    index: int
+    first_game: int  # 第一局的局号（决定座位轮换，写入 replay 列）
+    games: int
+    players: Tuple[PlayerSpec, ...]
+    output_dir: str
+    seed: int = 0
+    level: Optional[str] = None
+    features: bool = True
+    shard_rows: int = DEFAULT_SHARD_ROWS
+
+
+@dataclass
+class TaskResult:
+    """一批自我对弈的统计"""
+    index: int
+    games: int = 0
+    decisions: int = 0
+    explored: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    wins: List[int] = field(default_factory=lambda: [0] * 4)  # 按玩家编号：所在方获胜的局数
+    level_delta: List[int] = field(default_factory=lambda: [0] * 4)  # 按玩家编号：所在方累计升级数
+    shards: List[Dict] = field(default_factory=list)
+
+
+# 工作进程内缓存的引擎（按类型和座位），避免每个任务重新加载知识库；每局开始时 reset()；
+# 参数覆盖不同的规格共用一个引擎，决策前按当前规格写入参数（见 ReplayEngine._apply_weights）
+_engines: Dict[Tuple[str, int], ReplayEngine] = {}
+
+
+def _engine(spec: EngineSpec, seat: int) -> ReplayEngine:
+    key = (spec.kind, seat)
+    if key not in _engines:
+        _engines[key] = ReplayEngine(spec, seat)
+    _engines[key].spec = spec
+    return _engines[key]
+
+
+def _init_worker():
+    """工作进程只产出数据：关闭日志（引擎在热路径上的日志和 first_prize 的打印都丢弃）"""
+    logging.disable(logging.CRITICAL)
+
+
+def _broadcast(engines: List[ReplayEngine], message: dict):
+    # 每个引擎拿到独立的副本（引擎可能修改消息）
+    text = json.dumps(message)
+    for engine in engines:
+        engine.observe(json.loads(text))
+
+
+def play_game(players: Tuple[PlayerSpec, ...], rng: random.Random, game_id: int,
+              level: Optional[str] = None) -> Tuple[SelfPlayGame, List[Tuple[ReplayDecision, int, bool]], int]:
+    """
+    对一局（一小局）
+
+    Args:
+        players: 4个座位规格（按玩家编号）
+        rng: 发牌、探索使用的随机数发生器
+        game_id: 局号（决定座位轮换）
+        level: 级牌，None 表示随机
+
+    Returns:
+        (结束后的对局, [(决策, 玩家编号, 是否探索), ...], 引擎出错次数)
+    """
+    game = SelfPlayGame(rng, level)
+    seats = [(player + game_id) % 4 for player in range(4)]
+    engines = [None] * 4
+    for player, seat in enumerate(seats):
+        engines[seat] = _engine(players[player].engine, seat)
+    player_at = {seat: player for player, seat in enumerate(seats)}
+    random.seed(rng.random())
+
+    for seat, engine in enumerate(engines):
+        engine.reset()
+        engine.observe(game.beginning(seat))
+
+    decisions = []
+    errors = 0
+    while not game.finished:
+        seat = game.turn
+        player = player_at[seat]
+        message = game.prompt(seat)
+        count = len(message["actionList"])
+        text = json.dumps(message)
+        engines[seat].observe(json.loads(text))
+
+        explore = rng.random() < players[player].epsilon
+        if explore:
+            choice = rng.randrange(count)
+        else:
+            try:
+                choice = engines[seat].decide(json.loads(text))
+            except Exception:
+                choice = None
+            if not isinstance(choice, int) or not 0 <= choice < count:
+                # 与客户端相同：决策出错时发送 actIndex 0
+                errors += 1
+                choice = 0
+
+        action = message["actionList"][choice]
+        decisions.append((ReplayDecision(
+            game_id, game.step, seat, message, choice, [] if action[0] == "PASS" else list(action[2]),
+            [list(game.played[pos]) for pos in range(4)], tuple(game.pass_counts[seat])
+        ), player, explore))
+        _broadcast(engines, game.play(seat, choice))
+
+    _broadcast(engines, game.episode_over())
+    return game, decisions, errors
+
+
+def run_task(task: SelfPlayTask) -> TaskResult:
+    """
+    执行一批自我对弈并写出分片（在工作进程中运行）
+
+    Args:
+        task: 任务
+
+    Returns:
+        统计和写出的分片
+    """
+    start = time.perf_counter()
+    rng = random.Random(f"{task.seed}:{task.index}")
+    writer = DatasetWriter(task.output_dir, task.shard_rows, task.features,
+                           extra_columns=RESULT_COLUMNS, prefix=f"task-{task.index:05d}-part")
+    result = TaskResult(task.index)
+    # first_prize 的 State 会打印每条消息
+    with contextlib.redirect_stdout(None):
+        for g in range(task.games):
+            game_id = task.first_game + g
+            game, decisions, errors = play_game(task.players, rng, game_id, task.level)
+            order = game.order
+            delta = game.level_delta()
+            winners = order[0] % 2
+            for seat in range(4):
+                player = (seat - game_id) % 4
+                won = seat % 2 == winners
+                result.wins[player] += won
+                result.level_delta[player] += delta if won else -delta
+            for decision, player, explore in decisions:
+                won = decision.seat % 2 == winners
+                writer.add(
+                    game_id, decision,
+                    outcome=1 if won else -1, level_delta=delta if won else -delta,
+                    place=order.index(decision.seat) + 1, explore=int(explore), player=player,
+                )
+            result.games += 1
+            result.decisions += len(decisions)
+            result.explored += sum(explore for _, _, explore in decisions)
+            result.errors += errors
+    writer.flush()
+    result.shards = writer.shards
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def plan_tasks(players: Tuple[PlayerSpec, ...], games: int, output_dir: str,
+               games_per_task: int = DEFAULT_GAMES_PER_TASK, seed: int = 0, level: Optional[str] = None,
+               features: bool = True, shard_rows: int = DEFAULT_SHARD_ROWS) -> Iterator[SelfPlayTask]:
+    """按 games_per_task 局一个任务划分（惰性生成，最后一个任务可能不满）"""
+    for index, first in enumerate(range(0, games, games_per_task)):
+        yield SelfPlayTask(index, first, min(games_per_task, games - first), players, output_dir,
+                           seed, level, features, shard_rows)
+
+
+@dataclass
+class SelfPlayReport:
+    """全部任务的汇总"""
+    players: Tuple[PlayerSpec, ...]
+    games: int = 0
+    decisions: int = 0
+    explored: int = 0
+    errors: int = 0
+    elapsed: float = 0.0
+    wins: List[int] = field(default_factory=lambda: [0] * 4)
+    level_delta: List[int] = field(default_factory=lambda: [0] * 4)
+    shards: List[Dict] = field(default_factory=list)
+
+    def add(self, result: TaskResult):
+        self.games += result.games
+        self.decisions += result.decisions
+        self.explored += result.explored
+        self.errors += result.errors
+        for player in range(4):
+            self.wins[player] += result.wins[player]
+            self.level_delta[player] += result.level_delta[player]
+        self.shards.extend(result.shards)
+
+    def describe(self) -> str:
+        """多行文字报告"""
+        per_hour = self.decisions / self.elapsed * 3600 if self.elapsed > 0 else 0.0
+        lines = [
+            f"自我对弈: {self.games} 局，决策 {self.decisions}（探索 {self.explored}，引擎出错 {self.errors}），"
+            f"用时 {self.elapsed:.1f}s（{per_hour:,.0f} 决策/小时），分片 {len(self.shards)} 个",
+        ]
+        for player, spec in enumerate(self.players):
+            rate = self.wins[player] / self.games * 100 if self.games else 0.0
+            lines.append(f"  玩家{player} {spec}: 胜率 {rate:.1f}%，累计升级 {self.level_delta[player]:+d}")
+        return "\n".join(lines)
+
+
+def run_selfplay(tasks: Iterator[SelfPlayTask], players: Tuple[PlayerSpec, ...], output_dir: str,
+                 workers: int = 1, features: bool = True) -> SelfPlayReport:
+    """
+    执行全部任务并写出 manifest.json
+
+    Args:
+        tasks: plan_tasks() 的结果
+        players: 座位规格（写入报告和 manifest）
+        output_dir: 输出目录（与任务中的相同）
+        workers: 进程数，1表示在当前进程中执行
+        features: 任务是否写出特征数组（写入 manifest）
+
+    Returns:
+        汇总报告
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    report = SelfPlayReport(players)
+    start = time.perf_counter()
+    if workers <= 1:
+        for task in tasks:
+            report.add(run_task(task))
+    else:
+        # 在途任务数有上限：任务惰性生成，完成一个再提交一个
+        max_in_flight = workers * 2
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = set()
+            for task in tasks:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report.add(future.result())
+                pending.add(executor.submit(run_task, task))
+            for future in pending:
+                report.add(future.result())
+    report.elapsed = time.perf_counter() - start
+    report.shards.sort(key=lambda shard: shard["file"])
+
+    # 各任务已写出分片，这里只按相同格式汇总 manifest
+    writer = DatasetWriter(output_dir, features=features, extra_columns=RESULT_COLUMNS)
+    writer.shards = report.shards
+    writer.rows = report.decisions
+    manifest = writer.manifest({
+        "games": report.games, "explored": report.explored, "errors": report.errors,
+        "elapsed": round(report.elapsed, 3),
+    })
+    manifest["players"] = [str(player) for player in players]
+    write_manifest(output_dir, manifest)
+    return report
+
+
+def main():
+    """离线自我对弈，生成训练数据集"""
+    import argparse
+    parser = argparse.ArgumentParser(description="自我对弈训练数据生成（不连接服务器）")
+    parser.add_argument("-o", "--output", required=True, help="输出目录")
+    parser.add_argument("--players", default="v4,yf",
+                        help="座位规格，逗号分隔（4个，或2个表示甲乙对抗），可加 @探索概率，例如 v4,yf,v4@0.1,yf")
+    parser.add_argument("--games", type=int, default=1000, help="局数（默认: 1000）")
+    parser.add_argument("--games-per-task", type=int, default=DEFAULT_GAMES_PER_TASK,
+                        help=f"每个任务（分片文件）的局数（默认: {DEFAULT_GAMES_PER_TASK}）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数（默认: CPU核数）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认: 0）")
+    parser.add_argument("--level", default=None, help="固定级牌点数（默认每局随机）")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS, help="每个分片的最多决策行数")
+    parser.add_argument("--no-features", action="store_true", help="不写特征数组（只写原始列）")
+    args = parser.parse_args()
+
+    try:
+        players = parse_players(args.players)
+    except ValueError as e:
+        parser.error(str(e))
+    features = not args.no_features
+    tasks = plan_tasks(players, args.games, args.output, args.games_per_task, args.seed,
+                       args.level, features, args.shard_rows)
+    print(f"共 {args.games} 局，{args.workers} 个进程对弈...")
+    report = run_selfplay(tasks, players, args.output, args.workers, features)
+    print(report.describe())
+    print(f"数据集已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
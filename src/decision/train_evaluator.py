@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""
+学习型评估模型的离线训练 (Evaluator Trainer)
+功能：
+- 读取 rep_dataset --features 写出的数据集（回放或自对弈记录），拟合 LearnedEvaluator
+- 目标：每个决策在其合法动作上做softmax，最大化实际选择动作的概率（交叉熵）
+- 纯NumPy实现（CPU），Adam优化，按决策分批；留出一部分决策作验证集，保留验证损失最低的权重
+
+用法：
+    cd src
+    python -m decision.train_evaluator ../dataset -o ../models/evaluator.npz --hidden 64 --epochs 20
+    python -m decision.train_evaluator ../dataset -o ../models/linear.npz --hidden 0
+    python -m decision.train_evaluator ../selfplay -o ../models/evaluator.npz --min-delta 1    # 只学胜方的决策
+"""
+
+import json
+import logging
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from decision.learned_evaluator import LearnedEvaluator
+from game_logic.features import ACTION_FEATURES, STATE_FEATURES
+
+
+logger = logging.getLogger(__name__)
+
+
+class DecisionSet:
+    """
+    训练数据：全部合法动作的特征行 + 每个决策的行范围
+
+    x[offsets[i]:offsets[i+1]] 是第i个决策的合法动作，chosen[i] 为实际选择在其中的下标
+    """
+
+    def __init__(self, x: np.ndarray, offsets: np.ndarray, chosen: np.ndarray,
+                 weight: Optional[np.ndarray] = None):
+        self.x = x
+        self.offsets = offsets
+        self.chosen = chosen
+        self.weight = np.ones(len(chosen), np.float32) if weight is None else weight
+
+    def __len__(self) -> int:
+        return len(self.chosen)
+
+    def rows(self, decisions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """一批决策的特征行下标（按决策连续排列）和各决策在批内的起始位置"""
+        starts = self.offsets[decisions]
+        lengths = self.offsets[decisions + 1] - starts
+        batch_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        rows = np.arange(lengths.sum()) + np.repeat(starts - batch_starts, lengths)
+        return rows, batch_starts
+
+    def subset(self, decisions: np.ndarray) -> "DecisionSet":
+        rows, batch_starts = self.rows(decisions)
+        lengths = self.offsets[decisions + 1] - self.offsets[decisions]
+        offsets = np.concatenate([batch_starts, [lengths.sum()]]).astype(np.int64)
+        return DecisionSet(self.x[rows], offsets, self.chosen[decisions], self.weight[decisions])
+
+
+def load_dataset(directory: str, min_delta: Optional[int] = None) -> DecisionSet:
+    """
+    读取数据集目录（manifest.json + .npz 分片），去掉实际选择不在合法动作中的决策，
+    以及自我对弈数据中随机探索的决策（explore 列）
+
+    Args:
+        directory: 数据集目录
+        min_delta: 只保留决策者所在方升级数（level_delta 列）不低于该值的决策，None 表示不筛选
+
+    Raises:
+        ValueError: 数据集没有特征数组或特征编码不一致
+    """
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    if "state_features" not in manifest:
+        raise ValueError(f"{directory}: 数据集没有特征数组，请用 rep_dataset --features 重新生成")
+    if (tuple(manifest["state_features"]), tuple(manifest["legal_features"])) != (STATE_FEATURES, ACTION_FEATURES):
+        raise ValueError(f"{directory}: 数据集的特征编码与 game_logic.features 不一致，请重新生成")
+
+    xs, offsets, chosen, weights = [], [0], [], []
+    total = 0
+    for shard in manifest["shards"]:
+        with np.load(os.path.join(directory, shard["file"])) as data:
+            state = data["state_features"]
+            legal = data["legal_features"]
+            legal_offsets = data["legal_offsets"]
+            shard_chosen = data["chosen"]
+            # 可选的每个决策样本权重
+            shard_weight = data["weight"] if "weight" in data.files else np.ones(len(shard_chosen), np.float32)
+            mask = shard_chosen >= 0
+            if "explore" in data.files:
+                mask &= data["explore"] == 0
+            if min_delta is not None and "level_delta" in data.files:
+                mask &= data["level_delta"] >= min_delta
+        keep = np.flatnonzero(mask)
+        lengths = np.diff(legal_offsets)[keep]
+        rows, _ = DecisionSet(legal, legal_offsets, shard_chosen).rows(keep)
+        xs.append(np.concatenate([np.repeat(state[keep], lengths, axis=0), legal[rows]], axis=1))
+        offsets.extend(total + np.cumsum(lengths))
+        total += int(lengths.sum())
+        chosen.append(shard_chosen[keep])
+        weights.append(shard_weight[keep].astype(np.float32))
+    width = len(STATE_FEATURES) + len(ACTION_FEATURES)
+    return DecisionSet(
+        np.concatenate(xs) if xs else np.zeros((0, width), np.float32),
+        np.asarray(offsets, np.int64),
+        np.concatenate(chosen).astype(np.int64) if chosen else np.zeros(0, np.int64),
+        np.concatenate(weights) if weights else None,
+    )
+
+
+class _Adam:
+    def __init__(self, params: List[np.ndarray], lr: float):
+        self.params = params
+        self.lr = lr
+        self.m = [np.zeros_like(p) for p in params]
+        self.v = [np.zeros_like(p) for p in params]
+        self.t = 0
+
+    def step(self, grads: List[np.ndarray], beta1: float = 0.9, beta2: float = 0.999, eps: float = 1e-8):
+        self.t += 1
+        scale = self.lr * np.sqrt(1 - beta2 ** self.t) / (1 - beta1 ** self.t)
+        for p, g, m, v in zip(self.params, grads, self.m, self.v):
+            m *= beta1
+            m += (1 - beta1) * g
+            v *= beta2
+            v += (1 - beta2) * g * g
+            p -= scale * m / (np.sqrt(v) + eps)
+
+
+def _forward(params: List[np.ndarray], x: np.ndarray) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """返回每行logit和各层输入（反向传播用）"""
+    inputs = []
+    h = x
+    last = len(params) // 2 - 1
+    for i in range(last + 1):
+        inputs.append(h)
+        h = h @ params[2 * i] + params[2 * i + 1]
+        if i < last:
+            h = np.maximum(h, 0)
+    return h[:, 0], inputs
+
+
+def _segment_softmax(logits: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    lengths = np.diff(np.append(starts, len(logits)))
+    shifted = logits - np.repeat(np.maximum.reduceat(logits, starts), lengths)
+    exp = np.exp(shifted)
+    return exp / np.repeat(np.add.reduceat(exp, starts), lengths)
+
+
+def _loss_and_grads(params: List[np.ndarray], data: DecisionSet, decisions: np.ndarray,
+                    l2: float) -> Tuple[float, float, List[np.ndarray]]:
+    """一批决策的加权交叉熵、top-1准确率和梯度"""
+    rows, starts = data.rows(decisions)
+    logits, inputs = _forward(params, data.x[rows])
+    probs = _segment_softmax(logits, starts)
+    targets = starts + data.chosen[decisions]
+    weight = data.weight[decisions]
+    total = weight.sum()
+    loss = float(-(weight * np.log(probs[targets] + 1e-12)).sum() / total)
+    best = np.maximum.reduceat(logits, starts)
+    accuracy = float((logits[targets] >= best).mean())
+
+    lengths = np.diff(np.append(starts, len(rows)))
+    grad = probs * np.repeat(weight / total, lengths)
+    grad[targets] -= weight / total
+    grads = [None] * len(params)
+    delta = grad[:, None].astype(np.float32)
+    for i in reversed(range(len(params) // 2)):
+        w = params[2 * i]
+        grads[2 * i] = inputs[i].T @ delta + l2 * w
+        grads[2 * i + 1] = delta.sum(axis=0)
+        if i > 0:
+            delta = (delta @ w.T) * (inputs[i] > 0)
+    return loss, accuracy, grads
+
+
+def _evaluate(params: List[np.ndarray], data: DecisionSet, batch: int = 4096) -> Tuple[float, float]:
+    losses, accuracies, counts = [], [], []
+    for start in range(0, len(data), batch):
+        decisions = np.arange(start, min(start + batch, len(data)))
+        loss, accuracy, _ = _loss_and_grads(params, data, decisions, 0.0)
+        losses.append(loss)
+        accuracies.append(accuracy)
+        counts.append(len(decisions))
+    if not counts:
+        return float("nan"), float("nan")
+    return float(np.average(losses, weights=counts)), float(np.average(accuracies, weights=counts))
+
+
+def train(data: DecisionSet, hidden: Sequence[int] = (64,), epochs: int = 20, batch: int = 256,
+          lr: float = 1e-3, l2: float = 1e-5, validation: float = 0.1, seed: int = 0) -> LearnedEvaluator:
+    """
+    拟合评估模型
+
+    Args:
+        data: 训练数据（load_dataset）
+        hidden: 各隐藏层宽度（空表示线性模型）
+        epochs: 训练轮数
+        batch: 每批决策数
+        lr: Adam学习率
+        l2: 权重衰减
+        validation: 验证集比例（按决策划分）
+        seed: 随机种子
+
+    Returns:
+        验证损失最低的模型（metadata 记录训练信息）
+    """
+    if len(data) == 0:
+        raise ValueError("没有可用于训练的决策")
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(data))
+    n_val = int(len(data) * validation) if len(data) >= 10 else 0
+    val = data.subset(np.sort(order[:n_val])) if n_val else None
+    train_set = data.subset(np.sort(order[n_val:]))
+
+    mean = train_set.x.mean(axis=0)
+    std = train_set.x.std(axis=0)
+    std[std < 1e-6] = 1.0
+    train_set.x = ((train_set.x - mean) / std).astype(np.float32)
+    if val is not None:
+        val.x = ((val.x - mean) / std).astype(np.float32)
+
+    sizes = [train_set.x.shape[1], *hidden, 1]
+    params = []
+    for fan_in, fan_out in zip(sizes[:-1], sizes[1:]):
+        params.append((rng.standard_normal((fan_in, fan_out)) * np.sqrt(2.0 / fan_in)).astype(np.float32))
+        params.append(np.zeros(fan_out, np.float32))
+    optimizer = _Adam(params, lr)
+
+    best = (float("inf"), [p.copy() for p in params], 0)
+    for epoch in range(1, epochs + 1):
+        started = time.perf_counter()
+        perm = rng.permutation(len(train_set))
+        for start in range(0, len(perm), batch):
+            _, _, grads = _loss_and_grads(params, train_set, perm[start:start + batch], l2)
+            optimizer.step(grads)
+        train_loss, train_acc = _evaluate(params, train_set)
+        val_loss, val_acc = _evaluate(params, val) if val is not None else (train_loss, train_acc)
+        logger.info(
+            "epoch %d: train loss %.4f acc %.3f, val loss %.4f acc %.3f (%.1fs)",
+            epoch, train_loss, train_acc, val_loss, val_acc, time.perf_counter() - started
+        )
+        if val_loss < best[0]:
+            best = (val_loss, [p.copy() for p in params], epoch)
+
+    val_loss, params, epoch = best
+    _, val_acc = _evaluate(params, val) if val is not None else _evaluate(params, train_set)
+    metadata = {
+        "hidden": ",".join(str(h) for h in hidden),
+        "epoch": epoch,
+        "decisions": len(train_set),
+        "val_loss": val_loss,
+        "val_accuracy": val_acc,
+    }
+    weights = [(params[2 * i], params[2 * i + 1]) for i in range(len(params) // 2)]
+    return LearnedEvaluator(weights, mean, std, metadata)
+
+
+def main():
+    """从数据集训练评估模型"""
+    import argparse
+    parser = argparse.ArgumentParser(description="训练学习型动作评估模型（NumPy，CPU）")
+    parser.add_argument("dataset", help="rep_dataset --features 写出的数据集目录")
+    parser.add_argument("-o", "--output", required=True, help="模型文件（.npz）")
+    parser.add_argument("--hidden", default="64", help="隐藏层宽度，逗号分隔（0：线性模型，默认: 64）")
+    parser.add_argument("--epochs", type=int, default=20, help="训练轮数（默认: 20）")
+    parser.add_argument("--batch", type=int, default=256, help="每批决策数（默认: 256）")
+    parser.add_argument("--lr", type=float, default=1e-3, help="学习率（默认: 0.001）")
+    parser.add_argument("--l2", type=float, default=1e-5, help="权重衰减（默认: 1e-5）")
+    parser.add_argument("--validation", type=float, default=0.1, help="验证集比例（默认: 0.1）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--min-delta", type=int, default=None,
+                        help="自我对弈数据：只用决策者所在方升级数不低于该值的决策（例如1：只学胜方）")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    hidden = [int(h) for h in args.hidden.split(",") if int(h) > 0]
+    data = load_dataset(args.dataset, args.min_delta)
+    logger.info("决策 %d 个，合法动作 %d 个", len(data), len(data.x))
+    model = train(data, hidden, args.epochs, args.batch, args.lr, args.l2, args.validation, args.seed)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    model.save(args.output)
+    logger.info(
+        "最佳轮次 %s：验证损失 %.4f，top-1 准确率 %.3f → %s",
+        model.metadata["epoch"], model.metadata["val_loss"], model.metadata["val_accuracy"], args.output
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+可调参数与权重文件 (Tuned Weights)
+功能：
+- 登记决策引擎中需要调参的常数（默认值和搜索范围），按 "分组.名称" 组成参数向量：
+    evaluation.*   MultiFactorEvaluator.weights 的六个评估因素权重（与 config.yaml evaluation.weights 对应）
+    knowledge.*    KnowledgeEnhancedDecisionEngine._apply_knowledge_rules 的规则权重
+                   （队友保护/对手压制两组分档加减分的整体倍数，以及其余四条规则的加分）
+    yf.*           YFAdapter._score_yf_action 的候选评分加分
+- 读写带版本号的权重文件（weights-v0001.json ...，由 decision/tuner.py 写出）
+- 引擎创建时通过 section() 取得本组参数：默认值，再用 GD_WEIGHTS 指定的文件覆盖
+
+GD_WEIGHTS 可以是权重文件，也可以是目录（使用其中版本号最大的文件）。
+文件无法读取或参数名未登记时记录错误并使用默认值（客户端照常对局）。
+
+用法：
+    from decision import tuned_weights
+    self.weights = tuned_weights.section("evaluation")
+"""
+
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+WEIGHTS_ENV = "GD_WEIGHTS"
+FILE_FORMAT = "gd-weights"
+FILE_PATTERN = re.compile(r"^weights-v(\d+)\.json$")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """一个可调常数"""
+    name: str  # 分组.名称
+    default: float
+    low: float
+    high: float
+
+
+PARAMETERS: Tuple[Parameter, ...] = (
+    Parameter("evaluation.remaining_cards", 0.25, 0.0, 1.0),
+    Parameter("evaluation.card_type_value", 0.20, 0.0, 1.0),
+    Parameter("evaluation.cooperation", 0.20, 0.0, 1.0),
+    Parameter("evaluation.risk", 0.15, 0.0, 1.0),
+    Parameter("evaluation.timing", 0.10, 0.0, 1.0),
+    Parameter("evaluation.hand_structure", 0.10, 0.0, 1.0),
+    # 队友保护（队友剩1-2张时PASS+150/出牌-80等）和对手压制各档加减分的倍数
+    Parameter("knowledge.teammate_protection", 1.0, 0.0, 3.0),
+    Parameter("knowledge.opponent_pressure", 1.0, 0.0, 3.0),
+    Parameter("knowledge.opponent_control", 30.0, 0.0, 100.0),
+    Parameter("knowledge.active_play", 20.0, 0.0, 100.0),
+    Parameter("knowledge.teammate_pass", 15.0, 0.0, 100.0),
+    Parameter("knowledge.opponent_response", 25.0, 0.0, 100.0),
+    Parameter("yf.base", 100.0, 50.0, 200.0),
+    Parameter("yf.non_pass", 10.0, -20.0, 50.0),
+    Parameter("yf.pass", -5.0, -50.0, 20.0),
+    Parameter("yf.high_rank", 15.0, 0.0, 50.0),
+    Parameter("yf.face_rank", 10.0, 0.0, 50.0),
+    Parameter("yf.mid_rank", 5.0, 0.0, 50.0),
+    Parameter("yf.opponent_urgent", 20.0, 0.0, 60.0),
+    Parameter("yf.opponent_close", 10.0, 0.0, 60.0),
+    Parameter("yf.additional_ratio", 0.7, 0.3, 1.0),
+)
+PARAMETER_NAMES: Tuple[str, ...] = tuple(p.name for p in PARAMETERS)
+_BY_NAME = {p.name: p for p in PARAMETERS}
+
+
+def defaults() -> Dict[str, float]:
+    """全部参数的默认值"""
+    return {p.name: p.default for p in PARAMETERS}
+
+
+def validate(params: Dict[str, float]) -> Dict[str, float]:
+    """
+    检查参数名和取值
+
+    Raises:
+        ValueError: 参数名未登记或值不是数字
+    """
+    unknown = sorted(set(params) - set(_BY_NAME))
+    if unknown:
+        raise ValueError(f"未登记的参数: {', '.join(unknown)}")
+    result = {}
+    for name, value in params.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"参数 {name} 的值不是数字: {value!r}")
+        result[name] = float(value)
+    return result
+
+
+def latest_version(directory: str) -> Tuple[int, Optional[str]]:
+    """目录中版本号最大的权重文件 (版本号, 路径)，没有时为 (0, None)"""
+    best = (0, None)
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = FILE_PATTERN.match(name)
+            if match and int(match.group(1)) > best[0]:
+                best = (int(match.group(1)), os.path.join(directory, name))
+    return best
+
+
+def load_weights(path: str) -> Dict[str, float]:
+    """
+    读取权重文件（目录时读取其中版本号最大的文件），只返回文件中的参数
+
+    Raises:
+        ValueError: 文件格式错误、参数名未登记或目录中没有权重文件
+        OSError: 文件无法读取
+    """
+    if os.path.isdir(path):
+        _, file_path = latest_version(path)
+        if file_path is None:
+            raise ValueError(f"{path}: 目录中没有 weights-v*.json")
+        path = file_path
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get("format") != FILE_FORMAT:
+        raise ValueError(f"{path}: 不是权重文件（format 应为 {FILE_FORMAT}）")
+    return validate(data.get("params", {}))
+
+
+# 按路径缓存的 current() 结果（一个进程中的多个引擎共用）
+_current: Dict[str, Dict[str, float]] = {}
+
+
+def current() -> Dict[str, float]:
+    """默认值 + GD_WEIGHTS 文件中的参数"""
+    path = os.environ.get(WEIGHTS_ENV) or ""
+    if path not in _current:
+        params = defaults()
+        if path:
+            try:
+                params.update(load_weights(path))
+                logger.info("已加载调参权重: %s", path)
+            except (OSError, ValueError) as e:
+                logger.error("无法加载调参权重 %s，使用默认值: %s", path, e)
+        _current[path] = params
+    return dict(_current[path])
+
+
+def section(group: str, params: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """
+    一组参数（去掉 "分组." 前缀）
+
+    Args:
+        group: evaluation / knowledge / yf
+        params: 完整参数，None 表示 current()
+    """
+    params = current() if params is None else params
+    prefix = group + "."
+    return {name[len(prefix):]: value for name, value in params.items() if name.startswith(prefix)}
+
+
+def apply(layer, params: Dict[str, float]):
+    """
+    把参数写入一个决策层（评估器权重、知识规则权重、YF评分加分中该层具有的部分）
+
+    params 中没有的参数保持不变；需要完整覆盖时先与 current() 合并。
+    """
+    evaluator = getattr(layer, "evaluator", None)
+    if evaluator is not None:
+        evaluator.weights.update(section("evaluation", params))
+    for attr, group in (("rule_weights", "knowledge"), ("score_bonuses", "yf")):
+        target = getattr(layer, attr, None)
+        if isinstance(target, dict):
+            target.update(section(group, params))
+
+
+def save_weights(directory: str, params: Dict[str, float], metadata: Optional[Dict] = None) -> str:
+    """
+    写出下一个版本的权重文件
+
+    Args:
+        directory: 输出目录
+        params: 参数（validate 检查）
+        metadata: 调参信息（写入文件的 metadata 字段）
+
+    Returns:
+        文件路径
+    """
+    params = validate(params)
+    os.makedirs(directory, exist_ok=True)
+    version = latest_version(directory)[0] + 1
+    path = os.path.join(directory, f"weights-v{version:04d}.json")
+    data = {
+        "format": FILE_FORMAT,
+        "version": version,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "params": {name: params[name] for name in PARAMETER_NAMES if name in params},
+        "metadata": metadata or {},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def vector(params: Dict[str, float]) -> List[float]:
+    """参数 → 按 PARAMETERS 顺序的向量（缺少的参数取默认值）"""
+    return [params.get(p.name, p.default) for p in PARAMETERS]
+
+
+def from_vector(values) -> Dict[str, float]:
+    """按 PARAMETERS 顺序的向量 → 参数（裁剪到搜索范围内）"""
+    return {p.name: min(max(float(v), p.low), p.high) for p, v in zip(PARAMETERS, values)}
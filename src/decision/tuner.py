@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+"""
+参数调优 (Weight Tuning)
+功能：
+- 把 tuned_weights.PARAMETERS 登记的常数（评估权重、知识规则加分、YF评分加分）作为参数向量，用 CMA-ES 搜索
+- 候选参数的适应度：候选方（玩家0、2）对参照方（玩家1、3）离线自我对弈的平均升级数（见 selfplay.play_game）
+- 公共随机数：同一代的所有候选使用同一组发牌，每副牌两方交换座位各打一次，
+  适应度之差只来自参数，不来自牌的好坏；引擎按 ReplayEngine 的配置创建并每局重置
+  （V4 候选层顺序固定、时间预算充足、不按延迟熔断），对局结果与机器快慢和进程分配无关
+- 对局按 (候选, 若干副牌) 划分任务，分发到多个进程；一个进程池用到结束，引擎按类型缓存在工作进程中
+- 结束时在另一组发牌上复核 起点参数 / 搜索均值 / 历代最优候选，写出最优的版本化权重文件（weights-v0001.json ...）
+
+搜索在 [0, 1] 归一化的参数空间中进行（按 Parameter.low/high 缩放），越界的候选裁剪到边界后再对局。
+起点为当前参数（默认值；设置了 GD_WEIGHTS 时为其中的调参结果，可以在上一版的基础上继续调）。
+
+引擎与参数分组：decision 只用 evaluation，knowledge 用 evaluation + knowledge，v4 用全部
+（yf 分组只在 V4 的 YF 层可用时生效）。
+
+用法：
+    python -m decision.tuner -o ../weights --engine knowledge --generations 30 --deals 100
+    python -m decision.tuner -o ../weights --engine v4 --opponent yf --groups knowledge,yf --workers 32
+    set GD_WEIGHTS=../weights    # 客户端和回放使用最新版本
+"""
+
+import contextlib
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 将 src 目录添加到系统路径
+if str(Path(__file__).parent.parent) not in sys.path:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from decision import tuned_weights
+from decision.replay import EngineSpec
+from decision.selfplay import PlayerSpec, _init_worker, play_game
+
+
+# 可调参的引擎 → 默认调参的分组
+ENGINE_GROUPS = {
+    "decision": ("evaluation",),
+    "knowledge": ("evaluation", "knowledge"),
+    "v4": ("evaluation", "knowledge", "yf"),
+}
+DEFAULT_DEALS_PER_TASK = 5
+
+
+class CMAES:
+    """(μ/μ_w, λ)-CMA-ES，求最大值（Hansen, The CMA Evolution Strategy: A Tutorial）"""
+
+    def __init__(self, mean: Sequence[float], sigma: float, seed: int = 0, population: Optional[int] = None):
+        """
+        Args:
+            mean: 初始均值
+            sigma: 初始步长
+            seed: 采样的随机种子
+            population: 每代候选数 λ，None 表示 4 + 3·ln(n)
+        """
+        n = len(mean)
+        self.n = n
+        self.mean = np.array(mean, dtype=float)
+        self.sigma = float(sigma)
+        self.rng = np.random.default_rng(seed)
+        self.population = population or 4 + int(3 * math.log(n))
+        self.mu = self.population // 2
+        weights = math.log(self.mu + 0.5) - np.log(np.arange(1, self.mu + 1))
+        self.weights = weights / weights.sum()
+        self.mueff = 1.0 / float((self.weights ** 2).sum())
+
+        self.cc = (4 + self.mueff / n) / (n + 4 + 2 * self.mueff / n)
+        self.cs = (self.mueff + 2) / (n + self.mueff + 5)
+        self.c1 = 2 / ((n + 1.3) ** 2 + self.mueff)
+        self.cmu = min(1 - self.c1, 2 * (self.mueff - 2 + 1 / self.mueff) / ((n + 2) ** 2 + self.mueff))
+        self.damps = 1 + 2 * max(0.0, math.sqrt((self.mueff - 1) / (n + 1)) - 1) + self.cs
+        self.chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        self.pc = np.zeros(n)
+        self.ps = np.zeros(n)
+        self.B = np.eye(n)
+        self.D = np.ones(n)
+        self.C = np.eye(n)
+        self.generation = 0
+
+    def ask(self) -> np.ndarray:
+        """本代候选 (λ, n)"""
+        z = self.rng.standard_normal((self.population, self.n))
+        return self.mean + self.sigma * (z * self.D) @ self.B.T
+
+    def tell(self, candidates: np.ndarray, fitness: Sequence[float]):
+        """用本代候选（可以是修正后的）及其适应度更新分布"""
+        self.generation += 1
+        order = np.argsort(-np.asarray(fitness, dtype=float), kind="stable")[:self.mu]
+        y = (candidates[order] - self.mean) / self.sigma
+        y_mean = self.weights @ y
+        self.mean = self.mean + self.sigma * y_mean
+
+        inv_sqrt_c = self.B @ np.diag(1 / self.D) @ self.B.T
+        self.ps = (1 - self.cs) * self.ps + math.sqrt(self.cs * (2 - self.cs) * self.mueff) * inv_sqrt_c @ y_mean
+        ps_norm = float(np.linalg.norm(self.ps))
+        h_sig = ps_norm / math.sqrt(1 - (1 - self.cs) ** (2 * self.generation)) / self.chi_n < 1.4 + 2 / (self.n + 1)
+        self.pc = (1 - self.cc) * self.pc + h_sig * math.sqrt(self.cc * (2 - self.cc) * self.mueff) * y_mean
+
+        rank_one = np.outer(self.pc, self.pc) + (1 - h_sig) * self.cc * (2 - self.cc) * self.C
+        rank_mu = (y.T * self.weights) @ y
+        self.C = (1 - self.c1 - self.cmu) * self.C + self.c1 * rank_one + self.cmu * rank_mu
+        self.sigma *= math.exp(self.cs / self.damps * (ps_norm / self.chi_n - 1))
+
+        self.C = np.triu(self.C) + np.triu(self.C, 1).T
+        eigenvalues, self.B = np.linalg.eigh(self.C)
+        self.D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+
+
+@dataclass
+class TuneTask:
+    """一个候选在若干副牌上的对局（发送到工作进程）"""
+    candidate: int
+    engine: EngineSpec  # 带候选参数覆盖
+    opponent: PlayerSpec
+    deals: Tuple[int, ...]
+    deal_seed: str  # 发牌种子前缀：同一代的所有候选相同
+    level: Optional[str] = None
+
+
+@dataclass
+class TuneResult:
+    """一个候选的对局统计（可累加多个任务）"""
+    candidate: int
+    games: int = 0
+    wins: int = 0
+    level_delta: int = 0  # 候选方累计升级数（负方为胜方升级数的相反数）
+    errors: int = 0
+
+    def add(self, other: "TuneResult"):
+        self.games += other.games
+        self.wins += other.wins
+        self.level_delta += other.level_delta
+        self.errors += other.errors
+
+    @property
+    def fitness(self) -> float:
+        """平均每局升级数"""
+        return self.level_delta / self.games if self.games else 0.0
+
+
+def run_task(task: TuneTask) -> TuneResult:
+    """
+    对局并统计候选方的结果（在工作进程中运行）
+
+    每副牌打两局：第一局候选方坐 0、2 号座位，第二局坐 1、3 号座位拿对方的牌。
+    """
+    candidate = PlayerSpec(task.engine)
+    players = (candidate, task.opponent, candidate, task.opponent)
+    result = TuneResult(task.candidate)
+    # first_prize 的 State 会打印每条消息
+    with contextlib.redirect_stdout(None):
+        for deal in task.deals:
+            for game_id in (0, 1):
+                # 同一副牌的两局使用相同的随机序列：发牌、首个出牌座位、引擎的 random 都相同
+                rng = random.Random(f"{task.deal_seed}:{deal}")
+                game, _, errors = play_game(players, rng, game_id, task.level)
+                delta = game.level_delta()
+                won = game.order[0] % 2 == game_id % 2  # 玩家0坐在座位 game_id
+                result.games += 1
+                result.wins += won
+                result.level_delta += delta if won else -delta
+                result.errors += errors
+    return result
+
+
+@dataclass
+class TuneSettings:
+    """调参设置"""
+    engine: str = "knowledge"
+    opponent: Optional[PlayerSpec] = None  # None 表示同类型引擎、当前参数
+    groups: Optional[Tuple[str, ...]] = None  # None 表示 ENGINE_GROUPS[engine]
+    generations: int = 20
+    population: Optional[int] = None
+    deals: int = 50  # 每代每个候选的发牌数（每副打两局）
+    validation_deals: int = 200
+    deals_per_task: int = DEFAULT_DEALS_PER_TASK
+    sigma: float = 0.2  # 归一化空间中的初始步长
+    seed: int = 0
+    level: Optional[str] = None
+
+    def tuned(self) -> List[tuned_weights.Parameter]:
+        groups = self.groups or ENGINE_GROUPS[self.engine]
+        return [p for p in tuned_weights.PARAMETERS if p.name.split(".")[0] in groups]
+
+
+@dataclass
+class Generation:
+    """一代的统计"""
+    index: int
+    best: float
+    mean: float
+    sigma: float
+    games: int
+    errors: int
+    elapsed: float
+
+    def describe(self) -> str:
+        return (f"第{self.index + 1}代: 最优 {self.best:+.3f}，平均 {self.mean:+.3f}，σ {self.sigma:.3f}，"
+                f"{self.games} 局（出错 {self.errors}），用时 {self.elapsed:.1f}s")
+
+
+@dataclass
+class TuneReport:
+    """调参结果"""
+    settings: TuneSettings
+    start: Dict[str, float]
+    best: Dict[str, float]
+    selected: str = "start"  # 复核后选中的参数：start / mean / best
+    validation: Dict[str, float] = field(default_factory=dict)  # 复核适应度
+    generations: List[Generation] = field(default_factory=list)
+    games: int = 0
+    elapsed: float = 0.0
+    path: Optional[str] = None
+
+    def describe(self) -> str:
+        """多行文字报告"""
+        lines = [
+            f"调参: 引擎 {self.settings.engine}，{len(self.generations)} 代，共 {self.games} 局，用时 {self.elapsed:.1f}s",
+            "  复核（平均每局升级数）: " + "，".join(f"{name} {value:+.3f}" for name, value in self.validation.items()),
+            f"  选中: {self.selected}",
+        ]
+        for name in tuned_weights.PARAMETER_NAMES:
+            if self.best.get(name) != self.start.get(name):
+                lines.append(f"    {name:<32} {self.start[name]:>8.3f} -> {self.best[name]:.3f}")
+        if self.path:
+            lines.append(f"  权重文件: {self.path}")
+        return "\n".join(lines)
+
+
+class Tuner:
+    """CMA-ES 搜索 + 公共随机数的并行自我对弈评估"""
+
+    def __init__(self, settings: TuneSettings, workers: int = 1):
+        """
+        Args:
+            settings: 调参设置
+            workers: 进程数，1表示在当前进程中对局
+        """
+        if settings.engine not in ENGINE_GROUPS:
+            raise ValueError(f"不可调参的引擎: {settings.engine}，可选: {', '.join(ENGINE_GROUPS)}")
+        self.settings = settings
+        self.workers = workers
+        self.parameters = settings.tuned()
+        if not self.parameters:
+            raise ValueError(f"没有可调的参数（分组: {settings.groups}）")
+        self.opponent = settings.opponent or PlayerSpec(EngineSpec(settings.engine))
+        self.start = tuned_weights.current()
+        self._low = np.array([p.low for p in self.parameters])
+        self._span = np.array([p.high - p.low for p in self.parameters])
+        self.games = 0
+
+    def params(self, x: np.ndarray) -> Dict[str, float]:
+        """归一化向量 → 完整参数（未调的参数保持起点的值）"""
+        params = dict(self.start)
+        values = self._low + np.clip(x, 0.0, 1.0) * self._span
+        params.update((p.name, float(v)) for p, v in zip(self.parameters, values))
+        return params
+
+    def evaluate(self, executor: Optional[ProcessPoolExecutor], candidates: List[Dict[str, float]],
+                 deal_seed: str, deals: int) -> List[TuneResult]:
+        """全部候选在同一组发牌上的对局结果（按候选顺序）"""
+        per_task = max(1, self.settings.deals_per_task)
+        tasks = []
+        for index, params in enumerate(candidates):
+            engine = EngineSpec(self.settings.engine, tuple(params.items()))
+            for first in range(0, deals, per_task):
+                tasks.append(TuneTask(index, engine, self.opponent, tuple(range(first, min(first + per_task, deals))),
+                                      deal_seed, self.settings.level))
+        results = [TuneResult(index) for index in range(len(candidates))]
+        outputs = map(run_task, tasks) if executor is None else executor.map(run_task, tasks)
+        for output in outputs:
+            results[output.candidate].add(output)
+            self.games += output.games
+        return results
+
+    def run(self, progress: Optional[Callable[[Generation], None]] = None) -> TuneReport:
+        """
+        搜索并复核
+
+        Args:
+            progress: 每代结束时的回调
+
+        Returns:
+            调参结果（未写文件）
+        """
+        settings = self.settings
+        start_time = time.perf_counter()
+        x0 = (np.array([self.start[p.name] for p in self.parameters]) - self._low) / self._span
+        cma = CMAES(x0, settings.sigma, settings.seed, settings.population)
+        best_fitness, best_x = -math.inf, x0
+        report = TuneReport(settings, self.start, self.start)
+
+        with contextlib.ExitStack() as stack:
+            executor = None
+            if self.workers > 1:
+                executor = stack.enter_context(
+                    ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker))
+            for generation in range(settings.generations):
+                gen_start = time.perf_counter()
+                xs = np.clip(cma.ask(), 0.0, 1.0)
+                results = self.evaluate(executor, [self.params(x) for x in xs],
+                                        f"{settings.seed}:g{generation}", settings.deals)
+                fitness = [result.fitness for result in results]
+                cma.tell(xs, fitness)
+                top = int(np.argmax(fitness))
+                if fitness[top] > best_fitness:
+                    best_fitness, best_x = fitness[top], xs[top]
+                stats = Generation(generation, fitness[top], float(np.mean(fitness)), cma.sigma,
+                                   sum(r.games for r in results), sum(r.errors for r in results),
+                                   time.perf_counter() - gen_start)
+                report.generations.append(stats)
+                if progress:
+                    progress(stats)
+
+            # 复核：在未参与搜索的发牌上比较（历代最优候选的适应度偏高，需要独立的发牌）
+            finalists = {"start": self.start, "mean": self.params(cma.mean), "best": self.params(best_x)}
+            results = self.evaluate(executor, list(finalists.values()), f"{settings.seed}:validation",
+                                    settings.validation_deals)
+        report.validation = {name: result.fitness for name, result in zip(finalists, results)}
+        report.selected = max(report.validation, key=lambda name: report.validation[name])
+        report.best = finalists[report.selected]
+        report.games = self.games
+        report.elapsed = time.perf_counter() - start_time
+        return report
+
+
+def write_report(output_dir: str, report: TuneReport) -> str:
+    """把选中的参数写成下一个版本的权重文件，返回路径"""
+    settings = report.settings
+    report.path = tuned_weights.save_weights(output_dir, report.best, {
+        "engine": settings.engine,
+        "opponent": str(settings.opponent) if settings.opponent else settings.engine,
+        "tuned": [p.name for p in settings.tuned()],
+        "start": os.environ.get(tuned_weights.WEIGHTS_ENV) or "defaults",
+        "generations": len(report.generations),
+        "population": settings.population,
+        "deals": settings.deals,
+        "validation_deals": settings.validation_deals,
+        "seed": settings.seed,
+        "level": settings.level,
+        "selected": report.selected,
+        "validation": {name: round(value, 4) for name, value in report.validation.items()},
+        "games": report.games,
+        "elapsed": round(report.elapsed, 3),
+    })
+    return report.path
+
+
+def main():
+    """用离线自我对弈调参，写出版本化权重文件"""
+    import argparse
+    parser = argparse.ArgumentParser(description="评估权重/知识规则加分调参（CMA-ES + 离线自我对弈）")
+    parser.add_argument("-o", "--output", required=True, help="权重文件目录（写出 weights-vNNNN.json）")
+    parser.add_argument("--engine", default="knowledge", choices=sorted(ENGINE_GROUPS), help="被调参的引擎（默认: knowledge）")
+    parser.add_argument("--opponent", default=None, help="参照方座位规格（默认: 同类型引擎、当前参数），例如 yf、v4@0.05")
+    parser.add_argument("--groups", default=None, help="调参的分组，逗号分隔: evaluation,knowledge,yf（默认按引擎）")
+    parser.add_argument("--generations", type=int, default=20, help="代数（默认: 20）")
+    parser.add_argument("--population", type=int, default=None, help="每代候选数（默认: 4+3·ln(参数个数)）")
+    parser.add_argument("--deals", type=int, default=50, help="每代每个候选的发牌数，每副打两局（默认: 50）")
+    parser.add_argument("--validation-deals", type=int, default=200, help="复核的发牌数（默认: 200）")
+    parser.add_argument("--deals-per-task", type=int, default=DEFAULT_DEALS_PER_TASK,
+                        help=f"每个任务的发牌数（默认: {DEFAULT_DEALS_PER_TASK}）")
+    parser.add_argument("--sigma", type=float, default=0.2, help="初始步长，相对参数范围（默认: 0.2）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数（默认: CPU核数）")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子（默认: 0）")
+    parser.add_argument("--level", default=None, help="固定级牌点数（默认每局随机）")
+    args = parser.parse_args()
+
+    try:
+        settings = TuneSettings(
+            engine=args.engine,
+            opponent=PlayerSpec.parse(args.opponent) if args.opponent else None,
+            groups=tuple(args.groups.split(",")) if args.groups else None,
+            generations=args.generations, population=args.population, deals=args.deals,
+            validation_deals=args.validation_deals, deals_per_task=args.deals_per_task,
+            sigma=args.sigma, seed=args.seed, level=args.level,
+        )
+        tuner = Tuner(settings, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"调参 {len(tuner.parameters)} 个参数，{args.workers} 个进程对局...")
+    report = tuner.run(progress=lambda stats: print(stats.describe(), flush=True))
+    write_report(args.output, report)
+    print(report.describe())
+
+
+if __name__ == "__main__":
+    main()
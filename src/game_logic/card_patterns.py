@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+牌型识别与合法动作枚举 (Card Patterns)
+功能：
+- 识别一手牌的牌型（含红桃级牌作为万能牌"逢人配"）
+- 比较两手牌的大小（炸弹等级：四炸 < 五炸 < 同花顺 < 六炸及以上 < 天王炸）
+- 枚举手牌中的全部合法动作（跟牌时只保留能压过上家的动作，外加PASS）
+
+牌的表示与服务器消息一致："S3"、"HT"（T表示10）、"SB"（小王）、"HR"（大王）；
+动作为 [牌型, 点数, [牌...]]，例如 ["Pair", "Q", ["SQ", "HQ"]]。
+
+合法动作按 (牌型, 点数, 组成点数) 去重，每种只给出一组具体的牌
+（优先使用非万能牌），不枚举同一组合的不同花色选择。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+RANKS = "23456789TJQKA"
+SUITS = "SHCD"
+SMALL_JOKER = "SB"
+BIG_JOKER = "HR"
+# 顺子/连对/钢板的点数顺序（A既可在最前也可在最后）
+SEQUENCE = "A23456789TJQKA"
+
+PASS = "PASS"
+PASS_ACTION = [PASS, PASS, PASS]
+TYPES = (PASS, "Single", "Pair", "Trips", "ThreeWithTwo", "ThreePair", "TwoTrips",
+         "Straight", "StraightFlush", "Bomb")
+JOKER_RANK = "JOKER"
+# 数组编码用的点数顺序（B: 小王，R: 大王）
+RANK_CODES = RANKS + "BR"
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """一手牌的牌型"""
+    type: str
+    rank: str
+    ranks: Tuple[str, ...]  # 万能牌代入后的各张点数（用于区分三带二带的对子等）
+
+    @property
+    def key(self) -> Tuple[str, str, Tuple[str, ...]]:
+        return self.type, self.rank, tuple(sorted(self.ranks))
+
+
+def card_rank(card: str) -> str:
+    """牌 → 点数（小王 "B"，大王 "R"）"""
+    return card[1]
+
+
+def is_joker(card: str) -> bool:
+    return card in (SMALL_JOKER, BIG_JOKER)
+
+
+def is_wild(card: str, level: str) -> bool:
+    """红桃级牌是万能牌"""
+    return card == "H" + level
+
+
+def rank_value(rank: str, level: str) -> int:
+    """单张/对子/三张等的大小：2 < ... < A < 级牌 < 小王 < 大王"""
+    if rank == "B":
+        return 14
+    if rank == "R":
+        return 15
+    if rank == level:
+        return 13
+    value = RANKS.index(rank)
+    return value - 1 if value > RANKS.index(level) else value
+
+
+def _sequence_starts(length: int) -> range:
+    return range(len(SEQUENCE) - length + 1)
+
+
+def _fill_sequence(counts: Dict[str, int], wild: int, length: int, width: int) -> Optional[Tuple[int, int]]:
+    """
+    自然牌能否（加万能牌）组成 length 个连续点数、每个点数 width 张的序列
+
+    Returns:
+        (起点, 使用的万能牌数)，取最大的起点；不能组成时返回None
+    """
+    total = sum(counts.values())
+    for start in reversed(_sequence_starts(length)):
+        window = SEQUENCE[start:start + length]
+        if len(set(window)) < length:
+            continue
+        if sum(min(counts.get(rank, 0), width) for rank in window) != total:
+            continue  # 有自然牌不在窗口内，或某个点数超过width张
+        need = sum(width - counts.get(rank, 0) for rank in window)
+        if need <= wild:
+            return start, need
+    return None
+
+
+def classify(cards: Sequence[str], level: str) -> Optional[Pattern]:
+    """
+    识别牌型
+
+    Args:
+        cards: 一手牌
+        level: 当前级牌点数
+
+    Returns:
+        牌型，不是合法牌型时返回None
+    """
+    n = len(cards)
+    if n == 0:
+        return None
+    wild = sum(1 for card in cards if is_wild(card, level))
+    naturals = [card for card in cards if not is_wild(card, level)]
+    jokers = [card for card in naturals if is_joker(card)]
+    counts: Dict[str, int] = {}
+    for card in naturals:
+        if not is_joker(card):
+            counts[card_rank(card)] = counts.get(card_rank(card), 0) + 1
+
+    if jokers:
+        if n == 1:
+            return Pattern("Single", card_rank(jokers[0]), (card_rank(jokers[0]),))
+        if n == 2 and len(jokers) == 2 and jokers[0] == jokers[1]:
+            return Pattern("Pair", card_rank(jokers[0]), (card_rank(jokers[0]),) * 2)
+        if n == 4 and sorted(jokers) == [BIG_JOKER, BIG_JOKER, SMALL_JOKER, SMALL_JOKER]:
+            return Pattern("Bomb", JOKER_RANK, ("B", "B", "R", "R"))
+        return None
+
+    # 全部同点数（万能牌代入该点数；全是万能牌时为级牌）
+    if len(counts) <= 1:
+        rank = next(iter(counts), level)
+        same = {1: "Single", 2: "Pair", 3: "Trips"}
+        if n in same:
+            return Pattern(same[n], rank, (rank,) * n)
+        if n >= 4:
+            return Pattern("Bomb", rank, (rank,) * n)
+
+    if n == 5:
+        suits = {card[0] for card in naturals}
+        straight = _fill_sequence(counts, wild, 5, 1)
+        if straight is not None:
+            start, _ = straight
+            window = tuple(SEQUENCE[start:start + 5])
+            kind = "StraightFlush" if len(suits) == 1 else "Straight"
+            return Pattern(kind, window[0], window)
+        # 三带二：取能组成的最大三张
+        ranks = sorted(counts, key=lambda r: rank_value(r, level), reverse=True)
+        candidates = ranks + ([level] if level not in counts else [])
+        for trip in candidates:
+            for pair in candidates:
+                if pair == trip:
+                    continue
+                if set(counts) - {trip, pair}:
+                    continue
+                need = max(0, 3 - counts.get(trip, 0)) + max(0, 2 - counts.get(pair, 0))
+                if counts.get(trip, 0) <= 3 and counts.get(pair, 0) <= 2 and need == wild:
+                    return Pattern("ThreeWithTwo", trip, (trip,) * 3 + (pair,) * 2)
+        return None
+
+    if n == 6:
+        pairs = _fill_sequence(counts, wild, 3, 2)
+        if pairs is not None:
+            window = tuple(SEQUENCE[pairs[0]:pairs[0] + 3])
+            return Pattern("ThreePair", window[0], tuple(r for r in window for _ in range(2)))
+        trips = _fill_sequence(counts, wild, 2, 3)
+        if trips is not None:
+            window = tuple(SEQUENCE[trips[0]:trips[0] + 2])
+            return Pattern("TwoTrips", window[0], tuple(r for r in window for _ in range(3)))
+    return None
+
+
+def bomb_level(pattern: Pattern) -> int:
+    """炸弹等级：0 不是炸弹，四炸1，五炸2，同花顺3，六炸及以上4-8，天王炸9"""
+    if pattern.type == "StraightFlush":
+        return 3
+    if pattern.type != "Bomb":
+        return 0
+    if pattern.rank == JOKER_RANK:
+        return 9
+    size = len(pattern.ranks)
+    return size - 3 if size <= 5 else size - 2
+
+
+def _strength(pattern: Pattern, level: str) -> int:
+    if pattern.type in ("Straight", "StraightFlush", "ThreePair", "TwoTrips"):
+        # 序列按起点比较，A开头（A2345）最小
+        return 0 if pattern.rank == "A" else SEQUENCE.index(pattern.rank, 1)
+    if pattern.rank == JOKER_RANK:
+        return 0
+    return rank_value(pattern.rank, level)
+
+
+def beats(pattern: Pattern, target: Pattern, level: str) -> bool:
+    """pattern 能否压过 target"""
+    own, other = bomb_level(pattern), bomb_level(target)
+    if own or other:
+        if own != other:
+            return own > other
+        return _strength(pattern, level) > _strength(target, level)
+    if pattern.type != target.type or len(pattern.ranks) != len(target.ranks):
+        return False
+    return _strength(pattern, level) > _strength(target, level)
+
+
+def _pick(hand_by_rank: Dict[str, List[str]], wilds: List[str], ranks: Sequence[str],
+          suit: Optional[str] = None) -> Optional[List[str]]:
+    """按点数从手牌中取牌（suit指定时只取该花色），不足的用万能牌补"""
+    used: Dict[str, int] = {}
+    cards = []
+    wild_used = 0
+    for rank in ranks:
+        pool = [c for c in hand_by_rank.get(rank, ()) if suit is None or c[0] == suit]
+        index = used.get(rank, 0)
+        if index < len(pool):
+            cards.append(pool[index])
+            used[rank] = index + 1
+        elif wild_used < len(wilds):
+            cards.append(wilds[wild_used])
+            wild_used += 1
+        else:
+            return None
+    return cards
+
+
+def legal_actions(hand: Sequence[str], level: str, greater: Optional[Sequence] = None) -> List[list]:
+    """
+    枚举合法动作
+
+    Args:
+        hand: 手牌
+        level: 当前级牌点数
+        greater: 需要压过的动作 [牌型, 点数, 牌]，None或PASS表示自由出牌
+
+    Returns:
+        动作列表；跟牌时第一个是PASS
+    """
+    wilds = [card for card in hand if is_wild(card, level)]
+    hand_by_rank: Dict[str, List[str]] = {}
+    jokers = {SMALL_JOKER: 0, BIG_JOKER: 0}
+    for card in hand:
+        if is_joker(card):
+            jokers[card] += 1
+        elif not is_wild(card, level):
+            hand_by_rank.setdefault(card_rank(card), []).append(card)
+    counts = {rank: len(cards) for rank, cards in hand_by_rank.items()}
+    w = len(wilds)
+
+    patterns: Dict[tuple, Tuple[Pattern, List[str]]] = {}
+
+    def add(kind: str, rank: str, ranks: Sequence[str], suit: Optional[str] = None):
+        pattern = Pattern(kind, rank, tuple(ranks))
+        if pattern.key in patterns:
+            return
+        cards = _pick(hand_by_rank, wilds, ranks, suit)
+        if cards is not None:
+            patterns[pattern.key] = (pattern, cards)
+
+    # 按点数顺序枚举（不依赖字符串哈希，动作顺序在各进程间一致）
+    available = [rank for rank in RANKS if rank in counts or (w and rank == level)]
+    for rank in available:
+        have = counts.get(rank, 0)
+        if have + w >= 1:
+            add("Single", rank, (rank,))
+        if have + w >= 2:
+            add("Pair", rank, (rank,) * 2)
+        if have + w >= 3:
+            add("Trips", rank, (rank,) * 3)
+        for size in range(4, have + w + 1):
+            add("Bomb", rank, (rank,) * size)
+        if have + w >= 3:
+            for pair in available:
+                if pair != rank and max(0, 3 - have) + max(0, 2 - counts.get(pair, 0)) <= w:
+                    add("ThreeWithTwo", rank, (rank,) * 3 + (pair,) * 2)
+
+    for joker, count in jokers.items():
+        if count:
+            hand_by_rank.setdefault(card_rank(joker), []).extend([joker] * count)
+            add("Single", card_rank(joker), (card_rank(joker),))
+        if count == 2:
+            add("Pair", card_rank(joker), (card_rank(joker),) * 2)
+    if jokers[SMALL_JOKER] == 2 and jokers[BIG_JOKER] == 2:
+        add("Bomb", JOKER_RANK, ("B", "B", "R", "R"))
+
+    for length, width, kind in ((5, 1, "Straight"), (3, 2, "ThreePair"), (2, 3, "TwoTrips")):
+        for start in _sequence_starts(length):
+            window = SEQUENCE[start:start + length]
+            if sum(max(0, width - counts.get(rank, 0)) for rank in window) <= w:
+                add(kind, window[0], tuple(r for r in window for _ in range(width)))
+            if kind == "Straight":
+                for suit in SUITS:
+                    missing = sum(
+                        1 for rank in window
+                        if not any(c[0] == suit for c in hand_by_rank.get(rank, ()))
+                    )
+                    if missing <= w:
+                        pattern = Pattern("StraightFlush", window[0], tuple(window))
+                        if pattern.key not in patterns:
+                            cards = _pick(hand_by_rank, wilds, window, suit)
+                            if cards is not None:
+                                patterns[pattern.key] = (pattern, cards)
+
+    actions = []
+    target = None
+    if greater is not None and greater[0] != PASS:
+        target = classify(greater[2], level) if isinstance(greater[2], list) else None
+        actions.append(list(PASS_ACTION))
+    for pattern, cards in patterns.values():
+        if target is None or beats(pattern, target, level):
+            actions.append([pattern.type, pattern.rank, cards])
+    return actions
+
+
+def find_action(actions: Sequence[list], cards: Sequence[str], level: str) -> int:
+    """
+    在动作列表中查找与打出的牌同牌型同组成的动作
+
+    带万能牌的牌（如三带二）可能对应多个动作，按 classify 识别的组合匹配，
+    返回的动作与打出的牌组成相同，但声明的点数可能不同。
+
+    Returns:
+        动作下标，找不到时返回-1
+    """
+    if not cards:
+        return next((i for i, action in enumerate(actions) if action[0] == PASS), -1)
+    pattern = classify(cards, level)
+    if pattern is None:
+        return -1
+    for i, action in enumerate(actions):
+        if action[0] == pattern.type and action[1] == pattern.rank:
+            candidate = classify(action[2], level)
+            if candidate is not None and candidate.key == pattern.key:
+                return i
+    return -1
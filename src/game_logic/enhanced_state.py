@@ -44,6 +44,10 @@ class EnhancedGameStateManager:
         self.teammate_pos: Optional[int] = None
         self.opponent_positions: List[int] = []
     
+    def reset(self):
+        """重置为新一局的初始状态（共享该对象的评估器会同时看到重置后的状态）"""
+        self.__init__()
+    
     def update_from_message(self, message: Dict):
         """
         娴犲孩绉烽幁閺囧瓨鏌婇悩鑸
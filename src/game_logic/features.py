@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+局面特征提取 (Feature Extraction)
+功能：
+- 把一个出牌局面（act消息 + 记牌器）编码为定长的 float32 状态向量
+- 把 actionList 中的全部候选动作一次性编码为 (M, 动作特征) 矩阵（全部牌拼成一个字节数组查表，再用 bincount 计数）
+- 供学习型评估器和数据集导出（rep_dataset --features）共用同一套编码
+
+点数计数向量按 RANK_CODES 顺序（2..A、小王、大王，共15维），特征为原始计数/序数，不做归一化。
+
+状态特征（STATE_FEATURES，66维）：
+    hand[15]        手牌各点数张数
+    wild            手中红桃级牌张数
+    unseen[15]      其他三家手中各点数张数（未打出且不在自己手中）
+    rest[4]         剩余张数，按 自己、下家、对家、上家 排列
+    level[13]       级牌点数 one-hot
+    greater_type[10]    需要压过的动作牌型 one-hot（PASS 表示自由出牌）
+    greater_rank, greater_cards     该动作的大小（rank_value+1，天王炸为16，自由出牌为0）和张数
+    greater_seat[4]     该动作的相对座位 one-hot（0 表示自由出牌）
+    pass_num, my_pass_num           记牌器的连续PASS计数
+
+动作特征（ACTION_FEATURES，30维）：
+    type[10]        牌型 one-hot
+    rank, cards     大小（同 greater_rank）和张数
+    used[15]        使用的各点数张数
+    wild            使用的红桃级牌张数
+    hand_left       出牌后手牌张数
+    split_ranks     出牌后仍有剩余张数的点数个数（拆牌程度）
+
+用法：
+    extractor = FeatureExtractor()
+    state, actions = extractor.extract(message, tracker=state_manager.card_tracker)
+    x = extractor.combined(message, tracker)    # (M, 66 + 30)，每行 = 状态特征 + 动作特征
+"""
+
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .card_patterns import JOKER_RANK, PASS, RANK_CODES, RANKS, TYPES, rank_value
+
+
+RANK_DIM = len(RANK_CODES)
+TYPE_DIM = len(TYPES)
+SEATS = 4
+# 两副牌中每个点数的张数（大小王各2张）
+DECK_COUNTS = (8,) * len(RANKS) + (2, 2)
+
+
+def _names(prefix: str, labels: Iterable) -> List[str]:
+    return [f"{prefix}_{label}" for label in labels]
+
+
+STATE_FEATURES: Tuple[str, ...] = tuple(
+    _names("hand", RANK_CODES) + ["wild"] + _names("unseen", RANK_CODES)
+    + _names("rest", ("self", "next", "partner", "prev")) + _names("level", RANKS)
+    + _names("greater_type", TYPES) + ["greater_rank", "greater_cards"]
+    + _names("greater_seat", ("none", "next", "partner", "prev")) + ["pass_num", "my_pass_num"]
+)
+ACTION_FEATURES: Tuple[str, ...] = tuple(
+    _names("type", TYPES) + ["rank", "cards"] + _names("used", RANK_CODES)
+    + ["wild", "hand_left", "split_ranks"]
+)
+STATE_DIM = len(STATE_FEATURES)
+ACTION_DIM = len(ACTION_FEATURES)
+
+_RANK_INDEX = {rank: i for i, rank in enumerate(RANK_CODES)}
+_TYPE_INDEX = {name: i for i, name in enumerate(TYPES)}
+# 点数字符（ASCII）→ RANK_CODES 下标
+_RANK_LUT = np.zeros(256, np.intp)
+for _rank, _i in _RANK_INDEX.items():
+    _RANK_LUT[ord(_rank)] = _i
+_HEART = ord("H")
+# 状态向量各段的起点
+_HAND = 0
+_WILD = _HAND + RANK_DIM
+_UNSEEN = _WILD + 1
+_REST = _UNSEEN + RANK_DIM
+_LEVEL = _REST + SEATS
+_GREATER_TYPE = _LEVEL + len(RANKS)
+_GREATER_RANK = _GREATER_TYPE + TYPE_DIM
+_GREATER_SEAT = _GREATER_RANK + 2
+_PASS = _GREATER_SEAT + SEATS
+# 动作矩阵各段的起点
+_A_RANK = TYPE_DIM
+_A_USED = _A_RANK + 2
+_A_WILD = _A_USED + RANK_DIM
+
+
+def rank_counts(cards: Sequence[str]) -> np.ndarray:
+    """牌列表 → 各点数张数（RANK_CODES 顺序）"""
+    counts = np.zeros(RANK_DIM, np.float32)
+    for card in cards:
+        counts[_RANK_INDEX[card[1]]] += 1
+    return counts
+
+
+def tracker_unplayed(tracker) -> np.ndarray:
+    """CardTracker → 尚未打出的各点数张数（含自己手牌）"""
+    by_num = tracker.remain_cards_classbynum
+    index = tracker.card_index
+    counts = np.empty(RANK_DIM, np.float32)
+    counts[:len(RANKS)] = [by_num[index[rank]] for rank in RANKS]
+    # remain_cards_classbynum 的大小王共用一格，按花色表区分（S为小王，H为大王）
+    counts[-2] = tracker.remain_cards["S"][13]
+    counts[-1] = tracker.remain_cards["H"][13]
+    return counts
+
+
+def action_value(action: Optional[Sequence], level: str) -> int:
+    """动作大小：rank_value+1，天王炸为16，PASS/无动作为0"""
+    if not action or action[0] == PASS:
+        return 0
+    if action[1] == JOKER_RANK:
+        return 16
+    return rank_value(action[1], level) + 1
+
+
+_VALUE_TABLES: Dict[str, Dict[str, int]] = {}
+
+
+def _value_table(level: str) -> Dict[str, int]:
+    """动作点数 → action_value（按级牌缓存）"""
+    table = _VALUE_TABLES.get(level)
+    if table is None:
+        table = {rank: rank_value(rank, level) + 1 for rank in RANK_CODES}
+        table.update({PASS: 0, JOKER_RANK: 16})
+        _VALUE_TABLES[level] = table
+    return table
+
+
+class FeatureExtractor:
+    """act消息（+记牌器）→ 定长特征数组，无内部状态，可在多个局面间共用"""
+
+    def state_features(self, message: dict, tracker=None, played: Optional[Iterable[str]] = None,
+                       hand: Optional[np.ndarray] = None,
+                       passes: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        状态特征向量 (STATE_DIM,)
+
+        Args:
+            message: 服务器act消息（myPos、curRank、handCards、publicInfo、greaterPos、greaterAction）
+            tracker: CardTracker（提供已打出的牌和PASS计数），优先于played
+            played: 本小局已打出的全部牌（无记牌器时使用，例如回放数据）
+            hand: 已计算的手牌点数计数（extract 内部复用）
+            passes: (pass_num, my_pass_num)，无记牌器时使用（例如 ReplayDecision.passes）
+        """
+        level = message.get("curRank") or "2"
+        my_pos = message.get("myPos", 0)
+        if hand is None:
+            hand = rank_counts(message.get("handCards", []))
+        out = np.zeros(STATE_DIM, np.float32)
+        out[_HAND:_WILD] = hand
+        out[_WILD] = message.get("handCards", []).count("H" + level)
+
+        if tracker is not None:
+            unplayed = tracker_unplayed(tracker)
+            out[_PASS] = tracker.pass_num
+            out[_PASS + 1] = tracker.my_pass_num
+        else:
+            unplayed = np.array(DECK_COUNTS, np.float32)
+            if played is not None:
+                unplayed -= rank_counts(list(played))
+            if passes is not None:
+                out[_PASS:_PASS + 2] = passes
+        out[_UNSEEN:_REST] = np.maximum(unplayed - hand, 0)
+
+        public_info = message.get("publicInfo") or []
+        for offset in range(SEATS):
+            pos = (my_pos + offset) % SEATS
+            if pos < len(public_info):
+                out[_REST + offset] = public_info[pos].get("rest", 0)
+            elif tracker is not None:
+                out[_REST + offset] = tracker.get_player_remain(pos)
+        out[_LEVEL + RANKS.index(level)] = 1
+
+        greater = message.get("greaterAction")
+        greater_pos = message.get("greaterPos", -1)
+        if not greater or greater[0] == PASS or greater_pos in (-1, my_pos, None):
+            out[_GREATER_TYPE + _TYPE_INDEX[PASS]] = 1
+            out[_GREATER_SEAT] = 1
+        else:
+            out[_GREATER_TYPE + _TYPE_INDEX[greater[0]]] = 1
+            out[_GREATER_RANK] = action_value(greater, level)
+            out[_GREATER_RANK + 1] = len(greater[2])
+            out[_GREATER_SEAT + (greater_pos - my_pos) % SEATS] = 1
+        return out
+
+    def action_features(self, action_list: Sequence[Sequence], level: str = "2",
+                        hand: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        全部候选动作的特征矩阵 (len(action_list), ACTION_DIM)
+
+        Args:
+            action_list: 服务器actionList，[牌型, 点数, 牌列表]（PASS的牌为"PASS"）
+            level: 级牌点数
+            hand: 手牌点数计数（用于 hand_left、split_ranks；None 时这两列为0）
+        """
+        m = len(action_list)
+        out = np.zeros((m, ACTION_DIM), np.float32)
+        if m == 0:
+            return out
+        values = _value_table(level)
+        out[np.arange(m), [_TYPE_INDEX[action[0]] for action in action_list]] = 1
+        out[:, _A_RANK] = [values[action[1]] for action in action_list]
+
+        # 每张牌两个字符（花色、点数）：全部牌拼成一个字节数组后查表
+        played = [action[2] for action in action_list if action[2] != PASS]
+        sizes = np.array([len(cards) if cards != PASS else 0 for _, _, cards in action_list], np.intp)
+        codes = np.frombuffer("".join(chain.from_iterable(played)).encode("ascii"), np.uint8).reshape(-1, 2)
+        rows = np.repeat(np.arange(m), sizes)
+        used = np.bincount(rows * RANK_DIM + _RANK_LUT[codes[:, 1]], minlength=m * RANK_DIM)
+        used = used.reshape(m, RANK_DIM)
+        wilds = (codes[:, 0] == _HEART) & (codes[:, 1] == ord(level))
+        out[:, _A_RANK + 1] = sizes
+        out[:, _A_USED:_A_WILD] = used
+        out[:, _A_WILD] = np.bincount(rows, weights=wilds, minlength=m)
+        if hand is not None:
+            out[:, _A_WILD + 1] = hand.sum() - sizes
+            out[:, _A_WILD + 2] = ((used > 0) & (hand > used)).sum(axis=1)
+        return out
+
+    def extract(self, message: dict, tracker=None, played: Optional[Iterable[str]] = None,
+                passes: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        状态特征 (STATE_DIM,) 和全部候选动作的特征 (M, ACTION_DIM)
+
+        参数同 state_features
+        """
+        hand = rank_counts(message.get("handCards", []))
+        state = self.state_features(message, tracker, played, hand, passes)
+        actions = self.action_features(message.get("actionList", []), message.get("curRank") or "2", hand)
+        return state, actions
+
+    def combined(self, message: dict, tracker=None, played: Optional[Iterable[str]] = None,
+                 passes: Optional[Sequence[int]] = None) -> np.ndarray:
+        """每个候选动作一行：状态特征 + 动作特征，(M, STATE_DIM + ACTION_DIM)"""
+        state, actions = self.extract(message, tracker, played, passes)
+        return np.concatenate([np.broadcast_to(state, (len(actions), STATE_DIM)), actions], axis=1)
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+回放训练数据集 (Replay Dataset)
+功能：
+- 把 .rep 回放（见 rep_parser）中的每个出牌决策转换为一行列式数据：状态、合法动作、实际选择
+- 按行数分片写入 NumPy .npz 文件，处理大量回放时内存占用只与分片大小有关
+- manifest.json 记录回放名称、分片和解析统计
+
+每个分片包含的数组（N 行决策，M 个合法动作，牌向量为54维计数：4花色×13点数 + 小王 + 大王）：
+    replay (N,)           回放编号（对应 manifest 中的 replays）
+    episode, step, seat, level (N,)
+    hand (N,54)           当前手牌
+    played (N,4,54)       本小局各座位已打出的牌
+    rest (N,4)            各座位剩余张数
+    greater_seat, greater_type, greater_rank (N,)，greater_cards (N,54)   需要压过的动作（-1表示自由出牌）
+    legal_offsets (N+1,)  第i行的合法动作为 legal_*[legal_offsets[i]:legal_offsets[i+1]]
+    legal_type, legal_rank (M,)，legal_cards (M,54)
+    chosen (N,)           实际选择在本行合法动作中的下标（-1表示不在枚举范围内）
+    chosen_cards (N,54)   实际打出的牌
+    state_features (N,66)，legal_features (M,30)    加 --features 时写出，编码见 features.py
+    其他 (N,) 列由 DatasetWriter(extra_columns=...) 声明（例如自我对弈数据的小局结果，见 decision/selfplay.py）
+
+用法：
+    python -m game_logic.rep_dataset replays/ archive.zip -o dataset/ --level 2 [--features]
+"""
+
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+from .card_patterns import BIG_JOKER, JOKER_RANK, RANK_CODES, RANKS, SMALL_JOKER, SUITS, TYPES
+from .rep_parser import ReplayDecision, ReplayGame, iter_events, open_replays
+
+
+CARD_DIM = 54
+DEFAULT_SHARD_ROWS = 50000
+
+
+def card_index(card: str) -> int:
+    """牌 → 牌向量下标"""
+    if card == SMALL_JOKER:
+        return 52
+    if card == BIG_JOKER:
+        return 53
+    return SUITS.index(card[0]) * 13 + RANKS.index(card[1])
+
+
+def rank_code(rank: str) -> int:
+    """点数 → 编码（天王炸为15，PASS为-1）"""
+    if rank == JOKER_RANK:
+        return len(RANK_CODES)
+    return RANK_CODES.find(rank)
+
+
+def _fill(row, cards: Sequence[str]):
+    for card in cards:
+        row[card_index(card)] += 1
+
+
+class DatasetWriter:
+    """按分片写入决策数据"""
+
+    def __init__(self, output_dir: str, shard_rows: int = DEFAULT_SHARD_ROWS, features: bool = False,
+                 extra_columns: Optional[Dict[str, str]] = None, prefix: str = "part"):
+        """
+        Args:
+            output_dir: 输出目录
+            shard_rows: 每个分片的决策行数
+            features: 同时写出 FeatureExtractor 的状态/动作特征
+            extra_columns: 附加的每行标量列 {列名: NumPy dtype}，值由 add(..., **extra) 提供
+            prefix: 分片文件名前缀（多个进程写同一目录时区分）
+        """
+        import numpy  # 可选依赖，只在生成数据集时需要
+        self._np = numpy
+        self._extractor = None
+        if features:
+            from .features import FeatureExtractor
+            self._extractor = FeatureExtractor()
+        self.output_dir = output_dir
+        self.shard_rows = shard_rows
+        self.extra_columns = dict(extra_columns or {})
+        self.prefix = prefix
+        os.makedirs(output_dir, exist_ok=True)
+        self.replays: List[str] = []
+        self.shards: List[Dict] = []
+        self.rows = 0
+        self.unmatched = 0
+        self._pending: List[tuple] = []
+
+    def add_replay(self, name: str) -> int:
+        """登记一个回放，返回其编号"""
+        self.replays.append(name)
+        return len(self.replays) - 1
+
+    def add(self, replay: int, decision: ReplayDecision, **extra):
+        """加入一个决策（达到分片大小时写出），extra 为 extra_columns 中各列的值"""
+        self._pending.append((replay, decision, extra))
+        self.rows += 1
+        self.unmatched += decision.chosen < 0
+        if len(self._pending) >= self.shard_rows:
+            self._write_shard()
+
+    def _write_shard(self):
+        if not self._pending:
+            return
+        np = self._np
+        n = len(self._pending)
+        columns = {
+            "replay": np.zeros(n, np.int32),
+            "episode": np.zeros(n, np.int16),
+            "step": np.zeros(n, np.int32),
+            "seat": np.zeros(n, np.int8),
+            "level": np.zeros(n, np.int8),
+            "hand": np.zeros((n, CARD_DIM), np.uint8),
+            "played": np.zeros((n, 4, CARD_DIM), np.uint8),
+            "rest": np.zeros((n, 4), np.uint8),
+            "greater_seat": np.zeros(n, np.int8),
+            "greater_type": np.zeros(n, np.int8),
+            "greater_rank": np.zeros(n, np.int8),
+            "greater_cards": np.zeros((n, CARD_DIM), np.uint8),
+            "legal_offsets": np.zeros(n + 1, np.int64),
+            "chosen": np.zeros(n, np.int32),
+            "chosen_cards": np.zeros((n, CARD_DIM), np.uint8),
+        }
+        total_legal = sum(len(d.message["actionList"]) for _, d, _ in self._pending)
+        legal_type = np.zeros(total_legal, np.int8)
+        legal_rank = np.zeros(total_legal, np.int8)
+        legal_cards = np.zeros((total_legal, CARD_DIM), np.uint8)
+        if self._extractor is not None:
+            state_features, legal_features = [], []
+
+        offset = 0
+        for i, (replay, decision, _) in enumerate(self._pending):
+            message = decision.message
+            columns["replay"][i] = replay
+            columns["episode"][i] = decision.episode
+            columns["step"][i] = decision.step
+            columns["seat"][i] = decision.seat
+            columns["level"][i] = rank_code(message["curRank"])
+            _fill(columns["hand"][i], message["handCards"])
+            for pos, cards in enumerate(decision.played):
+                _fill(columns["played"][i, pos], cards)
+            columns["rest"][i] = [info["rest"] for info in message["publicInfo"]]
+            greater = message["greaterAction"]
+            columns["greater_seat"][i] = message["greaterPos"]
+            columns["greater_type"][i] = TYPES.index(greater[0]) if greater else -1
+            columns["greater_rank"][i] = rank_code(greater[1]) if greater else -1
+            if greater:
+                _fill(columns["greater_cards"][i], greater[2])
+            for action in message["actionList"]:
+                legal_type[offset] = TYPES.index(action[0])
+                legal_rank[offset] = rank_code(action[1])
+                if action[2] != "PASS":
+                    _fill(legal_cards[offset], action[2])
+                offset += 1
+            columns["legal_offsets"][i + 1] = offset
+            columns["chosen"][i] = decision.chosen
+            _fill(columns["chosen_cards"][i], decision.cards)
+            if self._extractor is not None:
+                # 回放没有记牌器，已出的牌和PASS计数由 ReplayGame 提供
+                played = [card for cards in decision.played for card in cards]
+                state, actions = self._extractor.extract(message, played=played, passes=decision.passes)
+                state_features.append(state)
+                legal_features.append(actions)
+
+        if self._extractor is not None:
+            columns["state_features"] = np.stack(state_features)
+            columns["legal_features"] = np.concatenate(legal_features)
+        for column, dtype in self.extra_columns.items():
+            columns[column] = np.array([extra[column] for _, _, extra in self._pending], dtype)
+
+        name = f"{self.prefix}-{len(self.shards):05d}.npz"
+        self._np.savez_compressed(
+            os.path.join(self.output_dir, name),
+            legal_type=legal_type, legal_rank=legal_rank, legal_cards=legal_cards, **columns
+        )
+        self.shards.append({"file": name, "rows": n, "legal_actions": total_legal})
+        self._pending = []
+
+    def flush(self):
+        """写出未满一个分片的剩余数据"""
+        self._write_shard()
+
+    def manifest(self, stats: Optional[Dict] = None) -> Dict:
+        """manifest.json 的内容"""
+        manifest = {
+            "rows": self.rows,
+            "unmatched": self.unmatched,
+            "card_dim": CARD_DIM,
+            "types": list(TYPES),
+            "rank_codes": list(RANK_CODES) + [JOKER_RANK],
+            "replays": self.replays,
+            "shards": self.shards,
+            "stats": stats or {},
+        }
+        if self._extractor is not None:
+            from .features import ACTION_FEATURES, STATE_FEATURES
+            manifest["state_features"] = list(STATE_FEATURES)
+            manifest["legal_features"] = list(ACTION_FEATURES)
+        if self.extra_columns:
+            manifest["extra_columns"] = self.extra_columns
+        return manifest
+
+    def close(self, stats: Optional[Dict] = None):
+        """写出剩余数据和 manifest.json"""
+        self.flush()
+        write_manifest(self.output_dir, self.manifest(stats))
+
+
+def write_manifest(output_dir: str, manifest: Dict):
+    """写出 manifest.json（多个 DatasetWriter 的分片合并到同一目录时，由调用方汇总后写出）"""
+    with open(os.path.join(output_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def build_dataset(paths: List[str], output_dir: str, level: str = "2",
+                  shard_rows: int = DEFAULT_SHARD_ROWS, features: bool = False) -> Dict:
+    """
+    解析回放并写出数据集
+
+    Args:
+        paths: 回放文件、目录或 .zip 归档
+        output_dir: 输出目录
+        level: 回放中没有级牌记录时使用的级牌
+        shard_rows: 每个分片的决策行数
+        features: 同时写出特征数组（见 features.py）
+
+    Returns:
+        统计信息
+    """
+    writer = DatasetWriter(output_dir, shard_rows, features)
+    stats = {"replays": 0, "failed": 0, "episodes": 0, "unknown_cards": 0, "invalid_plays": 0}
+    for name, stream in open_replays(paths):
+        replay = writer.add_replay(name)
+        game = ReplayGame(level)
+        try:
+            for event in iter_events(stream):
+                for _, decision in game.feed(event):
+                    if decision is not None:
+                        writer.add(replay, decision)
+        except ValueError as e:
+            # 单个回放格式错误不影响其他回放（已写入的决策保留）
+            stats["failed"] += 1
+            stats.setdefault("errors", []).append(f"{name}: {e}")
+        stats["replays"] += 1
+        stats["episodes"] += game.episode + 1
+        stats["unknown_cards"] += game.unknown_cards
+        stats["invalid_plays"] += game.invalid_plays
+    writer.close(stats)
+    stats.update(rows=writer.rows, unmatched=writer.unmatched, shards=len(writer.shards))
+    return stats
+
+
+def main():
+    """把回放转换为列式训练数据"""
+    import argparse
+    parser = argparse.ArgumentParser(description=".rep 回放 → 列式训练数据（.npz 分片）")
+    parser.add_argument("paths", nargs="+", help="回放文件、目录或 .zip 归档")
+    parser.add_argument("-o", "--output", required=True, help="输出目录")
+    parser.add_argument("--level", default="2", help="级牌点数（回放中没有级牌记录时使用，默认: 2）")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS, help="每个分片的决策行数")
+    parser.add_argument("--features", action="store_true", help="同时写出状态/动作特征数组（features.py）")
+    args = parser.parse_args()
+
+    stats = build_dataset(args.paths, args.output, args.level, args.shard_rows, args.features)
+    print(
+        f"回放 {stats['replays']} 个（失败 {stats['failed']}），小局 {stats['episodes']}，"
+        f"决策 {stats['rows']} 行（{stats['unmatched']} 行实际选择不在枚举的合法动作中），"
+        f"分片 {stats['shards']} 个 → {args.output}"
+    )
+    for error in stats.get("errors", [])[:10]:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
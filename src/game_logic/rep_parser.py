@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+平台回放文件解析 (.rep Parser)
+功能：
+- 流式读取平台 .rep 回放（按块读取，内存占用与文件大小无关），支持目录和 .zip 归档
+- 把发牌/进贡/出牌记录还原为客户端收到的 notify / act 消息（与服务器消息格式一致），
+  每个 act 消息附带合法动作列表和实际选择的下标，可直接送入决策引擎或生成训练数据
+
+记录格式（按 docs/replay_analysis 中引用的原始数据整理）：
+- 每条记录是一个带属性的元素，例如 <dispatch seat="2" data="RRC3C3SAHA..."/>、
+  <tribute data="1,3:3,A,4,4"/>、<play seat="1" data="S4D2"/>
+- 牌为两个字符：花色 S/H/C/D + 点数 2-9/T/J/Q/K/A，"rr" 为小王，"RR" 为大王
+- 出牌数据末尾带两个字符的附加标记（如 "D0"、"D2"），只有标记时表示PASS
+元素名和属性名的别名见 EVENT_TAGS / SEAT_ATTRS / DATA_ATTRS，未知元素忽略。
+
+用法：
+    python -m game_logic.rep_parser replay.rep --level 3     # 输出消息（每行一条JSON）
+"""
+
+import io
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .card_patterns import (
+    BIG_JOKER, PASS, PASS_ACTION, SMALL_JOKER, classify, beats, find_action, legal_actions,
+)
+
+
+# 元素名 → 事件类型
+EVENT_TAGS = {
+    "dispatch": "deal",
+    "deal": "deal",
+    "tribute": "tribute",
+    "back": "back",
+    "play": "play",
+    "action": "play",
+    "out": "play",
+    "rank": "level",
+    "level": "level",
+    "result": "end",
+    "over": "end",
+}
+SEAT_ATTRS = ("seat", "pos", "p")
+DATA_ATTRS = ("data", "cards", "d")
+
+# 出牌数据末尾附加标记的长度
+PLAY_TAG_LENGTH = 2
+# .rep牌面 → 服务器牌面
+JOKER_CODES = {"rr": SMALL_JOKER, "RR": BIG_JOKER}
+
+CHUNK_SIZE = 64 * 1024
+ELEMENT_PATTERN = re.compile(r"<\s*([A-Za-z_][\w.-]*)((?:\s+[\w.-]+\s*=\s*\"[^\"]*\")*)\s*/?>")
+ATTR_PATTERN = re.compile(r"([\w.-]+)\s*=\s*\"([^\"]*)\"")
+# 缓冲区中保留的未完成元素的最大长度（超过则丢弃，防止异常文件占满内存）
+MAX_ELEMENT_LENGTH = 64 * 1024
+
+
+@dataclass
+class RepEvent:
+    """一条回放记录"""
+    kind: str  # deal / tribute / back / play / level / end
+    seat: Optional[int]
+    data: str
+    attrs: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_cards(text: str) -> List[str]:
+    """
+    .rep牌面字符串 → 服务器牌面列表
+
+    Raises:
+        ValueError: 含有无法识别的牌
+    """
+    cards = []
+    for i in range(0, len(text) - 1, 2):
+        code = text[i:i + 2]
+        if code in JOKER_CODES:
+            cards.append(JOKER_CODES[code])
+        elif code[0] in "SHCD" and code[1] in "23456789TJQKA":
+            cards.append(code)
+        else:
+            raise ValueError(f"无法识别的牌: {code!r}")
+    if len(text) % 2:
+        raise ValueError(f"牌面长度不是偶数: {text!r}")
+    return cards
+
+
+def parse_play(data: str) -> List[str]:
+    """出牌数据 → 打出的牌（空列表表示PASS）"""
+    data = data.strip()
+    if data.upper() in ("", PASS, "P"):
+        return []
+    if PLAY_TAG_LENGTH:
+        data = data[:-PLAY_TAG_LENGTH]
+    return parse_cards(data)
+
+
+def iter_events(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[RepEvent]:
+    """
+    流式解析回放记录
+
+    Args:
+        stream: 文本流
+        chunk_size: 每次读取的字符数
+    """
+    buffer = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer += chunk
+        end = 0
+        for match in ELEMENT_PATTERN.finditer(buffer):
+            end = match.end()
+            kind = EVENT_TAGS.get(match.group(1).lower())
+            if kind is None:
+                continue
+            attrs = {key.lower(): value for key, value in ATTR_PATTERN.findall(match.group(2))}
+            seat = next((attrs[name] for name in SEAT_ATTRS if name in attrs), None)
+            data = next((attrs[name] for name in DATA_ATTRS if name in attrs), "")
+            yield RepEvent(kind, int(seat) if seat not in (None, "") else None, data, attrs)
+        buffer = buffer[end:]
+        # 只保留可能是未完成元素的部分
+        start = buffer.rfind("<")
+        buffer = buffer[start:] if start >= 0 and len(buffer) - start <= MAX_ELEMENT_LENGTH else ""
+        if not chunk:
+            break
+
+
+@dataclass
+class ReplayDecision:
+    """一次出牌决策"""
+    episode: int
+    step: int
+    seat: int
+    message: dict  # 该玩家收到的act消息
+    chosen: int  # 实际选择在actionList中的下标，-1表示不在枚举的合法动作中
+    cards: List[str]  # 实际打出的牌
+    played: List[List[str]]  # 本小局各座位已打出的牌（决策前）
+    passes: Tuple[int, int] = (0, 0)  # 决策前的连续PASS计数（pass_num, my_pass_num，与CardTracker相同）
+
+
+class ReplayGame:
+    """
+    回放状态机：跟踪手牌、出牌轮次，按客户端视角生成消息
+
+    用法：
+        game = ReplayGame(level="3")
+        for event in iter_events(stream):
+            for message, decision in game.feed(event):
+                ...
+    """
+
+    def __init__(self, level: str = "2"):
+        self.level = level
+        self.episode = -1
+        self.hands: Dict[int, List[str]] = {}
+        self.played: Dict[int, List[str]] = {}
+        self.order: List[int] = []
+        self.step = 0
+        self.greater_pos = -1
+        self.greater_action: Optional[list] = None
+        self.cur_pos = -1
+        self.cur_action: Optional[list] = None
+        self.passes = 0
+        self.pass_counts: Dict[int, List[int]] = {}
+        self.unknown_cards = 0  # 出牌中不在已知手牌里的牌数（进贡换牌等）
+        self.invalid_plays = 0
+
+    def _new_episode(self):
+        self.episode += 1
+        self.hands = {}
+        self.played = {seat: [] for seat in range(4)}
+        self.order = []
+        self.step = 0
+        self.pass_counts = {seat: [0, 0] for seat in range(4)}
+        self._reset_round()
+
+    def _reset_round(self):
+        # 新一轮自由出牌：与开局相同，act消息中没有当前动作和需要压过的动作
+        self.greater_pos = -1
+        self.greater_action = None
+        self.cur_pos = -1
+        self.cur_action = None
+        self.passes = 0
+
+    def feed(self, event: RepEvent) -> Iterator[Tuple[dict, Optional[ReplayDecision]]]:
+        """
+        处理一条记录
+
+        Yields:
+            (消息, 决策)：act消息附带决策，notify消息的决策为None
+        """
+        if event.kind == "level":
+            self.level = event.data.strip()[-1:] or self.level
+        elif event.kind == "deal" and event.seat is not None:
+            if self.episode < 0 or event.seat in self.hands or self.step:
+                if self.episode >= 0 and self.step:
+                    yield self._episode_over(), None
+                self._new_episode()
+            self.hands[event.seat] = parse_cards(event.data)
+            yield {
+                "type": "notify", "stage": "beginning", "myPos": event.seat,
+                "curRank": self.level, "handCards": list(self.hands[event.seat]),
+            }, None
+        elif event.kind in ("tribute", "back"):
+            yield {"type": "notify", "stage": event.kind, "result": event.data}, None
+        elif event.kind == "play" and event.seat is not None and self.episode >= 0:
+            yield from self._play(event.seat, parse_play(event.data))
+        elif event.kind == "end" and self.step:
+            yield self._episode_over(), None
+            self.step = 0
+
+    def _play(self, seat: int, cards: List[str]) -> Iterator[Tuple[dict, Optional[ReplayDecision]]]:
+        # 上家的牌已被所有人PASS（或记录中省略了PASS）时重新出牌
+        if self.greater_pos == seat or self.greater_action is None:
+            self._reset_round()
+        pattern = classify(cards, self.level) if cards else None
+        if cards and pattern is None:
+            self.invalid_plays += 1
+        elif cards and self.greater_action is not None:
+            target = classify(self.greater_action[2], self.level)
+            if target is not None and not beats(pattern, target, self.level):
+                self._reset_round()
+
+        message = self.prompt(seat)
+        chosen = find_action(message["actionList"], cards, self.level)
+        decision = ReplayDecision(
+            self.episode, self.step, seat, message, chosen, list(cards),
+            [list(self.played[pos]) for pos in range(4)], tuple(self.pass_counts[seat])
+        )
+        yield message, decision
+        yield self._apply(seat, cards, [pattern.type, pattern.rank, list(cards)] if pattern else list(PASS_ACTION)), None
+
+    def prompt(self, seat: int) -> dict:
+        """轮到 seat 出牌时收到的act消息（合法动作按当前需要压过的动作枚举）"""
+        hand = self.hands.setdefault(seat, [])
+        actions = legal_actions(hand, self.level, self.greater_action)
+        return {
+            "type": "act",
+            "stage": "play",
+            "myPos": seat,
+            "selfRank": self.level,
+            "oppoRank": self.level,
+            "curRank": self.level,
+            "handCards": list(hand),
+            "publicInfo": [{"rest": len(self.hands.get(pos, ())), "playArea": None} for pos in range(4)],
+            "curPos": self.cur_pos,
+            "curAction": self.cur_action,
+            "greaterPos": self.greater_pos,
+            "greaterAction": self.greater_action,
+            "actionList": actions,
+            "indexRange": len(actions) - 1,
+        }
+
+    def _apply(self, seat: int, cards: List[str], action: list) -> dict:
+        """打出 cards（空表示PASS），返回广播给所有人的notify消息"""
+        hand = self.hands.setdefault(seat, [])
+        for card in cards:
+            if card in hand:
+                hand.remove(card)
+            else:
+                self.unknown_cards += 1
+        self.played[seat].extend(cards)
+        self.step += 1
+        self.cur_pos, self.cur_action = seat, action
+        passed = action[0] == PASS
+        for pos, counts in self.pass_counts.items():
+            if seat in (pos, (pos + 2) % 4):
+                counts[0] = counts[0] + 1 if passed else 0
+            if seat == pos:
+                counts[1] = counts[1] + 1 if passed else 0
+        if cards:
+            self.greater_pos, self.greater_action = seat, action
+            self.passes = 0
+            if not hand and seat not in self.order:
+                self.order.append(seat)
+        else:
+            self.passes += 1
+            others = sum(1 for pos, cards_left in self.hands.items() if cards_left and pos != self.greater_pos)
+            if self.passes >= others:
+                self._reset_round()
+        return {
+            "type": "notify", "stage": "play", "curPos": seat, "curAction": action,
+            "greaterPos": self.greater_pos, "greaterAction": self.greater_action,
+        }
+
+    def _episode_over(self) -> dict:
+        order = self.order + [pos for pos in range(4) if pos not in self.order]
+        rest = [[pos, list(self.hands[pos])] for pos in range(4) if self.hands.get(pos)]
+        return {"type": "notify", "stage": "episodeOver", "order": order, "curRank": self.level, "restCards": rest}
+
+
+def open_replays(paths: List[str], encoding: str = "utf-8") -> Iterator[Tuple[str, TextIO]]:
+    """
+    依次打开回放文件（目录递归查找 *.rep，.zip 归档逐个读取其中的 *.rep）
+
+    Yields:
+        (名称, 文本流)，流在下一次迭代前关闭
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith((".rep", ".zip")):
+                        yield from open_replays([os.path.join(root, name)], encoding)
+        elif path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as archive:
+                for info in archive.infolist():
+                    if info.filename.lower().endswith(".rep"):
+                        with archive.open(info) as raw:
+                            yield f"{path}:{info.filename}", io.TextIOWrapper(raw, encoding=encoding, errors="replace")
+        else:
+            with open(path, encoding=encoding, errors="replace") as stream:
+                yield path, stream
+
+
+def main():
+    """把回放文件还原为消息（每行一条JSON）"""
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description=".rep 回放解析")
+    parser.add_argument("paths", nargs="+", help="回放文件、目录或 .zip 归档")
+    parser.add_argument("--level", default="2", help="级牌点数（回放中没有级牌记录时使用，默认: 2）")
+    parser.add_argument("--acts-only", action="store_true", help="只输出act消息")
+    args = parser.parse_args()
+
+    for name, stream in open_replays(args.paths):
+        game = ReplayGame(args.level)
+        for event in iter_events(stream):
+            for message, decision in game.feed(event):
+                if decision is None and args.acts_only:
+                    continue
+                record = {"replay": name, "message": message}
+                if decision is not None:
+                    record.update(episode=decision.episode, step=decision.step, chosen=decision.chosen)
+                print(json.dumps(record, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+离线对局模拟 (Self-play Simulator)
+功能：
+- 不连接服务器，在进程内按出牌规则推进一小局：随机发牌、轮转出牌、接风、判定完牌顺序
+- 复用 ReplayGame 的状态跟踪和消息格式，各座位收到的 notify / act 消息与回放、服务器一致
+- 小局结束时给出完牌顺序和胜方升级数（对家第2名升3级、第3名升2级、第4名升1级）
+
+简化：
+- 不进贡/还贡，每小局从随机座位开始出牌
+- 级牌由调用方指定（默认随机），一小局内不变
+
+用法：
+    game = SelfPlayGame(random.Random(seed))
+    for seat in range(4):
+        send(seat, game.beginning(seat))
+    while not game.finished:
+        seat = game.turn
+        message = game.prompt(seat)
+        notify = game.play(seat, choose(message))    # actionList 下标
+        broadcast(notify)
+    broadcast(game.episode_over())
+"""
+
+import random
+from typing import List, Optional
+
+from .card_patterns import BIG_JOKER, PASS, RANKS, SMALL_JOKER, SUITS
+from .rep_parser import ReplayGame
+
+
+# 两副牌（108张）
+DECK = [suit + rank for suit in SUITS for rank in RANKS] * 2 + [SMALL_JOKER, BIG_JOKER] * 2
+HAND_SIZE = 27
+# 对家的完牌名次（1-3，从0开始的下标）→ 胜方升级数
+LEVEL_DELTAS = {1: 3, 2: 2, 3: 1}
+
+
+class SelfPlayGame(ReplayGame):
+    """一小局离线对局（发牌后由调用方为每个座位选择动作）"""
+
+    def __init__(self, rng: random.Random, level: Optional[str] = None, first: Optional[int] = None):
+        """
+        Args:
+            rng: 随机数发生器（发牌、首个出牌座位、默认级牌）
+            level: 级牌点数，None 表示随机
+            first: 首个出牌座位，None 表示随机
+        """
+        super().__init__(level or rng.choice(RANKS))
+        self._new_episode()
+        deck = list(DECK)
+        rng.shuffle(deck)
+        for seat in range(4):
+            self.hands[seat] = deck[seat * HAND_SIZE:(seat + 1) * HAND_SIZE]
+        self.turn = rng.randrange(4) if first is None else first
+        self.finished = False
+        self._prompted = None  # (座位, 步数, actionList)：play 复用最近一次 prompt 枚举的合法动作
+
+    def beginning(self, seat: int) -> dict:
+        """seat 收到的开局消息"""
+        return {
+            "type": "notify", "stage": "beginning", "myPos": seat,
+            "curRank": self.level, "handCards": list(self.hands[seat]),
+        }
+
+    def prompt(self, seat: int) -> dict:
+        message = super().prompt(seat)
+        self._prompted = (seat, self.step, message["actionList"])
+        return message
+
+    def play(self, seat: int, index: int) -> dict:
+        """
+        seat 选择 prompt(seat) 中 actionList 的第 index 个动作
+
+        Returns:
+            广播给所有人的notify消息
+
+        Raises:
+            ValueError: 不是该座位出牌，或下标超出合法动作范围
+        """
+        if self.finished or seat != self.turn:
+            raise ValueError(f"现在不是座位 {seat} 出牌")
+        if self._prompted is not None and self._prompted[:2] == (seat, self.step):
+            actions = self._prompted[2]
+        else:
+            actions = self.prompt(seat)["actionList"]
+        if not 0 <= index < len(actions):
+            raise ValueError(f"动作下标 {index} 超出范围（共 {len(actions)} 个合法动作）")
+        action = actions[index]
+        cards = [] if action[0] == PASS else list(action[2])
+        leader = self.greater_pos
+        notify = self._apply(seat, cards, action)
+        self._advance(seat, leader)
+        return notify
+
+    def _advance(self, seat: int, leader: int):
+        order = self.order
+        if len(order) >= 3 or (len(order) == 2 and order[1] == (order[0] + 2) % 4):
+            self.finished = True
+            return
+        if self.greater_action is None:
+            # 一轮结束：最后出牌者继续出牌，已完牌时由对家接风
+            for pos in (leader, (leader + 2) % 4):
+                if self.hands[pos]:
+                    self.turn = pos
+                    return
+            seat = leader
+        self.turn = self._next_active(seat)
+
+    def _next_active(self, seat: int) -> int:
+        for offset in range(1, 4):
+            pos = (seat + offset) % 4
+            if self.hands[pos]:
+                return pos
+        return seat
+
+    def final_order(self) -> List[int]:
+        """完牌顺序（未完牌的座位按剩余张数排在后面）"""
+        rest = sorted((pos for pos in range(4) if pos not in self.order), key=lambda pos: len(self.hands[pos]))
+        return self.order + rest
+
+    def level_delta(self) -> int:
+        """胜方（头游所在方）升级数"""
+        order = self.final_order()
+        return LEVEL_DELTAS[order.index((order[0] + 2) % 4)]
+
+    def episode_over(self) -> dict:
+        """小局结束消息（order 为完整的完牌顺序）"""
+        self.order = self.final_order()
+        message = self._episode_over()
+        self.step = 0
+        return message
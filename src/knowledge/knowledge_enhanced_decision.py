@@ -17,6 +17,7 @@ if str(Path(__file__).parent.parent) not in sys.path:
 from decision.decision_engine import DecisionEngine
 from game_logic.enhanced_state import EnhancedGameStateManager
 from knowledge.knowledge_loader import KnowledgeLoader
+from decision import tuned_weights
 
 
 class KnowledgeEnhancedDecisionEngine(DecisionEngine):
@@ -44,6 +45,9 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                 self.knowledge_loader = None
         else:
             self.knowledge_loader = knowledge_loader
+
+        # 知识规则权重（默认值见 tuned_weights.PARAMETERS，可由 GD_WEIGHTS 调参文件覆盖）
+        self.rule_weights = tuned_weights.section("knowledge")
     
     def active_decision(self, message: Dict, action_list: List[List]) -> int:
         """
@@ -223,13 +227,17 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                 cards_left[i] = 27
         
         # 应用核心策略
+        rules = self.rule_weights
         enhanced_evaluations = []
         for idx, base_score in evaluations:
             action = action_list[idx]
             action_type = action[0] if len(action) > 0 else "PASS"
             score = base_score
+            protect = 0.0
+            pressure = 0.0
             
             # 策略1：队友保护（验证并完善）
+            # 各档加减分累计后按 rule_weights["teammate_protection"] 整体缩放
             # 参考：lalala策略和关键规则层实现
             teammate_cards = cards_left.get(teammate_pos, 27)
             
@@ -238,9 +246,9 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                 # 关键情况：队友剩余1-2张牌（即将获胜）
                 if teammate_cards <= 2:
                     if action_type == "PASS":
-                        score += 150  # 极强烈鼓励PASS，让队友走
+                        protect += 150  # 极强烈鼓励PASS，让队友走
                     else:
-                        score -= 80   # 严重惩罚出牌
+                        protect -= 80   # 严重惩罚出牌
                 
                 # 重要情况：队友剩余3-5张牌（残局阶段）
                 elif teammate_cards <= 5:
@@ -253,33 +261,33 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                                 # 如果队友出的是大牌（A或以上），让队友走
                                 if card_value >= 14:  # A=14, 2=15, Joker=16/17
                                     if action_type == "PASS":
-                                        score += 120  # 强烈鼓励PASS
+                                        protect += 120  # 强烈鼓励PASS
                                     else:
-                                        score -= 60   # 惩罚出牌
+                                        protect -= 60   # 惩罚出牌
                                 # 如果队友出的是中等牌（10-K），适度保护
                                 elif card_value >= 10:
                                     if action_type == "PASS":
-                                        score += 80   # 鼓励PASS
+                                        protect += 80   # 鼓励PASS
                                     else:
-                                        score -= 30   # 轻微惩罚出牌
+                                        protect -= 30   # 轻微惩罚出牌
                             except:
                                 # 无法解析牌值，使用默认规则
                                 if action_type == "PASS":
-                                    score += 100
+                                    protect += 100
                                 else:
-                                    score -= 50
+                                    protect -= 50
                         else:
                             # 没有当前动作（主动模式），队友控场时鼓励PASS
                             if action_type == "PASS":
-                                score += 100
+                                protect += 100
                             else:
-                                score -= 50
+                                protect -= 50
                     else:
                         # 主动模式，队友控场时适度保护
                         if action_type == "PASS":
-                            score += 60
+                            protect += 60
                         else:
-                            score -= 30
+                            protect -= 30
                 
                 # 中等情况：队友剩余6-8张牌（接近残局）
                 elif teammate_cards <= 8:
@@ -291,9 +299,9 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                                 card_value = self._get_card_value(cur_action[1])
                                 if card_value >= 15:  # 2或Joker
                                     if action_type == "PASS":
-                                        score += 50   # 适度鼓励PASS
+                                        protect += 50   # 适度鼓励PASS
                                     else:
-                                        score -= 20   # 轻微惩罚
+                                        protect -= 20   # 轻微惩罚
                             except:
                                 pass
             
@@ -305,9 +313,9 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                 # 如果队友快走完了，让队友继续控场
                 if teammate_cards <= 3:
                     if action_type == "PASS":
-                        score += 100  # 强烈鼓励PASS
+                        protect += 100  # 强烈鼓励PASS
                     else:
-                        score -= 50   # 惩罚出牌
+                        protect -= 50   # 惩罚出牌
                 elif teammate_cards <= 6:
                     # 检查队友出的牌值
                     cur_action = message.get("curAction", [])
@@ -317,13 +325,16 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                             # 队友出大牌，让队友走
                             if card_value >= 14:
                                 if action_type == "PASS":
-                                    score += 70
+                                    protect += 70
                                 else:
-                                    score -= 35
+                                    protect -= 35
                         except:
                             pass
             
+            score += protect * rules["teammate_protection"]
+
             # 策略2：对手压制（验证并完善）
+            # 各档加减分累计后按 rule_weights["opponent_pressure"] 整体缩放
             # 参考：lalala策略和关键规则层实现
             opponent_cards = [
                 cards_left.get(next_pos, 27),
@@ -343,19 +354,19 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                             # 被动模式，检查是否能压制对手
                             if action_type == cur_action[0] or action_type == "Bomb":
                                 # 同类型或炸弹，可以压制
-                                score += 150  # 极强烈鼓励压制
+                                pressure += 150  # 极强烈鼓励压制
                             else:
                                 # 不同类型，无法压制，但还是要出牌
-                                score += 100  # 强烈鼓励出牌
+                                pressure += 100  # 强烈鼓励出牌
                         else:
                             # 没有当前动作，鼓励出牌
-                            score += 120
+                            pressure += 120
                     else:
                         # 主动模式，对手快走完，必须出牌压制
-                        score += 120
+                        pressure += 120
                 else:
                     # PASS是严重错误
-                    score -= 100  # 严重惩罚PASS
+                    pressure -= 100  # 严重惩罚PASS
             
             # 重要情况：对手剩余4张牌
             # 规则："火不打四" - 对手4张时可能是炸弹，不要轻易用炸弹
@@ -366,23 +377,23 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                     if cur_action and len(cur_action) > 0:
                         if action_type == "Bomb":
                             # 对手4张，可能是炸弹，不要轻易用炸弹
-                            score -= 30  # 轻微惩罚用炸弹
+                            pressure -= 30  # 轻微惩罚用炸弹
                         elif action_type == cur_action[0] or action_type == "Bomb":
                             # 可以压制，但不是炸弹
-                            score += 60  # 鼓励出牌压制
+                            pressure += 60  # 鼓励出牌压制
                         else:
-                            score += 30  # 适度鼓励出牌
+                            pressure += 30  # 适度鼓励出牌
                     else:
-                        score += 40
+                        pressure += 40
                 else:
                     # 主动模式，适度出牌
                     if action_type != "PASS":
                         if action_type == "Bomb":
-                            score -= 20  # 避免用炸弹
+                            pressure -= 20  # 避免用炸弹
                         else:
-                            score += 50
+                            pressure += 50
                     else:
-                        score -= 20
+                        pressure -= 20
             
             # 重要情况：对手剩余5张牌
             # 规则："逢五出对" - 对手5张时优先出对子
@@ -393,30 +404,30 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                     if cur_action and len(cur_action) > 0:
                         # 如果当前是对子，优先出对子压制
                         if cur_action[0] == "Pair" and action_type == "Pair":
-                            score += 100  # 强烈鼓励出对子压制
+                            pressure += 100  # 强烈鼓励出对子压制
                         elif action_type == "Pair":
                             # 主动出对子（虽然是被动模式，但可以主动出对子）
-                            score += 80
+                            pressure += 80
                         elif action_type != "PASS":
-                            score += 60  # 鼓励出牌
+                            pressure += 60  # 鼓励出牌
                         else:
-                            score -= 40  # 惩罚PASS
+                            pressure -= 40  # 惩罚PASS
                     else:
                         # 被动模式但没有当前动作（接风等情况），鼓励出对子
                         if action_type == "Pair":
-                            score += 80
+                            pressure += 80
                         elif action_type != "PASS":
-                            score += 50
+                            pressure += 50
                         else:
-                            score -= 30
+                            pressure -= 30
                 else:
                     # 主动模式，鼓励出对子
                     if action_type == "Pair":
-                        score += 70
+                        pressure += 70
                     elif action_type != "PASS":
-                        score += 50
+                        pressure += 50
                     else:
-                        score -= 30
+                        pressure -= 30
             
             # 中等情况：对手剩余6-8张牌（接近残局）
             elif min_opponent_cards <= 8:
@@ -431,26 +442,26 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                                 if len(action) >= 2:
                                     card_value = self._get_card_value(action[1])
                                     if card_value <= 10:  # 小牌，安全
-                                        score += 70  # 鼓励用小牌压制
+                                        pressure += 70  # 鼓励用小牌压制
                                     elif card_value <= 13:  # 中等牌
-                                        score += 50
+                                        pressure += 50
                                     else:  # 大牌，谨慎
-                                        score += 30
+                                        pressure += 30
                             except:
-                                score += 50
+                                pressure += 50
                         elif action_type != "PASS":
-                            score += 40
+                            pressure += 40
                         else:
-                            score -= 20
+                            pressure -= 20
                     else:
                         if action_type != "PASS":
-                            score += 40
+                            pressure += 40
                 else:
                     # 主动模式，适度出牌
                     if action_type != "PASS":
-                        score += 30
+                        pressure += 30
                     else:
-                        score -= 15
+                        pressure -= 15
             
             # 一般情况：对手剩余9-15张牌（中局）
             elif min_opponent_cards <= 15:
@@ -459,32 +470,34 @@ class KnowledgeEnhancedDecisionEngine(DecisionEngine):
                     cur_action = message.get("curAction", [])
                     if cur_action and len(cur_action) > 0:
                         if action_type != "PASS":
-                            score += 20  # 适度鼓励出牌
+                            pressure += 20  # 适度鼓励出牌
                 else:
                     if action_type != "PASS":
-                        score += 15
+                        pressure += 15
             
+            score += pressure * rules["opponent_pressure"]
+
             # 策略3：对手控场检测
             if greater_pos != teammate_pos and greater_pos != my_pos and greater_pos != -1:
                 # 对手控场
                 if action_type != "PASS":
-                    score += 30  # 鼓励出牌打断对手节奏
+                    score += rules["opponent_control"]  # 鼓励出牌打断对手节奏
             
             # 策略4：主动出牌时更积极
             if is_active:
                 if action_type != "PASS":
-                    score += 20  # 主动时鼓励出牌
+                    score += rules["active_play"]  # 主动时鼓励出牌
             
             # 策略5：被动时根据情况
             else:
                 if cur_pos == teammate_pos:
                     # 队友刚出牌
                     if action_type == "PASS":
-                        score += 15  # 适当鼓励PASS
+                        score += rules["teammate_pass"]  # 适当鼓励PASS
                 elif cur_pos in [next_pos, prev_pos]:
                     # 对手刚出牌
                     if action_type != "PASS":
-                        score += 25  # 鼓励压制对手
+                        score += rules["opponent_response"]  # 鼓励压制对手
             
             enhanced_evaluations.append((idx, score))
         
@@ -1,5 +1,4 @@
 import os
-import yaml
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -62,6 +61,7 @@ class KnowledgeLoader:
                 if end_idx > 3:
                     yaml_str = content[3:end_idx].strip()
                     try:
+                        import yaml  # 延迟导入，减少客户端启动时间
                         frontmatter = yaml.safe_load(yaml_str) or {}
                     except Exception:
                         # YAML瑙ｆ瀽澶辫触锛岃烦杩噁rontmatter锛屼娇鐢ㄩ粯璁ゅ
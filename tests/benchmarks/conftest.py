@@ -0,0 +1,122 @@
+"""
+性能基准测试的局面数据
+
+局面来源：
+- Testscore/client1、client2：实战中记录的合法动作列表（每行一个），手牌由动作列表中的牌还原
+- GD_BENCH_RECORDINGS 指向的对局记录目录（见 communication.recorder）：全部act消息和出牌通知
+"""
+
+import copy
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+# lalala底层模块（state/action/utils），与 lalala_adapter_v4 使用的一致
+LALALA = SRC / "communication" / "first_prize"
+for path in (SRC, LALALA):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+CORPUS_FILES = sorted((ROOT / "Testscore").glob("client*"))
+# Testscore 语料的级牌（动作列表中2排在A之后）
+CORPUS_RANK = "2"
+# 从对局记录中最多读取的局面数
+MAX_RECORDED_POSITIONS = int(os.environ.get("GD_BENCH_MAX_POSITIONS", "200"))
+# 作为基准局面的act消息必须包含的字段
+ACT_FIELDS = ("myPos", "curRank", "handCards", "publicInfo", "curPos", "curAction",
+              "greaterPos", "greaterAction", "actionList", "indexRange")
+
+
+def _hand_from_actions(action_list):
+    """合法动作列表 → 手牌（每张牌取各动作中出现的最多张数）"""
+    hand = Counter()
+    for action in action_list:
+        if action[0] == "PASS":
+            continue
+        for card, count in Counter(action[2]).items():
+            hand[card] = max(hand[card], count)
+    return sorted(hand.elements())
+
+
+def _corpus_message(action_list, my_pos=0):
+    """把语料中的一行动作列表还原为act消息"""
+    following = action_list[0][0] == "PASS"
+    # 跟牌时以列出的最小非炸弹动作近似上家的牌（服务器列出的都是能压过上家的动作）
+    greater = None
+    if following:
+        greater = next((a for a in action_list[1:] if a[0] not in ("Bomb", "StraightFlush")), action_list[-1])
+    hand = _hand_from_actions(action_list)
+    return {
+        "type": "act",
+        "stage": "play",
+        "myPos": my_pos,
+        "curRank": CORPUS_RANK,
+        "handCards": hand,
+        "publicInfo": [{"rest": len(hand) if pos == my_pos else 27, "playArea": None} for pos in range(4)],
+        "curPos": (my_pos + 3) % 4 if following else -1,
+        "curAction": greater,
+        "greaterPos": (my_pos + 3) % 4 if following else -1,
+        "greaterAction": greater,
+        "actionList": action_list,
+        "indexRange": len(action_list) - 1,
+    }
+
+
+def _load_recordings(path):
+    """从对局记录中读取act消息和出牌通知"""
+    from communication.recorder import iter_messages
+    positions, plays = [], []
+    for record in iter_messages(path):
+        if record.direction != "recv":
+            continue
+        data = record.data()
+        if data.get("type") == "act" and data.get("stage") == "play" and data.get("actionList"):
+            if len(positions) < MAX_RECORDED_POSITIONS and all(key in data for key in ACT_FIELDS):
+                positions.append(data)
+        elif data.get("type") == "notify" and data.get("stage") == "play" and data.get("curAction"):
+            plays.append((data["curPos"], data["curAction"], data.get("myPos", 0)))
+    return positions, plays
+
+
+@pytest.fixture(scope="session")
+def positions():
+    """基准局面（act消息列表，只读，需要修改时先复制）"""
+    result = []
+    for corpus in CORPUS_FILES:
+        with open(corpus, encoding="utf-8") as f:
+            result.extend(_corpus_message(json.loads(line)) for line in f if line.strip())
+    recordings = os.environ.get("GD_BENCH_RECORDINGS")
+    if recordings:
+        result.extend(_load_recordings(recordings)[0])
+    if not result:
+        pytest.skip("没有可用的基准局面")
+    return result
+
+
+@pytest.fixture(scope="session")
+def plays(positions):
+    """出牌序列 [(座位, 动作, 我的座位)]：优先使用对局记录，否则按座位轮流打出语料中的动作"""
+    recordings = os.environ.get("GD_BENCH_RECORDINGS")
+    if recordings:
+        recorded = _load_recordings(recordings)[1]
+        if recorded:
+            return recorded
+    result = []
+    for message in positions:
+        for action in message["actionList"]:
+            if action[0] != "PASS":
+                result.append((len(result) % 4, action, 0))
+    return result
+
+
+@pytest.fixture
+def fresh_positions(positions):
+    """每轮计时前复制局面（被测函数会原地修改消息）"""
+    return lambda: ((copy.deepcopy(positions),), {})
@@ -0,0 +1,257 @@
+"""
+决策热路径的性能基准（pytest-benchmark）
+
+每个基准在一轮中处理全部基准局面（见 conftest.py），报告的时间是一轮的耗时。
+
+用法（在项目根目录）：
+    # 运行并保存为JSON基线（.benchmarks/<机器>/0001_baseline.json）
+    python -m pytest tests/benchmarks --benchmark-only --benchmark-save=baseline
+    # 与最近一次保存的基线比较，中位数变慢超过20%时失败
+    python -m pytest tests/benchmarks --benchmark-only --benchmark-compare --benchmark-compare-fail=median:20%
+    # 加入对局记录中的局面
+    set GD_BENCH_RECORDINGS=recordings
+"""
+
+import copy
+import logging
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    """被测代码的INFO日志不计入耗时"""
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="module")
+def adapter():
+    from communication.lalala_adapter_v4 import YFAdapter
+    return YFAdapter(0)
+
+
+def test_convert_message(benchmark, adapter, fresh_positions, positions):
+    """YFAdapter._convert_message：服务器消息 → YF格式"""
+    def run(messages):
+        for message in messages:
+            adapter._convert_message(message)
+
+    benchmark.extra_info["positions"] = len(positions)
+    benchmark.pedantic(run, setup=fresh_positions, rounds=50)
+
+
+def test_combine_handcards(benchmark, positions):
+    """lalala utils.combine_handcards：手牌按牌型分组"""
+    from utils import combine_handcards
+
+    def card_values(rank):
+        values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "T": 10,
+                  "J": 11, "Q": 12, "K": 13, "A": 14, "B": 16, "R": 17}
+        values[rank] = 15
+        return values
+
+    inputs = [(message["handCards"], message["curRank"], card_values(message["curRank"])) for message in positions]
+
+    def run():
+        for hand, rank, values in inputs:
+            combine_handcards(hand, rank, values)
+
+    benchmark(run)
+
+
+def test_hand_combiner(benchmark, positions):
+    """HandCombiner.combine_handcards：决策引擎使用的手牌组合"""
+    from game_logic.hand_combiner import HandCombiner
+    combiner = HandCombiner()
+    values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "T": 10,
+              "J": 11, "Q": 12, "K": 13, "A": 14, "B": 16, "R": 17}
+    inputs = [(message["handCards"], message["curRank"], dict(values, **{message["curRank"]: 15}))
+              for message in positions]
+
+    def run():
+        for hand, rank, card_val in inputs:
+            combiner.combine_handcards(hand, rank, card_val)
+
+    benchmark(run)
+
+
+def test_rule_parse(benchmark, adapter, positions):
+    """Action.rule_parse：YF规则决策"""
+    from action import Action
+    from state import State
+
+    prepared = []
+    for message in positions:
+        converted = adapter._convert_message(copy.deepcopy(message))
+        state = State("bench")
+        state.parse(converted)
+        prepared.append((converted, state))
+    action = Action("bench")
+
+    def run():
+        random.seed(0)
+        for converted, state in prepared:
+            action.rule_parse(
+                converted, state._myPos, state.remain_cards, state.history,
+                state.remain_cards_classbynum, state.pass_num, state.my_pass_num, state.tribute_result
+            )
+
+    benchmark(run)
+
+
+@pytest.fixture(scope="module")
+def engines(positions):
+    """每个局面一个已更新状态的DecisionEngine"""
+    from decision.decision_engine import DecisionEngine
+    from game_logic.enhanced_state import EnhancedGameStateManager
+    result = []
+    for message in positions:
+        state = EnhancedGameStateManager()
+        state.update_from_message(message)
+        result.append((DecisionEngine(state), message))
+    return result
+
+
+def test_evaluate_all_actions(benchmark, engines):
+    """MultiFactorEvaluator.evaluate_all_actions：全部合法动作评分"""
+    def run():
+        for engine, message in engines:
+            engine.evaluator.evaluate_all_actions(message["actionList"], message["greaterAction"])
+
+    benchmark(run)
+
+
+def test_enhance_candidates(benchmark, engines):
+    """KnowledgeEnhancedDecisionEngine.enhance_candidates：知识规则加权"""
+    from knowledge.knowledge_enhanced_decision import KnowledgeEnhancedDecisionEngine
+    prepared = []
+    for engine, message in engines:
+        evaluations = engine.evaluator.evaluate_all_actions(message["actionList"], message["greaterAction"])
+        candidates = [(idx, score, "DecisionEngine") for idx, score in evaluations[:5]]
+        prepared.append((KnowledgeEnhancedDecisionEngine(engine.state), candidates, message))
+
+    def run():
+        for knowledge, candidates, message in prepared:
+            knowledge.enhance_candidates(candidates, message)
+
+    benchmark(run)
+
+
+def test_card_tracker(benchmark, plays):
+    """CardTracker.update_from_play：逐个出牌更新记牌器"""
+    from game_logic.card_tracking import CardTracker
+
+    def run():
+        tracker = CardTracker()
+        for cur_pos, action, my_pos in plays:
+            tracker.update_from_play(cur_pos, action, my_pos)
+
+    benchmark.extra_info["plays"] = len(plays)
+    benchmark(run)
+
+
+def test_feature_extract(benchmark, positions):
+    """FeatureExtractor.extract：局面 + 全部候选动作 → 特征数组（extra_info 给出每个候选动作的微秒数）"""
+    pytest.importorskip("numpy")
+    from game_logic.card_tracking import CardTracker
+    from game_logic.features import FeatureExtractor
+    extractor = FeatureExtractor()
+    tracker = CardTracker()
+    candidates = sum(len(message["actionList"]) for message in positions)
+
+    def run():
+        for message in positions:
+            extractor.extract(message, tracker)
+
+    benchmark.extra_info["candidates"] = candidates
+    benchmark(run)
+    if benchmark.stats is not None:
+        benchmark.extra_info["us_per_candidate"] = benchmark.stats.stats.median / candidates * 1e6
+
+
+def test_learned_top_candidates(benchmark, positions):
+    """LearnedEvaluator.top_candidates：特征提取 + 批量前向计算（随机初始化的 96-64-1 MLP）"""
+    np = pytest.importorskip("numpy")
+    from game_logic.card_tracking import CardTracker
+    from decision.learned_evaluator import LearnedEvaluator
+    from game_logic.features import ACTION_DIM, STATE_DIM
+    rng = np.random.default_rng(0)
+    model = LearnedEvaluator([
+        (rng.standard_normal((STATE_DIM + ACTION_DIM, 64)) * 0.1, np.zeros(64)),
+        (rng.standard_normal((64, 1)) * 0.1, np.zeros(1)),
+    ])
+    tracker = CardTracker()
+
+    def run():
+        for message in positions:
+            model.top_candidates(message, tracker)
+
+    benchmark.extra_info["positions"] = len(positions)
+    benchmark(run)
+    if benchmark.stats is not None:
+        benchmark.extra_info["us_per_decision"] = benchmark.stats.stats.median / len(positions) * 1e6
+
+
+def test_v4_decide(benchmark, positions):
+    """HybridDecisionEngineV4.decide：完整决策（全部层，不受时间预算影响）"""
+    import time
+    from decision.hybrid_decision_engine_v4 import HybridDecisionEngineV4
+    engine = HybridDecisionEngineV4(0, {
+        "decision_budget": 60.0,
+        "breaker_latency": float("inf"),
+        "log_mode": "production",
+    })
+
+    def run(messages):
+        random.seed(0)
+        for message in messages:
+            engine.decide(message, deadline=time.perf_counter() + 60.0)
+
+    # 预热：首次决策时才创建各层引擎和加载知识库
+    run(copy.deepcopy(positions))
+    benchmark.extra_info["positions"] = len(positions)
+    benchmark.pedantic(run, setup=lambda: ((copy.deepcopy(positions),), {}), rounds=5)
+
+
+def test_selfplay_game(benchmark):
+    """decision.selfplay.play_game：一局离线对局（first_prize 规则 对 随机，extra_info 给出每小时决策数）"""
+    import contextlib
+    from decision.selfplay import parse_players, play_game
+
+    players = parse_players("yf,random")
+    games = []
+
+    def run():
+        with contextlib.redirect_stdout(None):
+            _, decisions, _ = play_game(players, random.Random(len(games)), 0, level="2")
+        games.append(len(decisions))
+
+    benchmark.pedantic(run, rounds=10)
+    if benchmark.stats is not None:
+        decisions = sum(games) / len(games)
+        benchmark.extra_info["decisions"] = decisions
+        benchmark.extra_info["decisions_per_hour"] = decisions / benchmark.stats.stats.mean * 3600
+
+
+def test_tune_deal(benchmark):
+    """decision.tuner.run_task：一个候选参数在一副牌上打两局（交换座位，extra_info 给出每小时局数）"""
+    from decision import tuned_weights
+    from decision.replay import EngineSpec
+    from decision.selfplay import PlayerSpec
+    from decision.tuner import TuneTask, run_task
+
+    params = tuned_weights.current()
+    params["knowledge.active_play"] = 40.0
+    task = TuneTask(0, EngineSpec("knowledge", tuple(params.items())), PlayerSpec(EngineSpec("knowledge")),
+                    (0,), "bench", level="2")
+    run_task(task)  # 预热：创建引擎、加载知识库
+    result = benchmark.pedantic(run_task, args=(task,), rounds=5)
+    if benchmark.stats is not None:
+        benchmark.extra_info["games_per_hour"] = result.games / benchmark.stats.stats.mean * 3600
@@ -0,0 +1,3 @@
+"""
+单元测试
+"""
@@ -0,0 +1,16 @@
+"""
+单元测试的导入路径
+
+src 下的模块按 "decision.xxx"、"game_logic.xxx" 导入（与客户端相同），
+批量执行器按 "batch_executor.xxx" 从项目根目录导入。
+"""
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+for path in (ROOT, SRC):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,102 @@
+"""
+牌型识别、大小比较和合法动作枚举
+
+手牌取自 docs/replay_analysis 中引用的比赛发牌记录。
+"""
+
+import pytest
+
+from game_logic.card_patterns import PASS, beats, classify, find_action, legal_actions
+from game_logic.rep_parser import parse_cards
+
+pytestmark = pytest.mark.unit
+
+HANDS = {
+    0: "S3CADACKSJHTSTSTH9C9C9H8C8D8S7H7C7H6C6H5C5S5H4D4D4H2D2",
+    1: "RRrrS3H3D3CASKCKSQCQDQHJHJCJCJHTH9D8H7C7C6D5S4H4S2C2C2",
+    2: "RRC3C3SAHAHAHKHKHQHQSJCTDTS9D9S8C8D7D7S6H6D6S5H5D5C4C4",
+    3: "rrH3D3SADASKDKDKSQCQDQDJDJCTDTS9D9S8H8S7S6D6C5S4S2H2D2",
+}
+LEVELS = ("2", "4")
+
+
+@pytest.mark.parametrize("cards, level, expected", [
+    (["SQ", "HQ"], "2", ("Pair", "Q")),
+    (["S5", "H5", "D5", "C4", "C4"], "2", ("ThreeWithTwo", "5")),
+    (["S8", "S7", "S6", "S5", "S4"], "2", ("StraightFlush", "4")),
+    (["S8", "C7", "S6", "H2", "S4"], "2", ("Straight", "4")),  # 红桃级牌补5
+    (["SA", "C2", "D3", "S4", "H5"], "9", ("Straight", "A")),
+    (["SK", "HK", "CK", "DK", "DK"], "2", ("Bomb", "K")),
+    (["SB", "SB", "HR", "HR"], "2", ("Bomb", "JOKER")),
+])
+def test_classify(cards, level, expected):
+    pattern = classify(cards, level)
+    assert (pattern.type, pattern.rank) == expected
+
+
+@pytest.mark.parametrize("cards", [["S3", "S4"], ["SB", "HR"], ["S3", "S3", "S4", "S4"]])
+def test_classify_rejects_invalid(cards):
+    assert classify(cards, "2") is None
+
+
+def test_bomb_order():
+    level = "2"
+    ordered = [
+        ["SA", "HA", "CA"],  # 非炸弹
+        ["S3", "H3", "C3", "D3"],
+        ["S9", "H9", "C9", "D9"],
+        ["S3", "H3", "C3", "D3", "D3"],
+        ["S8", "S7", "S6", "S5", "S4"],
+        ["S3", "H3", "C3", "D3", "D3", "S3"],
+        ["SB", "SB", "HR", "HR"],
+    ]
+    patterns = [classify(cards, level) for cards in ordered]
+    for weaker, stronger in zip(patterns[1:], patterns[2:]):
+        assert beats(stronger, weaker, level)
+        assert not beats(weaker, stronger, level)
+    assert not beats(patterns[0], patterns[1], level)
+
+
+def test_different_types_do_not_beat_each_other():
+    pair = classify(["SQ", "HQ"], "2")
+    single = classify(["SA"], "2")
+    assert not beats(single, pair, "2")
+    assert not beats(pair, single, "2")
+
+
+@pytest.mark.parametrize("seat", sorted(HANDS))
+@pytest.mark.parametrize("level", LEVELS)
+def test_find_action_round_trip(seat, level):
+    actions = legal_actions(parse_cards(HANDS[seat]), level)
+    assert actions
+    for i, action in enumerate(actions):
+        pattern = classify(action[2], level)
+        assert pattern is not None and pattern.type == action[0]
+        j = find_action(actions, action[2], level)
+        # 带万能牌的三带二可以声明为不同的三张点数，按牌识别出的组合查找
+        assert j >= 0 and classify(actions[j][2], level).key == pattern.key
+        if pattern.rank == action[1]:
+            assert j == i
+
+
+@pytest.mark.parametrize("greater", [
+    ["Single", "J", ["SJ"]],
+    ["Pair", "4", ["S4", "H4"]],
+    ["ThreeWithTwo", "5", ["S5", "H5", "D5", "C4", "C4"]],
+    ["Bomb", "6", ["S6", "H6", "C6", "D6"]],
+])
+def test_following_actions_beat_target(greater):
+    level = "2"
+    target = classify(greater[2], level)
+    actions = legal_actions(parse_cards(HANDS[1]), level, greater)
+    assert actions[0][0] == PASS
+    assert find_action(actions, [], level) == 0
+    for action in actions[1:]:
+        assert beats(classify(action[2], level), target, level)
+
+
+def test_find_action_missing():
+    actions = legal_actions(["S3", "S4"], "2")
+    assert find_action(actions, ["SA"], "2") == -1
+    assert find_action(actions, ["S3", "S4"], "2") == -1
+    assert find_action(actions, [], "2") == -1
@@ -0,0 +1,44 @@
+"""
+快速路径只处理强制或等价的决策
+"""
+
+import pytest
+
+from decision.fast_path import classify_trivial
+
+pytestmark = pytest.mark.unit
+
+PASS = ["PASS", "PASS", "PASS"]
+
+
+def _play(actions, hand=("S3", "H5", "C9", "DK"), my_pos=0, greater_pos=-1):
+    return {"type": "act", "stage": "play", "myPos": my_pos, "curRank": "2", "handCards": list(hand),
+            "greaterPos": greater_pos, "actionList": actions}
+
+
+def test_single_action_is_forced():
+    assert classify_trivial(_play([PASS])) == (0, "forced")
+
+
+def test_playing_out_the_hand():
+    actions = [PASS, ["Single", "9", ["C9"]], ["Pair", "9", ["C9", "H9"]]]
+    assert classify_trivial(_play(actions, hand=["C9", "H9"], greater_pos=1)) == (2, "wins_hand")
+
+
+@pytest.mark.parametrize("greater_pos", [1, 2, 3])
+def test_pass_or_beat_goes_to_pipeline(greater_pos):
+    # 出牌还是PASS由关键规则和知识层决定（对手、队友领先都一样）
+    actions = [PASS, ["Single", "K", ["DK"]]]
+    assert classify_trivial(_play(actions, greater_pos=greater_pos)) is None
+    assert classify_trivial(_play(actions[::-1], greater_pos=greater_pos)) is None
+
+
+def test_back_with_equivalent_cards():
+    message = {"type": "act", "stage": "back", "actionList": [["back", "5", ["S5"]], ["back", "5", ["H5"]]]}
+    assert classify_trivial(message) == (0, "equivalent")
+
+
+def test_tribute_keeps_wild_card():
+    message = {"type": "act", "stage": "tribute", "curRank": "3",
+               "actionList": [["tribute", "3", ["H3"]], ["tribute", "A", ["SA"]]]}
+    assert classify_trivial(message) == (1, "tribute")
@@ -0,0 +1,100 @@
+"""
+HybridDecisionEngineV4 的候选合并与层统计
+"""
+
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from decision import hybrid_decision_engine_v4
+from decision.hybrid_decision_engine_v4 import HybridDecisionEngineV4, LayerCircuitBreaker
+
+pytestmark = pytest.mark.unit
+
+
+MESSAGE = {
+    "type": "act", "stage": "play", "myPos": 0, "curRank": "2",
+    "handCards": ["S3", "H3", "S5", "C9"],
+    "publicInfo": [{"rest": 4}, {"rest": 20}, {"rest": 20}, {"rest": 20}],
+    "curPos": -1, "curAction": None, "greaterPos": -1, "greaterAction": None,
+    "actionList": [["Single", "3", ["S3"]], ["Pair", "3", ["S3", "H3"]],
+                   ["Single", "5", ["S5"]], ["Single", "9", ["C9"]]],
+    "indexRange": 3,
+}
+
+
+def _engine(order, yf, decision):
+    engine = HybridDecisionEngineV4(0, {"log_mode": "production", "enable_fast_path": False})
+    engine.logger.setLevel(logging.CRITICAL)
+    engine._candidate_layer_order = lambda: list(order)
+    engine._try_yf = lambda message: list(yf)
+    engine._try_decision_engine = lambda message, timer=None: list(decision)
+    return engine
+
+
+@pytest.mark.parametrize("yf, decision", [
+    ([(1, 110.0), (2, 80.0)], [(2, 95.0), (1, 60.0), (3, 40.0)]),
+    ([(3, 100.0)], [(3, 100.0), (0, 10.0)]),
+])
+def test_candidate_merge_ignores_layer_order(yf, decision):
+    first = _engine(["YF", "DecisionEngine"], yf, decision)
+    second = _engine(["DecisionEngine", "YF"], yf, decision)
+    assert first._generate_candidates(MESSAGE) == second._generate_candidates(MESSAGE)
+    assert first._proposers == second._proposers
+
+
+def test_duplicate_action_keeps_highest_score_and_credits_every_proposer():
+    engine = _engine(["YF", "DecisionEngine"], [(2, 80.0)], [(2, 95.0), (1, 60.0)])
+    engine._enhance_candidates = lambda candidates, message: list(candidates)
+    candidates = engine._generate_candidates(MESSAGE)
+    assert (2, 95.0, "DecisionEngine") in candidates
+    assert sorted(engine._proposers[2]) == ["DecisionEngine", "YF"]
+
+    assert engine.decide(MESSAGE) == 2
+    assert engine.stats.selected_layers == {"YF": 1, "DecisionEngine": 1}
+
+
+def test_failed_enhancement_is_not_counted_as_success():
+    engine = _engine(["YF", "DecisionEngine"], [(1, 100.0)], [])
+
+    class Broken:
+        def enhance_candidates(self, candidates, message):
+            raise RuntimeError("boom")
+
+    engine.knowledge_enhanced = Broken()
+    assert engine.decide(MESSAGE) == 1
+    usage = engine.stats.layer_usage["KnowledgeEnhanced"]
+    assert (usage["success"], usage["failure"]) == (0, 1)
+
+
+def test_reset_game_clears_layer_costs():
+    engine = _engine(["YF", "DecisionEngine"], [(1, 100.0)], [])
+    engine._layer_cost = {"YF": 0.2, "DecisionEngine": None}
+    engine.reset_game()
+    assert engine._layer_cost == {"YF": None, "DecisionEngine": None}
+    engine._observe_cost("YF", 0.01)
+    assert engine._layer_cost["YF"] == 0.01
+
+
+def test_slow_first_call_does_not_open_breaker(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(hybrid_decision_engine_v4, "time",
+                        SimpleNamespace(perf_counter=lambda: clock[0], time=time.time))
+    engine = _engine(["YF", "DecisionEngine"], [], [])
+
+    def call(duration):
+        def run():
+            clock[0] += duration
+            return []
+        return run
+
+    # 第一次调用包含延迟初始化（加载知识库等），远超熔断的延迟阈值
+    engine._run_layer("YF", call(2.0), None)
+    for _ in range(engine.breaker.min_samples):
+        engine._run_layer("YF", call(0.01), None)
+
+    assert engine.breaker.get_states().get("YF", LayerCircuitBreaker.CLOSED) == LayerCircuitBreaker.CLOSED
+    assert engine.stats.get_layer_window("YF") == [(True, pytest.approx(0.01))] * engine.breaker.min_samples
+    assert engine._layer_cost["YF"] == pytest.approx(0.01)
@@ -0,0 +1,109 @@
+"""
+ServerOutputParser 的逐行解析
+
+data/server_output/ 下是按平台输出格式整理的服务器输出：
+完整批次、批次中途崩溃、只有"本局结束"行的输出。
+"""
+
+from pathlib import Path
+
+import pytest
+
+from batch_executor.output_parser import ServerOutputParser, seat_wins_to_teams
+
+pytestmark = pytest.mark.unit
+
+DATA = Path(__file__).parent / "data" / "server_output"
+
+
+def _feed(name, expected_games):
+    parser = ServerOutputParser(batch=1, expected_games=expected_games)
+    events = []
+    for line in (DATA / name).read_text(encoding="utf-8").splitlines():
+        events.extend(parser.feed(line))
+    return parser, events
+
+
+def test_seat_wins_count_each_game_once_per_team():
+    # 平台示例：0、2号位赢下2局后为 [2, 0, 2, 0]
+    assert seat_wins_to_teams({0: 2, 1: 0, 2: 2, 3: 0}) == (2, 0)
+    assert seat_wins_to_teams({0: 2, 1: 1, 2: 2, 3: 1}) == (2, 1)
+    assert seat_wins_to_teams({1: 3}) == (0, 3)
+
+
+def test_full_batch_converts_cumulative_lines_to_deltas():
+    parser, events = _feed("full_batch.log", expected_games=3)
+
+    scores = [(e.team_a, e.team_b) for e in events if e.kind == "score"]
+    assert scores == [(1, 0), (0, 1), (1, 0)]
+    assert parser.result() == (2, 1)
+    assert parser.finished
+    assert parser.games_finished == 3
+    assert parser.remaining_games() == 0
+    assert sum(e.games for e in events) == 3
+    # 批次结束行同时带最终战绩，先产生score事件再产生batch_end
+    assert [e.kind for e in events[-2:]] == ["score", "batch_end"]
+    # 平局统计行不是战绩行
+    assert parser.tail[-1].startswith("其中平局次数")
+
+
+def test_mid_batch_crash_leaves_unplayed_games():
+    parser, events = _feed("mid_batch_crash.log", expected_games=5)
+
+    assert parser.result() == (1, 1)
+    assert not parser.finished
+    assert parser.games_finished == 2
+    assert parser.remaining_games() == 3
+    errors = [e for e in events if e.kind == "error"]
+    assert errors and errors[0].line == "Traceback (most recent call last):"
+
+
+def test_game_end_only_output_counts_games_without_result():
+    parser, events = _feed("game_end_only.log", expected_games=3)
+
+    assert parser.result() is None
+    assert [e.kind for e in events] == ["game_end"] * 3
+    assert [e.games for e in events] == [1, 1, 1]
+    assert parser.remaining_games() == 0
+    assert not parser.finished
+
+
+def test_games_never_exceed_expected():
+    parser, _ = _feed("game_end_only.log", expected_games=2)
+
+    assert parser.games_finished == 2
+    assert parser.remaining_games() == 0
+
+
+def test_repeated_cumulative_line_is_not_scored_twice():
+    parser = ServerOutputParser(batch=2, expected_games=3)
+    line = "其中0号位胜利1次，1号位胜利0次，2号位胜利1次，3号位胜利0次"
+
+    first = parser.feed(line)
+    second = parser.feed(line)
+
+    assert [(e.kind, e.team_a, e.seat_wins) for e in first] == [("score", 1, {0: 1, 2: 1})]
+    assert second == []
+    assert parser.result() == (1, 0)
+
+
+def test_finish_order_and_level_attach_to_next_score():
+    _, events = _feed("full_batch.log", expected_games=3)
+
+    games = [result for e in events if e.kind == "score" for result in e.game_results()]
+    assert games == [
+        ("team_a", 0, [0, 2, 1, 3], "2"),
+        ("team_b", 3, [3, 1, 0, 2], "2"),
+        ("team_a", 2, [2, 0, 3, 1], "2"),
+    ]
+
+
+def test_game_results_without_matching_order():
+    parser = ServerOutputParser(batch=1, expected_games=3)
+    parser.feed("对局结束，完牌次序为[1, 3, 0, 2]，结束时所打的等级为5")
+    # 一个战绩行计入两局：完牌次序只属于其中一局，不填入
+    events = parser.feed("其中0号位胜利1次，1号位胜利1次，2号位胜利1次，3号位胜利1次")
+    assert events[0].game_results() == [("team_a", None, None, None), ("team_b", None, None, None)]
+    # 完牌次序已被上一个战绩事件使用
+    events = parser.feed("其中0号位胜利2次，1号位胜利1次，2号位胜利2次，3号位胜利1次")
+    assert events[0].game_results() == [("team_a", None, None, None)]
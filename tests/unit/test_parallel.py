@@ -0,0 +1,99 @@
+"""
+并行对局组：服务器中途退出后的配额处理
+
+服务器和客户端进程由 _FakeRestartManager 代替，服务器输出取自 data/server_output/。
+"""
+
+import queue
+import threading
+from pathlib import Path
+
+import pytest
+
+from batch_executor.executor import MAX_STALLED_BATCHES
+from batch_executor.parallel import GameGroup
+
+pytestmark = pytest.mark.unit
+
+DATA = Path(__file__).parent / "data" / "server_output"
+
+
+class _FakeProcess:
+    def wait(self, timeout=None):
+        return 0
+
+    def kill(self):
+        pass
+
+
+class _FakeRestartManager:
+    """每次启动服务器时依次输出一段服务器输出"""
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.started = []
+        self.clients = []
+
+    def cleanup(self, kill_strays=True):
+        pass
+
+    def restart_server(self, server_path, games, port=None, server_args=None):
+        self.started.append(games)
+        return _FakeProcess()
+
+    def restart_clients(self, scripts, env=None, seed=None):
+        self.clients.append(scripts)
+        return [object()] * len(scripts)
+
+    def get_startup_overhead(self):
+        return 0.0
+
+    def iter_server_output(self):
+        output = self.outputs.pop(0) if self.outputs else ""
+        return iter(output.splitlines())
+
+    def shutdown(self, kill_strays=True):
+        pass
+
+
+def _run(outputs, quota):
+    group = GameGroup(0, 23456, "server", ["client.py"] * 4)
+    group.restart_manager = _FakeRestartManager(outputs)
+    quotas = queue.Queue()
+    quotas.put(quota)
+    results = []
+    group._run(quotas, lambda index, event: None,
+               lambda index, parser, overhead: results.append(parser), threading.Event())
+    return group, quotas, results
+
+
+def _log(name):
+    return (DATA / name).read_text(encoding="utf-8")
+
+
+def test_crashed_batch_is_requeued():
+    group, quotas, results = _run([_log("mid_batch_crash.log"), _log("full_batch.log")], (4, 5))
+
+    assert group.restart_manager.started == [5, 3]
+    assert [(p.batch, p.games_finished, p.finished) for p in results] == [(4, 2, False), (4, 3, True)]
+    assert sum(p.games_finished for p in results) == 5
+    assert quotas.empty()
+
+
+def test_requeued_quota_keeps_client_scripts():
+    scripts = ["a.py", "b.py", "a.py", "b.py"]
+    group, quotas, results = _run([_log("mid_batch_crash.log"), _log("full_batch.log")], (1, 5, scripts))
+
+    assert group.restart_manager.clients == [scripts, scripts]
+    assert results[-1].finished and quotas.empty()
+
+
+def test_group_stops_after_stalled_batches():
+    outputs = [_log("mid_batch_crash.log")] + [""] * (MAX_STALLED_BATCHES + 1)
+    group, quotas, results = _run(outputs, (1, 5))
+
+    assert len(results) == 1 + MAX_STALLED_BATCHES
+    assert group.stalled_batches == MAX_STALLED_BATCHES
+    # 未完成的场次留在队列中，由其他组或串行循环完成
+    assert quotas.get_nowait() == (1, 3)
+    assert quotas.empty()
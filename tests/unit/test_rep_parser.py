@@ -0,0 +1,88 @@
+"""
+.rep 回放解析
+
+data/replays/sample.rep 按 docs/replay_analysis 中引用的比赛记录整理（发牌、进贡和第一轮出牌）。
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from game_logic.card_patterns import BIG_JOKER, PASS, SMALL_JOKER
+from game_logic.rep_parser import ReplayGame, iter_events, parse_cards, parse_play
+
+pytestmark = pytest.mark.unit
+
+SAMPLE = Path(__file__).parent / "data" / "replays" / "sample.rep"
+
+
+def _events(chunk_size):
+    with open(SAMPLE, encoding="utf-8") as stream:
+        return list(iter_events(stream, chunk_size))
+
+
+def test_parse_cards_jokers():
+    assert parse_cards("RRrrS3HT") == [BIG_JOKER, SMALL_JOKER, "S3", "HT"]
+    assert parse_cards("") == []
+
+
+@pytest.mark.parametrize("text", ["S3H", "X3", "S1"])
+def test_parse_cards_invalid(text):
+    with pytest.raises(ValueError):
+        parse_cards(text)
+
+
+@pytest.mark.parametrize("data, cards", [
+    ("S4D2", ["S4"]),
+    ("S5H5D5C4C4D3", ["S5", "H5", "D5", "C4", "C4"]),
+    ("RRD2", [BIG_JOKER]),
+    ("D0", []),
+    ("PASS", []),
+    ("", []),
+])
+def test_parse_play_strips_tag(data, cards):
+    assert parse_play(data) == cards
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_iter_events_independent_of_chunk_size(chunk_size):
+    expected = _events(64 * 1024)
+    assert [e.kind for e in expected[:5]] == ["deal"] * 4 + ["tribute"]
+    assert expected[-1].kind == "end"
+    assert _events(chunk_size) == expected
+
+
+def test_iter_events_ignores_unknown_elements():
+    stream = io.StringIO('<replay><note text="x"/><play p="1" cards="S4D2"/></replay>')
+    events = list(iter_events(stream))
+    assert [(e.kind, e.seat, e.data) for e in events] == [("play", 1, "S4D2")]
+
+
+def test_replay_game_decisions():
+    game = ReplayGame(level="2")
+    decisions = []
+    stages = []
+    for event in _events(64 * 1024):
+        for message, decision in game.feed(event):
+            stages.append(message["stage"])
+            if decision is not None:
+                decisions.append(decision)
+
+    assert stages[:5] == ["beginning"] * 4 + ["tribute"]
+    assert stages[-1] == "episodeOver"
+    assert [d.seat for d in decisions] == [1, 2, 3, 0, 1, 2, 3, 0]
+    for decision in decisions:
+        action = decision.message["actionList"][decision.chosen]
+        assert decision.chosen >= 0
+        if decision.cards:
+            assert sorted(action[2]) == sorted(decision.cards)
+        else:
+            assert action[0] == PASS
+    assert [d.cards for d in decisions][:4] == [["S4"], ["SJ"], ["SQ"], ["CK"]]
+    # 三家PASS后0号位重新出牌
+    assert decisions[-1].message["greaterAction"] is None
+    # 队友（2号位）刚PASS过一次，自己没有PASS
+    assert decisions[-1].passes == (1, 0)
+    assert game.invalid_plays == 0 and game.unknown_cards == 0
+    assert len(game.hands[0]) == 25
@@ -0,0 +1,64 @@
+"""
+决策回放的确定性：同一份记录用1个进程和多个进程回放，V4的选择相同
+"""
+
+import json
+import random
+
+import pytest
+
+from communication.recorder import GameRecorder
+from decision import replay
+from decision.replay import EngineSpec, plan_tasks, run_replay
+from game_logic.simulator import SelfPlayGame
+
+pytestmark = pytest.mark.unit
+
+GAMES = 3
+
+
+def _record(directory, games, seed=7):
+    """随机出牌对局中0号位收发的消息写成记录（与客户端记录的内容相同）"""
+    rng = random.Random(seed)
+    recorder = GameRecorder(str(directory), "yf1_v4", codec="gzip")
+    for _ in range(games):
+        game = SelfPlayGame(rng, "2")
+        recorder.received(json.dumps(game.beginning(0)))
+        while not game.finished:
+            seat = game.turn
+            message = game.prompt(seat)
+            choice = rng.randrange(len(message["actionList"]))
+            if seat == 0:
+                recorder.received(json.dumps(message))
+                recorder.sent(json.dumps({"actIndex": choice}))
+            recorder.received(json.dumps(game.play(seat, choice)))
+        recorder.received(json.dumps(game.episode_over()))
+        recorder.received(json.dumps({"type": "notify", "stage": "gameResult", "victoryNum": [1, 0, 1, 0]}))
+    recorder.close()
+
+
+def _choices(report):
+    return report.decisions, report.agreed_recorded, [
+        (item["game"], item["decision"], item["choice"]) for item in report.mismatches
+    ]
+
+
+@pytest.mark.slow
+def test_v4_replay_independent_of_workers(tmp_path):
+    _record(tmp_path, GAMES)
+    tasks = plan_tasks(str(tmp_path), EngineSpec("v4"), seed=3)
+    assert len(tasks) == GAMES
+
+    serial = run_replay(tasks, workers=1)
+    parallel = run_replay(tasks, workers=2)
+    # 每局使用新建的引擎
+    fresh = []
+    for task in tasks:
+        replay._engines.clear()
+        fresh.append(replay.replay_game(task))
+
+    assert serial.decisions > 0 and serial.errors == 0
+    assert _choices(parallel) == _choices(serial)
+    assert [item["choice"] for result in fresh for item in result.mismatches] == \
+        [item["choice"] for item in serial.mismatches]
+    assert sum(result.agreed_recorded for result in fresh) == serial.agreed_recorded
@@ -0,0 +1,40 @@
+"""
+逐局战绩数据库
+"""
+
+import sqlite3
+
+import pytest
+
+from batch_executor.results_store import GameRecord, ResultsStore
+
+pytestmark = pytest.mark.unit
+
+
+def test_records_level_and_finish_order(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    store.record_games([
+        GameRecord("run", 1, "team_a", seat=2, level="5", finish_order="2,0,3,1", duration=30.0),
+        GameRecord("run", 1, "team_b"),
+    ])
+
+    assert store.totals("run") == {"team_a": 1, "team_b": 1, "total": 2}
+    assert [(row["key"], row["games"]) for row in store.summary_by("level")] == [(None, 1), ("5", 1)]
+    store.close()
+
+
+def test_opens_database_without_new_columns(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, run_id TEXT NOT NULL, batch INTEGER NOT NULL, "
+        "winner TEXT NOT NULL, seat INTEGER, strategy_a TEXT, strategy_b TEXT, duration REAL, ts REAL NOT NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    store = ResultsStore(path)
+    assert store.record_games([GameRecord("run", 1, "team_a", seat=0, level="2", finish_order="0,2,1,3")]) == 1
+    store.close()
+    row = sqlite3.connect(path).execute("SELECT seat, level, finish_order FROM games").fetchone()
+    assert row == (0, "2", "0,2,1,3")
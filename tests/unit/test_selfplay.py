@@ -0,0 +1,52 @@
+"""
+自我对弈的确定性：工作进程中缓存的引擎先对过其他局，不影响之后的决策
+"""
+
+import contextlib
+import random
+
+import pytest
+
+from decision import selfplay
+from decision.selfplay import parse_players, play_game
+
+pytestmark = pytest.mark.unit
+
+
+def _choices(players, seed, game_id):
+    with contextlib.redirect_stdout(None):
+        _, decisions, errors = play_game(players, random.Random(seed), game_id, "2")
+    return [(decision.seat, decision.chosen) for decision, _, _ in decisions], errors
+
+
+@pytest.mark.slow
+def test_cached_engines_do_not_carry_over_between_games():
+    players = parse_players("v4,random")
+
+    selfplay._engines.clear()
+    fresh = _choices(players, "game", 1)
+
+    selfplay._engines.clear()
+    _choices(players, "warm-up-1", 0)
+    _choices(players, "warm-up-2", 2)
+    reused = _choices(players, "game", 1)
+
+    assert fresh[0] and fresh == reused
+
+
+def test_v4_engine_is_pinned_and_reset_each_game():
+    players = parse_players("v4,random")
+    selfplay._engines.clear()
+    engine = selfplay._engine(players[0].engine, 0)
+    v4 = engine.engine
+    order = v4._candidate_layer_order()
+
+    # 前面的局：YF层熔断，各层的耗时和选中次数足以改变自适应顺序
+    v4.breaker.record("YF", [(False, 0.01)] * 5)
+    v4._layer_cost.update(YF=0.2, DecisionEngine=0.001)
+    v4.stats.selected_layers.update(YF=1, DecisionEngine=50)
+    assert v4._candidate_layer_order() == order
+
+    engine.reset()
+    assert v4.breaker.get_states() == {}
+    assert all(cost is None for cost in v4._layer_cost.values())
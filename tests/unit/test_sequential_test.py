@@ -0,0 +1,39 @@
+"""
+序贯检验参数：无效的 alpha/beta/elo 在创建检验前被拒绝
+"""
+
+import argparse
+
+import pytest
+
+from batch_executor.main import validate_arguments
+from batch_executor.sequential_test import SequentialTest
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("params", [
+    dict(alpha=0), dict(alpha=1), dict(beta=0), dict(beta=1.5), dict(elo0=50, elo1=50),
+])
+def test_invalid_params_raise_value_error(params):
+    with pytest.raises(ValueError):
+        SequentialTest(**params)
+
+
+def test_defaults_are_valid():
+    test = SequentialTest()
+    assert test.lower_bound < 0 < test.upper_bound
+
+
+@pytest.mark.parametrize("alpha, beta, valid", [
+    (0.05, 0.05, True), (0, 0.05, False), (1, 0.05, False), (0.05, 0, False), (0.6, 0.05, False),
+])
+def test_arguments_rejected_before_test_is_built(tmp_path, capsys, alpha, beta, valid):
+    server = tmp_path / "server"
+    server.write_text("")
+    args = argparse.Namespace(
+        server_path=str(server), target_games=100, parallel=1, clients=[],
+        sprt=True, elo0=0.0, elo1=50.0, alpha=alpha, beta=beta, min_games=20,
+    )
+    assert validate_arguments(args) is valid
+    assert ("序贯检验参数无效" in capsys.readouterr().err) is not valid
@@ -0,0 +1,31 @@
+"""
+调参评估的公共随机数：相同参数的候选在同一组发牌上得到相同的结果
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from decision import tuned_weights
+from decision.tuner import Tuner, TuneSettings
+
+pytestmark = pytest.mark.unit
+
+
+def _summary(results):
+    return [(r.games, r.wins, r.level_delta, r.errors) for r in results]
+
+
+@pytest.mark.slow
+def test_v4_candidates_share_random_numbers():
+    tuner = Tuner(TuneSettings(engine="v4", deals_per_task=1, level="2"))
+    params = tuned_weights.current()
+    candidates = [params, dict(params)]
+
+    serial = tuner.evaluate(None, candidates, "crn", deals=2)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = tuner.evaluate(executor, candidates, "crn", deals=2)
+
+    assert serial[0].games == 4
+    assert _summary(serial)[0] == _summary(serial)[1]
+    assert _summary(parallel) == _summary(serial)